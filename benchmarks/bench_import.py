@@ -0,0 +1,78 @@
+#!/usr/bin/env python3
+"""
+Import time of the entry points of OPI, measured with `python -X importtime` in fresh interpreters.
+Exits with a non-zero status if an entry point exceeds its budget, so it can guard against regressions,
+e.g., a module that eagerly imports all blocks or keyword boxes again.
+
+Usage: python benchmarks/bench_import.py [--repeat N] [--top N]
+"""
+
+import argparse
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+# > Entry point -> budget in milliseconds (cumulative import time of the module itself)
+BUDGETS = {
+    "opi.input.core": 400.0,
+    "opi.input.structures": 400.0,
+    "opi.core": 700.0,
+    # > Imported by ExtOpt client scripts at every geometry step
+    "opi.external_methods.interface": 120.0,
+}
+
+# > Modules that must not be imported by an entry point, as they are only needed on demand
+FORBIDDEN = {
+    "opi.input.core": ("opi.input.simple_keywords.basis_set", "opi.input.blocks.block_geom", "rdkit"),
+    "opi.input.structures": ("rdkit",),
+    "opi.external_methods.interface": ("opi.core", "opi.output.core", "opi.input.core", "numpy"),
+}
+
+
+def importtime(module: str, /) -> dict[str, int]:
+    """Cumulative import time in microseconds of every module imported by `import module`."""
+    env = dict(os.environ)
+    src = str(Path(__file__).resolve().parents[1] / "src")
+    env["PYTHONPATH"] = os.pathsep.join(filter(None, (src, env.get("PYTHONPATH"))))
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-W", "ignore", "-c", f"import {module}"],
+        env=env,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    times = {}
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        _, cumulative, name = line.split("|")
+        if cumulative.strip().isdigit():
+            times[name.strip()] = int(cumulative)
+    return times
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--repeat", type=int, default=5, help="fresh interpreters per entry point")
+    parser.add_argument("--top", type=int, default=5, help="slowest imports shown per entry point")
+    args = parser.parse_args()
+
+    failed = False
+    print(f"{'module':<32} {'best/ms':>9} {'budget/ms':>10}")
+    for module, budget in BUDGETS.items():
+        runs = [importtime(module) for _ in range(args.repeat)]
+        best = min(run[module] for run in runs) / 1e3
+        status = "" if best <= budget else "  OVER BUDGET"
+        print(f"{module:<32} {best:9.1f} {budget:10.1f}{status}")
+        for name, time_us in sorted(runs[0].items(), key=lambda item: -item[1])[1 : args.top + 1]:
+            print(f"    {name:<56} {time_us / 1e3:8.1f}")
+        loaded = [name for name in FORBIDDEN.get(module, ()) if name in runs[0]]
+        for name in loaded:
+            print(f"    imports {name}, which should only be loaded on demand")
+        failed |= best > budget or bool(loaded)
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,65 @@
+#!/usr/bin/env python3
+"""
+Payload size and encode/decode time of the wire format (`opi.execution.wire`) compared to pickle,
+for calculators with structures of 10 to 10,000 atoms.
+
+Usage: python benchmarks/bench_wire.py
+"""
+
+import pickle
+import tempfile
+import timeit
+from typing import Any, Callable
+
+import numpy as np
+
+from opi.core import Calculator
+from opi.execution.wire import dumps, loads
+from opi.input.blocks import BlockScf
+from opi.input.simple_keywords import BasisSet, Dft
+from opi.input.structures.atom import Atom
+from opi.input.structures.structure import Structure
+
+SIZES = (10, 100, 1_000, 10_000)
+
+
+def make_calculator(natoms: int, working_dir: str) -> Calculator:
+    rng = np.random.default_rng(0)
+    symbols = ("C", "H", "N", "O")
+    calc = Calculator("bench", working_dir=working_dir, version_check=False)
+    calc.structure = Structure(
+        [
+            Atom(element=symbols[i % 4], coordinates=tuple(rng.normal(scale=10.0, size=3)))
+            for i in range(natoms)
+        ]
+    )
+    calc.input.add_simple_keywords(Dft.B3LYP, BasisSet.DEF2_SVP)
+    calc.input.add_blocks(BlockScf(maxiter=200))
+    return calc
+
+
+def best_of(func: Callable[[], Any], /) -> float:
+    """Best time of a few repetitions in milliseconds."""
+    number = 3
+    return min(timeit.repeat(func, number=number, repeat=5)) / number * 1e3
+
+
+def main() -> None:
+    print(f"{'atoms':>7} {'format':>7} {'bytes':>10} {'encode/ms':>10} {'decode/ms':>10}")
+    with tempfile.TemporaryDirectory() as working_dir:
+        for natoms in SIZES:
+            calc = make_calculator(natoms, working_dir)
+            for name, encode, decode in (
+                ("pickle", pickle.dumps, pickle.loads),
+                ("wire", dumps, loads),
+            ):
+                payload = encode(calc)
+                print(
+                    f"{natoms:7d} {name:>7} {len(payload):10d}"
+                    f" {best_of(lambda: encode(calc)):10.3f}"
+                    f" {best_of(lambda: decode(payload)):10.3f}"
+                )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,134 @@
+#!/usr/bin/env python3
+"""
+Benchmark suite of the hot paths of OPI (`benchmarks/suite`), runs offline.
+Results are stored per machine and commit in `benchmarks/.results` with `--save`, and `--compare REF` exits with a
+non-zero status if a case became slower than the results of another commit by more than `--threshold`.
+
+Usage: python benchmarks/run_suite.py [-k PATTERN] [--quick] [--list] [--save] [--compare [REF]] [--history]
+"""
+
+import argparse
+import fnmatch
+import sys
+from typing import Any
+
+from suite import REGISTRY
+from suite.harness import compare, git_commit, history, load, run, save
+
+
+def _format_time(seconds: float | None, /) -> str:
+    if seconds is None:
+        return f"{'failed':>11}"
+    for unit, scale in (("s", 1.0), ("ms", 1e-3), ("us", 1e-6)):
+        if seconds >= scale:
+            return f"{seconds / scale:8.3f} {unit:<2}"
+    return f"{seconds / 1e-9:8.1f} ns"
+
+
+def _report(name: str, result: dict[str, Any], /) -> None:
+    if "error" in result:
+        print(f"{name:<56} failed: {result['error']}", flush=True)
+        return
+    print(
+        f"{name:<56} {_format_time(result['best'])} {_format_time(result['median'])}"
+        f" {result['number']:8d}",
+        flush=True,
+    )
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument(
+        "-k",
+        dest="patterns",
+        action="append",
+        default=[],
+        metavar="PATTERN",
+        help="only run cases whose name matches the glob pattern, can be repeated",
+    )
+    parser.add_argument(
+        "--quick", action="store_true", help="only the smallest cases, fewer rounds"
+    )
+    parser.add_argument("--list", action="store_true", help="list the cases and exit")
+    parser.add_argument(
+        "--save", action="store_true", help="store the results of the current commit"
+    )
+    parser.add_argument(
+        "--compare",
+        nargs="?",
+        const="HEAD",
+        metavar="REF",
+        help="compare with the results of a commit or file (default: HEAD)",
+    )
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=0.2,
+        help="relative slowdown reported as regression (default: 0.2)",
+    )
+    parser.add_argument(
+        "--history",
+        action="store_true",
+        help="show the stored best times of the latest commits and exit",
+    )
+    args = parser.parse_args()
+
+    def selected(name: str) -> bool:
+        return not args.patterns or any(fnmatch.fnmatch(name, f"*{p}*") for p in args.patterns)
+
+    if args.history:
+        runs = history()
+        names = [name for run_ in runs for name in run_["results"] if selected(name)]
+        print(f"{'case':<56}" + "".join(f" {run_['commit'][:10]:>11}" for run_ in runs))
+        for name in dict.fromkeys(names):
+            times = [run_["results"].get(name, {}).get("best") for run_ in runs]
+            print(f"{name:<56}" + "".join(f" {_format_time(t)}" for t in times))
+        return 0
+
+    if args.list:
+        for bench in REGISTRY.values():
+            for name, _ in bench.cases(quick=args.quick):
+                if selected(name):
+                    print(name)
+        return 0
+
+    reference = None
+    if args.compare:
+        reference = load(args.compare)
+        print(f"Comparing with {reference['commit'][:10]} ({reference['date']})")
+
+    benchmarks = [
+        bench
+        for bench in REGISTRY.values()
+        if any(selected(name) for name, _ in bench.cases(quick=args.quick))
+    ]
+    print(f"{'case':<56} {'best':>11} {'median':>11} {'calls':>8}")
+    results = run(
+        benchmarks,
+        quick=args.quick,
+        repeat=3 if args.quick else 5,
+        min_time=0.05 if args.quick else 0.2,
+        report=_report,
+    )
+    results = {name: result for name, result in results.items() if selected(name)}
+
+    if args.save:
+        print(f"Saved results of {git_commit()[:10]} to {save(results)}")
+
+    if reference is None:
+        return 0
+    regressions = 0
+    print(f"\n{'case':<56} {'before':>11} {'after':>11} {'ratio':>7}")
+    for name, before, after, regressed in compare(
+        results, reference["results"], threshold=args.threshold
+    ):
+        regressions += regressed
+        ratio = f"{after / before:7.2f}" if before and after else f"{'-':>7}"
+        flag = "  REGRESSION" if regressed else ""
+        print(f"{name:<56} {_format_time(before)} {_format_time(after)} {ratio}{flag}")
+    print(f"{regressions} regression(s) above {args.threshold:.0%}")
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,9 @@
+"""
+Benchmarks of the hot paths of OPI, run with `python benchmarks/run_suite.py`.
+Importing the package registers all benchmarks in `harness.REGISTRY`.
+"""
+
+from . import bench_execution, bench_grepper, bench_input, bench_output
+from .harness import REGISTRY
+
+__all__ = ("REGISTRY", "bench_execution", "bench_grepper", "bench_input", "bench_output")
@@ -0,0 +1,51 @@
+"""
+Overhead of running ORCA jobs, measured with stand-ins for the ORCA binaries.
+"""
+
+import os
+import stat
+from pathlib import Path
+from typing import Any, Callable
+
+from opi.core import Calculator
+from opi.execution.core import Runner
+from opi.execution.fake_orca import FakeOrca
+from opi.input.simple_keywords import BasisSet, Dft
+from opi.lib.orca_binary import OrcaBinary
+from opi.output.core import Output
+
+from .bench_input import make_structure
+from .harness import benchmark
+
+
+@benchmark()
+def bench_runner_spawn(workdir: Path) -> Callable[[], Any]:
+    orca = workdir / "orca"
+    orca.write_text("#!/bin/sh\nexit 0\n")
+    orca.chmod(orca.stat().st_mode | stat.S_IEXEC)
+    # > Restored by the harness after the benchmark
+    os.environ["OPI_ORCA"] = str(orca)
+    runner = Runner(workdir)
+    return lambda: runner.run(OrcaBinary.ORCA, ["job.inp"])
+
+
+@benchmark(params=(3, 100))
+def bench_calculator_job(workdir: Path, natoms: int) -> Callable[[], Any]:
+    """Run a single point with the stand-in binaries, convert the results to JSON and parse them."""
+    fake = FakeOrca()
+    fake.install(workdir / "fake_orca")
+    os.environ["OPI_ORCA"] = str(fake.orca)
+    calc = Calculator("job", working_dir=workdir, version_check=False)
+    calc.structure = make_structure(natoms)
+    calc.input.add_simple_keywords(Dft.B3LYP, BasisSet.DEF2_SVP)
+
+    def func() -> Output:
+        for path in workdir.glob("job.*"):
+            path.unlink()
+        calc.write_input()
+        calc.run()
+        output = calc.get_output()
+        output.parse()
+        return output
+
+    return func
@@ -0,0 +1,47 @@
+"""
+Grepper recipes on large output files.
+"""
+
+from pathlib import Path
+from typing import Any, Callable
+
+from opi.output.grepper.recipes import (
+    get_scf_cycles,
+    has_geometry_optimization_converged,
+    has_terminated_normally,
+)
+
+from .harness import benchmark
+
+OUTPUT_FILES = Path(__file__).resolve().parents[2] / "tests" / "fixtures" / "output_files"
+
+
+def large_output(workdir: Path, megabytes: int, /) -> Path:
+    """
+    Output of the optimization fixture, preceded by repetitions of the output of the failed one, so that the
+    recipes have to scan the whole file.
+    """
+    filler = (OUTPUT_FILES / "failed_geometry.out").read_bytes()
+    outfile = workdir / "job.out"
+    with outfile.open("wb") as f:
+        f.write(filler * max(megabytes * 2**20 // len(filler), 1))
+        f.write((OUTPUT_FILES / "geometry.out").read_bytes())
+    return outfile
+
+
+@benchmark(params=(1, 32))
+def bench_has_terminated_normally(workdir: Path, megabytes: int) -> Callable[[], Any]:
+    outfile = large_output(workdir, megabytes)
+    return lambda: has_terminated_normally(outfile)
+
+
+@benchmark(params=(1, 32))
+def bench_has_geometry_optimization_converged(workdir: Path, megabytes: int) -> Callable[[], Any]:
+    outfile = large_output(workdir, megabytes)
+    return lambda: has_geometry_optimization_converged(outfile)
+
+
+@benchmark(params=(1, 32))
+def bench_get_scf_cycles(workdir: Path, megabytes: int) -> Callable[[], Any]:
+    outfile = large_output(workdir, megabytes)
+    return lambda: get_scf_cycles(outfile)
@@ -0,0 +1,47 @@
+"""
+Writing inputs and reading structures.
+"""
+
+from pathlib import Path
+from typing import Any, Callable
+
+import numpy as np
+
+from opi.core import Calculator
+from opi.input.blocks import BlockScf
+from opi.input.simple_keywords import BasisSet, Dft
+from opi.input.structures.structure import Structure
+
+from .harness import benchmark
+
+SYMBOLS = ("C", "H", "N", "O")
+
+
+def make_structure(natoms: int, /) -> Structure:
+    """Random neutral structure, seeded so that every run formats the same numbers."""
+    coordinates = np.random.default_rng(0).normal(scale=10.0, size=(natoms, 3))
+    return Structure.from_lists(
+        [SYMBOLS[i % 4] for i in range(natoms)], [tuple(xyz) for xyz in coordinates.tolist()]
+    )
+
+
+@benchmark(params=(10, 1_000, 10_000))
+def bench_write_input(workdir: Path, natoms: int) -> Callable[[], Any]:
+    calc = Calculator("bench", working_dir=workdir, version_check=False)
+    calc.structure = make_structure(natoms)
+    calc.input.add_simple_keywords(Dft.B3LYP, BasisSet.DEF2_SVP)
+    calc.input.add_blocks(BlockScf(maxiter=200))
+    return calc.write_input
+
+
+@benchmark(params=(100, 10_000, 100_000))
+def bench_structure_from_xyz(workdir: Path, natoms: int) -> Callable[[], Any]:
+    xyzfile = workdir / "structure.xyz"
+    # > Without the blank line that `to_xyz_block()` appends
+    xyzfile.write_text(make_structure(natoms).to_xyz_block().rstrip("\n") + "\n")
+    return lambda: Structure.from_xyz(xyzfile)
+
+
+@benchmark(params=(100, 10_000))
+def bench_structure_format_orca(workdir: Path, natoms: int) -> Callable[[], Any]:
+    return make_structure(natoms).format_orca
@@ -0,0 +1,60 @@
+"""
+Parsing the JSON files of ORCA.
+"""
+
+import json
+import shutil
+from pathlib import Path
+from typing import Any, Callable
+
+from opi.output.core import Output
+from opi.utils.misc import lowercase
+
+from .harness import benchmark
+
+JSON_FILES = Path(__file__).resolve().parents[2] / "tests" / "fixtures" / "json_files"
+FIXTURES = tuple(
+    sorted(path.name.removesuffix(".property.json") for path in JSON_FILES.glob("*.property.json"))
+)
+
+
+def scaled_property_json(ngeometries: int, /) -> dict[str, Any]:
+    """Property JSON of the optimization fixture with its geometries repeated to `ngeometries` entries."""
+    data: dict[str, Any] = json.loads((JSON_FILES / "opt.property.json").read_text())
+    geometries = data["Geometries"]
+    data["Geometries"] = [geometries[i % len(geometries)] for i in range(ngeometries)]
+    return data
+
+
+def parse(workdir: Path, basename: str, /) -> Callable[[], Any]:
+    read_gbw_json = (workdir / f"{basename}.json").is_file()
+
+    def func() -> Output:
+        output = Output(basename, working_dir=workdir, version_check=False)
+        output.parse(
+            do_create_property_json=False, do_create_gbw_json=False, read_gbw_json=read_gbw_json
+        )
+        return output
+
+    return func
+
+
+@benchmark(params=FIXTURES, quick=("opt", "scf"))
+def bench_parse_fixture(workdir: Path, name: str) -> Callable[[], Any]:
+    for suffix in (".property.json", ".json"):
+        if (JSON_FILES / f"{name}{suffix}").is_file():
+            shutil.copyfile(JSON_FILES / f"{name}{suffix}", workdir / f"{name}{suffix}")
+    return parse(workdir, name)
+
+
+@benchmark(params=(10, 100, 1_000))
+def bench_parse_scaled(workdir: Path, ngeometries: int) -> Callable[[], Any]:
+    (workdir / "job.property.json").write_text(json.dumps(scaled_property_json(ngeometries)))
+    return parse(workdir, "job")
+
+
+@benchmark(params=(10, 1_000))
+def bench_lowercase(workdir: Path, ngeometries: int) -> Callable[[], Any]:
+    # > `lowercase()` rebuilds every dictionary, also if its keys are lowercase already
+    data = scaled_property_json(ngeometries)
+    return lambda: lowercase(data)
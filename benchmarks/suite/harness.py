@@ -0,0 +1,278 @@
+"""
+Registration, timing and bookkeeping of the benchmarks in this package.
+Only the standard library is used, so that the suite runs offline and in any environment that can import OPI.
+
+A benchmark is a setup function decorated with `benchmark()`. It prepares everything that should not be timed in
+a fresh temporary directory and returns the callable that is timed, e.g.::
+
+     >>@benchmark(params=(10, 1_000))
+     >>def bench_write_input(workdir: Path, natoms: int) -> Callable[[], Any]:
+     >>    calc = make_calculator(natoms, workdir)
+     >>    return calc.write_input
+
+Results are stored per machine and commit, so that runs of different commits can be compared.
+"""
+
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import timeit
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Callable, Iterator, Sequence
+
+__all__ = (
+    "Benchmark",
+    "REGISTRY",
+    "benchmark",
+    "measure",
+    "run",
+    "save",
+    "load",
+    "history",
+    "compare",
+    "git_commit",
+    "machine",
+)
+
+Setup = Callable[..., Callable[[], Any]]
+
+# > Benchmark name -> benchmark, in order of registration
+REGISTRY: dict[str, "Benchmark"] = {}
+# > Results of all runs: <RESULTS_DIR>/<machine>/<commit>.json
+RESULTS_DIR = Path(__file__).resolve().parents[1] / ".results"
+_REPO = Path(__file__).resolve().parents[2]
+
+
+class Benchmark:
+    """
+    Registered benchmark.
+
+    Attributes
+    ----------
+    name: str
+        `<module>.<function>` without the `bench_` prefixes.
+    setup: Setup
+        Called with a temporary directory (and the parameter) and returns the callable that is timed.
+    params: tuple[Any, ...]
+        Parameters of the cases, or empty for a single case without parameter.
+    quick: tuple[Any, ...]
+        Parameters that are run with `--quick`.
+    """
+
+    __slots__ = ("name", "setup", "params", "quick")
+
+    def __init__(
+        self, name: str, setup: Setup, params: Sequence[Any], quick: Sequence[Any]
+    ) -> None:
+        self.name = name
+        self.setup = setup
+        self.params = tuple(params)
+        self.quick = tuple(quick)
+
+    def cases(self, *, quick: bool = False) -> Iterator[tuple[str, tuple[Any, ...]]]:
+        """Name and setup arguments of every case."""
+        if not self.params:
+            yield self.name, ()
+            return
+        for param in self.quick if quick else self.params:
+            yield f"{self.name}[{param}]", (param,)
+
+
+def benchmark(
+    *, params: Sequence[Any] = (), quick: Sequence[Any] | None = None
+) -> Callable[[Setup], Setup]:
+    """
+    Register a setup function as benchmark.
+
+    Parameters
+    ----------
+    params : Sequence[Any], default: ()
+        The benchmark is run once per parameter, which is passed to the setup function after the directory.
+    quick : Sequence[Any] | None, default: None
+        Parameters that are run with `--quick`. Defaults to the first parameter.
+    """
+
+    def register(setup: Setup) -> Setup:
+        module = setup.__module__.rpartition(".")[2].removeprefix("bench_")
+        name = f"{module}.{setup.__name__.removeprefix('bench_')}"
+        if name in REGISTRY:
+            raise ValueError(f"Benchmark registered twice: {name}")
+        REGISTRY[name] = Benchmark(name, setup, params, params[:1] if quick is None else quick)
+        return setup
+
+    return register
+
+
+def measure(
+    func: Callable[[], Any], /, *, repeat: int = 5, min_time: float = 0.2
+) -> dict[str, Any]:
+    """
+    Time `func` after a warm-up call.
+
+    Parameters
+    ----------
+    func : Callable[[], Any]
+    repeat : int, default: 5
+        Number of timed rounds.
+    min_time : float, default: 0.2
+        Minimal duration of a round in seconds; fast functions are called several times per round.
+
+    Returns
+    -------
+    dict[str, Any]
+        Best and median time per call in seconds and the number of calls per round.
+    """
+    func()
+    timer = timeit.Timer(func)
+    number = 1
+    # > Same strategy as `Timer.autorange()`, but with a configurable target
+    while (elapsed := timer.timeit(number)) < min_time and number < 1_000_000:
+        number = max(number * 2, int(number * min_time / max(elapsed, 1e-9)))
+    times = [t / number for t in timer.repeat(repeat, number)]
+    return {"best": min(times), "median": statistics.median(times), "number": number}
+
+
+def run(
+    benchmarks: Sequence[Benchmark],
+    /,
+    *,
+    quick: bool = False,
+    repeat: int = 5,
+    min_time: float = 0.2,
+    report: Callable[[str, dict[str, Any]], None] | None = None,
+) -> dict[str, dict[str, Any]]:
+    """
+    Run every case of `benchmarks` in its own temporary directory.
+    Changes of the environment variables by a setup function are undone after the case.
+    A case that raises is recorded with its error instead of a time, the other cases still run.
+
+    Returns
+    -------
+    dict[str, dict[str, Any]]
+        Case name -> result of `measure()` or `{"error": message}`.
+    """
+    results = {}
+    for bench in benchmarks:
+        for name, args in bench.cases(quick=quick):
+            environ = os.environ.copy()
+            try:
+                with tempfile.TemporaryDirectory(prefix="opi_bench_") as workdir:
+                    func = bench.setup(Path(workdir), *args)
+                    results[name] = measure(func, repeat=repeat, min_time=min_time)
+            except Exception as err:
+                results[name] = {"error": f"{type(err).__name__}: {str(err).splitlines()[0]}"}
+            finally:
+                os.environ.clear()
+                os.environ.update(environ)
+            if report is not None:
+                report(name, results[name])
+    return results
+
+
+def _git(*args: str) -> str:
+    proc = subprocess.run(["git", *args], cwd=_REPO, capture_output=True, text=True, check=True)
+    return proc.stdout.strip()
+
+
+def git_commit(ref: str = "HEAD", /) -> str:
+    """Full hash of a commit."""
+    return _git("rev-parse", "--verify", f"{ref}^{{commit}}")
+
+
+def machine() -> str:
+    """Name of the directory with the results of this machine."""
+    return f"{platform.node() or 'unknown'}-{platform.machine()}"
+
+
+def save(results: dict[str, dict[str, Any]], /, *, directory: Path = RESULTS_DIR) -> Path:
+    """
+    Store the results of the current commit of this machine.
+    Cases of an earlier run of the same commit that were not run again are kept.
+    Runs with uncommitted changes are marked as dirty.
+    """
+    commit = git_commit()
+    path = directory / machine() / f"{commit}.json"
+    path.parent.mkdir(parents=True, exist_ok=True)
+    if path.is_file():
+        results = json.loads(path.read_text())["results"] | results
+    data = {
+        "commit": commit,
+        "dirty": bool(_git("status", "--porcelain", "--untracked-files=no")),
+        "date": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "machine": machine(),
+        "python": sys.version.split()[0],
+        "platform": platform.platform(),
+        "results": results,
+    }
+    path.write_text(json.dumps(data, indent=1))
+    return path
+
+
+def load(ref: str, /, *, directory: Path = RESULTS_DIR) -> dict[str, Any]:
+    """
+    Load stored results.
+
+    Parameters
+    ----------
+    ref : str
+        Path of a results file or a git revision whose results of this machine are loaded.
+
+    Raises
+    ------
+    FileNotFoundError
+        If there are no results for `ref`.
+    """
+    path = Path(ref)
+    if not path.is_file():
+        path = directory / machine() / f"{git_commit(ref)}.json"
+    if not path.is_file():
+        raise FileNotFoundError(f"No benchmark results for {ref}: {path}")
+    data: dict[str, Any] = json.loads(path.read_text())
+    return data
+
+
+def history(*, directory: Path = RESULTS_DIR, max_count: int = 20) -> list[dict[str, Any]]:
+    """Stored results of this machine for the latest commits of the current branch, oldest first."""
+    runs = []
+    for commit in reversed(_git("rev-list", f"--max-count={max_count}", "HEAD").split()):
+        path = directory / machine() / f"{commit}.json"
+        if path.is_file():
+            runs.append(json.loads(path.read_text()))
+    return runs
+
+
+def compare(
+    results: dict[str, dict[str, Any]],
+    reference: dict[str, dict[str, Any]],
+    /,
+    *,
+    threshold: float = 0.2,
+) -> list[tuple[str, float | None, float | None, bool]]:
+    """
+    Compare the best times of the cases that are in both results.
+
+    Parameters
+    ----------
+    threshold : float, default: 0.2
+        Relative slowdown above which a case counts as regression.
+
+    Returns
+    -------
+    list[tuple[str, float | None, float | None, bool]]
+        Name, reference time, time and whether the case regressed. Times of failed cases are None;
+        a case that fails now, but did not before, counts as regression.
+    """
+    comparison = []
+    for name, result in results.items():
+        if name not in reference:
+            continue
+        before = reference[name].get("best")
+        after = result.get("best")
+        regressed = before is not None and (after is None or after > before * (1 + threshold))
+        comparison.append((name, before, after, regressed))
+    return comparison
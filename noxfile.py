@@ -51,6 +51,20 @@ def tests(session):
     session.run("pytest", *session.posargs)
 
 
+# //////////////////////////////////////////
+# ///         BENCHMARKS                 ///
+# //////////////////////////////////////////
+@nox.session(default=False)
+def benchmarks(session):
+    session.run_install(
+        "uv",
+        "sync",
+        env={"UV_PROJECT_ENVIRONMENT": session.virtualenv.location},
+    )
+    # > E.g.: nox -s benchmarks -- --save --compare HEAD~1
+    session.run("python", "benchmarks/run_suite.py", *session.posargs)
+
+
 # //////////////////////////////////////////
 # ///     STATIC TYPE CHECKING: mypy     ///
 # //////////////////////////////////////////
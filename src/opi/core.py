@@ -3,17 +3,27 @@ Main module of OPI.
 This module contains the `Calculator` class which combines job setup (i.e. input creation), execution and parsing of results.
 """
 
+import hashlib
+from copy import deepcopy
+from io import StringIO
 from os import PathLike
 from pathlib import Path
 from typing import Any, cast
 
+import numpy as np
+
 from opi.execution.core import Runner
+from opi.execution.result_store import HASH_SCHEME, ResultStore, orca_version_tag
+from opi.execution.scratch import Scratch
+from opi.execution.watchdog import Watchdog
 from opi.input.arbitrary_string import ArbitraryStringPos
 from opi.input.blocks.block_output import BlockOutput
 from opi.input.core import Input
 from opi.input.structures.structure import Structure
 from opi.input.structures.structure_file import BaseStructureFile
 from opi.output.core import Output
+from opi.utils.misc import file_digest
+from opi.utils.tracing import span
 
 
 class Calculator:
@@ -40,6 +50,10 @@ class Calculator:
         Can only be disabled after initialization of a `Calculator` (not recommended!).
     _input | input: Input
         Contains all ORCA input parameters except for the primary structural information.
+    scratch: Scratch | None, default: None
+        Optional settings to run ORCA in a node-local scratch directory.
+    result_store: ResultStore | None, default: None
+        Optional store of previous results. If set, `run()` reuses the results of an identical job instead of running ORCA.
     """
 
     def __init__(
@@ -86,6 +100,10 @@ class Calculator:
         # -----------------------------
         # // Force JSON write in ORCA output block
         self.json_via_input: bool = True
+        # // Run ORCA in a scratch directory
+        self.scratch: Scratch | None = None
+        # // Reuse results of identical jobs
+        self.result_store: ResultStore | None = None
 
         # -----------------------------
         # > ORCA INPUT
@@ -191,92 +209,156 @@ class Calculator:
         assert self.working_dir
         self._inpfile = self.working_dir / f"{self.basename}.inp"
 
+        with span(
+            "calculator.write_input", basename=self.basename, ncores=self.input.ncores
+        ) as trace:
+            with span("calculator.format_input"):
+                content = self.format_input()
+            try:
+                assert self.inpfile is not None
+                trace.set("size", self.inpfile.write_text(content))
+            except IOError as err:
+                raise RuntimeError(
+                    # Raises an error if the input file cannot be written
+                    f"Error writing input file {self.inpfile}: {err}"
+                ) from err
+
+    def format_input(self) -> str:
+        """
+        Content of the ORCA input file `.inp` as written by `write_input()`.
+
+        Raises
+        ------
+        ValueError
+          * When the `moinp` path is given, and it is not a subpath of the working directory.
+        """
+        return self._format_input(self.structure)
+
+    def _format_input(self, structure: Structure | BaseStructureFile | None, /) -> str:
+        """
+        Content of the ORCA input file with the given primary structure.
+
+        Parameters
+        ----------
+        structure : Structure | BaseStructureFile | None
+            Primary structure written to the coords block.
+        """
         # add JSON generation to output blocks
         if self.json_via_input:
             self._set_json_output_block()
 
-        try:
-            input_param = self.input
-            simple_keywords = input_param.simple_keywords
-            blocks = input_param.blocks.values() if input_param.blocks else ()
-            arbitrary_strings = input_param.arbitrary_strings
-
-            assert self.inpfile is not None
-            with self.inpfile.open("w") as inp:
-                # ---------------------------------
-                # > Arbitrary Strings: top
-                # ---------------------------------
-                if arbitrary_strings:
-                    for item in arbitrary_strings:
-                        if item.pos is ArbitraryStringPos.TOP:
-                            inp.write(f"{item.format_orca()}\n")
-
-                # ---------------------------------
-                # > Simple Keywords
-                # ---------------------------------
-                if simple_keywords:
-                    for keyword in simple_keywords:
-                        if isinstance(keyword, str):
-                            inp.write(f"!{keyword}\n")
-                        else:
-                            inp.write(f"!{keyword.format_orca()}\n")
-
-                # ---------------------------------
-                # > Special Strings
-                # ---------------------------------
-                if (memory := input_param.memory) is not None:
-                    inp.write(f"%maxcore {memory:d}\n")
-                if (ncores := input_param.ncores) is not None:
-                    inp.write(f"%pal\n    nprocs {ncores:d}\nend\n")
-                if (moinp := input_param.moinp) is not None:
-                    inp.write(f'%moinp "{moinp.relative_to(self.working_dir)}"\n')
-
-                # ---------------------------------
-                # > Block Options: Before coords
-                # ---------------------------------
-                if blocks:
-                    for block in blocks:
-                        if not block.aftercoord:
-                            inp.write(f"\n{block.format_orca()}\n")
-
-                # ---------------------------------
-                # > Arbitrary Strings: Before Coords
-                # ---------------------------------
-                if arbitrary_strings:
-                    for item in arbitrary_strings:
-                        if item.pos is ArbitraryStringPos.BEFORE_COORDS:
-                            inp.write(f"\n{item}\n")
-
-                # ---------------------------------
-                # > Coords block
-                # ---------------------------------
-                if self.structure:
-                    if isinstance(self.structure, BaseStructureFile):
-                        inp.write(f"{self.structure.format_orca(self.working_dir)} ")
-                    else:
-                        inp.write(f"\n{self.structure.format_orca()}\n")
-
-                # ---------------------------------
-                # > Block options: After coords
-                # ---------------------------------
-                if blocks:
-                    for block in blocks:
-                        if block.aftercoord:
-                            inp.write(f"\n{block.format_orca()}\n")
-
-                # ---------------------------------
-                # > Arbitrary Strings: Bottom
-                # ---------------------------------
-                if arbitrary_strings:
-                    for item in arbitrary_strings:
-                        if item.pos is ArbitraryStringPos.BOTTOM:
-                            inp.write(f"\n{item}\n")
-
-        except IOError as err:
-            raise RuntimeError(
-                # Raises an error if the input file cannot be written
-                f"Error writing input file {self.inpfile}: {err}"
-            ) from err
+        input_param = self.input
+        simple_keywords = input_param.simple_keywords
+        blocks = input_param.blocks.values() if input_param.blocks else ()
+        arbitrary_strings = input_param.arbitrary_strings
+
+        inp = StringIO()
+        # ---------------------------------
+        # > Arbitrary Strings: top
+        # ---------------------------------
+        if arbitrary_strings:
+            for item in arbitrary_strings:
+                if item.pos is ArbitraryStringPos.TOP:
+                    inp.write(f"{item.format_orca()}\n")
+
+        # ---------------------------------
+        # > Simple Keywords
+        # ---------------------------------
+        if simple_keywords:
+            for keyword in simple_keywords:
+                if isinstance(keyword, str):
+                    inp.write(f"!{keyword}\n")
+                else:
+                    inp.write(f"!{keyword.format_orca()}\n")
+
+        # ---------------------------------
+        # > Special Strings
+        # ---------------------------------
+        if (memory := input_param.memory) is not None:
+            inp.write(f"%maxcore {memory:d}\n")
+        if (ncores := input_param.ncores) is not None:
+            inp.write(f"%pal\n    nprocs {ncores:d}\nend\n")
+        if (moinp := input_param.moinp) is not None:
+            inp.write(f'%moinp "{moinp.relative_to(self.working_dir)}"\n')
+
+        # ---------------------------------
+        # > Block Options: Before coords
+        # ---------------------------------
+        if blocks:
+            for block in blocks:
+                if not block.aftercoord:
+                    inp.write(f"\n{block.format_orca()}\n")
+
+        # ---------------------------------
+        # > Arbitrary Strings: Before Coords
+        # ---------------------------------
+        if arbitrary_strings:
+            for item in arbitrary_strings:
+                if item.pos is ArbitraryStringPos.BEFORE_COORDS:
+                    inp.write(f"\n{item}\n")
+
+        # ---------------------------------
+        # > Coords block
+        # ---------------------------------
+        if structure:
+            if isinstance(structure, BaseStructureFile):
+                inp.write(f"{structure.format_orca(self.working_dir)} ")
+            else:
+                inp.write(f"\n{structure.format_orca()}\n")
+
+        # ---------------------------------
+        # > Block options: After coords
+        # ---------------------------------
+        if blocks:
+            for block in blocks:
+                if block.aftercoord:
+                    inp.write(f"\n{block.format_orca()}\n")
+
+        # ---------------------------------
+        # > Arbitrary Strings: Bottom
+        # ---------------------------------
+        if arbitrary_strings:
+            for item in arbitrary_strings:
+                if item.pos is ArbitraryStringPos.BOTTOM:
+                    inp.write(f"\n{item}\n")
+
+        return inp.getvalue()
+
+    def input_hash(self, *, decimals: int = 6, orca_version: str | None = None) -> str:
+        """
+        Canonical hash of the job input. Two jobs with the same hash yield the same results.
+        Covers the rendered input (keywords, blocks, arbitrary strings, `%pal`, `%maxcore`, structure),
+        the content of the `moinp` file and of structure files, as well as the ORCA version.
+        The basename and the working directory are not part of the hash.
+
+        Parameters
+        ----------
+        decimals : int, default: 6
+            Coordinates of a `Structure` are rounded to this number of decimals.
+        orca_version : str | None, default: None
+            Version of ORCA. If None, it is determined from the ORCA binary.
+
+        Raises
+        ------
+        RuntimeError
+            If the ORCA version could not be determined.
+        """
+        structure = self.structure
+        if isinstance(structure, Structure) and structure.atoms:
+            structure = deepcopy(structure)
+            coordinates = np.array([atom.coordinates.coordinates for atom in structure.atoms])
+            # > Adding 0.0 turns -0.0 into 0.0
+            structure.update_coordinates(np.round(coordinates, decimals) + 0.0)
+
+        parts = [HASH_SCHEME, self._format_input(structure)]
+        if isinstance(structure, BaseStructureFile):
+            parts.append(file_digest(structure.file))
+        if (moinp := self.input.moinp) is not None:
+            parts.append(file_digest(moinp))
+        if orca_version is None:
+            orca_version = orca_version_tag(self._create_runner())
+        parts.append(orca_version)
+        return hashlib.sha256("\0".join(parts).encode()).hexdigest()
 
     def _set_json_output_block(self) -> None:
         """
@@ -290,6 +372,10 @@ class Calculator:
 
         thereby telling ORCA to also create respective JSON files automatically.
         """
+        # > Avoid copying a block shared with other inputs (see `Input.derive()`) if nothing changes
+        current = self.input.blocks.get(BlockOutput) if self.input.blocks else None
+        if isinstance(current, BlockOutput) and current.jsongbwfile and current.jsonpropfile:
+            return
         output_block = self.input.get_blocks(BlockOutput, create_missing=True)[BlockOutput]
         # > assert correct type of block for mypy
         assert isinstance(output_block, BlockOutput)
@@ -297,22 +383,47 @@ class Calculator:
         output_block.jsonpropfile = True
 
     def _create_runner(self) -> "Runner":
-        """Create a `Runner` object passing on `self.working_dir`."""
-        return Runner(working_dir=self.working_dir)
+        """Create a `Runner` object passing on `self.working_dir` and `self.scratch`."""
+        return Runner(working_dir=self.working_dir, scratch=self.scratch)
 
-    def run(self, *, timeout: int = -1) -> None:
+    def run(self, *, timeout: int = -1, watchdog: Watchdog | None = None) -> None:
         """
         Execute ORCA calculation.
+        If `result_store` is set and contains the results of an identical job, the output files are taken
+        from the store instead. Results of jobs that terminated normally are added to the store.
 
         Parameters
         ----------
         timeout : int, default: = -1
             Timeout in seconds to wait for ORCA process.
             If value is smaller than zero, wait indefinitely.
+        watchdog : Watchdog | None, default: None
+            Supervise ORCA and abort hopeless jobs, see `Runner.run_orca()`.
         """
         runner = self._create_runner()
         assert self.inpfile
-        runner.run_orca(self.inpfile, timeout=timeout)
+
+        with span("calculator.run", basename=self.basename, ncores=self.input.ncores) as trace:
+            # > Reuse results of an identical job
+            if self.result_store is not None:
+                key = self.input_hash(orca_version=orca_version_tag(runner))
+                if self.result_store.materialize(key, self.working_dir, self.basename):
+                    trace.set("cached", True)
+                    return
+
+            # > Files referenced by the input are needed for scratch execution
+            stage_files = []
+            if isinstance(self.structure, BaseStructureFile):
+                stage_files.append(self.structure.file)
+            if self.input.moinp is not None:
+                stage_files.append(self.input.moinp)
+            runner.run_orca(
+                self.inpfile, timeout=timeout, stage_files=stage_files, watchdog=watchdog
+            )
+
+            # > Only successful jobs are stored
+            if self.result_store is not None and self.get_output().terminated_normally():
+                self.result_store.put(key, self.working_dir, self.basename)
 
     def create_jsons(self, *, force: bool = False) -> None:
         """
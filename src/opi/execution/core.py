@@ -18,10 +18,13 @@ from subprocess import CompletedProcess
 from typing import Any, Callable, Sequence, TypeVar, cast
 
 from opi import ORCA_MINIMAL_VERSION
+from opi.execution.scratch import Scratch
+from opi.execution.watchdog import Watchdog, WatchdogAbort
 from opi.lib.orca_binary import OrcaBinary
 from opi.utils.config import get_config
 from opi.utils.misc import add_to_env, check_minimal_version, delete_empty_file, resolve_binary_name
 from opi.utils.orca_version import OrcaVersion
+from opi.utils.tracing import span
 
 R = TypeVar("R")
 
@@ -70,18 +73,32 @@ class Runner:
     Main class that facilities execution of ORCA binaries.
     Makes sure that correct ORCA binary and MPI libraries are used.
     This class should be to used to execute any ORCA binary.
+
+    Attributes
+    ----------
+    scratch: Scratch | None
+        If set, `run_orca()` executes ORCA in a scratch directory and only copies back selected result files.
     """
 
-    def __init__(self, working_dir: Path | str | os.PathLike[str] | None = None) -> None:
+    def __init__(
+        self,
+        working_dir: Path | str | os.PathLike[str] | None = None,
+        *,
+        scratch: Scratch | None = None,
+    ) -> None:
         """
         Parameters
         ----------
         working_dir : Path | str | os.PathLike[str] | None, default = None
             Optional working directory for execution.
+        scratch : Scratch | None, default: None
+            Optional scratch settings for `run_orca()`.
         """
         # > Working dir. Must exist!
         self._working_dir: Path = Path.cwd()
         self.working_dir: Path = cast(Path, working_dir)
+        # > Scratch execution
+        self.scratch: Scratch | None = scratch
 
         # //////////////////////////////////////////////////////////////////////////////////////////////////////////////////
         # > ORCA & Open MPI Installation
@@ -136,6 +153,7 @@ class Runner:
         capture: bool = False,
         cwd: Path | None = None,
         timeout: int = -1,
+        watchdog: Watchdog | None = None,
     ) -> subprocess.CompletedProcess[str] | None:
         """
         Function that executes ORCA binary.
@@ -162,6 +180,9 @@ class Runner:
             Set working directory for execution. Overrules `self.working_dir`.
         timeout : int, default: -1
             Optional timeout in seconds to wait for process to complete.
+        watchdog : Watchdog | None, default: None
+            Supervise the process by watching `stdout`, which must be set.
+            The process is started in a new session, so that its whole process tree can be terminated.
 
         Returns
         -------
@@ -174,6 +195,8 @@ class Runner:
           Error if path to ORCA binary cannot be resolved.
         subprocess.TimeoutExpired:
             If `timeout>-1` and the process times out.
+        WatchdogAbort:
+            If the watchdog aborted the process.
         """
 
         # ------------------------------------------------------------
@@ -199,6 +222,8 @@ class Runner:
 
         if not isinstance(binary, OrcaBinary):
             raise ValueError(f"`binary` must be of type OrcaBinary, not: {type(binary)}")
+        if watchdog is not None and stdout is None:
+            raise ValueError("A watchdog requires `stdout` to be dumped to a file.")
 
         # > Working dir
         if not cwd:
@@ -219,16 +244,28 @@ class Runner:
         # Run the binary
         proc = None
         try:
-            with outfile as f_out, errfile as f_err:
-                proc = subprocess.run(
-                    cmd,
-                    input=stdin_str,
-                    stdout=f_out,
-                    stderr=f_err,
-                    cwd=cwd,
-                    text=True,
-                    timeout=timeout if timeout > 0 else None,
-                )
+            # > Covers the start of the process and its whole runtime
+            with (
+                span("runner.run", binary=binary, args=args, cwd=cwd, timeout=timeout) as trace,
+                outfile as f_out,
+                errfile as f_err,
+            ):
+                if watchdog is not None:
+                    assert stdout is not None
+                    proc = self._run_watched(
+                        cmd, stdin_str, f_out, f_err, cwd, stdout, watchdog, timeout
+                    )
+                else:
+                    proc = subprocess.run(
+                        cmd,
+                        input=stdin_str,
+                        stdout=f_out,
+                        stderr=f_err,
+                        cwd=cwd,
+                        text=True,
+                        timeout=timeout if timeout > 0 else None,
+                    )
+                trace.set("returncode", proc.returncode)
             return proc
         except subprocess.TimeoutExpired:
             raise
@@ -239,11 +276,55 @@ class Runner:
             if stderr:
                 delete_empty_file(stderr)
 
+    @staticmethod
+    def _run_watched(
+        cmd: list[str],
+        stdin_str: str | None,
+        f_out: TextIOWrapper,
+        f_err: TextIOWrapper,
+        cwd: Path,
+        watched_file: Path,
+        watchdog: Watchdog,
+        timeout: int,
+        /,
+    ) -> subprocess.CompletedProcess[str]:
+        """Run `cmd` in a new session under the supervision of `watchdog`. See `run()`."""
+        with subprocess.Popen(
+            cmd,
+            stdin=subprocess.PIPE if stdin_str is not None else None,
+            stdout=f_out,
+            stderr=f_err,
+            cwd=cwd,
+            text=True,
+            start_new_session=True,
+        ) as proc:
+            if stdin_str is not None:
+                assert proc.stdin is not None
+                proc.stdin.write(stdin_str)
+                proc.stdin.close()
+            try:
+                watchdog.supervise(proc, watched_file, timeout=timeout if timeout > 0 else None)
+            except BaseException:
+                # > Also terminate ORCA on interrupts
+                if proc.poll() is None:
+                    watchdog.terminate(proc)
+                raise
+        return subprocess.CompletedProcess(cmd, proc.returncode)
+
     def run_orca(
-        self, inpfile: Path, /, *extra_args: str, silent: bool = True, timeout: int = -1
+        self,
+        inpfile: Path,
+        /,
+        *extra_args: str,
+        silent: bool = True,
+        timeout: int = -1,
+        stage_files: Sequence[Path] = (),
+        watchdog: Watchdog | None = None,
     ) -> None:
         """
         Execute ORCA's main binary and pass the path to the main input file as well as extra arguments.
+        If `self.scratch` is set, ORCA runs in a scratch directory. The `.out` and `.err` files are still written to
+        the directory of `inpfile`.
 
         Parameters
         ----------
@@ -255,6 +336,11 @@ class Runner:
             Capture and discard STDOUT and STDERR.
         timeout : int, default: -1
             Optional timeout in seconds to wait for process to complete.
+        stage_files : Sequence[Path], default: ()
+            Files referenced by the input, e.g., structure files or the `moinp` file.
+            Only relevant for scratch execution.
+        watchdog : Watchdog | None, default: None
+            Supervise ORCA and abort hopeless jobs. The reason of an abort is written to `<basename>.abort.json`.
         """
         if not inpfile.is_file():
             # Raises an error if the input file does not exist
@@ -263,6 +349,9 @@ class Runner:
         # Sets the output and error file from the inpfile.
         outfile = inpfile.with_suffix(".out")
         errfile = inpfile.with_suffix(".err")
+        abortfile = inpfile.with_suffix(".abort.json")
+        # > Remove the abort record of a previous run
+        abortfile.unlink(missing_ok=True)
 
         # > CLI arguments
         arguments = [inpfile.name]
@@ -271,14 +360,39 @@ class Runner:
             arguments += list(extra_args)
 
         # Run the Orca calculation
-        self.run(
-            OrcaBinary.ORCA,
-            arguments,
-            stdout=outfile,
-            stderr=errfile,
-            silent=silent,
-            timeout=timeout,
-        )
+        with span(
+            "runner.run_orca", basename=inpfile.stem, scratch=self.scratch is not None
+        ) as trace:
+            try:
+                if self.scratch is None:
+                    self.run(
+                        OrcaBinary.ORCA,
+                        arguments,
+                        stdout=outfile,
+                        stderr=errfile,
+                        silent=silent,
+                        timeout=timeout,
+                        watchdog=watchdog,
+                    )
+                else:
+                    with self.scratch.stage(inpfile, stage_files) as scratch_inpfile:
+                        self.run(
+                            OrcaBinary.ORCA,
+                            arguments,
+                            stdout=outfile,
+                            stderr=errfile,
+                            silent=silent,
+                            cwd=scratch_inpfile.parent,
+                            timeout=timeout,
+                            watchdog=watchdog,
+                        )
+            except WatchdogAbort as abort:
+                # > An aborted job is handled like a failed job, only the reason is recorded
+                abort.reason.write(abortfile)
+                trace.set("aborted", abort.reason.policy)
+            finally:
+                if outfile.is_file():
+                    trace.set("output_size", outfile.stat().st_size)
 
     def run_orca_plot(
         self,
@@ -621,7 +735,10 @@ class Runner:
         else:
             # > Delete eventually existing ".property.json" and recreate
             property_json_file.unlink(missing_ok=True)
-            self.run_orca_2json([basename, "-property"])
+            with span("runner.create_property_json", basename=basename) as trace:
+                self.run_orca_2json([basename, "-property"])
+                if property_json_file.is_file():
+                    trace.set("size", property_json_file.stat().st_size)
 
     def create_gbw_json(
         self,
@@ -659,7 +776,10 @@ class Runner:
                 config_file.write_text(config_fmt)
             # > Create JSON from GBW file
             gbw_filename = str(gbw_json_file.with_suffix(".gbw"))
-            self.run_orca_2json([gbw_filename])
+            with span("runner.create_gbw_json", basename=basename) as trace:
+                self.run_orca_2json([gbw_filename])
+                if gbw_json_file.is_file():
+                    trace.set("size", gbw_json_file.stat().st_size)
 
     @staticmethod
     def format_gbw_json_config(config: dict[str, bool | str | list[str | int]] | None) -> str:
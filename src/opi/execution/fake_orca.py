@@ -0,0 +1,760 @@
+"""
+Stand-in for the ORCA binaries `orca`, `orca_2json` and `orca_plot`, to test and benchmark the orchestration of jobs
+(scheduling, timeouts, watchdogs, JSON conversion and parsing) on machines without ORCA.
+
+`FakeOrca.install()` writes executables that are found like a real installation, through `OPI_ORCA` or the
+`ORCA_PATH` of the OPI config file. `orca` answers `--version` and writes the `.out`, `.gbw` and `.property.txt`
+files of a job, which `orca_2json` converts to the property and GBW JSON files. Size, runtime and failures of the
+jobs are configurable. The executables run this file as a script, which only uses the standard library,
+so that starting them is cheap.
+"""
+
+import json
+import math
+import os
+import random
+import shlex
+import signal
+import stat
+import sys
+import time
+import zlib
+from enum import StrEnum
+from pathlib import Path
+from typing import Any, Sequence, TextIO
+
+__all__ = ("FakeFailure", "FakeOrca")
+
+# > Configuration read by the executables, stored next to them
+CONFIG_NAME = "fake_orca.json"
+# > Bohr radius in Angstrom
+_BOHR = 0.529177210903
+_OPT_KEYWORDS = frozenset(("OPT", "COPT", "ZOPT", "LOOSEOPT", "TIGHTOPT", "VERYTIGHTOPT"))
+
+
+class FakeFailure(StrEnum):
+    """
+    How the jobs of the stand-in fail.
+    """
+
+    # > Jobs terminate normally
+    NONE = "none"
+    # > ORCA stops with an error before the first SCF, e.g., due to an invalid input
+    INPUT_ERROR = "input_error"
+    # > The first SCF does not converge and ORCA stops with an error
+    SCF_NOT_CONVERGED = "scf_not_converged"
+    # > The process is killed during the first SCF, leaving a partial `.out` file and no other results
+    CRASH = "crash"
+    # > The first SCF keeps iterating until the process is killed, e.g., by a timeout or a watchdog
+    HANG = "hang"
+
+
+class FakeOrca:
+    """
+    Settings of the stand-in ORCA binaries.
+    Changes only take effect in the executables after `install()` or with `configure()`.
+
+    Attributes
+    ----------
+    version: str
+        Version reported by `orca --version` and in the output files.
+    runtime: float
+        Wall-clock time of a job in seconds, spread evenly over its SCF iterations.
+    scf_cycles: int
+        Iterations of every SCF.
+    opt_cycles: int
+        Cycles of geometry optimizations, i.e., of jobs with an optimization keyword like `OPT`.
+    basis_per_atom: int
+        Basis functions per atom. The GBW JSON file stores nbasis^2 MO coefficients.
+    failure: FakeFailure
+        How failing jobs fail.
+    failure_rate: float
+        Fraction of jobs that fail. Jobs are picked by a hash of their basename, so reruns behave the same.
+    write_delay: float
+        Seconds `orca_2json` needs to write a file. The file is written in chunks, so that readers see partial files.
+    truncate_json: bool
+        `orca_2json` only writes the first half of the JSON files, but still exits successfully.
+    directory: Path | None
+        Directory of the executables after `install()`.
+    """
+
+    __slots__ = (
+        "version",
+        "runtime",
+        "scf_cycles",
+        "opt_cycles",
+        "basis_per_atom",
+        "failure",
+        "failure_rate",
+        "write_delay",
+        "truncate_json",
+        "directory",
+    )
+
+    # > Names of the settings passed on to the executables
+    SETTINGS = __slots__[:-1]
+
+    def __init__(
+        self,
+        *,
+        version: str = "6.1.0",
+        runtime: float = 0.0,
+        scf_cycles: int = 8,
+        opt_cycles: int = 3,
+        basis_per_atom: int = 10,
+        failure: FakeFailure | str = FakeFailure.NONE,
+        failure_rate: float = 1.0,
+        write_delay: float = 0.0,
+        truncate_json: bool = False,
+    ) -> None:
+        """
+        Raises
+        ------
+        ValueError
+            If a setting is out of range.
+        """
+        self.version = version
+        self.runtime = runtime
+        self.scf_cycles = scf_cycles
+        self.opt_cycles = opt_cycles
+        self.basis_per_atom = basis_per_atom
+        self.failure = FakeFailure(failure)
+        self.failure_rate = failure_rate
+        self.write_delay = write_delay
+        self.truncate_json = truncate_json
+        self.directory: Path | None = None
+        self._check()
+
+    def _check(self) -> None:
+        if self.runtime < 0 or self.write_delay < 0:
+            raise ValueError(f"{self.__class__.__name__}: times must not be negative.")
+        if self.scf_cycles < 1 or self.opt_cycles < 1 or self.basis_per_atom < 1:
+            raise ValueError(
+                f"{self.__class__.__name__}: numbers of cycles and basis functions must be positive."
+            )
+        if not 0.0 <= self.failure_rate <= 1.0:
+            raise ValueError(f"{self.__class__.__name__}.failure_rate must be between 0 and 1.")
+
+    def to_dict(self) -> dict[str, Any]:
+        """Settings as written to the configuration of the executables."""
+        return {name: getattr(self, name) for name in self.SETTINGS}
+
+    @property
+    def orca(self) -> Path:
+        """
+        Path to the `orca` executable.
+
+        Raises
+        ------
+        RuntimeError
+            If the executables are not installed.
+        """
+        if self.directory is None:
+            raise RuntimeError(f"{self.__class__.__name__} is not installed.")
+        return self.directory / "orca"
+
+    def install(self, directory: Path | str, /) -> Path:
+        """
+        Write the executables and their configuration into `directory`.
+        Point `OPI_ORCA` or the `ORCA_PATH` of the config file (see `write_config_file()`) to the directory.
+
+        Returns
+        -------
+        Path
+            The directory.
+        """
+        directory = Path(directory).expanduser().resolve()
+        directory.mkdir(parents=True, exist_ok=True)
+        # > OPI expects the libraries next to a `bin/` folder
+        if directory.name == "bin":
+            directory.with_name("lib").mkdir(exist_ok=True)
+        self.directory = directory
+        self._write_config()
+        # > Isolated and without site-packages, as the script only needs the standard library
+        command = shlex.join([sys.executable, "-I", "-S", str(Path(__file__).resolve())])
+        for binary in ("orca", "orca_2json", "orca_plot"):
+            executable = directory / binary
+            executable.write_text(
+                f'#!/bin/sh\nexec {command} {shlex.quote(str(directory / CONFIG_NAME))} {binary} "$@"\n'
+            )
+            executable.chmod(executable.stat().st_mode | stat.S_IXUSR | stat.S_IXGRP | stat.S_IXOTH)
+        return directory
+
+    def configure(self, **settings: Any) -> None:
+        """
+        Change settings and pass them on to the installed executables.
+
+        Raises
+        ------
+        TypeError
+            If a setting does not exist.
+        ValueError
+            If a setting is out of range.
+        """
+        for name, value in settings.items():
+            if name not in self.SETTINGS:
+                raise TypeError(f"{self.__class__.__name__} has no setting {name!r}")
+            setattr(self, name, FakeFailure(value) if name == "failure" else value)
+        self._check()
+        if self.directory is not None:
+            self._write_config()
+
+    def write_config_file(self, config_dir: Path | str, /) -> Path:
+        """
+        Write an OPI config file below `config_dir` whose `ORCA_PATH` points to the executables.
+        OPI finds it if `config_dir` is the user config directory, e.g., `$XDG_CONFIG_HOME` on Linux.
+
+        Returns
+        -------
+        Path
+            The config file.
+
+        Raises
+        ------
+        RuntimeError
+            If the executables are not installed.
+        """
+        from opi.utils.config import PKG_NAME
+
+        config_file = Path(config_dir) / PKG_NAME / "config.toml"
+        config_file.parent.mkdir(parents=True, exist_ok=True)
+        config_file.write_text(f"ORCA_PATH = {json.dumps(str(self.orca))}\n")
+        return config_file
+
+    def _write_config(self) -> None:
+        from opi.utils.periodic_table import SYMBOLS
+
+        assert self.directory is not None
+        config = self.to_dict()
+        # > So that the executables do not need to import OPI and NumPy
+        config["symbols"] = SYMBOLS.tolist()
+        (self.directory / CONFIG_NAME).write_text(json.dumps(config))
+
+
+# %%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%
+#                                                   EXECUTABLES
+# %%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%
+class _Job:
+    """Molecule and method of an input file, as far as the stand-in needs them."""
+
+    __slots__ = (
+        "basename",
+        "symbols",
+        "numbers",
+        "coordinates",
+        "charge",
+        "multiplicity",
+        "optimization",
+    )
+
+    def __init__(self, inpfile: Path, symbols: Sequence[str], /) -> None:
+        self.basename = inpfile.stem
+        self.symbols: list[str] = []
+        self.coordinates: list[list[float]] = []
+        self.charge = 0
+        self.multiplicity = 1
+        self.optimization = False
+
+        lines = iter(inpfile.read_text().splitlines())
+        for line in lines:
+            fields = line.split()
+            if not fields or fields[0].startswith("#"):
+                continue
+            if fields[0].startswith("!"):
+                keywords = " ".join(fields)[1:].upper().split()
+                self.optimization |= not _OPT_KEYWORDS.isdisjoint(keywords)
+            elif fields[0] == "*" and len(fields) >= 4 or fields[0] in ("*xyz", "*xyzfile"):
+                header = " ".join(fields).removeprefix("*").split()
+                self.charge, self.multiplicity = int(header[1]), int(header[2])
+                if header[0].lower() == "xyzfile":
+                    xyz_lines = (inpfile.parent / header[3]).read_text().splitlines()[2:]
+                else:
+                    xyz_lines = []
+                    for xyz_line in lines:
+                        if xyz_line.strip() == "*":
+                            break
+                        xyz_lines.append(xyz_line)
+                self._read_atoms(xyz_lines)
+                break
+        if not self.symbols:
+            self._read_atoms(["O 0.0 0.0 0.0", "H 0.96 0.0 0.0", "H -0.24 0.93 0.0"])
+
+        numbers = {symbol.lower(): number for number, symbol in enumerate(symbols)}
+        self.numbers = [numbers.get(symbol.lower(), 6) for symbol in self.symbols]
+
+    def _read_atoms(self, lines: list[str], /) -> None:
+        for line in lines:
+            fields = line.split()
+            if not fields:
+                continue
+            symbol = "".join(char for char in fields[0] if char.isalpha()) or "X"
+            try:
+                xyz = [float(value) for value in fields[1:4]]
+            except ValueError:
+                xyz = [0.0, 0.0, 0.0]
+            self.symbols.append(symbol[:2].capitalize())
+            self.coordinates.append(xyz + [0.0] * (3 - len(xyz)))
+
+    @property
+    def nelectrons(self) -> int:
+        return sum(self.numbers) - self.charge
+
+
+def _fails(settings: dict[str, Any], basename: str, /) -> FakeFailure:
+    """Failure of the job, picked by a hash of its basename."""
+    failure = FakeFailure(settings["failure"])
+    if failure is FakeFailure.NONE:
+        return failure
+    return (
+        failure
+        if zlib.crc32(basename.encode()) % 10_000 < settings["failure_rate"] * 10_000
+        else FakeFailure.NONE
+    )
+
+
+def _version_banner(version: str, /) -> str:
+    return (
+        "\n"
+        "                                 *****************\n"
+        "                                 * O   R   C   A *\n"
+        "                                 *****************\n"
+        "\n"
+        "         (stand-in for tests and benchmarks, created by OPI)\n"
+        "\n"
+        f"                         Program Version {version}  -   RELEASE  -\n"
+        "\n"
+    )
+
+
+def _write(path: Path, text: str, settings: dict[str, Any], /) -> None:
+    """Write a result file as configured: delayed in chunks or truncated."""
+    if settings["truncate_json"]:
+        text = text[: len(text) // 2]
+    nchunks = 4 if settings["write_delay"] > 0 else 1
+    size = -(-len(text) // nchunks)
+    with path.open("w") as f:
+        for i in range(nchunks):
+            f.write(text[i * size : (i + 1) * size])
+            f.flush()
+            if settings["write_delay"] > 0:
+                time.sleep(settings["write_delay"] / nchunks)
+
+
+class _OrcaRun:
+    """A single run of the stand-in `orca`."""
+
+    def __init__(self, settings: dict[str, Any], inpfile: Path, out: TextIO, /) -> None:
+        self.settings = settings
+        self.job = _Job(inpfile, settings["symbols"])
+        self.out = out
+        self.inpfile = inpfile
+        self.rng = random.Random(zlib.crc32(self.job.basename.encode()))
+        self.failure = _fails(settings, self.job.basename)
+        self.ncycles = settings["opt_cycles"] if self.job.optimization else 1
+        self.nbasis = settings["basis_per_atom"] * len(self.job.numbers)
+        self.iteration_time = settings["runtime"] / (self.ncycles * settings["scf_cycles"])
+        self.final_energy: float = -sum(0.5 * z**2.4 for z in self.job.numbers) - self.rng.random()
+        self.start = time.monotonic()
+
+    def energy(self, cycle: int, /) -> float:
+        return (
+            self.final_energy + 0.01 * 0.5**cycle if cycle < self.ncycles - 1 else self.final_energy
+        )
+
+    def write(self, text: str, /) -> None:
+        self.out.write(text)
+
+    def run(self) -> int:
+        """Write the output and result files, returns the exit status."""
+        job = self.job
+        self.write(_version_banner(self.settings["version"]))
+        self.write(
+            "\n================================================================================\n"
+        )
+        self.write("                                       INPUT FILE\n")
+        self.write(
+            "================================================================================\n"
+        )
+        self.write(f"NAME = {self.inpfile.name}\n")
+        for i, line in enumerate(self.inpfile.read_text().splitlines(), start=1):
+            self.write(f"|{i:3d}> {line}\n")
+        self.write("\n****END OF INPUT****\n")
+        if self.failure is FakeFailure.INPUT_ERROR:
+            return self.error_termination("Startup", "INPUT ERROR: stand-in configured to fail")
+
+        if job.optimization:
+            self.write("\n                       *****************************\n")
+            self.write("                       * Geometry Optimization Run *\n")
+            self.write("                       *****************************\n")
+
+        geometries = []
+        for cycle in range(self.ncycles):
+            if job.optimization:
+                self.write(
+                    "\n         *************************************************************\n"
+                )
+                self.write(
+                    f"         *                GEOMETRY OPTIMIZATION CYCLE {cycle + 1:3d}            *\n"
+                )
+                self.write(
+                    "         *************************************************************\n"
+                )
+            coordinates = [
+                [x + 0.01 * 0.5**cycle * self.rng.uniform(-1, 1) for x in xyz]
+                for xyz in job.coordinates
+            ]
+            self.write("\n--------------\nSCF SETTINGS\n--------------\n")
+            self.write(f"Number of basis functions                   ...  {self.nbasis}\n")
+            status = self.scf(cycle)
+            if status is not None:
+                return status
+            self.orbital_energies()
+            self.write(
+                f"\n-------------------------   --------------------\nFINAL SINGLE POINT ENERGY     {self.energy(cycle):20.12f}\n"
+            )
+            self.write("-------------------------   --------------------\n")
+            rms_gradient = 0.01 * 0.3**cycle
+            if job.optimization:
+                converged = "YES" if cycle == self.ncycles - 1 else "NO"
+                self.write(
+                    "\n          ----------------------|Geometry convergence|-------------------------\n"
+                )
+                self.write(
+                    "          Item                value                   Tolerance       Converged\n"
+                )
+                self.write(
+                    "          ---------------------------------------------------------------------\n"
+                )
+                self.write(
+                    f"          RMS gradient        {rms_gradient:.10f}            0.0001000000      {converged}\n"
+                )
+            geometries.append(self.geometry(cycle, coordinates, rms_gradient))
+            self.out.flush()
+
+        if job.optimization:
+            self.write("\n                    ***********************HURRAY********************\n")
+            self.write("                    ***        THE OPTIMIZATION HAS CONVERGED     ***\n")
+            self.write("                    *************************************************\n")
+
+        Path(f"{job.basename}.gbw").write_text(self.gbw_json(coordinates))
+        Path(f"{job.basename}.property.txt").write_text(json.dumps(self.property_json(geometries)))
+
+        elapsed = time.monotonic() - self.start
+        self.write("\nTimings for individual modules:\n\n")
+        self.write(f"SCF iterations                   ...  {elapsed:10.3f} sec\n")
+        self.write("\n                             ****ORCA TERMINATED NORMALLY****\n")
+        self.write(
+            f"TOTAL RUN TIME: 0 days 0 hours {int(elapsed // 60)} minutes {int(elapsed % 60)} seconds"
+            f" {int(elapsed * 1000 % 1000)} msec\n"
+        )
+        return 0
+
+    def scf(self, cycle: int, /) -> int | None:
+        """SCF iterations; returns the exit status if the job fails."""
+        self.write("\n--------------\nSCF ITERATIONS\n--------------\n")
+        self.write(
+            "Iteration    Energy (Eh)           Delta-E    RMSDP     MaxDP     DIISErr   Damp  Time(sec)\n"
+        )
+        self.write(
+            "-------------------------------------------------------------------------------------------\n"
+        )
+        failure = self.failure if cycle == 0 else FakeFailure.NONE
+        ncycles = self.settings["scf_cycles"]
+        energy = previous = self.energy(cycle) + 0.1
+        iteration = 1
+        while iteration <= ncycles or failure is FakeFailure.HANG:
+            if failure is FakeFailure.HANG:
+                # > Oscillates forever
+                energy = self.energy(cycle) + 0.01 * (-1) ** iteration
+            else:
+                energy = self.energy(cycle) + 0.1 * 0.2**iteration
+            delta = 0.0 if iteration == 1 else energy - previous
+            self.write(
+                f"{iteration:5d}  {energy:24.16f}  {delta:10.2e}  {1e-3 * 0.5**iteration:.2e}"
+                f"  {1e-2 * 0.5**iteration:.2e}  {1e-1 * 0.5**iteration:.2e}  0.700"
+                f"  {self.iteration_time:8.1f}\n"
+            )
+            self.out.flush()
+            previous = energy
+            time.sleep(max(self.iteration_time, 0.01 if failure is FakeFailure.HANG else 0.0))
+            if failure is FakeFailure.CRASH and iteration >= (ncycles + 1) // 2:
+                os.kill(os.getpid(), signal.SIGKILL)
+            iteration += 1
+
+        self.write("\n               *****************************************************\n")
+        if failure is FakeFailure.SCF_NOT_CONVERGED:
+            self.write("               *                      ERROR                        *\n")
+            self.write(
+                f"               *        SCF NOT CONVERGED AFTER {ncycles:3d} CYCLES         *\n"
+            )
+            self.write("               *****************************************************\n")
+            return self.error_termination("LEANSCF", "This wavefunction IS NOT CONVERGED!")
+        self.write("               *                     SUCCESS                       *\n")
+        self.write(
+            f"               *           SCF CONVERGED AFTER {ncycles:3d} CYCLES          *\n"
+        )
+        self.write("               *****************************************************\n")
+        return None
+
+    def orbital_energies(self) -> None:
+        nocc = self.job.nelectrons // 2
+        self.write("\n----------------\nORBITAL ENERGIES\n----------------\n\n")
+        self.write("  NO   OCC          E(Eh)            E(eV) \n")
+        for i in range(self.nbasis):
+            energy = -20.0 + 25.0 * (i + 1) / self.nbasis
+            self.write(
+                f"{i:4d}   {2.0 if i < nocc else 0.0:6.4f}    {energy:14.6f}  {energy * 27.211386:14.4f} \n"
+            )
+
+    def error_termination(self, module: str, message: str, /) -> int:
+        self.write(f"\n{message}\n\nORCA finished by error termination in {module}\n")
+        self.write(f"Calling Command: orca {self.inpfile.name}\n")
+        self.write("[file orca_tools/qcmsg.cpp, line 394]:\n  .... aborting the run\n\n")
+        return 1
+
+    def geometry(
+        self, cycle: int, coordinates: list[list[float]], rms_gradient: float, /
+    ) -> dict[str, Any]:
+        """Entry of the property JSON file for a single geometry."""
+        job = self.job
+        natoms = len(job.numbers)
+        charges = [self.rng.uniform(-0.5, 0.5) for _ in range(natoms)]
+        geometry: dict[str, Any] = {
+            "Geometry": {
+                "Coordinates": {
+                    "Cartesians": [
+                        [symbol, *(x / _BOHR for x in xyz)]
+                        for symbol, xyz in zip(job.symbols, coordinates)
+                    ],
+                    "Type": "Cartesians",
+                    "Units": "a.u.",
+                },
+                "NAtoms": natoms,
+                "NCorelessECP": 0,
+                "NGhostAtoms": 0,
+            },
+            "Energy": [
+                {
+                    "Method": "SCF",
+                    "Mult": [[job.multiplicity]],
+                    "totalEnergy": [[self.energy(cycle)]],
+                }
+            ],
+            "Mulliken_Population_Analysis": [
+                {
+                    "ATNO": [[z] for z in job.numbers],
+                    "AtomicCharges": [[q - sum(charges) / natoms] for q in charges],
+                    "Irrep": 0,
+                    "Level": "Relaxed density",
+                    "Method": "SCF",
+                    "Mult": job.multiplicity,
+                    "NAtoms": natoms,
+                    "State": -1,
+                }
+            ],
+            "Single_Point_Data": {"Converged": True, "FinalEnergy": self.energy(cycle)},
+        }
+        if job.optimization:
+            gradient = [[self.rng.gauss(0.0, rms_gradient)] for _ in range(3 * natoms)]
+            geometry["Nuclear_Gradient"] = [
+                {
+                    "Irrep": 0,
+                    "Level": "Relaxed density",
+                    "Method": "SCF",
+                    "Mult": job.multiplicity,
+                    "NAtoms": natoms,
+                    "State": 0,
+                    "grad": gradient,
+                    "gradNorm": math.sqrt(sum(g[0] ** 2 for g in gradient)),
+                }
+            ]
+        return geometry
+
+    def property_json(self, geometries: list[dict[str, Any]], /) -> dict[str, Any]:
+        job = self.job
+        major, minor = self.settings["version"].split(".")[:2]
+        runtime = time.monotonic() - self.start
+        timings = {"GTOINT": 0.15 * runtime, "SCF": 0.6 * runtime, "PROP": 0.05 * runtime}
+        if job.optimization:
+            timings |= {"SCFGRAD": 0.15 * runtime, "GSTEP": 0.05 * runtime}
+        timings["SUM"] = sum(timings.values())
+        return {
+            "Calculation_Info": {
+                "Charge": job.charge,
+                "Mult": job.multiplicity,
+                "NumOfAtoms": len(job.numbers),
+                "NumOfBasisFuncts": self.nbasis,
+                "NumOfElectrons": job.nelectrons,
+            },
+            "Calculation_Status": {
+                "Status": "NORMAL TERMINATION",
+                "progName": "LeanSCF",
+                "version": f"{major}.{minor}.x",
+            },
+            "Calculation_Timings": timings,
+            "Geometries": geometries,
+        }
+
+    def gbw_json(self, coordinates: list[list[float]], /) -> str:
+        """
+        Content of the GBW JSON file. With thousands of basis functions, most of it are the MO coefficients,
+        which are formatted once and rotated per orbital to keep the stand-in fast.
+        """
+        job = self.job
+        nbasis = self.nbasis
+        nocc = job.nelectrons // 2
+        per_atom = self.settings["basis_per_atom"]
+        data = {
+            "ORCA Header": {"Version": self.settings["version"]},
+            "Molecule": {
+                "Atoms": [
+                    {
+                        "Coords": xyz,
+                        "ElementLabel": symbol,
+                        "ElementNumber": z,
+                        "Idx": i,
+                        "NuclearCharge": float(z),
+                    }
+                    for i, (symbol, z, xyz) in enumerate(zip(job.symbols, job.numbers, coordinates))
+                ],
+                "BaseName": job.basename,
+                "MolecularOrbitals": {
+                    "EnergyUnit": "Eh",
+                    "MOs": [],
+                    "OrbitalLabels": [
+                        f"{i // per_atom}{job.symbols[i // per_atom]}   {i % per_atom + 1}s"
+                        for i in range(nbasis)
+                    ],
+                },
+                "CoordinateUnits": "Angs",
+                "Multiplicity": job.multiplicity,
+                "Charge": job.charge,
+                "HFTyp": "RHF" if job.multiplicity == 1 else "UHF",
+                "PointGroup": "C1",
+                "Origin": [0.0, 0.0, 0.0],
+            },
+        }
+        coefficients = [repr(self.rng.uniform(-1.0, 1.0)) for _ in range(nbasis)]
+        mos = ", ".join(
+            f'{{"MOCoefficients": [{", ".join(coefficients[i:] + coefficients[:i])}],'
+            f' "Occupancy": {2.0 if i < nocc else 0.0}, "OrbitalEnergy": {-20.0 + 25.0 * (i + 1) / nbasis!r},'
+            ' "OrbitalSymLabel": "A", "OrbitalSymmetry": 0}'
+            for i in range(nbasis)
+        )
+        return json.dumps(data).replace('"MOs": []', f'"MOs": [{mos}]', 1)
+
+
+def _orca(settings: dict[str, Any], args: list[str], /) -> int:
+    if args[:1] == ["--version"]:
+        sys.stdout.write(_version_banner(settings["version"]))
+        return 0
+    if not args:
+        sys.stderr.write("This program requires the name of a parameterfile as argument\n")
+        return 1
+    inpfile = Path(args[0])
+    if not inpfile.is_file():
+        sys.stderr.write(f"ERROR: input file {args[0]} does not exist\n")
+        return 1
+    return _OrcaRun(settings, inpfile, sys.stdout).run()
+
+
+def _orca_2json(settings: dict[str, Any], args: list[str], /) -> int:
+    if len(args) >= 2 and args[1] == "-property":
+        source = Path(f"{args[0]}.property.txt")
+        target = Path(f"{args[0]}.property.json")
+    elif args and args[0].endswith(".gbw"):
+        source = Path(args[0])
+        target = source.with_suffix(".json")
+    else:
+        sys.stderr.write("usage: orca_2json <basename>.gbw | orca_2json <basename> -property\n")
+        return 1
+    if not source.is_file():
+        sys.stderr.write(f"ERROR: Cannot open file {source}\n")
+        return 1
+    # > The stand-in files already contain the JSON data
+    _write(target, source.read_text(), settings)
+    return 0
+
+
+def _orca_plot(settings: dict[str, Any], args: list[str], /) -> int:
+    """Interactive mode of `orca_plot`, driven by the menu entries read from stdin."""
+    if not args or not Path(args[0]).is_file():
+        sys.stderr.write("ERROR: GBW file not found\n")
+        return 1
+    gbwfile = Path(args[0])
+    atoms = json.loads(gbwfile.read_text())["Molecule"]["Atoms"]
+    tokens = iter(sys.stdin.read().split())
+    plot_type, index, operator, resolution = "1", 0, 0, 40
+    for token in tokens:
+        sys.stdout.write(f"Enter a number: {token}\n")
+        if token == "1":
+            plot_type = next(tokens, "1")
+            if plot_type in ("2", "3") and next(tokens, "y") == "n":
+                next(tokens, None)
+        elif token == "2":
+            index = int(next(tokens, "0"))
+        elif token == "3":
+            operator = int(next(tokens, "0"))
+        elif token == "4":
+            resolution = int(next(tokens, "40"))
+        elif token == "5":
+            next(tokens, None)
+        elif token == "11":
+            name = {"2": "eldens", "3": "spindens"}.get(plot_type, f"mo{index}{'ab'[operator]}")
+            _write_cube(
+                gbwfile.with_name(f"{gbwfile.stem}.{name}.cube"),
+                atoms,
+                resolution,
+                plot_type == "1",
+            )
+        elif token == "12":
+            break
+    return 0
+
+
+def _write_cube(path: Path, atoms: list[dict[str, Any]], resolution: int, mo: bool, /) -> None:
+    """Gaussian cube file with a smooth function around the atoms on a `resolution`^3 grid."""
+    centers = [[x / _BOHR for x in atom["Coords"]] for atom in atoms]
+    lower = [min(c[k] for c in centers) - 4.0 for k in range(3)]
+    step = [(max(c[k] for c in centers) + 4.0 - lower[k]) / (resolution - 1) for k in range(3)]
+    lines = [f"{path.name}", "Generated by the ORCA stand-in of OPI"]
+    lines.append(f"{-len(atoms) if mo else len(atoms):5d} " + " ".join(f"{x:11.6f}" for x in lower))
+    for k in range(3):
+        axis = [step[k] if j == k else 0.0 for j in range(3)]
+        lines.append(f"{resolution:5d} " + " ".join(f"{x:11.6f}" for x in axis))
+    for atom, center in zip(atoms, centers):
+        lines.append(
+            f"{atom['ElementNumber']:5d} {atom['NuclearCharge']:11.6f} "
+            + " ".join(f"{x:11.6f}" for x in center)
+        )
+    if mo:
+        lines.append("    1    1")
+    for i in range(resolution):
+        for j in range(resolution):
+            row = []
+            for k in range(resolution):
+                point = (lower[0] + i * step[0], lower[1] + j * step[1], lower[2] + k * step[2])
+                value = sum(math.exp(-math.dist(point, center)) for center in centers)
+                row.append(f"{value:13.5E}")
+            lines += [" ".join(row[n : n + 6]) for n in range(0, resolution, 6)]
+    path.write_text("\n".join(lines) + "\n")
+
+
+def main(argv: Sequence[str], /) -> int:
+    """
+    Entry point of the executables.
+
+    Parameters
+    ----------
+    argv : Sequence[str]
+        Path of the configuration and name of the binary, followed by the arguments of the binary.
+    """
+    config, binary, *args = argv
+    settings = json.loads(Path(config).read_text())
+    return {"orca": _orca, "orca_2json": _orca_2json, "orca_plot": _orca_plot}[binary](
+        settings, args
+    )
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
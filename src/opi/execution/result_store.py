@@ -0,0 +1,169 @@
+"""
+Content-addressed store for the results of ORCA calculations.
+Jobs are identified by a canonical hash of their input (see `Calculator.input_hash()`),
+so that identical jobs are only run once and their output files are reused otherwise.
+"""
+
+import glob
+import json
+import os
+import shutil
+from pathlib import Path
+
+from opi.execution.core import Runner
+from opi.lib.orca_binary import OrcaBinary
+
+__all__ = ("ResultStore", "orca_version_tag")
+
+# > Version of the hashing scheme. Increase whenever the canonical input changes.
+HASH_SCHEME = "opi-result-store-1"
+
+# > ORCA version per binary path and modification time
+_ORCA_VERSIONS: dict[tuple[Path, int], str] = {}
+
+
+def orca_version_tag(runner: Runner, /) -> str:
+    """
+    Version of the ORCA binary used by `runner`.
+    The version is only determined once per binary as long as it is not modified.
+
+    Raises
+    ------
+    RuntimeError
+        If the ORCA version could not be determined.
+    """
+    binary = runner.get_orca_binary(OrcaBinary.ORCA)
+    cache_key = (binary, binary.stat().st_mtime_ns)
+    if cache_key not in _ORCA_VERSIONS:
+        version = runner.get_version()
+        if version is None:
+            raise RuntimeError("Could not determine the ORCA version.")
+        _ORCA_VERSIONS[cache_key] = str(version)
+    return _ORCA_VERSIONS[cache_key]
+
+
+class ResultStore:
+    """
+    Directory that keeps the output files of successful calculations, addressed by the hash of their input.
+
+    Each entry is a directory named by the hash that contains all files `<basename>.*` of the job
+    (except for the input file), with `<basename>` replaced by `ENTRY_BASENAME`.
+    Entries are only added if complete, so a store can be shared by concurrent jobs.
+
+    Attributes
+    ----------
+    directory: Path
+        Root directory of the store.
+    hardlink: bool
+        Materialize files as hard links instead of copies. Saves time and disk space,
+        but the materialized files must then never be modified in place.
+    """
+
+    # > Basename of the stored files
+    ENTRY_BASENAME = "result"
+    # > Name of the metadata file of each entry
+    METADATA_NAME = "entry.json"
+    # > Suffixes of files that are not stored
+    EXCLUDED_SUFFIXES = (".inp",)
+
+    def __init__(
+        self, directory: Path | str | os.PathLike[str], /, *, hardlink: bool = False
+    ) -> None:
+        self.directory = Path(directory).expanduser().resolve()
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.hardlink = hardlink
+
+    def get_path(self, key: str, /) -> Path:
+        """Directory of the entry that belongs to `key`."""
+        return self.directory / key[:2] / key
+
+    def __contains__(self, key: object, /) -> bool:
+        return isinstance(key, str) and (self.get_path(key) / self.METADATA_NAME).is_file()
+
+    @staticmethod
+    def job_files(working_dir: Path, basename: str, /) -> list[Path]:
+        """All files of a job, i.e., files named `<basename>.*`, except for the input file."""
+        return sorted(
+            path
+            for path in working_dir.glob(f"{glob.escape(basename)}.*")
+            if path.is_file() and path.suffix not in ResultStore.EXCLUDED_SUFFIXES
+        )
+
+    def put(self, key: str, working_dir: Path, basename: str, /) -> Path:
+        """
+        Add the files of a finished job to the store. An existing entry is kept.
+
+        Parameters
+        ----------
+        key : str
+            Hash of the job input.
+        working_dir : Path
+            Working directory of the job.
+        basename : str
+            Basename of the job.
+
+        Returns
+        -------
+        Path
+            Directory of the entry.
+        """
+        entry = self.get_path(key)
+        if key in self:
+            return entry
+        entry.parent.mkdir(exist_ok=True)
+        tmp_entry = entry.with_name(f".{key}.{os.getpid()}.tmp")
+        shutil.rmtree(tmp_entry, ignore_errors=True)
+        tmp_entry.mkdir()
+        names = []
+        for path in self.job_files(working_dir, basename):
+            name = self.ENTRY_BASENAME + path.name.removeprefix(basename)
+            shutil.copyfile(path, tmp_entry / name)
+            names.append(name)
+        (tmp_entry / self.METADATA_NAME).write_text(
+            json.dumps({"scheme": HASH_SCHEME, "basename": basename, "files": names})
+        )
+        try:
+            tmp_entry.rename(entry)
+        except OSError:
+            # > Entry was added concurrently
+            shutil.rmtree(tmp_entry, ignore_errors=True)
+        return entry
+
+    def materialize(self, key: str, working_dir: Path, basename: str, /) -> bool:
+        """
+        Place the stored files of an entry in the working directory under the given basename.
+        Existing files are replaced.
+
+        Parameters
+        ----------
+        key : str
+            Hash of the job input.
+        working_dir : Path
+            Working directory of the job.
+        basename : str
+            Basename of the job.
+
+        Returns
+        -------
+        bool
+            True if the entry exists and its files were materialized, False otherwise.
+        """
+        if key not in self:
+            return False
+        entry = self.get_path(key)
+        metadata = json.loads((entry / self.METADATA_NAME).read_text())
+        for name in metadata["files"]:
+            source = entry / name
+            target = working_dir / (basename + name.removeprefix(self.ENTRY_BASENAME))
+            tmp_target = target.with_name(f".{target.name}.{os.getpid()}.tmp")
+            tmp_target.unlink(missing_ok=True)
+            if self.hardlink:
+                try:
+                    os.link(source, tmp_target)
+                except OSError:
+                    # > E.g., store and working directory on different file systems
+                    shutil.copyfile(source, tmp_target)
+            else:
+                shutil.copyfile(source, tmp_target)
+            tmp_target.replace(target)
+        return True
@@ -0,0 +1,175 @@
+"""
+Execution of ORCA in a node-local scratch directory.
+Input files are staged into a temporary directory below a fast local file system (e.g. `$TMPDIR` or `/dev/shm`),
+ORCA runs there, and only selected result files are copied back to the working directory.
+"""
+
+import os
+import shutil
+import sys
+import tempfile
+from contextlib import contextmanager
+from fnmatch import fnmatch
+from pathlib import Path
+from typing import Iterable, Iterator
+
+__all__ = ("DEFAULT_COPY_BACK", "Scratch")
+
+# > Result files that ORCA leaves behind, including those of every step of scans and NEB runs
+DEFAULT_COPY_BACK: tuple[str, ...] = (
+    "*.gbw",
+    "*.json",
+    "*.property.txt",
+    "*.engrad",
+    "*.hess",
+    "*.xyz",
+)
+# > ioctl request to clone a file on Linux (reflink), e.g., on Btrfs or XFS
+_FICLONE = 0x40049409
+
+
+def _reflink(source: Path, target: Path, /) -> None:
+    """
+    Create a copy-on-write clone of `source`.
+
+    Raises
+    ------
+    OSError
+        If the file system or platform does not support reflinks.
+    """
+    if not sys.platform.startswith("linux"):
+        raise OSError("Reflinks are only supported on Linux.")
+    import fcntl
+
+    with source.open("rb") as src, target.open("wb") as dst:
+        try:
+            fcntl.ioctl(dst.fileno(), _FICLONE, src.fileno())
+        except OSError:
+            dst.close()
+            target.unlink(missing_ok=True)
+            raise
+
+
+def link_or_copy(source: Path, target: Path, /, *, link: bool = True) -> None:
+    """
+    Place `source` at `target` as hard link, reflink or plain copy, whichever is possible first.
+
+    Parameters
+    ----------
+    source : Path
+    target : Path
+    link : bool, default: True
+        Try a hard link first. Only safe for files that are not modified in place.
+    """
+    target.parent.mkdir(parents=True, exist_ok=True)
+    if link:
+        try:
+            os.link(source, target)
+            return
+        except OSError:
+            pass
+    try:
+        _reflink(source, target)
+    except OSError:
+        shutil.copyfile(source, target)
+
+
+class Scratch:
+    """
+    Settings for running ORCA in a scratch directory.
+
+    Attributes
+    ----------
+    root: Path
+        Directory in which a temporary directory is created for every job.
+    copy_back: tuple[str, ...]
+        Patterns for the result files that are copied back, matched against the file name without the basename.
+        E.g., ".gbw" matches only `<basename>.gbw`, while "*.gbw" also matches the GBW files of scans
+        (`<basename>.001.gbw`) and NEB runs (`<basename>_im1.gbw`).
+    """
+
+    # > Environment variable that points to the default scratch root
+    ROOT_VARIABLE = "TMPDIR"
+
+    def __init__(
+        self,
+        root: Path | str | os.PathLike[str] | None = None,
+        /,
+        *,
+        copy_back: Iterable[str] = DEFAULT_COPY_BACK,
+    ) -> None:
+        """
+        Parameters
+        ----------
+        root : Path | str | os.PathLike[str] | None, default: None
+            Scratch root. If None, `$TMPDIR` is used and if it is not set the default temporary directory.
+        copy_back : Iterable[str], default: DEFAULT_COPY_BACK
+            Patterns of the result files to copy back.
+            The `.out` and `.err` files are always written directly to the working directory.
+
+        Raises
+        ------
+        ValueError
+            If `root` is not a directory.
+        """
+        if root is None:
+            root = os.environ.get(self.ROOT_VARIABLE) or tempfile.gettempdir()
+        self.root = Path(root).expanduser().resolve()
+        if not self.root.is_dir():
+            raise ValueError(f"{self.__class__.__name__}.root: {self.root} is not a directory!")
+        self.copy_back = tuple(copy_back)
+
+    def is_result(self, name: str, basename: str, /) -> bool:
+        """Check if a file in the scratch directory is copied back."""
+        if not name.startswith(basename):
+            return False
+        suffix = name.removeprefix(basename)
+        return any(fnmatch(suffix, pattern) for pattern in self.copy_back)
+
+    @contextmanager
+    def stage(self, inpfile: Path, /, files: Iterable[Path] = ()) -> Iterator[Path]:
+        """
+        Stage a job into a new scratch directory and yield the path of the staged input file.
+        When the context exits, also on errors or timeouts, the result files are copied back
+        and the scratch directory is removed.
+
+        Parameters
+        ----------
+        inpfile : Path
+            Input file in the working directory.
+        files : Iterable[Path], default: ()
+            Further files the job needs, e.g., structure files or the `moinp` file.
+            Files within the working directory keep their relative path, all other files are placed next to the input.
+        """
+        working_dir = inpfile.parent.resolve()
+        basename = inpfile.stem
+        scratch_dir = Path(tempfile.mkdtemp(prefix=f"opi-{basename}-", dir=self.root))
+        try:
+            staged = {inpfile.resolve()}
+            link_or_copy(inpfile, scratch_dir / inpfile.name)
+            for file in files:
+                file = file.resolve()
+                if file in staged:
+                    continue
+                staged.add(file)
+                try:
+                    relative = file.relative_to(working_dir)
+                except ValueError:
+                    relative = Path(file.name)
+                link_or_copy(file, scratch_dir / relative)
+            # > ORCA automatically uses an existing `<basename>.gbw` as initial guess.
+            # >> It is copied, as ORCA overwrites it in place.
+            gbw_file = working_dir / f"{basename}.gbw"
+            if gbw_file.is_file() and gbw_file.resolve() not in staged:
+                link_or_copy(gbw_file, scratch_dir / gbw_file.name, link=False)
+
+            yield scratch_dir / inpfile.name
+        finally:
+            try:
+                for file in scratch_dir.iterdir():
+                    if file.is_file() and self.is_result(file.name, basename):
+                        tmp_target = working_dir / f".{file.name}.{os.getpid()}.tmp"
+                        shutil.move(file, tmp_target)
+                        tmp_target.replace(working_dir / file.name)
+            finally:
+                shutil.rmtree(scratch_dir, ignore_errors=True)
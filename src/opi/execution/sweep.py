@@ -0,0 +1,80 @@
+"""
+Generation of many jobs from a template, e.g., for sweeps over functionals, basis sets or structures.
+"""
+
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Any, Iterable, Mapping
+
+from opi.core import Calculator
+
+__all__ = ("write_jobs",)
+
+
+def _derive_calculator(template: Calculator, row: Mapping[str, Any], /) -> Calculator:
+    """Create the calculator of one row of the parameter table."""
+    changes = dict(row)
+    try:
+        basename = changes.pop("basename")
+    except KeyError:
+        raise ValueError("Every row of the parameter table needs a 'basename'.") from None
+    working_dir = Path(changes.pop("working_dir", template.working_dir))
+    working_dir.mkdir(parents=True, exist_ok=True)
+
+    calc = Calculator(basename, working_dir=working_dir, version_check=False)
+    calc.structure = changes.pop("structure", template.structure)
+    calc.json_via_input = template.json_via_input
+    calc.scratch = template.scratch
+    calc.result_store = template.result_store
+    # > Remaining keys are passed on to `Input.derive()`
+    calc.input = template.input.derive(**changes)
+    return calc
+
+
+def write_jobs(
+    template: Calculator,
+    rows: Iterable[Mapping[str, Any]],
+    /,
+    *,
+    max_workers: int | None = None,
+) -> list[Calculator]:
+    """
+    Create one calculator per row of a parameter table from a template and write all input files.
+    The inputs are created with `Input.derive()`, so unchanged blocks are shared with the template.
+
+    Parameters
+    ----------
+    template : Calculator
+        Calculator whose structure, input and settings are used for all jobs.
+    rows : Iterable[Mapping[str, Any]]
+        Parameter table. Each row must contain the key "basename" and can contain "working_dir"
+        (created if missing, default: working directory of the template), "structure",
+        and any keyword argument of `Input.derive()`, e.g.,
+        `{"basename": "pbe", "add_simple_keywords": [Dft.PBE]}`.
+    max_workers : int | None, default: None
+        Number of threads that write the input files. If None, the default of `ThreadPoolExecutor` is used.
+
+    Returns
+    -------
+    list[Calculator]
+        Calculators of all jobs in the order of `rows`. Their input files are written.
+
+    Raises
+    ------
+    ValueError
+        If a row has no basename or two rows would write the same input file.
+    """
+    # > Set the JSON output options once, so that the derived inputs share the block
+    if template.json_via_input:
+        template._set_json_output_block()
+
+    calculators = [_derive_calculator(template, row) for row in rows]
+    inpfiles = {calc.working_dir / calc.basename for calc in calculators}
+    if len(inpfiles) != len(calculators):
+        raise ValueError("The parameter table contains duplicated jobs.")
+
+    with ThreadPoolExecutor(max_workers) as executor:
+        # > Consume the iterator to raise the first error
+        for _ in executor.map(Calculator.write_input, calculators):
+            pass
+    return calculators
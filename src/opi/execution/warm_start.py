@@ -0,0 +1,352 @@
+"""
+Reuse of converged orbitals as initial guess for related jobs, e.g., along scans,
+for conformer re-ranking, or in multistep protocols.
+"""
+
+import json
+import os
+import shutil
+from pathlib import Path
+from typing import TYPE_CHECKING, Any
+
+import numpy as np
+import numpy.typing as npt
+
+from opi.input.blocks.block_basis import BlockBasis
+from opi.input.core import Input
+from opi.input.simple_keywords import BasisSet, Ecp, Scf, SimpleKeyword
+from opi.input.structures.atom import Atom
+from opi.input.structures.structure import Structure
+from opi.utils.misc import file_digest
+
+if TYPE_CHECKING:
+    from opi.core import Calculator
+
+__all__ = ("WarmStartEntry", "WarmStartManager")
+
+# > Keywords that determine the orbital basis
+_BASIS_KEYWORDS = frozenset(
+    keyword.keyword
+    for box in (BasisSet, Ecp)
+    for keyword in vars(box).values()
+    if isinstance(keyword, SimpleKeyword)
+)
+
+
+def basis_tag(inp: Input, /) -> str:
+    """
+    String that identifies the orbital basis of an input, i.e., basis set and ECP keywords,
+    composite methods with built-in basis sets (`-3c`), and the `%basis` block.
+
+    Parameters
+    ----------
+    inp : Input
+    """
+    keywords = set()
+    for keyword in inp.simple_keywords or ():
+        name = str(keyword).lower()
+        if name in _BASIS_KEYWORDS or name.endswith("3c"):
+            keywords.add(name)
+    tag = " ".join(sorted(keywords))
+    if inp.blocks and (block := inp.blocks.get(BlockBasis)) is not None:
+        tag += "\n" + block.format_orca()
+    return tag
+
+
+class WarmStartEntry:
+    """
+    Converged job whose orbitals can be used as initial guess.
+
+    Attributes
+    ----------
+    gbw_file: Path
+        GBW file with the converged orbitals.
+    symbols: tuple[str, ...]
+        Type and element of all atoms in the order of the structure.
+    coordinates: npt.NDArray[np.float64]
+        Cartesian coordinates in Angstrom, shape (natoms, 3).
+    basis: str
+        Orbital basis, see `basis_tag()`.
+    charge: int
+    multiplicity: int
+    scf_cycles: int
+        Number of cycles of the first SCF of the job.
+    cold_scf_cycles: int
+        Number of SCF cycles without warm-start. Taken from the job from which the chain of warm-starts originated.
+    """
+
+    __slots__ = (
+        "gbw_file",
+        "symbols",
+        "coordinates",
+        "basis",
+        "charge",
+        "multiplicity",
+        "scf_cycles",
+        "cold_scf_cycles",
+    )
+
+    def __init__(
+        self,
+        gbw_file: Path,
+        symbols: tuple[str, ...],
+        coordinates: npt.NDArray[np.float64],
+        basis: str,
+        charge: int,
+        multiplicity: int,
+        /,
+        *,
+        scf_cycles: int,
+        cold_scf_cycles: int,
+    ) -> None:
+        self.gbw_file = gbw_file
+        self.symbols = symbols
+        self.coordinates = coordinates
+        self.basis = basis
+        self.charge = charge
+        self.multiplicity = multiplicity
+        self.scf_cycles = scf_cycles
+        self.cold_scf_cycles = cold_scf_cycles
+
+    def to_dict(self) -> dict[str, Any]:
+        """Convert the entry to plain JSON-serializable data."""
+        return {
+            "gbw_file": str(self.gbw_file),
+            "symbols": list(self.symbols),
+            "coordinates": self.coordinates.tolist(),
+            "basis": self.basis,
+            "charge": self.charge,
+            "multiplicity": self.multiplicity,
+            "scf_cycles": self.scf_cycles,
+            "cold_scf_cycles": self.cold_scf_cycles,
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any], /) -> "WarmStartEntry":
+        """Create an entry from data created by `to_dict()`."""
+        return cls(
+            Path(data["gbw_file"]),
+            tuple(data["symbols"]),
+            np.array(data["coordinates"], dtype=np.float64).reshape(-1, 3),
+            data["basis"],
+            data["charge"],
+            data["multiplicity"],
+            scf_cycles=data["scf_cycles"],
+            cold_scf_cycles=data["cold_scf_cycles"],
+        )
+
+    def rmsd(self, coordinates: npt.NDArray[np.float64], /) -> float:
+        """
+        Root-mean-square deviation to `coordinates` without any alignment,
+        as orbitals are not rotated when they are read by ORCA.
+        """
+        return float(np.sqrt(np.mean(np.sum((self.coordinates - coordinates) ** 2, axis=1))))
+
+
+class WarmStartManager:
+    """
+    Keeps track of converged jobs and uses their orbitals as initial guess (`%moinp` with `MOREAD`) for new jobs.
+    A previous job is a candidate if it has the same atoms in the same order, the same orbital basis,
+    charge and multiplicity. Of all candidates, the one with the smallest RMSD is used.
+
+    For each warm-started job, a metadata file `<basename>.warmstart.json` is written to the working directory.
+    After `register()`, it also contains the number of SCF cycles saved compared to the cold start.
+
+    Attributes
+    ----------
+    directory: Path | None
+        If set, GBW files of registered jobs are copied to this directory and the list of jobs is stored in it.
+        Otherwise, the GBW files are used from the working directories of the jobs and nothing is persisted.
+    max_rmsd: float
+        Maximum RMSD in Angstrom between the structures.
+    hardlink: bool
+        Place the initial guess in the working directory as hard link instead of a copy.
+    """
+
+    # > Name of the file that lists all registered jobs
+    INDEX_NAME = "index.jsonl"
+    # > Suffix of the initial guess in the working directory
+    GUESS_SUFFIX = ".guess.gbw"
+    # > Suffix of the metadata file in the working directory
+    METADATA_SUFFIX = ".warmstart.json"
+
+    def __init__(
+        self,
+        directory: Path | str | os.PathLike[str] | None = None,
+        /,
+        *,
+        max_rmsd: float = 0.5,
+        hardlink: bool = True,
+    ) -> None:
+        self.directory: Path | None = None
+        self.max_rmsd = max_rmsd
+        self.hardlink = hardlink
+        self._entries: list[WarmStartEntry] = []
+        if directory is not None:
+            self.directory = Path(directory).expanduser().resolve()
+            self.directory.mkdir(parents=True, exist_ok=True)
+            index = self.directory / self.INDEX_NAME
+            if index.is_file():
+                with index.open() as f:
+                    self._entries = [
+                        WarmStartEntry.from_dict(json.loads(line)) for line in f if line.strip()
+                    ]
+
+    @property
+    def entries(self) -> tuple[WarmStartEntry, ...]:
+        """All registered jobs."""
+        return tuple(self._entries)
+
+    @staticmethod
+    def _describe(
+        calculator: "Calculator", /
+    ) -> tuple[tuple[str, ...], npt.NDArray[np.float64], str, int, int] | None:
+        """Symbols, coordinates, basis, charge and multiplicity of a job or None if there is no `Structure`."""
+        structure = calculator.structure
+        if not isinstance(structure, Structure) or not structure.atoms:
+            return None
+        symbols = tuple(
+            f"{type(atom).__name__}:{atom.element.value}"
+            if isinstance(atom, Atom)
+            else type(atom).__name__
+            for atom in structure.atoms
+        )
+        coordinates = np.array([atom.coordinates.coordinates for atom in structure.atoms])
+        return (
+            symbols,
+            coordinates,
+            basis_tag(calculator.input),
+            structure.charge,
+            structure.multiplicity,
+        )
+
+    @classmethod
+    def metadata_file(cls, calculator: "Calculator", /) -> Path:
+        """Path of the warm-start metadata of a job."""
+        return calculator.working_dir / f"{calculator.basename}{cls.METADATA_SUFFIX}"
+
+    def find(self, calculator: "Calculator", /) -> tuple[WarmStartEntry, float] | None:
+        """
+        Closest registered job that is compatible with `calculator`.
+
+        Returns
+        -------
+        tuple[WarmStartEntry, float] | None
+            Entry and its RMSD, or None if there is no compatible job within `max_rmsd`.
+        """
+        description = self._describe(calculator)
+        if description is None:
+            return None
+        symbols, coordinates, basis, charge, multiplicity = description
+        best: tuple[WarmStartEntry, float] | None = None
+        for entry in self._entries:
+            if (
+                entry.symbols != symbols
+                or entry.basis != basis
+                or entry.charge != charge
+                or entry.multiplicity != multiplicity
+                or not entry.gbw_file.is_file()
+            ):
+                continue
+            rmsd = entry.rmsd(coordinates)
+            if rmsd <= self.max_rmsd and (best is None or rmsd < best[1]):
+                best = (entry, rmsd)
+        return best
+
+    def apply(self, calculator: "Calculator", /) -> WarmStartEntry | None:
+        """
+        Use the orbitals of the closest compatible job as initial guess for `calculator`.
+        The GBW file is placed in the working directory, `moinp` is set and the `MOREAD` keyword is added.
+        Must be called before `Calculator.write_input()`.
+
+        Returns
+        -------
+        WarmStartEntry | None
+            The job used for the initial guess or None if there is no compatible job.
+        """
+        metadata_file = self.metadata_file(calculator)
+        metadata_file.unlink(missing_ok=True)
+        match = self.find(calculator)
+        if match is None:
+            return None
+        entry, rmsd = match
+
+        guess = calculator.working_dir / f"{calculator.basename}{self.GUESS_SUFFIX}"
+        if guess.resolve() != entry.gbw_file.resolve():
+            guess.unlink(missing_ok=True)
+            try:
+                if not self.hardlink:
+                    raise OSError
+                os.link(entry.gbw_file, guess)
+            except OSError:
+                shutil.copyfile(entry.gbw_file, guess)
+
+        calculator.input.moinp = guess
+        if not calculator.input.has_simple_keywords(Scf.MOREAD)[0]:
+            calculator.input.add_simple_keywords(Scf.MOREAD)
+
+        metadata_file.write_text(
+            json.dumps(
+                {
+                    "source": str(entry.gbw_file),
+                    "rmsd": rmsd,
+                    "cold_scf_cycles": entry.cold_scf_cycles,
+                },
+                indent=2,
+            )
+        )
+        return entry
+
+    def register(self, calculator: "Calculator", /) -> WarmStartEntry | None:
+        """
+        Register a finished job, so its orbitals can be used for later jobs.
+        If the job was warm-started, the number of saved SCF cycles is added to its metadata file.
+
+        Returns
+        -------
+        WarmStartEntry | None
+            The new entry or None if the job did not terminate normally, has no converged SCF or no `Structure`.
+        """
+        description = self._describe(calculator)
+        output = calculator.get_output()
+        gbw_file = calculator.working_dir / f"{calculator.basename}.gbw"
+        if description is None or not gbw_file.is_file() or not output.terminated_normally():
+            return None
+        cycles = output.get_scf_cycles()
+        if not cycles:
+            return None
+
+        scf_cycles = cycles[0]
+        cold_scf_cycles = scf_cycles
+        metadata_file = self.metadata_file(calculator)
+        if metadata_file.is_file():
+            metadata = json.loads(metadata_file.read_text())
+            cold_scf_cycles = metadata["cold_scf_cycles"]
+            metadata["scf_cycles"] = scf_cycles
+            metadata["saved_scf_cycles"] = cold_scf_cycles - scf_cycles
+            metadata_file.write_text(json.dumps(metadata, indent=2))
+
+        if self.directory is not None:
+            stored = self.directory / f"{file_digest(gbw_file)}.gbw"
+            if not stored.is_file():
+                tmp_stored = stored.with_name(f".{stored.name}.{os.getpid()}.tmp")
+                shutil.copyfile(gbw_file, tmp_stored)
+                tmp_stored.replace(stored)
+            gbw_file = stored
+
+        symbols, coordinates, basis, charge, multiplicity = description
+        entry = WarmStartEntry(
+            gbw_file,
+            symbols,
+            coordinates,
+            basis,
+            charge,
+            multiplicity,
+            scf_cycles=scf_cycles,
+            cold_scf_cycles=cold_scf_cycles,
+        )
+        self._entries.append(entry)
+        if self.directory is not None:
+            with (self.directory / self.INDEX_NAME).open("a") as f:
+                f.write(json.dumps(entry.to_dict()) + "\n")
+        return entry
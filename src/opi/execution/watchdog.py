@@ -0,0 +1,434 @@
+"""
+Supervision of running ORCA jobs.
+The growing `.out` file is parsed incrementally while ORCA runs and the job is aborted as soon as one of
+the configured policies considers it hopeless, e.g., an oscillating SCF or a stalled geometry optimization.
+"""
+
+import json
+import os
+import re
+import signal
+import subprocess
+import time
+from abc import ABC, abstractmethod
+from pathlib import Path
+from typing import Any, Iterable
+
+__all__ = (
+    "AbortReason",
+    "GradientPlateau",
+    "JobProgress",
+    "ScfStagnation",
+    "TimeBudget",
+    "Watchdog",
+    "WatchdogAbort",
+    "WatchdogPolicy",
+)
+
+# > Line of the SCF iteration table: iteration, energy, Delta-E, ...
+_SCF_ITERATION = re.compile(r"\s*(\d+)\s+(-?\d+\.\d+)\s+(-?\d+\.\d+e[+-]\d+)\s")
+# > Start of a geometry optimization cycle
+_OPT_CYCLE = re.compile(r"\s*\*\s+GEOMETRY OPTIMIZATION CYCLE\s+(\d+)\s+\*")
+# > RMS gradient in the "Geometry convergence" table, which ends with YES/NO
+_RMS_GRADIENT = re.compile(r"\s*RMS gradient\s+(\S+)\s+\S+\s+(?:YES|NO)\s*")
+
+
+class JobProgress:
+    """
+    Progress of a running ORCA job, parsed incrementally from its `.out` file.
+
+    Attributes
+    ----------
+    elapsed: float
+        Wall-clock time in seconds since the job was started.
+    scf_delta_e: list[float]
+        Delta-E of every iteration of the current SCF.
+    scf_times: list[float]
+        Elapsed time at which every iteration of the current SCF was seen.
+    rms_gradients: list[float]
+        RMS gradient of every finished geometry optimization cycle.
+    cycle_times: list[float]
+        Elapsed time at which every geometry optimization cycle started.
+    """
+
+    __slots__ = (
+        "elapsed",
+        "scf_delta_e",
+        "scf_times",
+        "rms_gradients",
+        "cycle_times",
+        "_start",
+        "_offset",
+        "_rest",
+        "_in_scf",
+    )
+
+    def __init__(self) -> None:
+        self.elapsed = 0.0
+        self.scf_delta_e: list[float] = []
+        self.scf_times: list[float] = []
+        self.rms_gradients: list[float] = []
+        self.cycle_times: list[float] = []
+        self._start = time.monotonic()
+        # > Position up to which the file was read and the incomplete last line
+        self._offset = 0
+        self._rest = b""
+        self._in_scf = False
+
+    def read(self, outfile: Path, /) -> None:
+        """
+        Parse the part of `outfile` that was written since the last call.
+
+        Parameters
+        ----------
+        outfile : Path
+            `.out` file of the running job. Nothing happens if it does not exist yet.
+        """
+        self.elapsed = time.monotonic() - self._start
+        try:
+            with outfile.open("rb") as f:
+                f.seek(self._offset)
+                data = f.read()
+        except FileNotFoundError:
+            return
+        self._offset += len(data)
+        *lines, self._rest = (self._rest + data).split(b"\n")
+        for line in lines:
+            self.feed(line.decode(errors="replace"))
+
+    def feed(self, line: str, /) -> None:
+        """Parse a single line of the `.out` file."""
+        if line.startswith("Iteration    Energy (Eh)"):
+            # > A new table either starts a new SCF or continues the current one, e.g., with SOSCF
+            if not self._in_scf:
+                self.scf_delta_e.clear()
+                self.scf_times.clear()
+            self._in_scf = True
+        elif self._in_scf:
+            if match := _SCF_ITERATION.match(line):
+                self.scf_delta_e.append(float(match.group(3)))
+                self.scf_times.append(self.elapsed)
+            elif "SCF CONVERGED AFTER" in line or "SCF NOT CONVERGED AFTER" in line:
+                self._in_scf = False
+        elif _OPT_CYCLE.match(line):
+            self.cycle_times.append(self.elapsed)
+        elif match := _RMS_GRADIENT.match(line):
+            self.rms_gradients.append(float(match.group(1)))
+
+    def to_dict(self) -> dict[str, Any]:
+        """Summary of the progress for the abort record."""
+        return {
+            "scf_iterations": len(self.scf_delta_e),
+            "last_delta_e": self.scf_delta_e[-1] if self.scf_delta_e else None,
+            "optimization_cycles": len(self.cycle_times),
+            "last_rms_gradient": self.rms_gradients[-1] if self.rms_gradients else None,
+        }
+
+
+class AbortReason:
+    """
+    Structured record why a job was aborted by the watchdog.
+    Written to `<basename>.abort.json` and available from `Output.get_abort_reason()`.
+
+    Attributes
+    ----------
+    policy: str
+        Name of the policy that aborted the job.
+    message: str
+        Human-readable explanation.
+    elapsed: float
+        Wall-clock time in seconds after which the job was aborted.
+    progress: dict[str, Any]
+        Progress of the job at the time of the abort, see `JobProgress.to_dict()`.
+    """
+
+    __slots__ = ("policy", "message", "elapsed", "progress")
+
+    def __init__(
+        self, policy: str, message: str, /, *, elapsed: float, progress: dict[str, Any]
+    ) -> None:
+        self.policy = policy
+        self.message = message
+        self.elapsed = elapsed
+        self.progress = progress
+
+    def __repr__(self) -> str:
+        return f"{self.__class__.__name__}({self.policy!r}, {self.message!r})"
+
+    def to_dict(self) -> dict[str, Any]:
+        """Convert the record to plain JSON-serializable data."""
+        return {
+            "policy": self.policy,
+            "message": self.message,
+            "elapsed": self.elapsed,
+            "progress": self.progress,
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any], /) -> "AbortReason":
+        """Create a record from data created by `to_dict()`."""
+        return cls(
+            data["policy"], data["message"], elapsed=data["elapsed"], progress=data["progress"]
+        )
+
+    def write(self, file: Path, /) -> None:
+        """Write the record to a JSON file."""
+        file.write_text(json.dumps(self.to_dict(), indent=4))
+
+    @classmethod
+    def read(cls, file: Path, /) -> "AbortReason":
+        """
+        Read a record written by `write()`.
+
+        Raises
+        ------
+        FileNotFoundError
+            If `file` does not exist.
+        """
+        return cls.from_dict(json.loads(file.read_text()))
+
+
+class WatchdogAbort(RuntimeError):
+    """Raised by `Runner.run()` if the watchdog aborted the process."""
+
+    def __init__(self, reason: AbortReason, /) -> None:
+        super().__init__(f"Job aborted by {reason.policy}: {reason.message}")
+        self.reason = reason
+
+
+class WatchdogPolicy(ABC):
+    """
+    Base class of all watchdog policies.
+    Subclasses implement `check()`, which returns an explanation if the job should be aborted.
+    """
+
+    __slots__ = ()
+
+    @abstractmethod
+    def check(self, progress: JobProgress, /) -> str | None:
+        """
+        Decide if the job is hopeless.
+
+        Parameters
+        ----------
+        progress : JobProgress
+            Current progress of the job.
+
+        Returns
+        -------
+        str | None
+            Reason for the abort or None, if the job should continue.
+        """
+
+
+class ScfStagnation(WatchdogPolicy):
+    """
+    Abort if |Delta-E| of the current SCF did not reach a new minimum during the last `iterations` iterations,
+    as is typical for oscillating SCFs.
+
+    Attributes
+    ----------
+    iterations: int
+        Number of iterations without improvement that are tolerated.
+    """
+
+    __slots__ = ("iterations",)
+
+    def __init__(self, iterations: int = 50, /) -> None:
+        if iterations < 1:
+            raise ValueError(f"{self.__class__.__name__}.iterations must be positive.")
+        self.iterations = iterations
+
+    def check(self, progress: JobProgress, /) -> str | None:
+        # > Delta-E of the first iteration is always zero
+        delta_e = [abs(value) for value in progress.scf_delta_e[1:]]
+        if len(delta_e) <= self.iterations:
+            return None
+        best = min(delta_e[: -self.iterations])
+        if min(delta_e[-self.iterations :]) < best:
+            return None
+        return f"|Delta-E| did not improve on {best:.2e} Eh during the last {self.iterations} SCF iterations."
+
+
+class GradientPlateau(WatchdogPolicy):
+    """
+    Abort a geometry optimization whose RMS gradient decreased by less than `min_decrease` (relative)
+    during the last `cycles` optimization cycles.
+
+    Attributes
+    ----------
+    cycles: int
+        Number of cycles that are compared.
+    min_decrease: float
+        Required relative decrease of the smallest RMS gradient.
+    """
+
+    __slots__ = ("cycles", "min_decrease")
+
+    def __init__(self, cycles: int = 10, /, *, min_decrease: float = 0.1) -> None:
+        if cycles < 1:
+            raise ValueError(f"{self.__class__.__name__}.cycles must be positive.")
+        if not 0.0 <= min_decrease < 1.0:
+            raise ValueError(f"{self.__class__.__name__}.min_decrease must be in [0, 1).")
+        self.cycles = cycles
+        self.min_decrease = min_decrease
+
+    def check(self, progress: JobProgress, /) -> str | None:
+        gradients = progress.rms_gradients
+        if len(gradients) <= self.cycles:
+            return None
+        best = min(gradients[: -self.cycles])
+        if min(gradients[-self.cycles :]) < (1.0 - self.min_decrease) * best:
+            return None
+        return (
+            f"RMS gradient decreased by less than {self.min_decrease:.0%} from {best:.2e} Eh/bohr"
+            f" during the last {self.cycles} optimization cycles."
+        )
+
+
+class TimeBudget(WatchdogPolicy):
+    """
+    Abort if the job exceeded its time budget or if the current step is projected to exceed it.
+    A step is a geometry optimization cycle or, before the second cycle, an SCF iteration.
+    The duration of a step is projected as the mean duration of the previous steps.
+
+    Attributes
+    ----------
+    seconds: float
+        Wall-clock time budget of the job.
+    """
+
+    __slots__ = ("seconds",)
+
+    def __init__(self, seconds: float, /) -> None:
+        if seconds <= 0:
+            raise ValueError(f"{self.__class__.__name__}.seconds must be positive.")
+        self.seconds = seconds
+
+    def check(self, progress: JobProgress, /) -> str | None:
+        if progress.elapsed > self.seconds:
+            return f"Time budget of {self.seconds:g} s exceeded."
+        starts = progress.cycle_times if len(progress.cycle_times) > 1 else progress.scf_times
+        if len(starts) < 2:
+            return None
+        mean_step = (starts[-1] - starts[0]) / (len(starts) - 1)
+        projected = starts[-1] + mean_step
+        if projected <= self.seconds:
+            return None
+        return (
+            f"Current step is projected to finish after {projected:.0f} s,"
+            f" which exceeds the time budget of {self.seconds:g} s."
+        )
+
+
+class Watchdog:
+    """
+    Supervises an ORCA process and terminates its process tree if any policy considers the job hopeless.
+    A watchdog holds no state of a job and can be shared between jobs and threads.
+
+    Attributes
+    ----------
+    policies: tuple[WatchdogPolicy, ...]
+        Policies that are checked in order.
+    interval: float
+        Seconds between two checks of the `.out` file.
+    grace_period: float
+        Seconds to wait after SIGTERM before the process tree is killed.
+    """
+
+    __slots__ = ("policies", "interval", "grace_period")
+
+    def __init__(
+        self,
+        policies: Iterable[WatchdogPolicy],
+        /,
+        *,
+        interval: float = 5.0,
+        grace_period: float = 10.0,
+    ) -> None:
+        """
+        Parameters
+        ----------
+        policies : Iterable[WatchdogPolicy]
+            Policies that decide if a job is aborted, e.g., `[ScfStagnation(50), TimeBudget(3600)]`.
+        interval : float, default: 5.0
+            Seconds between two checks of the `.out` file.
+        grace_period : float, default: 10.0
+            Seconds to wait after SIGTERM before the process tree is killed.
+        """
+        self.policies = tuple(policies)
+        self.interval = interval
+        self.grace_period = grace_period
+
+    def check(self, progress: JobProgress, /) -> AbortReason | None:
+        """Check all policies and return the reason of the first one that aborts the job."""
+        for policy in self.policies:
+            if (message := policy.check(progress)) is not None:
+                return AbortReason(
+                    policy.__class__.__name__,
+                    message,
+                    elapsed=progress.elapsed,
+                    progress=progress.to_dict(),
+                )
+        return None
+
+    def supervise(
+        self, proc: subprocess.Popen[str], outfile: Path, /, *, timeout: float | None = None
+    ) -> None:
+        """
+        Wait for `proc` to complete while watching `outfile`.
+        The process should be started in a new session, so that its whole process tree can be terminated.
+
+        Parameters
+        ----------
+        proc : subprocess.Popen[str]
+            Running ORCA process.
+        outfile : Path
+            File to which ORCA writes its output.
+        timeout : float | None, default: None
+            Optional timeout in seconds to wait for the process to complete.
+
+        Raises
+        ------
+        WatchdogAbort
+            If a policy aborted the job.
+        subprocess.TimeoutExpired
+            If the process did not complete within `timeout`.
+        """
+        progress = JobProgress()
+        while True:
+            try:
+                proc.wait(self.interval)
+                return
+            except subprocess.TimeoutExpired:
+                pass
+            progress.read(outfile)
+            if (reason := self.check(progress)) is not None:
+                self.terminate(proc)
+                raise WatchdogAbort(reason)
+            if timeout is not None and progress.elapsed > timeout:
+                self.terminate(proc)
+                raise subprocess.TimeoutExpired(proc.args, timeout)
+
+    def terminate(self, proc: subprocess.Popen[str], /) -> None:
+        """
+        Terminate the process tree of `proc`, first with SIGTERM and after the grace period with SIGKILL.
+        On platforms without process groups, only `proc` itself is terminated.
+        """
+        self._signal(proc, signal.SIGTERM)
+        try:
+            proc.wait(self.grace_period)
+        except subprocess.TimeoutExpired:
+            self._signal(proc, signal.SIGKILL if hasattr(signal, "SIGKILL") else signal.SIGTERM)
+            proc.wait()
+
+    @staticmethod
+    def _signal(proc: subprocess.Popen[str], signum: int, /) -> None:
+        """Send a signal to the process group of `proc`, or to `proc` if there are no process groups."""
+        if hasattr(os, "killpg"):
+            try:
+                os.killpg(proc.pid, signum)
+            except ProcessLookupError:
+                pass
+        else:
+            proc.send_signal(signum)
@@ -0,0 +1,455 @@
+"""
+Compact wire format for sending `Calculator`, `Input` and `Structure` objects to worker processes.
+
+Blocks and simple keywords are stored as plain data and structures as packed NumPy arrays,
+which is much smaller and faster than pickling the individual Python objects.
+The format guarantees that `loads(dumps(obj))` produces the identical ORCA input.
+
+Layout of a payload:
+    MAGIC | uint32 length of header | header (JSON) | array buffers
+"""
+
+import importlib
+import json
+import struct
+from enum import Enum
+from pathlib import Path
+from typing import Any, Mapping, TypeVar
+
+import numpy as np
+import numpy.typing as npt
+from pydantic import BaseModel
+
+from opi.core import Calculator
+from opi.execution.result_store import ResultStore
+from opi.execution.scratch import Scratch
+from opi.input import simple_keywords
+from opi.input.arbitrary_string import ArbitraryString, ArbitraryStringPos
+from opi.input.blocks.base import Block
+from opi.input.core import Input
+from opi.input.simple_keywords.base import SimpleKeyword, SimpleKeywordBox
+from opi.input.structures.atom import (
+    Atom,
+    EmbeddingPotential,
+    GhostAtom,
+    PointCharge,
+)
+from opi.input.structures.coordinates import Coordinates
+from opi.input.structures.structure import Structure
+from opi.input.structures.structure_file import BaseStructureFile
+from opi.utils.element import Element
+
+__all__ = ("dumps", "loads", "decode_message")
+
+# > Identifies payloads and the version of the format
+MAGIC = b"OPIW\x01"
+
+# > Types of coordinate lines in the order of their codes in the packed structure
+_ATOM_TYPES: tuple[type[Atom | GhostAtom | PointCharge | EmbeddingPotential], ...] = (
+    Atom,
+    GhostAtom,
+    PointCharge,
+    EmbeddingPotential,
+)
+
+T = TypeVar("T")
+
+# > Paths of the predefined simple keyword objects, filled on first use
+_KEYWORD_REFS: dict[int, str] = {}
+
+
+def _keyword_ref(keyword: SimpleKeyword, /) -> str | None:
+    """Path `module:Box.NAME` if `keyword` is one of the objects predefined in a `SimpleKeywordBox`."""
+    if not _KEYWORD_REFS:
+        # > Boxes are loaded lazily, all of them must be known here
+        for name in simple_keywords.__all__:
+            getattr(simple_keywords, name)
+        boxes: list[type[SimpleKeywordBox]] = list(SimpleKeywordBox.__subclasses__())
+        while boxes:
+            box = boxes.pop()
+            boxes.extend(box.__subclasses__())
+            for name, value in vars(box).items():
+                if isinstance(value, SimpleKeyword):
+                    _KEYWORD_REFS.setdefault(id(value), f"{_class_path(box)}.{name}")
+    return _KEYWORD_REFS.get(id(keyword))
+
+
+def _encode_keyword(keyword: SimpleKeyword, /) -> dict[str, str]:
+    """
+    Predefined keywords are stored by reference, so that the decoded input contains the same objects,
+    e.g., `has_simple_keywords(Method.HF)` still works.
+    """
+    if (ref := _keyword_ref(keyword)) is not None:
+        return {"ref": ref}
+    return {"kw": keyword.keyword}
+
+
+def _decode_keyword(data: dict[str, str], /) -> SimpleKeyword:
+    if "ref" in data:
+        box_path, _, name = data["ref"].rpartition(".")
+        keyword = getattr(_resolve(box_path, SimpleKeywordBox), name)
+        if not isinstance(keyword, SimpleKeyword):
+            raise ValueError(f"Not a simple keyword: {data['ref']}")
+        return keyword
+    return SimpleKeyword(data["kw"])
+
+
+def _class_path(cls: type, /) -> str:
+    return f"{cls.__module__}:{cls.__qualname__}"
+
+
+def _resolve(path: str, base: type[T], /) -> type[T]:
+    """
+    Import a class from `_class_path()`. Only subclasses of `base` defined within OPI are allowed.
+
+    Raises
+    ------
+    ValueError
+        If the class is not allowed.
+    """
+    module, _, qualname = path.partition(":")
+    if module.split(".")[0] != "opi":
+        raise ValueError(f"Refusing to load class from outside of OPI: {path}")
+    obj: Any = importlib.import_module(module)
+    for name in qualname.split("."):
+        obj = getattr(obj, name)
+    if not isinstance(obj, type) or not issubclass(obj, base):
+        raise ValueError(f"{path} is not a subclass of {base.__name__}")
+    return obj
+
+
+# //////////////////////////////////////////////////////////////
+# > PLAIN DATA
+# //////////////////////////////////////////////////////////////
+def _encode_value(value: Any, /) -> Any:
+    """
+    Convert a block option into JSON-compatible data.
+    All dictionaries in the result are markers, plain dictionaries are stored as lists of pairs.
+    """
+    if isinstance(value, SimpleKeyword):
+        return _encode_keyword(value)
+    if isinstance(value, Enum):
+        return {"enum": _class_path(type(value)), "value": value.value}
+    if value is None or isinstance(value, (bool, int, float, str)):
+        return value
+    if isinstance(value, BaseModel):
+        return _encode_model(value)
+    if isinstance(value, Path):
+        return {"path": str(value)}
+    if isinstance(value, list):
+        return [_encode_value(item) for item in value]
+    if isinstance(value, tuple):
+        return {"tuple": [_encode_value(item) for item in value]}
+    if isinstance(value, dict):
+        return {"dict": [[_encode_value(k), _encode_value(v)] for k, v in value.items()]}
+    raise TypeError(f"Cannot encode value of type {type(value).__name__}: {value!r}")
+
+
+def _decode_value(data: Any, /) -> Any:
+    """Inverse of `_encode_value()`."""
+    if isinstance(data, list):
+        return [_decode_value(item) for item in data]
+    if not isinstance(data, dict):
+        return data
+    if "kw" in data or "ref" in data:
+        return _decode_keyword(data)
+    if "enum" in data:
+        return _resolve(data["enum"], Enum)(data["value"])
+    if "model" in data:
+        return _decode_model(data)
+    if "path" in data:
+        return Path(data["path"])
+    if "tuple" in data:
+        return tuple(_decode_value(item) for item in data["tuple"])
+    if "dict" in data:
+        return {_decode_value(k): _decode_value(v) for k, v in data["dict"]}
+    raise ValueError(f"Unknown value in payload: {data!r}")
+
+
+def _encode_model(model: BaseModel, /) -> dict[str, Any]:
+    """Class and all fields that were set or differ from their default."""
+    fields = {}
+    for name, info in type(model).model_fields.items():
+        value = getattr(model, name)
+        if name in model.model_fields_set or value != info.get_default(call_default_factory=True):
+            fields[name] = _encode_value(value)
+    return {
+        "model": _class_path(type(model)),
+        "fields": fields,
+        "set": sorted(model.model_fields_set),
+    }
+
+
+def _decode_model(data: dict[str, Any], /) -> BaseModel:
+    """
+    Inverse of `_encode_model()`. The values are not validated again, as they were taken from a valid model.
+    """
+    cls = _resolve(data["model"], BaseModel)
+    fields = {name: _decode_value(value) for name, value in data["fields"].items()}
+    return cls.model_construct(_fields_set=set(data["set"]), **fields)
+
+
+# //////////////////////////////////////////////////////////////
+# > STRUCTURE
+# //////////////////////////////////////////////////////////////
+def _encode_structure(structure: Structure, arrays: list[npt.NDArray[Any]], /) -> dict[str, Any]:
+    """Pack the atoms into arrays. Optional properties are only stored if any atom has them."""
+    atoms = structure.atoms
+    natoms = len(atoms)
+
+    def add(array: npt.NDArray[Any]) -> int:
+        arrays.append(np.ascontiguousarray(array))
+        return len(arrays) - 1
+
+    data: dict[str, Any] = {
+        "charge": structure.charge,
+        "multiplicity": structure.multiplicity,
+        "origin": None if structure.origin is None else str(structure.origin),
+        "natoms": natoms,
+        "types": add(np.array([_ATOM_TYPES.index(type(atom)) for atom in atoms], dtype=np.uint8)),
+        "symbols": " ".join(str(atom._element) for atom in atoms),
+        "coordinates": add(
+            np.array([atom.coordinates.coordinates for atom in atoms], dtype=np.float64).reshape(
+                natoms, 3
+            )
+        ),
+    }
+    if any(atom.fragment_id is not None for atom in atoms):
+        data["fragment_id"] = add(
+            np.array([atom.fragment_id or 0 for atom in atoms], dtype=np.int32)
+        )
+    for name in ("nuclear_charge", "mass", "charge"):
+        values = [getattr(atom, name, None) for atom in atoms]
+        if any(value is not None for value in values):
+            data[f"atom_{name}"] = add(
+                np.array([np.nan if v is None else v for v in values], dtype=np.float64)
+            )
+    append_str = {str(i): atom.append_str for i, atom in enumerate(atoms) if atom.append_str}
+    if append_str:
+        data["append_str"] = append_str
+    return data
+
+
+def _decode_structure(data: dict[str, Any], arrays: list[npt.NDArray[Any]], /) -> Structure:
+    """
+    Inverse of `_encode_structure()`.
+    The atoms are created without validation, as the values were taken from valid atoms.
+    """
+    natoms = data["natoms"]
+    types = arrays[data["types"]].tolist()
+    symbols = data["symbols"].split(" ") if natoms else []
+    # > Writable copy, each atom gets its own row
+    coordinates = arrays[data["coordinates"]].copy()
+
+    def optional(name: str, /) -> list[Any]:
+        """Values of an optional property with None for missing values (NaN)."""
+        if name not in data:
+            return [None] * natoms
+        return [value if value == value else None for value in arrays[data[name]].tolist()]
+
+    # > Fragment IDs are positive, 0 means no fragment
+    fragment_ids = [value or None for value in optional("fragment_id")]
+    nuclear_charges = optional("atom_nuclear_charge")
+    masses = optional("atom_mass")
+    charges = optional("atom_charge")
+    append_str = data.get("append_str", {})
+
+    elements: dict[str, Element] = {}
+    atoms: list[Atom | EmbeddingPotential | GhostAtom | PointCharge] = []
+    for i, row in enumerate(coordinates):
+        cls = _ATOM_TYPES[types[i]]
+        symbol = symbols[i]
+        if issubclass(cls, Atom):
+            element: Any = elements.get(symbol) or elements.setdefault(symbol, Element(symbol))
+        else:
+            element = symbol
+        attributes: dict[str, Any] = {
+            "element": element,
+            "coordinates": Coordinates._from_trusted(row),
+            "fragment_id": fragment_ids[i],
+            "nuclear_charge": nuclear_charges[i],
+            "mass": masses[i],
+            "append_str": append_str.get(str(i)),
+        }
+        if not issubclass(cls, Atom):
+            attributes["charge"] = charges[i]
+        atoms.append(cls._from_trusted(**attributes))
+
+    structure = Structure(atoms, charge=data["charge"], multiplicity=data["multiplicity"])
+    structure.origin = data["origin"]
+    return structure
+
+
+def _encode_structure_any(
+    structure: Structure | BaseStructureFile | None, arrays: list[npt.NDArray[Any]], /
+) -> dict[str, Any] | None:
+    if structure is None:
+        return None
+    if isinstance(structure, BaseStructureFile):
+        return {
+            "file_type": _class_path(type(structure)),
+            "file": str(structure.file),
+            "charge": structure.charge,
+            "multiplicity": structure.multiplicity,
+        }
+    return _encode_structure(structure, arrays)
+
+
+def _decode_structure_any(
+    data: dict[str, Any] | None, arrays: list[npt.NDArray[Any]], /
+) -> Structure | BaseStructureFile | None:
+    if data is None:
+        return None
+    if "file_type" in data:
+        cls = _resolve(data["file_type"], BaseStructureFile)
+        return cls(data["file"], charge=data["charge"], multiplicity=data["multiplicity"])
+    return _decode_structure(data, arrays)
+
+
+# //////////////////////////////////////////////////////////////
+# > INPUT AND CALCULATOR
+# //////////////////////////////////////////////////////////////
+def _encode_input(inp: Input, /) -> dict[str, Any]:
+    return {
+        "simple_keywords": [
+            {"kw": keyword} if isinstance(keyword, str) else _encode_keyword(keyword)
+            for keyword in inp.simple_keywords or ()
+        ],
+        "blocks": [_encode_model(block) for block in (inp.blocks or {}).values()],
+        "arbitrary_strings": [[item.string, str(item.pos)] for item in inp.arbitrary_strings or ()],
+        "ncores": inp.ncores,
+        "memory": inp.memory,
+        "moinp": None if inp.moinp is None else str(inp.moinp),
+    }
+
+
+def _decode_input(data: dict[str, Any], /) -> Input:
+    inp = Input()
+    inp.add_simple_keywords(*(_decode_keyword(keyword) for keyword in data["simple_keywords"]))
+    for block_data in data["blocks"]:
+        block = _decode_model(block_data)
+        if not isinstance(block, Block):
+            raise ValueError(f"Not a block: {block_data['model']}")
+        inp.add_blocks(block)
+    for string, pos in data["arbitrary_strings"]:
+        inp._arbitrary_strings.append(ArbitraryString(string, ArbitraryStringPos(pos)))
+    inp.ncores = data["ncores"]
+    inp.memory = data["memory"]
+    # > The file is not checked again, as it might only exist on the side of the sender
+    inp._moinp = None if data["moinp"] is None else Path(data["moinp"])
+    return inp
+
+
+def _encode_calculator(calc: Calculator, arrays: list[npt.NDArray[Any]], /) -> dict[str, Any]:
+    scratch = calc.scratch
+    store = calc.result_store
+    return {
+        "basename": calc.basename,
+        "working_dir": str(calc.working_dir),
+        "structure": _encode_structure_any(calc.structure, arrays),
+        "input": _encode_input(calc.input),
+        "json_via_input": calc.json_via_input,
+        "scratch": None if scratch is None else [str(scratch.root), list(scratch.copy_back)],
+        "result_store": None if store is None else [str(store.directory), store.hardlink],
+    }
+
+
+def _decode_calculator(data: dict[str, Any], arrays: list[npt.NDArray[Any]], /) -> Calculator:
+    calc = Calculator(data["basename"], data["working_dir"], version_check=False)
+    calc.structure = _decode_structure_any(data["structure"], arrays)
+    calc.input = _decode_input(data["input"])
+    calc.json_via_input = data["json_via_input"]
+    if data["scratch"] is not None:
+        root, copy_back = data["scratch"]
+        calc.scratch = Scratch(root, copy_back=copy_back)
+    if data["result_store"] is not None:
+        directory, hardlink = data["result_store"]
+        calc.result_store = ResultStore(directory, hardlink=hardlink)
+    return calc
+
+
+# //////////////////////////////////////////////////////////////
+# > PAYLOAD
+# //////////////////////////////////////////////////////////////
+def dumps(obj: Calculator | Input | Structure, /) -> bytes:
+    """
+    Serialize a `Calculator`, `Input` or `Structure` into the compact wire format.
+
+    Raises
+    ------
+    TypeError
+        If the object or any block option cannot be serialized.
+    """
+    arrays: list[npt.NDArray[Any]] = []
+    data: dict[str, Any]
+    if isinstance(obj, Calculator):
+        data = {"kind": "calculator", "data": _encode_calculator(obj, arrays)}
+    elif isinstance(obj, Input):
+        data = {"kind": "input", "data": _encode_input(obj)}
+    elif isinstance(obj, Structure):
+        data = {"kind": "structure", "data": _encode_structure(obj, arrays)}
+    else:
+        raise TypeError(f"Cannot serialize object of type {type(obj).__name__}")
+
+    data["arrays"] = [[array.dtype.str, list(array.shape)] for array in arrays]
+    header = json.dumps(data, separators=(",", ":")).encode()
+    return b"".join(
+        (MAGIC, struct.pack("<I", len(header)), header, *(array.tobytes() for array in arrays))
+    )
+
+
+def loads(payload: bytes | bytearray | memoryview, /) -> Calculator | Input | Structure:
+    """
+    Deserialize an object created by `dumps()`.
+    For a `Calculator`, the working directory must exist.
+
+    Raises
+    ------
+    ValueError
+        If the payload is not valid.
+    """
+    view = memoryview(payload)
+    if bytes(view[: len(MAGIC)]) != MAGIC:
+        raise ValueError("Not an OPI wire payload or unsupported version.")
+    offset = len(MAGIC)
+    (length,) = struct.unpack_from("<I", view, offset)
+    offset += 4
+    data = json.loads(bytes(view[offset : offset + length]))
+    offset += length
+
+    arrays = []
+    for dtype_str, shape in data["arrays"]:
+        dtype = np.dtype(dtype_str)
+        count = int(np.prod(shape, dtype=np.int64))
+        arrays.append(np.frombuffer(view, dtype, count, offset).reshape(shape))
+        offset += count * dtype.itemsize
+
+    match data["kind"]:
+        case "calculator":
+            return _decode_calculator(data["data"], arrays)
+        case "input":
+            return _decode_input(data["data"])
+        case "structure":
+            return _decode_structure(data["data"], arrays)
+    raise ValueError(f"Unknown object in payload: {data['kind']}")
+
+
+def decode_message(message: Mapping[str, Any], /) -> dict[str, Any]:
+    """
+    Decode the calculator of a message sent by `CalcServer.load_calculator(compact=True)`.
+    Server scripts can call this for every "setup_calculator" message, whether it was sent compactly or pickled.
+
+    Returns
+    -------
+    dict[str, Any]
+        Copy of `message` with the decoded calculator. Messages without `"format": "opi-wire"` are returned as is.
+
+    Raises
+    ------
+    ValueError
+        If the payload is not valid.
+    """
+    message = dict(message)
+    if message.pop("format", None) == "opi-wire":
+        message["calculator"] = loads(message["calculator"])
+    return message
@@ -3,16 +3,54 @@ This sub-package contains all modules and classes required for using an external
 Those are namely:
     * `process`: Module for managing a python subprocess
     * `server`: Module for start and communicate with a calculation server
+    * `session`: Module for persistent connections to a calculation server
+    * `batching`: Module for evaluating concurrent requests as a batch
+    * `pool`: Module for spreading requests across several server processes
+    * `shm`: Module for exchanging coordinates and gradients with a server through shared memory
     * `interface`: Module for reading/writing ORCA output/input meant for the external-tools
+    * `driver`: Module for serving ExtOpt requests with a Python callable in the same process
+    * `extopt_shim`: Minimal client that ORCA launches for the driver
+The modules are only imported when one of their names is accessed for the first time.
 """
 
-from opi.external_methods.interface import ExtoptInterface
-from opi.external_methods.process import Process
-from opi.external_methods.server import CalcServer, OpiServer
+from typing import TYPE_CHECKING
+
+from opi.utils.lazy import lazy_package
+
+if TYPE_CHECKING:
+    from opi.external_methods.batching import MicroBatcher
+    from opi.external_methods.driver import ExtOptDriver
+    from opi.external_methods.interface import ExtoptInterface
+    from opi.external_methods.pool import ServerPool
+    from opi.external_methods.process import Process
+    from opi.external_methods.server import CalcServer, OpiServer
+    from opi.external_methods.session import ClientSession
+    from opi.external_methods.shm import SharedArrays, ShmEngradClient, ShmEngradHandler
 
 __all__ = [
     "CalcServer",
+    "ClientSession",
+    "ExtOptDriver",
     "ExtoptInterface",
+    "MicroBatcher",
     "OpiServer",
     "Process",
+    "ServerPool",
+    "SharedArrays",
+    "ShmEngradClient",
+    "ShmEngradHandler",
 ]
+
+__getattr__, __dir__ = lazy_package(
+    __name__,
+    {
+        ".batching": ("MicroBatcher",),
+        ".driver": ("ExtOptDriver",),
+        ".interface": ("ExtoptInterface",),
+        ".pool": ("ServerPool",),
+        ".process": ("Process",),
+        ".server": ("CalcServer", "OpiServer"),
+        ".session": ("ClientSession",),
+        ".shm": ("SharedArrays", "ShmEngradClient", "ShmEngradHandler"),
+    },
+)
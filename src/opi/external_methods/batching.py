@@ -0,0 +1,152 @@
+"""
+Micro-batching of requests to an external method, e.g., a machine-learned potential that evaluates
+many structures at once much faster than one at a time.
+"""
+
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from typing import Any, Callable, Sequence
+
+__all__ = ("MicroBatcher",)
+
+# > Stops the batching thread
+_STOP = object()
+
+
+class MicroBatcher:
+    """
+    Collects single requests that arrive concurrently within a short window, evaluates them with one call of a
+    vectorized callable and scatters the results back to the callers.
+    An instance is a thread-safe callable that can be used as handler of `opi.external_methods.session.serve()`
+    with `thread_safe=True` or as callable of `ExtOptDriver` with `thread_safe=True`.
+
+    Attributes
+    ----------
+    batch_fn: Callable[[list[Any]], Sequence[Any]]
+        Evaluates a batch of requests and returns one result per request in the same order.
+    max_batch: int
+        Maximal number of requests per batch.
+    window: float
+        Seconds to wait for further requests after the first request of a batch arrived.
+    nbatches: int
+        Number of batches evaluated.
+    nrequests: int
+        Number of requests evaluated.
+    """
+
+    def __init__(
+        self,
+        batch_fn: Callable[[list[Any]], Sequence[Any]],
+        /,
+        *,
+        max_batch: int = 32,
+        window: float = 0.002,
+    ) -> None:
+        """
+        Parameters
+        ----------
+        batch_fn : Callable[[list[Any]], Sequence[Any]]
+            Vectorized callable.
+        max_batch : int, default: 32
+            Maximal number of requests per batch.
+        window : float, default: 0.002
+            Seconds to wait for further requests after the first request of a batch arrived.
+        """
+        if max_batch < 1:
+            raise ValueError(f"{self.__class__.__name__}.max_batch must be positive.")
+        if window < 0:
+            raise ValueError(f"{self.__class__.__name__}.window must not be negative.")
+        self.batch_fn = batch_fn
+        self.max_batch = max_batch
+        self.window = window
+        self.nbatches = 0
+        self.nrequests = 0
+        self._queue: queue.SimpleQueue[Any] = queue.SimpleQueue()
+        self._thread: threading.Thread | None = None
+        self._start_lock = threading.Lock()
+
+    def __call__(self, request: Any, /) -> Any:
+        """Evaluate a single request and wait for its result."""
+        return self.submit(request).result()
+
+    def __enter__(self) -> "MicroBatcher":
+        return self
+
+    def __exit__(self, *args: Any) -> None:
+        self.close()
+
+    def submit(self, request: Any, /) -> "Future[Any]":
+        """
+        Queue a single request.
+
+        Returns
+        -------
+        Future[Any]
+            Future of the result. Exceptions of `batch_fn` are set on the futures of all requests of the batch.
+        """
+        with self._start_lock:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, daemon=True)
+                self._thread.start()
+        future: Future[Any] = Future()
+        self._queue.put((request, future))
+        return future
+
+    def close(self) -> None:
+        """Evaluate all queued requests and stop the batching thread."""
+        with self._start_lock:
+            if self._thread is not None:
+                self._queue.put(_STOP)
+                self._thread.join()
+                self._thread = None
+
+    def _collect(self) -> tuple[list[tuple[Any, "Future[Any]"]], bool]:
+        """
+        Wait for the next batch.
+
+        Returns
+        -------
+        list[tuple[Any, Future[Any]]]
+            Requests of the batch with their futures.
+        bool
+            True if the batcher was closed.
+        """
+        first = self._queue.get()
+        if first is _STOP:
+            return [], True
+        batch = [first]
+        deadline = time.monotonic() + self.window
+        while len(batch) < self.max_batch:
+            try:
+                item = self._queue.get(timeout=max(deadline - time.monotonic(), 0.0))
+            except queue.Empty:
+                break
+            if item is _STOP:
+                return batch, True
+            batch.append(item)
+        return batch, False
+
+    def _run(self) -> None:
+        """Batching thread."""
+        stopped = False
+        while not stopped:
+            batch, stopped = self._collect()
+            if not batch:
+                continue
+            futures = [future for _, future in batch]
+            try:
+                results = self.batch_fn([request for request, _ in batch])
+                if len(results) != len(batch):
+                    raise ValueError(
+                        f"Batch function returned {len(results)} results for {len(batch)} requests."
+                    )
+            except Exception as err:
+                for future in futures:
+                    future.set_exception(err)
+                continue
+            self.nbatches += 1
+            self.nrequests += len(batch)
+            for future, result in zip(futures, results):
+                future.set_result(result)
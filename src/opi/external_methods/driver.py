@@ -0,0 +1,282 @@
+"""
+In-process driver for ORCA's ExtOpt interface.
+Energies and gradients are computed by a Python callable in the process that runs ORCA. ORCA launches a
+minimal shim at every step (see `opi.external_methods.extopt_shim`), which forwards the request over a UNIX socket.
+"""
+
+import os
+import socket
+import sys
+import tempfile
+import threading
+from pathlib import Path
+from typing import Any, Callable
+
+import numpy as np
+import numpy.typing as npt
+
+from opi.external_methods import extopt_shim
+from opi.external_methods.interface import ExtoptInterface
+from opi.input.blocks.block_method import BlockMethod
+from opi.input.blocks.util import InputFilePath
+from opi.input.core import Input
+from opi.input.simple_keywords import ExternalTools
+from opi.input.structures.structure import Structure
+
+__all__ = ("EnergyAndGradient", "ExtOptDriver")
+
+EnergyAndGradient = Callable[[Structure], tuple[float, "npt.ArrayLike | None"]]
+"""Callable that returns the energy in Eh and the gradient in Eh/Bohr with shape (natoms, 3) of a structure."""
+
+# > Executable written by the driver. The shim module is imported directly, without the `opi` package.
+# >> `-I -S`: Neither user site nor site packages are needed.
+_SHIM_SCRIPT = """#!{python} -IS
+import sys
+sys.path.insert(0, {shim_dir!r})
+from extopt_shim import main
+sys.exit(main(sys.argv[1:], socket_path={socket_path!r}))
+"""
+
+
+def engrad_file(extinp_file: Path, /) -> Path:
+    """
+    Path of the `.engrad` file that ORCA expects for an ExtOpt input file,
+    e.g., `job_EXT.engrad` for `job_EXT.extinp.tmp`.
+
+    Parameters
+    ----------
+    extinp_file : Path
+    """
+    name = extinp_file.name
+    if name.endswith(".extinp.tmp"):
+        return extinp_file.with_name(name.removesuffix(".extinp.tmp") + ".engrad")
+    return extinp_file.with_suffix(".engrad")
+
+
+class ExtOptDriver:
+    """
+    Serves ORCA's ExtOpt requests with a Python callable in the current process.
+
+    Example
+    -------
+    ::
+
+     >>with ExtOptDriver(energy_and_gradient) as driver:
+     >>    driver.configure(calc.input)
+     >>    calc.write_input()
+     >>    calc.run()
+
+    Attributes
+    ----------
+    energy_and_gradient: EnergyAndGradient
+        Called with the structure of every step. Calls are serialized, unless `thread_safe` is set.
+    thread_safe: bool
+        `energy_and_gradient` can be called concurrently, e.g., a `MicroBatcher` that evaluates
+        the steps of concurrent ORCA jobs as a batch.
+    ncalls: int
+        Number of requests served.
+    """
+
+    def __init__(
+        self,
+        energy_and_gradient: EnergyAndGradient,
+        /,
+        *,
+        directory: Path | str | os.PathLike[str] | None = None,
+        thread_safe: bool = False,
+    ) -> None:
+        """
+        Parameters
+        ----------
+        energy_and_gradient : EnergyAndGradient
+            Callable that returns the energy in Eh and the gradient in Eh/Bohr of a structure in Angstrom.
+            The gradient can be None if ORCA did not request it.
+        directory : Path | str | os.PathLike[str] | None, default: None
+            Directory for the socket and the shim. If None, a temporary directory is created.
+        thread_safe : bool, default: False
+            Call `energy_and_gradient` concurrently for concurrent requests.
+        """
+        self.energy_and_gradient = energy_and_gradient
+        self.thread_safe = thread_safe
+        self.ncalls = 0
+        self._directory = Path(directory) if directory is not None else None
+        self._tmpdir: tempfile.TemporaryDirectory[str] | None = None
+        self._listener: socket.socket | None = None
+        self._thread: threading.Thread | None = None
+        self._lock = threading.Lock()
+        self._socket_path: Path | None = None
+        self._shim_path: Path | None = None
+
+    def __enter__(self) -> "ExtOptDriver":
+        self.start()
+        return self
+
+    def __exit__(self, *args: Any) -> None:
+        self.stop()
+
+    @property
+    def socket_path(self) -> Path:
+        if self._socket_path is None:
+            raise RuntimeError(f"{self.__class__.__name__} is not running.")
+        return self._socket_path
+
+    @property
+    def shim_path(self) -> Path:
+        if self._shim_path is None:
+            raise RuntimeError(f"{self.__class__.__name__} is not running.")
+        return self._shim_path
+
+    def start(self) -> None:
+        """
+        Bind the socket, write the shim and start serving requests in a background thread.
+
+        Raises
+        ------
+        RuntimeError
+            If the driver is already running.
+        """
+        if self._listener is not None:
+            raise RuntimeError(f"{self.__class__.__name__} is already running.")
+        if self._directory is None:
+            # > Short path, as UNIX socket paths are limited to about 100 characters
+            self._tmpdir = tempfile.TemporaryDirectory(prefix="opi-extopt-")
+            directory = Path(self._tmpdir.name)
+        else:
+            directory = self._directory
+            directory.mkdir(parents=True, exist_ok=True)
+
+        self._socket_path = directory / "extopt.sock"
+        self._socket_path.unlink(missing_ok=True)
+        self._shim_path = directory / "extopt_shim"
+        self._shim_path.write_text(
+            _SHIM_SCRIPT.format(
+                python=sys.executable,
+                shim_dir=str(Path(extopt_shim.__file__).parent),
+                socket_path=str(self._socket_path),
+            )
+        )
+        self._shim_path.chmod(0o755)
+
+        self._listener = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self._listener.bind(str(self._socket_path))
+        self._listener.listen()
+        self._thread = threading.Thread(target=self._serve, args=(self._listener,), daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        """Stop serving requests and remove the socket and the shim."""
+        if self._listener is not None:
+            # > `shutdown()` wakes up the blocking `accept()`
+            try:
+                self._listener.shutdown(socket.SHUT_RDWR)
+            except OSError:
+                pass
+            self._listener.close()
+            self._listener = None
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+        if self._tmpdir is not None:
+            self._tmpdir.cleanup()
+            self._tmpdir = None
+        else:
+            for path in (self._socket_path, self._shim_path):
+                if path is not None:
+                    path.unlink(missing_ok=True)
+        self._socket_path = self._shim_path = None
+
+    def configure(self, inp: Input, /) -> None:
+        """
+        Request ExtOpt with this driver in an ORCA input.
+        Adds the `ExtOpt` keyword and sets `ProgExt` of the `%method` block to the shim.
+
+        Parameters
+        ----------
+        inp : Input
+        """
+        inp.add_simple_keywords(ExternalTools.EXTOPT)
+        block = inp.get_blocks(BlockMethod, create_missing=True)[BlockMethod]
+        assert isinstance(block, BlockMethod)
+        block.ProgExt = InputFilePath(file=self.shim_path)
+
+    def _serve(self, listener: socket.socket, /) -> None:
+        """Accept connections until the listener is closed. Each connection is served in its own thread."""
+        while True:
+            try:
+                conn, _ = listener.accept()
+            except OSError:
+                return
+            threading.Thread(target=self._handle, args=(conn,), daemon=True).start()
+
+    def _handle(self, conn: socket.socket, /) -> None:
+        """Answer a single request of the shim."""
+        with conn:
+            data = b""
+            while not data.endswith(b"\n"):
+                chunk = conn.recv(4096)
+                if not chunk:
+                    return
+                data += chunk
+            working_dir, _, extinp = data.decode().rstrip("\n").partition("\0")
+            try:
+                self.compute(Path(working_dir) / extinp)
+            except Exception as err:
+                message = f"error {type(err).__name__}: {err}".replace("\n", " ")
+            else:
+                message = "ok"
+            try:
+                conn.sendall(message.encode() + b"\n")
+            except OSError:
+                pass
+
+    def compute(self, extinp_file: Path, /) -> Path:
+        """
+        Serve a single ExtOpt request: read the input written by ORCA, call `energy_and_gradient`
+        and write the `.engrad` file.
+
+        Parameters
+        ----------
+        extinp_file : Path
+            ExtOpt input file written by ORCA.
+
+        Returns
+        -------
+        Path
+            The `.engrad` file.
+
+        Raises
+        ------
+        ValueError
+            If point charges are requested or the gradient has the wrong shape.
+        """
+        interface = ExtoptInterface()
+        xyz_name, charge, multiplicity, _, do_gradient, pc_file = interface.read_extopt_input(
+            extinp_file
+        )
+        if pc_file is not None:
+            raise ValueError("Point charges are not supported by ExtOptDriver.")
+        structure = Structure.from_xyz(
+            extinp_file.parent / xyz_name, charge=charge, multiplicity=multiplicity
+        )
+        if self.thread_safe:
+            energy, gradient = self.energy_and_gradient(structure)
+            with self._lock:
+                self.ncalls += 1
+        else:
+            with self._lock:
+                energy, gradient = self.energy_and_gradient(structure)
+                self.ncalls += 1
+
+        grad: list[float] | None = None
+        if do_gradient:
+            if gradient is None:
+                raise ValueError("ORCA requested a gradient, but none was returned.")
+            array: npt.NDArray[np.float64] = np.asarray(gradient, dtype=np.float64)
+            if array.size != 3 * len(structure.atoms):
+                raise ValueError(
+                    f"Gradient has {array.size} components, expected {3 * len(structure.atoms)}."
+                )
+            grad = array.ravel().tolist()
+        engrad = engrad_file(extinp_file)
+        interface.write_orca_input(engrad, len(structure.atoms), float(energy), grad)
+        return engrad
@@ -0,0 +1,77 @@
+"""
+Minimal client that ORCA launches as `ProgExt` at every step of an ExtOpt calculation.
+It forwards the request over a UNIX socket to an `ExtOptDriver` and waits until the driver has written the
+`.engrad` file. The module only uses the standard library and is imported without the `opi` package,
+so that the interpreter starts as fast as possible.
+
+Request: `<working directory>\\0<extinp file>\\n`
+Response: `ok\\n` or `error <message>\\n`
+"""
+
+import os
+import socket
+import sys
+
+# > Environment variable with the path of the socket, used if it is not given otherwise
+SOCKET_VARIABLE = "OPI_EXTOPT_SOCKET"
+
+
+def request(socket_path: str, extinp_file: str, /) -> str:
+    """
+    Send a request to the driver and return its response without the trailing newline.
+
+    Parameters
+    ----------
+    socket_path : str
+        Path of the UNIX socket of the driver.
+    extinp_file : str
+        Input file written by ORCA, relative to the current working directory.
+    """
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+        sock.connect(socket_path)
+        sock.sendall(f"{os.getcwd()}\0{extinp_file}\n".encode())
+        response = b""
+        while not response.endswith(b"\n"):
+            chunk = sock.recv(4096)
+            if not chunk:
+                break
+            response += chunk
+    return response.decode().rstrip("\n")
+
+
+def main(argv: list[str], /, *, socket_path: str | None = None) -> int:
+    """
+    Entry point of the shim.
+
+    Parameters
+    ----------
+    argv : list[str]
+        Command line arguments passed by ORCA, the first one is the input file.
+    socket_path : str | None, default: None
+        Path of the UNIX socket. If None, it is taken from `$OPI_EXTOPT_SOCKET`.
+
+    Returns
+    -------
+    int
+        Exit code, 0 on success.
+    """
+    if not argv:
+        print("usage: extopt_shim <extinp file>", file=sys.stderr)
+        return 2
+    socket_path = socket_path or os.environ.get(SOCKET_VARIABLE)
+    if not socket_path:
+        print(f"extopt_shim: no socket given, set ${SOCKET_VARIABLE}", file=sys.stderr)
+        return 2
+    try:
+        response = request(socket_path, argv[0])
+    except OSError as err:
+        print(f"extopt_shim: cannot reach driver at {socket_path}: {err}", file=sys.stderr)
+        return 1
+    if response != "ok":
+        print(f"extopt_shim: {response or 'no response from driver'}", file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
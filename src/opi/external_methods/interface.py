@@ -1,4 +1,117 @@
+import os
+import re
 from pathlib import Path
+from typing import TYPE_CHECKING
+
+# > NumPy is only imported on demand, since ExtOpt client scripts import this module at every geometry step
+if TYPE_CHECKING:
+    import numpy as np
+    import numpy.typing as npt
+
+# > Comment lines of engrad files, which separate the sections
+_COMMENT_LINES = re.compile(r"^[ \t]*#.*$", re.MULTILINE)
+
+
+def format_engrad(natoms: int, energy: float, gradient: "npt.ArrayLike | None" = None) -> str:
+    """
+    Format the contents of an engrad file, which ORCA reads as result of an external method.
+    All gradient components are formatted with a single formatting operation, which is much faster for large
+    systems than formatting every component on its own. The output is identical to the component-wise formatting
+    `f"{g: .12e}"`.
+
+    Parameters
+    ----------
+    natoms : int
+        Number of atoms.
+    energy : float
+        Total energy in Hartree.
+    gradient : npt.ArrayLike | None, default: None
+        Gradient in Hartree/Bohr, any shape with 3 * `natoms` components. If None or empty, it is not written.
+
+    Returns
+    -------
+    str
+        Contents of the engrad file.
+    """
+    output = f"#\n# Number of atoms\n#\n{natoms}\n#\n# Total energy [Eh]\n#\n{energy:.12e}\n"
+    if gradient is not None:
+        components: list[float]
+        if isinstance(gradient, (list, tuple)) and all(
+            isinstance(g, (int, float)) for g in gradient
+        ):
+            components = [float(g) for g in gradient]
+        else:
+            import numpy as np
+
+            components = np.asarray(gradient, dtype=np.float64).ravel().tolist()
+        if components:
+            output += "#\n# Gradient [Eh/Bohr] A1X, A1Y, A1Z, A2X, ...\n#\n"
+            output += ("% .12e\n" * len(components)) % tuple(components)
+    return output
+
+
+def write_engrad(
+    filename: Path | str | os.PathLike[str],
+    natoms: int,
+    energy: float,
+    gradient: "npt.ArrayLike | None" = None,
+) -> None:
+    """
+    Write an engrad file. See `format_engrad()` for the parameters.
+
+    Parameters
+    ----------
+    filename : Path | str | os.PathLike[str]
+        Path to file to write to.
+    """
+    Path(filename).write_text(format_engrad(natoms, energy, gradient))
+
+
+def read_engrad(
+    filename: Path | str | os.PathLike[str],
+) -> "tuple[int, float, npt.NDArray[np.float64] | None]":
+    """
+    Read an engrad file written by `write_engrad()` or ORCA.
+    Reading the file written from a gradient `g` gives exactly `float(f"{x: .12e}")` for every component `x`
+    and writing the result again reproduces the file.
+
+    Parameters
+    ----------
+    filename : Path | str | os.PathLike[str]
+        Path to the engrad file.
+
+    Returns
+    -------
+    int
+        Number of atoms.
+    float
+        Total energy in Hartree.
+    npt.NDArray[np.float64] | None
+        Gradient in Hartree/Bohr with shape (natoms, 3), or None if the file contains no gradient.
+
+    Raises
+    ------
+    ValueError
+        If the file is incomplete.
+    """
+    import numpy as np
+
+    # > Sections are separated by comment lines. ORCA's own files also contain the coordinates, which are ignored.
+    sections = [
+        section for section in _COMMENT_LINES.split(Path(filename).read_text()) if section.strip()
+    ]
+    if len(sections) < 2:
+        raise ValueError(f"Engrad file {filename} must contain the number of atoms and the energy.")
+    natoms = int(sections[0])
+    energy = float(sections[1])
+    if len(sections) < 3:
+        return natoms, energy, None
+    gradient = np.fromiter(map(float, sections[2].split()), dtype=np.float64)
+    if gradient.size != 3 * natoms:
+        raise ValueError(
+            f"Engrad file {filename} has {gradient.size} gradient components for {natoms} atoms."
+        )
+    return natoms, energy, gradient.reshape(natoms, 3)
 
 
 class ExtoptInterface:
@@ -83,18 +196,4 @@ class ExtoptInterface:
             gradients as plain list in Hartee/Bohr
             if not present or empty, it is not written
         """
-        with open(filename, "w") as f:
-            output = "#\n"
-            output += "# Number of atoms\n"
-            output += "#\n"
-            output += f"{nat}\n"
-            output += "#\n"
-            output += "# Total energy [Eh]\n"
-            output += "#\n"
-            output += f"{etot:.12e}\n"
-            if grad:
-                output += "#\n"
-                output += "# Gradient [Eh/Bohr] A1X, A1Y, A1Z, A2X, ...\n"
-                output += "#\n"
-                output += "\n".join(f"{g: .12e}" for g in grad) + "\n"
-            f.write(output)
+        write_engrad(filename, nat, etot, grad if grad else None)
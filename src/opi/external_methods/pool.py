@@ -0,0 +1,163 @@
+"""
+Pool of calculation servers that spreads requests across several worker processes.
+"""
+
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Iterable
+
+from opi.external_methods.server import OpiServer, ServerStatus
+from opi.external_methods.session import ClientSession
+
+__all__ = ("ServerPool",)
+
+
+class ServerPool:
+    """
+    Runs the same server script in `nworkers` processes on consecutive ports and dispatches every request
+    to the worker with the fewest requests in flight.
+    The server script must answer every message, e.g., by being built on `opi.external_methods.session.serve()`.
+    A pool is not thread-safe; use it from one thread.
+
+    Attributes
+    ----------
+    servers: list[OpiServer]
+        Worker servers, worker `i` listens on `port + i`.
+    window: int
+        Maximal number of requests in flight per worker in `map()`.
+    """
+
+    def __init__(
+        self,
+        serverpath: str,
+        nworkers: int,
+        /,
+        *,
+        host_id: str = "127.0.0.1",
+        port: int = 8888,
+        window: int = 64,
+    ) -> None:
+        """
+        Parameters
+        ----------
+        serverpath : str
+            Path to the server script.
+        nworkers : int
+            Number of worker processes.
+        host_id : str, default: "127.0.0.1"
+            IP to bind the workers to.
+        port : int, default: 8888
+            Port of the first worker.
+        window : int, default: 64
+            Maximal number of requests in flight per worker in `map()`.
+        """
+        if nworkers < 1:
+            raise ValueError(f"{self.__class__.__name__}.nworkers must be positive.")
+        self.servers = [
+            OpiServer(serverpath, host_id=host_id, port=port + i) for i in range(nworkers)
+        ]
+        self.window = window
+        self._sessions: list[ClientSession] = []
+        self._next_id = 0
+        # > Pool request ID -> worker index and request ID of the worker's session
+        self._requests: dict[int, tuple[int, int]] = {}
+
+    def __enter__(self) -> "ServerPool":
+        return self
+
+    def __exit__(self, *args: Any) -> None:
+        self.stop()
+
+    @property
+    def loads(self) -> list[int]:
+        """Number of requests in flight per worker."""
+        return [session.in_flight for session in self._sessions]
+
+    def start(
+        self,
+        cmd_arguments: str | None = None,
+        exe: str = sys.executable,
+        max_boot_time: float = 20.0,
+        handshake: bool = True,
+    ) -> ServerStatus:
+        """
+        Start all workers concurrently and connect to them. See `OpiServer.start_server()` for the parameters.
+
+        Returns
+        -------
+        ServerStatus
+            RUNNING if all workers are running, otherwise the status of the first worker that failed.
+            If a worker failed, all workers are stopped.
+        """
+        with ThreadPoolExecutor(len(self.servers)) as executor:
+            statuses: list[ServerStatus] = list(
+                executor.map(
+                    lambda server: server.start_server(
+                        cmd_arguments, exe, max_boot_time, handshake
+                    ),
+                    self.servers,
+                )
+            )
+        for status in statuses:
+            if status != ServerStatus.RUNNING:
+                self.stop()
+                return status
+        self._sessions = [
+            ClientSession((server._host_id, server._port), window=self.window)
+            for server in self.servers
+        ]
+        return ServerStatus.RUNNING
+
+    def stop(self) -> None:
+        """Close all connections and stop all workers."""
+        for session in self._sessions:
+            session.close()
+        self._sessions = []
+        self._requests.clear()
+        for server in self.servers:
+            server.kill_server()
+
+    def submit(self, message: dict[str, Any], /) -> int:
+        """
+        Send a message to the least-loaded worker without waiting for the response.
+
+        Returns
+        -------
+        int
+            Request ID to pass to `result()`.
+
+        Raises
+        ------
+        RuntimeError
+            If the pool is not running.
+        """
+        if not self._sessions:
+            raise RuntimeError(f"{self.__class__.__name__} is not running.")
+        worker = min(range(len(self._sessions)), key=lambda i: self._sessions[i].in_flight)
+        request_id = self._next_id
+        self._next_id += 1
+        self._requests[request_id] = (worker, self._sessions[worker].submit(message))
+        return request_id
+
+    def result(self, request_id: int, /, *, timeout: float | None = None) -> Any:
+        """Wait for the response to a request. See `ClientSession.result()`."""
+        worker, worker_request_id = self._requests.pop(request_id)
+        return self._sessions[worker].result(worker_request_id, timeout=timeout)
+
+    def request(self, message: dict[str, Any], /, *, timeout: float | None = None) -> Any:
+        """Send a message to the least-loaded worker and wait for the response."""
+        return self.result(self.submit(message), timeout=timeout)
+
+    def map(self, messages: Iterable[dict[str, Any]], /) -> list[Any]:
+        """
+        Send many messages with up to `window` requests in flight per worker and return the results in order.
+        """
+        max_in_flight = self.window * len(self.servers)
+        request_ids: list[int] = []
+        results: list[Any] = []
+        for message in messages:
+            if len(request_ids) - len(results) >= max_in_flight:
+                results.append(self.result(request_ids[len(results)]))
+            request_ids.append(self.submit(message))
+        results += [self.result(request_id) for request_id in request_ids[len(results) :]]
+        return results
@@ -1,6 +1,6 @@
 import subprocess
 from enum import Enum
-from typing import Any
+from typing import Any, Mapping, Sequence
 
 
 # Error type definitions
@@ -28,7 +28,14 @@ class Process:
         # Variable for storing the process
         self.process: subprocess.Popen[bytes] | None = None
 
-    def start(self, cmd: list[str], pipe: bool = False) -> None:
+    def start(
+        self,
+        cmd: list[str],
+        pipe: bool = False,
+        *,
+        pass_fds: Sequence[int] = (),
+        env: Mapping[str, str] | None = None,
+    ) -> None:
         """
         Starts a subprocess
 
@@ -38,6 +45,10 @@ class Process:
             List of arguments to be executed
         pipe: bool, default: False
             Determines whether to hold the channel open for piping input in or not.
+        pass_fds: Sequence[int], default: ()
+            File descriptors that are kept open in the subprocess (POSIX only).
+        env: Mapping[str, str] | None, default: None
+            Environment of the subprocess. If None, the environment is inherited.
 
         Raises
         ------
@@ -57,6 +68,10 @@ class Process:
             raise ProcessAlreadyRunningError
 
         pipe_kwargs: dict[str, Any] = {}
+        if pass_fds:
+            pipe_kwargs["pass_fds"] = pass_fds
+        if env is not None:
+            pipe_kwargs["env"] = env
         if pipe:
             pipe_kwargs["stdin"] = subprocess.PIPE
 
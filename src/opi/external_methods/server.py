@@ -1,3 +1,5 @@
+import os
+import select
 import socket
 import subprocess
 import sys
@@ -7,6 +9,7 @@ from multiprocessing.connection import Client
 from typing import Any
 
 from opi.external_methods.process import Process, ProcessAlreadyRunningError
+from opi.external_methods.session import READY_FD_VARIABLE, ClientSession
 
 
 class ServerStatus(Enum):
@@ -18,6 +21,7 @@ class ServerStatus(Enum):
     SUBPROCESS_ERROR = "subprocess_error"
     OS_ERROR = "os_error"
     BOOT_TIMEOUT = "boot_timeout"
+    BOOT_FAILED = "boot_failed"
 
 
 class OpiServer:
@@ -81,11 +85,41 @@ class OpiServer:
                     time.sleep(0.1)
         return False
 
+    def _wait_for_ready(self, ready_fd: int, timeout: float) -> ServerStatus:
+        """
+        Waits until the server signals readiness on the pipe `ready_fd` (see `opi.external_methods.session.signal_ready()`)
+        or its port is reachable, whichever comes first. Servers that never signal readiness are thereby still
+        detected by polling the port.
+
+        Parameters
+        ----------
+        ready_fd: int
+            Read end of the readiness pipe.
+        timeout: float
+            Maximum time in sec to wait.
+
+        Returns
+        -------
+        ServerStatus: RUNNING, BOOT_TIMEOUT, or BOOT_FAILED if the server exited or closed the pipe without signalling
+        """
+        end = time.time() + timeout
+        while (remaining := end - time.time()) > 0:
+            readable, _, _ = select.select([ready_fd], [], [], min(remaining, 0.1))
+            if readable:
+                # > An empty read means EOF, i.e., the server exited without signalling
+                if os.read(ready_fd, 16).startswith(b"ready"):
+                    return ServerStatus.RUNNING
+                return ServerStatus.BOOT_FAILED
+            if self.server_port_in_use():
+                return ServerStatus.RUNNING
+        return ServerStatus.BOOT_TIMEOUT
+
     def start_server(
         self,
         cmd_arguments: str | None = None,
         exe: str = sys.executable,
         max_boot_time: float = 20.0,
+        handshake: bool = True,
     ) -> ServerStatus:
         """
         Starts the Server from script
@@ -99,6 +133,12 @@ class OpiServer:
             Executable to use for starting the server
         max_boot_time: float, default: 5.0 (sec)
             Maximum time in sec to wait till server is booted
+        handshake: bool, default: True
+            Also accept the readiness signal of `opi.external_methods.session.signal_ready()`,
+            which `opi.external_methods.session.serve()` sends automatically, next to polling the port.
+            Servers that never signal are still running once their port is reachable, but a server that exits
+            during boot is detected immediately.
+            If False or not on POSIX systems, only the port is polled.
 
         Returns
         -------
@@ -107,19 +147,31 @@ class OpiServer:
         # First check, whether server.port is free
         if self.server_port_in_use():
             return ServerStatus.PORT_IN_USE
-        else:
-            # Start server by running a python process
-            # Therefore, first set up the command line call for the server script
-            # Build the command list:
-            # ["python", server_script] + -b ID:port + optional args
-            cmd = [exe, self.serverpath]
-            cmd.append("-b")
-            cmd.append(f"{self._host_id}:{self._port}")
-            if cmd_arguments:
-                cmd.append(cmd_arguments)
+
+        # Start server by running a python process
+        # Therefore, first set up the command line call for the server script
+        # Build the command list:
+        # ["python", server_script] + -b ID:port + optional args
+        cmd = [exe, self.serverpath]
+        cmd.append("-b")
+        cmd.append(f"{self._host_id}:{self._port}")
+        if cmd_arguments:
+            cmd.append(cmd_arguments)
+
+        # Readiness pipe, whose write end is passed on to the server
+        ready_fd = write_fd = None
+        start_kwargs: dict[str, Any] = {}
+        if handshake and os.name == "posix":
+            ready_fd, write_fd = os.pipe()
+            start_kwargs = {
+                "pass_fds": (write_fd,),
+                "env": {**os.environ, READY_FD_VARIABLE: str(write_fd)},
+            }
+
+        try:
             # Start the server
             try:
-                self.process.start(cmd)
+                self.process.start(cmd, **start_kwargs)
             except ProcessAlreadyRunningError:
                 return ServerStatus.ALREADY_RUNNING
             except FileNotFoundError:
@@ -130,15 +182,29 @@ class OpiServer:
                 return ServerStatus.SUBPROCESS_ERROR
             except OSError:
                 return ServerStatus.OS_ERROR
-
-        # Wait until the port is reachable
-        if not self._wait_for_port(self._host_id, self._port, timeout=max_boot_time):
+            finally:
+                # > Only the server holds the write end, so the pipe is closed if the server exits
+                if write_fd is not None:
+                    os.close(write_fd)
+
+            # Wait until the server is ready
+            if ready_fd is not None:
+                status = self._wait_for_ready(ready_fd, max_boot_time)
+            elif self._wait_for_port(self._host_id, self._port, timeout=max_boot_time):
+                status = ServerStatus.RUNNING
+            else:
+                status = ServerStatus.BOOT_TIMEOUT
+        finally:
+            if ready_fd is not None:
+                os.close(ready_fd)
+
+        if status != ServerStatus.RUNNING:
             # best effort cleanup
             try:
                 self.process.stop_process()
             finally:
                 pass
-            return ServerStatus.BOOT_TIMEOUT
+            return status
 
         return ServerStatus.RUNNING
 
@@ -195,6 +261,8 @@ class CalcServer:
         # If a new server should be set up, a new CalcServer instance must be initialized
         self.server = OpiServer(serverpath=serverpath, host_id=host_id, port=port)
         self._calculator = calculator
+        # Persistent connection, see `open_session()`
+        self._session: ClientSession | None = None
 
     @property
     def calculator(self) -> Any:
@@ -224,16 +292,70 @@ class CalcServer:
         else:
             return False
 
-    def load_calculator(self) -> None:
+    @property
+    def session(self) -> ClientSession | None:
+        return self._session
+
+    def open_session(self, *, keepalive: float = 30.0, window: int = 64) -> ClientSession:
+        """
+        Open a persistent connection to the server that is used for all further messages.
+        The server must answer every message, e.g., by being built on `opi.external_methods.session.serve()`.
+
+        Parameters
+        ----------
+        keepalive: float, default: 30.0
+            Idle time in sec after which the connection is checked with a ping before it is reused
+        window: int, default: 64
+            Maximal number of requests in flight in `ClientSession.map()`
+
+        Returns
+        -------
+        ClientSession: The open session
+        """
+        self.close_session()
+        self._session = ClientSession(
+            (self.server._host_id, self.server._port), keepalive=keepalive, window=window
+        )
+        return self._session
+
+    def close_session(self) -> None:
+        """
+        Close the persistent connection, if open.
+        """
+        if self._session is not None:
+            self._session.close()
+            self._session = None
+
+    def load_calculator(self, *, compact: bool = False) -> Any:
         """
         Send the calculator to the server via pickle. Return response.
+
+        Parameters
+        ----------
+        compact: bool, default: False
+            Send the calculator in the compact wire format of `opi.execution.wire` instead of pickling it.
+            The message then contains `"format": "opi-wire"` and the server has to decode
+            it with `opi.execution.wire.decode_message()`.
+
+        Returns
+        -------
+        Any: Result returned by the server if a session is open, else None
         """
+        message = {"type": "setup_calculator", "calculator": self._calculator}
+        if compact:
+            # > Imported here, since the wire format loads `opi.core` and client scripts import this module
+            from opi.execution.wire import dumps
+
+            message.update(format="opi-wire", calculator=dumps(self._calculator))
+        if self._session is not None:
+            return self._session.request(message)
         # Open a connection to server
         address = (self.server._host_id, self.server._port)
         with Client(address) as conn:
-            conn.send({"type": "setup_calculator", "calculator": self._calculator})
+            conn.send(message)
+        return None
 
-    def start_server(self, exe: str = sys.executable) -> ServerStatus:
+    def start_server(self, exe: str = sys.executable, handshake: bool = True) -> ServerStatus:
         """
         Start the server.
 
@@ -241,15 +363,18 @@ class CalcServer:
         ----------
         exe: str, default=sys.executable
             Executable to use for starting the server
+        handshake: bool, default: True
+            See `OpiServer.start_server()`.
 
         Returns
         -------
         bool: True if server started correctly
         """
-        return self.server.start_server(exe=exe)
+        return self.server.start_server(exe=exe, handshake=handshake)
 
     def kill_server(self) -> None:
         """
         Kill the server.
         """
+        self.close_session()
         self.server.kill_server()
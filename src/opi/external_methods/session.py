@@ -0,0 +1,380 @@
+"""
+Long-lived connections between clients and calculation servers.
+
+A `ClientSession` keeps one connection open for all messages and attaches a request ID to every message,
+so that many requests can be in flight at once (pipelining). Servers built on `serve()` answer every message
+with a response that carries the same ID:
+
+    {"id": 3, "ok": True, "result": ...}
+    {"id": 4, "ok": False, "error": "ValueError: ..."}
+
+Messages of type "ping" are answered by `serve()` itself and are used for health checks.
+"""
+
+import os
+import threading
+import time
+from multiprocessing.connection import Client, Connection, Listener
+from typing import Any, Callable, Iterable
+
+__all__ = ("READY_FD_VARIABLE", "ClientSession", "ServerError", "serve", "signal_ready")
+
+# > Environment variable with the file descriptor on which a server signals that it accepts connections
+READY_FD_VARIABLE = "OPI_SERVER_READY_FD"
+
+
+class ServerError(RuntimeError):
+    """Raised if the server could not process a request."""
+
+
+def signal_ready() -> bool:
+    """
+    Signal to `OpiServer.start_server()` that the server accepts connections.
+    Must be called by server scripts after the listening socket is bound. `serve()` does this automatically.
+
+    Returns
+    -------
+    bool
+        True if the readiness was signalled, False if the server was not started with a readiness handshake.
+    """
+    fd = os.environ.pop(READY_FD_VARIABLE, None)
+    if fd is None:
+        return False
+    with os.fdopen(int(fd), "wb") as pipe:
+        pipe.write(b"ready\n")
+    return True
+
+
+class ClientSession:
+    """
+    Persistent connection to a calculation server with request pipelining.
+    A session is not thread-safe; use one session per thread.
+
+    Attributes
+    ----------
+    address: tuple[str, int] | str
+        Address of the server.
+    keepalive: float
+        A connection idle for more than this many seconds is checked with a ping before it is reused
+        and re-established if the server does not answer.
+    window: int
+        Maximal number of requests in flight in `map()`.
+    """
+
+    def __init__(
+        self,
+        address: tuple[str, int] | str,
+        /,
+        *,
+        authkey: bytes | None = None,
+        keepalive: float = 30.0,
+        window: int = 64,
+    ) -> None:
+        """
+        Parameters
+        ----------
+        address : tuple[str, int] | str
+            Host and port or path of a UNIX socket.
+        authkey : bytes | None, default: None
+            Authentication key of `multiprocessing.connection`.
+        keepalive : float, default: 30.0
+            Idle time in seconds after which the connection is checked before it is reused.
+        window : int, default: 64
+            Maximal number of requests in flight in `map()`.
+        """
+        if window < 1:
+            raise ValueError(f"{self.__class__.__name__}.window must be positive.")
+        self.address = address
+        self.keepalive = keepalive
+        self.window = window
+        self._authkey = authkey
+        self._conn: Connection | None = None
+        self._next_id = 0
+        # > Responses that arrived before they were asked for
+        self._pending: dict[int, dict[str, Any]] = {}
+        self._in_flight: set[int] = set()
+        self._last_used = 0.0
+
+    def __enter__(self) -> "ClientSession":
+        return self
+
+    def __exit__(self, *args: Any) -> None:
+        self.close()
+
+    @property
+    def connected(self) -> bool:
+        return self._conn is not None
+
+    @property
+    def in_flight(self) -> int:
+        """Number of requests sent whose result was not collected yet."""
+        return len(self._in_flight)
+
+    def _connect(self) -> Connection:
+        """Open the connection. Requests in flight on a previous connection are lost."""
+        self.close()
+        self._conn = Client(self.address, authkey=self._authkey)
+        self._last_used = time.monotonic()
+        return self._conn
+
+    def _connection(self) -> Connection:
+        """Connection for the next request, established or checked as needed."""
+        if self._conn is None:
+            return self._connect()
+        idle = time.monotonic() - self._last_used
+        if not self._in_flight and idle > self.keepalive and not self.ping():
+            return self._connect()
+        return self._conn
+
+    def close(self) -> None:
+        """Close the connection. Requests in flight are discarded."""
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
+        self._pending.clear()
+        self._in_flight.clear()
+
+    def submit(self, message: dict[str, Any], /) -> int:
+        """
+        Send a message without waiting for the response.
+
+        Parameters
+        ----------
+        message : dict[str, Any]
+            Message to send. Must have a "type". The request ID is added as "id".
+
+        Returns
+        -------
+        int
+            Request ID to pass to `result()`.
+        """
+        conn = self._connection()
+        request_id = self._next_id
+        self._next_id += 1
+        try:
+            conn.send({**message, "id": request_id})
+        except OSError as err:
+            self.close()
+            raise ConnectionError(f"Lost connection to server at {self.address}.") from err
+        self._in_flight.add(request_id)
+        self._last_used = time.monotonic()
+        return request_id
+
+    def result(self, request_id: int, /, *, timeout: float | None = None) -> Any:
+        """
+        Wait for the response to a request.
+
+        Parameters
+        ----------
+        request_id : int
+            ID returned by `submit()`.
+        timeout : float | None, default: None
+            Seconds to wait for the response. If None, wait indefinitely.
+
+        Raises
+        ------
+        ServerError
+            If the server could not process the request.
+        TimeoutError
+            If no response arrived within `timeout`.
+        ConnectionError
+            If the connection was lost.
+        KeyError
+            If `request_id` is not in flight.
+        """
+        if request_id not in self._in_flight:
+            raise KeyError(f"Request {request_id} is not in flight.")
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while request_id not in self._pending:
+            response = self._receive(deadline)
+            self._pending[response["id"]] = response
+        self._in_flight.discard(request_id)
+        response = self._pending.pop(request_id)
+        if not response.get("ok", False):
+            raise ServerError(response.get("error", "Unknown server error."))
+        return response.get("result")
+
+    def _receive(self, deadline: float | None, /) -> dict[str, Any]:
+        """Receive the next response from the connection."""
+        assert self._conn is not None
+        remaining = None if deadline is None else max(deadline - time.monotonic(), 0.0)
+        try:
+            response: dict[str, Any] | None = (
+                self._conn.recv() if self._conn.poll(remaining) else None
+            )
+        except (EOFError, OSError) as err:
+            self.close()
+            raise ConnectionError(f"Lost connection to server at {self.address}.") from err
+        if response is None:
+            raise TimeoutError(f"No response from server at {self.address}.")
+        self._last_used = time.monotonic()
+        return response
+
+    def request(self, message: dict[str, Any], /, *, timeout: float | None = None) -> Any:
+        """Send a message and wait for the response. See `submit()` and `result()`."""
+        return self.result(self.submit(message), timeout=timeout)
+
+    def map(self, messages: Iterable[dict[str, Any]], /) -> list[Any]:
+        """
+        Send many messages with up to `window` requests in flight and return the results in order.
+
+        Raises
+        ------
+        ServerError
+            If the server could not process one of the requests.
+        """
+        request_ids: list[int] = []
+        results: list[Any] = []
+        for message in messages:
+            if len(request_ids) - len(results) >= self.window:
+                results.append(self.result(request_ids[len(results)]))
+            request_ids.append(self.submit(message))
+        results += [self.result(request_id) for request_id in request_ids[len(results) :]]
+        return results
+
+    def ping(self, *, timeout: float = 5.0) -> bool:
+        """
+        Health check of the server.
+
+        Parameters
+        ----------
+        timeout : float, default: 5.0
+            Seconds to wait for the answer.
+
+        Returns
+        -------
+        bool
+            True if the server answered in time, else False.
+        """
+        if self._conn is None:
+            try:
+                self._connect()
+            except OSError:
+                return False
+        # > Not via `submit()`, which would check the connection with a ping
+        assert self._conn is not None
+        request_id = self._next_id
+        self._next_id += 1
+        try:
+            self._conn.send({"type": "ping", "id": request_id})
+            self._in_flight.add(request_id)
+            self.result(request_id, timeout=timeout)
+        except (OSError, TimeoutError, ServerError):
+            self.close()
+            return False
+        return True
+
+
+def _respond(
+    message: dict[str, Any],
+    handler: Callable[[dict[str, Any]], Any],
+    lock: "threading.Lock | None",
+    /,
+) -> dict[str, Any]:
+    """Call `handler` and wrap its result or exception into a response."""
+    request_id = message.get("id")
+    try:
+        if lock is None:
+            result = handler(message)
+        else:
+            with lock:
+                result = handler(message)
+    except Exception as err:
+        return {"id": request_id, "ok": False, "error": f"{type(err).__name__}: {err}"}
+    return {"id": request_id, "ok": True, "result": result}
+
+
+def _handle_connection(
+    conn: Connection,
+    handler: Callable[[dict[str, Any]], Any],
+    lock: "threading.Lock | None",
+    /,
+) -> bool:
+    """
+    Answer the messages of one client until it disconnects.
+    Without `lock`, every message is answered in its own thread, so that pipelined messages
+    are processed concurrently and answered in the order they complete.
+
+    Returns
+    -------
+    bool
+        True if the client requested the server to shut down.
+    """
+    send_lock = threading.Lock()
+
+    def send(response: dict[str, Any]) -> bool:
+        with send_lock:
+            try:
+                conn.send(response)
+            except OSError:
+                return False
+        return True
+
+    def answer(message: dict[str, Any]) -> None:
+        send(_respond(message, handler, lock))
+
+    with conn:
+        while True:
+            try:
+                message = conn.recv()
+            except (EOFError, OSError):
+                return False
+            kind = message.get("type")
+            if kind == "ping":
+                sent = send({"id": message.get("id"), "ok": True, "result": "pong"})
+            elif kind == "shutdown":
+                send({"id": message.get("id"), "ok": True, "result": None})
+                return True
+            elif lock is None:
+                threading.Thread(target=answer, args=(message,), daemon=True).start()
+                sent = True
+            else:
+                sent = send(_respond(message, handler, lock))
+            if not sent:
+                return False
+
+
+def serve(
+    address: tuple[str, int] | str,
+    handler: Callable[[dict[str, Any]], Any],
+    /,
+    *,
+    authkey: bytes | None = None,
+    thread_safe: bool = False,
+) -> None:
+    """
+    Run a calculation server until a client sends a message of type "shutdown".
+    Each client is served in its own thread. Calls of `handler` are serialized, unless it is thread-safe.
+    Readiness is signalled with `signal_ready()` as soon as the server accepts connections.
+
+    Parameters
+    ----------
+    address : tuple[str, int] | str
+        Host and port or path of a UNIX socket to listen on.
+    handler : Callable[[dict[str, Any]], Any]
+        Called with every message except pings. The return value is sent back as result,
+        exceptions are sent back as error.
+    authkey : bytes | None, default: None
+        Authentication key of `multiprocessing.connection`.
+    thread_safe : bool, default: False
+        `handler` can be called concurrently, e.g., a `MicroBatcher`. Then all messages are processed
+        concurrently, also the pipelined messages of a single client.
+    """
+    lock = None if thread_safe else threading.Lock()
+    listener = Listener(address, authkey=authkey)
+    stop = threading.Event()
+
+    def client(conn: Connection) -> None:
+        if _handle_connection(conn, handler, lock):
+            stop.set()
+            # > Wake up `accept()`, closing the listener does not interrupt it
+            Client(listener.address, authkey=authkey).close()
+
+    signal_ready()
+    with listener:
+        while True:
+            conn = listener.accept()
+            if stop.is_set():
+                conn.close()
+                break
+            threading.Thread(target=client, args=(conn,), daemon=True).start()
@@ -0,0 +1,360 @@
+"""
+Shared-memory transport of coordinates, point charges and gradients between a client and a calculation server
+on the same node. Only a small message with the name and layout of the shared memory block is sent over
+the connection; both sides work on NumPy views of the same memory, so nothing is pickled or copied.
+"""
+
+import os
+import sys
+import threading
+import weakref
+from collections import OrderedDict
+from multiprocessing import resource_tracker
+from multiprocessing.shared_memory import SharedMemory
+from typing import Any, Callable, Mapping
+
+import numpy as np
+import numpy.typing as npt
+
+from opi.external_methods.session import ClientSession
+
+__all__ = ("ShmEngradClient", "ShmEngradHandler", "SharedArrays")
+
+# > Alignment of the arrays within the shared memory block in bytes
+_ALIGNMENT = 64
+# > Names of the blocks created by this process, which stay registered with its resource tracker
+_CREATED: set[str] = set()
+
+
+def _attach(name: str, /) -> SharedMemory:
+    """Attach to an existing block without registering it with the resource tracker of this process."""
+    if sys.version_info >= (3, 13):
+        return SharedMemory(name, track=False)
+    shm = SharedMemory(name)
+    # > Otherwise the tracker unlinks the block when this process exits, although the owner still uses it.
+    # >> Before Python 3.13, blocks are only tracked on POSIX, under their name with a leading slash.
+    if os.name == "posix" and name not in _CREATED:
+        resource_tracker.unregister(f"/{shm.name}", "shared_memory")
+    return shm
+
+
+class _Mapping:
+    """
+    Memory of a block as base of the NumPy views, which keeps the block open until the last view is gone.
+    NumPy does not hold a buffer export of `SharedMemory.buf`, so `SharedMemory.close()` would unmap the memory
+    of views that are still referenced.
+    """
+
+    __slots__ = ("shm", "__array_interface__", "__weakref__")
+
+    def __init__(self, shm: SharedMemory, /) -> None:
+        if shm.buf is None:
+            raise ValueError("The shared memory block is closed.")
+        self.shm = shm
+        self.__array_interface__ = {
+            "shape": (shm.size,),
+            "typestr": "|u1",
+            "data": (np.frombuffer(shm.buf, dtype=np.uint8).ctypes.data, False),
+            "version": 3,
+        }
+
+
+class SharedArrays:
+    """
+    Named NumPy arrays stored in a single shared memory block.
+
+    Attributes
+    ----------
+    descriptor: dict[str, Any]
+        Name and layout of the block, which is sent to the other process to `attach()` to the arrays.
+
+    The arrays are views of the memory of the block. Views must not be used after `close()`.
+    """
+
+    __slots__ = ("_shm", "_layout", "_arrays", "_owner", "_mapping")
+
+    def __init__(
+        self,
+        shm: SharedMemory,
+        layout: dict[str, tuple[tuple[int, ...], str, int]],
+        /,
+        *,
+        owner: bool,
+    ) -> None:
+        """
+        Use `create()` or `attach()` instead.
+
+        Parameters
+        ----------
+        shm : SharedMemory
+        layout : dict[str, tuple[tuple[int, ...], str, int]]
+            Shape, dtype and byte offset of every array.
+        owner : bool
+            The block was created by this object and is unlinked on `close()`.
+        """
+        self._shm = shm
+        self._layout = layout
+        self._owner = owner
+        mapping = _Mapping(shm)
+        self._mapping = weakref.ref(mapping)
+        memory = np.asarray(mapping)
+        self._arrays: dict[str, npt.NDArray[Any]] = {}
+        for key, (shape, dtype, offset) in layout.items():
+            item = np.dtype(dtype)
+            nbytes = int(np.prod(shape, dtype=np.int64)) * item.itemsize
+            self._arrays[key] = memory[offset : offset + nbytes].view(item).reshape(shape)
+
+    @classmethod
+    def create(
+        cls, arrays: Mapping[str, tuple[tuple[int, ...], npt.DTypeLike]], /
+    ) -> "SharedArrays":
+        """
+        Create a new block with zero-initialized arrays.
+
+        Parameters
+        ----------
+        arrays : Mapping[str, tuple[tuple[int, ...], npt.DTypeLike]]
+            Shape and dtype of every array, e.g., `{"coordinates": ((natoms, 3), np.float64)}`.
+        """
+        layout = {}
+        size = 0
+        for key, (shape, dtype) in arrays.items():
+            dtype = np.dtype(dtype)
+            layout[key] = (tuple(shape), dtype.str, size)
+            nbytes = int(np.prod(shape, dtype=np.int64)) * dtype.itemsize
+            size += -(-nbytes // _ALIGNMENT) * _ALIGNMENT
+        shm = SharedMemory(create=True, size=max(size, 1))
+        _CREATED.add(shm.name)
+        return cls(shm, layout, owner=True)
+
+    @classmethod
+    def attach(cls, descriptor: Mapping[str, Any], /) -> "SharedArrays":
+        """
+        Attach to a block created by another process.
+
+        Parameters
+        ----------
+        descriptor : Mapping[str, Any]
+            `descriptor` of the block.
+
+        Raises
+        ------
+        FileNotFoundError
+            If the block does not exist.
+        """
+        layout = {
+            key: (tuple(shape), dtype, offset)
+            for key, (shape, dtype, offset) in descriptor["layout"].items()
+        }
+        return cls(_attach(descriptor["name"]), layout, owner=False)
+
+    @property
+    def name(self) -> str:
+        return self._shm.name
+
+    @property
+    def descriptor(self) -> dict[str, Any]:
+        return {
+            "name": self._shm.name,
+            "layout": {
+                key: [list(shape), dtype, offset]
+                for key, (shape, dtype, offset) in self._layout.items()
+            },
+        }
+
+    def __getitem__(self, key: str, /) -> npt.NDArray[Any]:
+        return self._arrays[key]
+
+    def __contains__(self, key: object, /) -> bool:
+        return key in self._arrays
+
+    def __enter__(self) -> "SharedArrays":
+        return self
+
+    def __exit__(self, *args: Any) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """
+        Detach from the block. The owner also removes the block.
+        Views handed out must not be used afterward. If they are still referenced, the memory is only released
+        once the last of them is gone.
+        """
+        self._arrays.clear()
+        if self._mapping() is None:
+            self._shm.close()
+        if self._owner:
+            self._shm.unlink()
+            _CREATED.discard(self._shm.name)
+            self._owner = False
+
+
+class ShmEngradClient:
+    """
+    Requests energies and gradients from a server with a `ShmEngradHandler` through shared memory.
+    The shared memory block is allocated once and reused as long as the system size does not change.
+
+    Attributes
+    ----------
+    session: ClientSession
+        Connection to the server.
+    """
+
+    def __init__(self, session: ClientSession, /) -> None:
+        self.session = session
+        self._arrays: SharedArrays | None = None
+
+    def __enter__(self) -> "ShmEngradClient":
+        return self
+
+    def __exit__(self, *args: Any) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """Remove the shared memory block."""
+        if self._arrays is not None:
+            self._arrays.close()
+            self._arrays = None
+
+    def _block(self, natoms: int, npc: int, /) -> SharedArrays:
+        """Shared memory block for the given system size."""
+        arrays = self._arrays
+        if (
+            arrays is None
+            or arrays["coordinates"].shape[0] != natoms
+            or arrays["point_charges"].shape[0] != npc
+        ):
+            self.close()
+            arrays = self._arrays = SharedArrays.create(
+                {
+                    "numbers": ((natoms,), np.int32),
+                    "coordinates": ((natoms, 3), np.float64),
+                    "point_charges": ((npc, 4), np.float64),
+                    "gradient": ((natoms, 3), np.float64),
+                }
+            )
+        return arrays
+
+    def compute(
+        self,
+        numbers: npt.ArrayLike,
+        coordinates: npt.ArrayLike,
+        point_charges: npt.ArrayLike | None = None,
+        *,
+        do_gradient: bool = True,
+        timeout: float | None = None,
+    ) -> tuple[float, npt.NDArray[np.float64] | None]:
+        """
+        Request the energy and gradient of a system.
+
+        Parameters
+        ----------
+        numbers : npt.ArrayLike
+            Atomic numbers, shape (natoms,).
+        coordinates : npt.ArrayLike
+            Coordinates, shape (natoms, 3).
+        point_charges : npt.ArrayLike | None, default: None
+            Charge and coordinates of every point charge, shape (npc, 4).
+        do_gradient : bool, default: True
+            Also request the gradient.
+        timeout : float | None, default: None
+            Seconds to wait for the response.
+
+        Returns
+        -------
+        float
+            Energy.
+        npt.NDArray[np.float64] | None
+            Gradient with shape (natoms, 3) if requested. This is a view of the shared memory,
+            which is overwritten by the next call.
+        """
+        coords = np.asarray(coordinates, dtype=np.float64).reshape(-1, 3)
+        charges = (
+            np.empty((0, 4)) if point_charges is None else np.asarray(point_charges).reshape(-1, 4)
+        )
+        arrays = self._block(len(coords), len(charges))
+        arrays["numbers"][:] = numbers
+        arrays["coordinates"][:] = coords
+        arrays["point_charges"][:] = charges
+        energy = self.session.request(
+            {
+                "type": "engrad_shm",
+                "shm": arrays.descriptor,
+                "point_charges": point_charges is not None,
+                "do_gradient": do_gradient,
+            },
+            timeout=timeout,
+        )
+        return float(energy), arrays["gradient"] if do_gradient else None
+
+
+class ShmEngradHandler:
+    """
+    Handler for `opi.external_methods.session.serve()` that answers the requests of `ShmEngradClient`.
+    Blocks of clients stay attached, so that every step only costs a message round trip.
+
+    Attributes
+    ----------
+    energy_and_gradient: Callable
+        Called with the atomic numbers, coordinates and point charges (or None) as NumPy views and the gradient flag.
+        Returns the energy and the gradient with shape (natoms, 3), or None if no gradient was requested.
+    max_attached: int
+        Maximal number of blocks that stay attached.
+    """
+
+    def __init__(
+        self,
+        energy_and_gradient: Callable[
+            [npt.NDArray[np.int32], npt.NDArray[np.float64], npt.NDArray[np.float64] | None, bool],
+            tuple[float, npt.ArrayLike | None],
+        ],
+        /,
+        *,
+        max_attached: int = 16,
+    ) -> None:
+        self.energy_and_gradient = energy_and_gradient
+        self.max_attached = max_attached
+        self._attached: OrderedDict[str, SharedArrays] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _get(self, descriptor: Mapping[str, Any], /) -> SharedArrays:
+        """Attached block, least recently used blocks are detached."""
+        name = descriptor["name"]
+        with self._lock:
+            if name in self._attached:
+                self._attached.move_to_end(name)
+                return self._attached[name]
+            arrays = self._attached[name] = SharedArrays.attach(descriptor)
+            while len(self._attached) > self.max_attached:
+                self._attached.popitem(last=False)[1].close()
+            return arrays
+
+    def __call__(self, message: dict[str, Any], /) -> float:
+        """
+        Answer a single message.
+
+        Raises
+        ------
+        ValueError
+            If the message is not of type "engrad_shm" or the gradient has the wrong shape.
+        """
+        if message.get("type") != "engrad_shm":
+            raise ValueError(f"Unsupported message type: {message.get('type')}")
+        arrays = self._get(message["shm"])
+        energy, gradient = self.energy_and_gradient(
+            arrays["numbers"],
+            arrays["coordinates"],
+            arrays["point_charges"] if message["point_charges"] else None,
+            message["do_gradient"],
+        )
+        if message["do_gradient"]:
+            if gradient is None:
+                raise ValueError("A gradient was requested, but none was returned.")
+            arrays["gradient"][:] = np.reshape(gradient, arrays["gradient"].shape)
+        return float(energy)
+
+    def close(self) -> None:
+        """Detach from all blocks."""
+        with self._lock:
+            while self._attached:
+                self._attached.popitem()[1].close()
@@ -5,13 +5,19 @@ Those are namely:
     * `blocks` and `simple_keywords`: which hold the Python objects of the ORCA's simple keywords (those starting with "!") and block options (those starting with `%`).
     * `core`: Contains the central `Input` class, which is the glue between the three former mentioned objects.
     * `structures`: Contains classes to represent basic structures and structure files.
+The sub-packages and modules are only imported when they are accessed for the first time.
 """
 
-from opi.input import blocks as blocks
-from opi.input import simple_keywords as simple_keywords
-from opi.input import structures as structures
-from opi.input.arbitrary_string import ArbitraryString, ArbitraryStringPos
-from opi.input.core import Input
+from typing import TYPE_CHECKING
+
+from opi.utils.lazy import lazy_package
+
+if TYPE_CHECKING:
+    from opi.input import blocks as blocks
+    from opi.input import simple_keywords as simple_keywords
+    from opi.input import structures as structures
+    from opi.input.arbitrary_string import ArbitraryString, ArbitraryStringPos
+    from opi.input.core import Input
 
 __all__ = [
     "blocks",
@@ -21,3 +27,12 @@ __all__ = [
     "ArbitraryString",
     "Input",
 ]
+
+__getattr__, __dir__ = lazy_package(
+    __name__,
+    {
+        ".arbitrary_string": ("ArbitraryString", "ArbitraryStringPos"),
+        ".core": ("Input",),
+    },
+    submodules=("blocks", "simple_keywords", "structures"),
+)
@@ -1,62 +1,68 @@
 """
 Modules that hold Python objects representing the most common block options.
+The modules are only imported when one of their objects is accessed for the first time.
 """
 
-from opi.input.blocks.base import Block
-from opi.input.blocks.block_autoci import BlockAutoCI
-from opi.input.blocks.block_basis import (
-    BlockBasis,
-    FragAux,
-    FragAuxC,
-    FragAuxJ,
-    FragAuxJK,
-    FragBasis,
-    FragCabs,
-    FragEcp,
-    NewBasis,
-)
-from opi.input.blocks.block_casscf import BlockCasscf
-from opi.input.blocks.block_cis import BlockCis
-from opi.input.blocks.block_cosmors import BlockCosmors
-from opi.input.blocks.block_cpcm import AtomRadii, BlockCpcm, Radius
-from opi.input.blocks.block_docker import BlockDocker
-from opi.input.blocks.block_eda import BlockEda
-from opi.input.blocks.block_elprop import BlockElprop
-from opi.input.blocks.block_eprnmr import BlockEprnmr, NmrEquiv, NmrGroup, Nuclei, NucleiFlag
-from opi.input.blocks.block_frag import BlockFrag, FragDefinition
-from opi.input.blocks.block_freq import BlockFreq, HessList
-from opi.input.blocks.block_geom import (
-    BlockGeom,
-    ConnectFragments,
-    Constraint,
-    Constraints,
-    FragConstraint,
-    Hybrid,
-    Modify,
-    ModifyInternal,
-    Potential,
-    Scan,
-    TSMode,
-)
-from opi.input.blocks.block_goat import AtomList, BlockGoat
-from opi.input.blocks.block_ice import BlockIce
-from opi.input.blocks.block_irc import BlockIrc
-from opi.input.blocks.block_loc import BlockLoc
-from opi.input.blocks.block_mdci import BlockMdci
-from opi.input.blocks.block_method import BlockMethod
-from opi.input.blocks.block_mp2 import BlockMp2
-from opi.input.blocks.block_neb import BlockNeb
-from opi.input.blocks.block_output import BlockOutput
-from opi.input.blocks.block_qmmm import BlockQmmm
-from opi.input.blocks.block_rel import BlockRel
-from opi.input.blocks.block_rocis import BlockRocis
-from opi.input.blocks.block_scf import DIIS, SOSCF, BlockScf, Damp, Rotate, Shift, Stab, Trah
-from opi.input.blocks.block_solvator import BlockSolvator
-from opi.input.blocks.block_tddft import BlockTddft
-from opi.input.blocks.block_xtb import BlockXtb
-from opi.input.blocks.fragment import FragList, Fragment, Frags
-from opi.input.blocks.geom_wrapper import Internal, Internals
-from opi.input.blocks.util import InputFilePath, InputString, IntGroup, NumList
+from typing import TYPE_CHECKING
+
+from opi.utils.lazy import lazy_package
+
+if TYPE_CHECKING:
+    from opi.input.blocks.base import Block
+    from opi.input.blocks.block_autoci import BlockAutoCI
+    from opi.input.blocks.block_basis import (
+        BlockBasis,
+        FragAux,
+        FragAuxC,
+        FragAuxJ,
+        FragAuxJK,
+        FragBasis,
+        FragCabs,
+        FragEcp,
+        NewBasis,
+    )
+    from opi.input.blocks.block_casscf import BlockCasscf
+    from opi.input.blocks.block_cis import BlockCis
+    from opi.input.blocks.block_cosmors import BlockCosmors
+    from opi.input.blocks.block_cpcm import AtomRadii, BlockCpcm, Radius
+    from opi.input.blocks.block_docker import BlockDocker
+    from opi.input.blocks.block_eda import BlockEda
+    from opi.input.blocks.block_elprop import BlockElprop
+    from opi.input.blocks.block_eprnmr import BlockEprnmr, NmrEquiv, NmrGroup, Nuclei, NucleiFlag
+    from opi.input.blocks.block_frag import BlockFrag, FragDefinition
+    from opi.input.blocks.block_freq import BlockFreq, HessList
+    from opi.input.blocks.block_geom import (
+        BlockGeom,
+        ConnectFragments,
+        Constraint,
+        Constraints,
+        FragConstraint,
+        Hybrid,
+        Modify,
+        ModifyInternal,
+        Potential,
+        Scan,
+        TSMode,
+    )
+    from opi.input.blocks.block_goat import AtomList, BlockGoat
+    from opi.input.blocks.block_ice import BlockIce
+    from opi.input.blocks.block_irc import BlockIrc
+    from opi.input.blocks.block_loc import BlockLoc
+    from opi.input.blocks.block_mdci import BlockMdci
+    from opi.input.blocks.block_method import BlockMethod
+    from opi.input.blocks.block_mp2 import BlockMp2
+    from opi.input.blocks.block_neb import BlockNeb
+    from opi.input.blocks.block_output import BlockOutput
+    from opi.input.blocks.block_qmmm import BlockQmmm
+    from opi.input.blocks.block_rel import BlockRel
+    from opi.input.blocks.block_rocis import BlockRocis
+    from opi.input.blocks.block_scf import DIIS, SOSCF, BlockScf, Damp, Rotate, Shift, Stab, Trah
+    from opi.input.blocks.block_solvator import BlockSolvator
+    from opi.input.blocks.block_tddft import BlockTddft
+    from opi.input.blocks.block_xtb import BlockXtb
+    from opi.input.blocks.fragment import FragList, Fragment, Frags
+    from opi.input.blocks.geom_wrapper import Internal, Internals
+    from opi.input.blocks.util import InputFilePath, InputString, IntGroup, NumList
 
 __all__ = [
     "Block",
@@ -133,3 +139,64 @@ __all__ = [
     "Internal",
     "Internals",
 ]
+
+__getattr__, __dir__ = lazy_package(
+    __name__,
+    {
+        ".base": ("Block",),
+        ".block_autoci": ("BlockAutoCI",),
+        ".block_basis": (
+            "BlockBasis",
+            "FragAux",
+            "FragAuxC",
+            "FragAuxJ",
+            "FragAuxJK",
+            "FragBasis",
+            "FragCabs",
+            "FragEcp",
+            "NewBasis",
+        ),
+        ".block_casscf": ("BlockCasscf",),
+        ".block_cis": ("BlockCis",),
+        ".block_cosmors": ("BlockCosmors",),
+        ".block_cpcm": ("AtomRadii", "BlockCpcm", "Radius"),
+        ".block_docker": ("BlockDocker",),
+        ".block_eda": ("BlockEda",),
+        ".block_elprop": ("BlockElprop",),
+        ".block_eprnmr": ("BlockEprnmr", "NmrEquiv", "NmrGroup", "Nuclei", "NucleiFlag"),
+        ".block_frag": ("BlockFrag", "FragDefinition"),
+        ".block_freq": ("BlockFreq", "HessList"),
+        ".block_geom": (
+            "BlockGeom",
+            "ConnectFragments",
+            "Constraint",
+            "Constraints",
+            "FragConstraint",
+            "Hybrid",
+            "Modify",
+            "ModifyInternal",
+            "Potential",
+            "Scan",
+            "TSMode",
+        ),
+        ".block_goat": ("AtomList", "BlockGoat"),
+        ".block_ice": ("BlockIce",),
+        ".block_irc": ("BlockIrc",),
+        ".block_loc": ("BlockLoc",),
+        ".block_mdci": ("BlockMdci",),
+        ".block_method": ("BlockMethod",),
+        ".block_mp2": ("BlockMp2",),
+        ".block_neb": ("BlockNeb",),
+        ".block_output": ("BlockOutput",),
+        ".block_qmmm": ("BlockQmmm",),
+        ".block_rel": ("BlockRel",),
+        ".block_rocis": ("BlockRocis",),
+        ".block_scf": ("DIIS", "SOSCF", "BlockScf", "Damp", "Rotate", "Shift", "Stab", "Trah"),
+        ".block_solvator": ("BlockSolvator",),
+        ".block_tddft": ("BlockTddft",),
+        ".block_xtb": ("BlockXtb",),
+        ".fragment": ("FragList", "Fragment", "Frags"),
+        ".geom_wrapper": ("Internal", "Internals"),
+        ".util": ("InputFilePath", "InputString", "IntGroup", "NumList"),
+    },
+)
@@ -18,7 +18,8 @@ class Block(BaseModel, ABC):
     which defines attributes, methods and properties shared by all blocks.
     """
 
-    model_config = ConfigDict(arbitrary_types_allowed=True)
+    # > Validators are built on first use, a process usually only touches a few of the blocks
+    model_config = ConfigDict(arbitrary_types_allowed=True, defer_build=True)
     _name: str
     aftercoord: bool = False
 
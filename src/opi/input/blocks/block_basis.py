@@ -36,7 +36,7 @@ class NewBasis(BaseModel):
 
     """
 
-    model_config = ConfigDict(arbitrary_types_allowed=True)
+    model_config = ConfigDict(arbitrary_types_allowed=True, defer_build=True)
     element: Element
     basis: SimpleKeyword
 
@@ -58,7 +58,7 @@ class FragBasis(BaseModel):
 
     """
 
-    model_config = ConfigDict(arbitrary_types_allowed=True)
+    model_config = ConfigDict(arbitrary_types_allowed=True, defer_build=True)
     frag: dict[int, SimpleKeyword]
     name: str = "fragbasis"
 
@@ -1,6 +1,6 @@
 from typing import Any, Callable, Literal, Union
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field
 
 from opi.input.blocks import Block
 from opi.input.simple_keywords import Solvent
@@ -20,6 +20,8 @@ class AtomRadii(BaseModel):
         Radius(in Angstrom)
     """
 
+    model_config = ConfigDict(defer_build=True)
+
     n: int = Field(gt=0, le=118)
     radius: float = Field(gt=0.0)
 
@@ -40,6 +42,8 @@ class Radius(BaseModel):
 
     """
 
+    model_config = ConfigDict(defer_build=True)
+
     n: int = Field(gt=0, le=118)
     value: float = Field(gt=0.0)
 
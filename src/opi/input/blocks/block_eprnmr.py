@@ -1,7 +1,7 @@
 import re
 from typing import Annotated, Literal
 
-from pydantic import BaseModel, Field, field_validator
+from pydantic import BaseModel, ConfigDict, Field, field_validator
 
 from opi.input.blocks import Block
 from opi.input.blocks.util import InputFilePath, IntGroup, NumList
@@ -15,6 +15,8 @@ class NucleiFlag(BaseModel):
     This class contains all flags for the `nuclei` parameter in `BlockEprnmr`.
     """
 
+    model_config = ConfigDict(defer_build=True)
+
     ppp: float | None = None
     qqq: float | None = None
     iii: float | None = None
@@ -97,6 +99,8 @@ class Nuclei(BaseModel):
         Defines flags
     """
 
+    model_config = ConfigDict(defer_build=True)
+
     mode: Literal["all"] | NumList = "all"
     atom: Element
     flags: NucleiFlag
@@ -195,6 +199,8 @@ class NmrGroup(BaseModel):
 
     """
 
+    model_config = ConfigDict(defer_build=True)
+
     groupnumber: Annotated[int, Field(gt=0)]
     atoms: IntGroup
 
@@ -249,6 +255,8 @@ class NmrEquiv(BaseModel):
 
     """
 
+    model_config = ConfigDict(defer_build=True)
+
     groups: list[NmrGroup]
 
     def __str__(self) -> str:
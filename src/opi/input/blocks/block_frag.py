@@ -1,6 +1,6 @@
 from typing import List, Literal
 
-from pydantic import BaseModel, field_validator
+from pydantic import BaseModel, ConfigDict, field_validator
 
 from opi.input.blocks import Block
 from opi.input.blocks.fragment import Fragment, Frags
@@ -23,6 +23,8 @@ class FragProc(BaseModel):
     Class to model `fragproc` attribute in `BlockFrag`
     """
 
+    model_config = ConfigDict(defer_build=True)
+
     flags: List[
         Literal[
             "extlib",
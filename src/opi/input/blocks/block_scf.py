@@ -1,6 +1,6 @@
 from typing import Any, Literal, Self
 
-from pydantic import BaseModel, field_validator
+from pydantic import BaseModel, ConfigDict, field_validator
 
 from opi.input.blocks import Block
 from opi.input.blocks.util import InputFilePath, NumList
@@ -13,6 +13,8 @@ class SubBlock(BaseModel):
     Class to define a sub block within an input block
     """
 
+    model_config = ConfigDict(defer_build=True)
+
     def __str__(self) -> str:
         s = " ".join(
             f"{key} {str(value)}" for key, value in self.__dict__.items() if value is not None
@@ -182,6 +184,8 @@ class Rotate(BaseModel):
     rotate: list[int | float]
     """
 
+    model_config = ConfigDict(defer_build=True)
+
     rotate: list[int | float]
 
     @field_validator("rotate")
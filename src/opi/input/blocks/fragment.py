@@ -1,7 +1,7 @@
 import re
 from typing import Annotated
 
-from pydantic import BaseModel, Field, field_validator
+from pydantic import BaseModel, ConfigDict, Field, field_validator
 
 from opi.input.blocks.util import IntGroup
 
@@ -27,6 +27,8 @@ class Fragment(BaseModel):
         Group of atoms for fragment
     """
 
+    model_config = ConfigDict(defer_build=True)
+
     fragmentid: Annotated[int, Field(gt=0)]
     atoms: IntGroup
 
@@ -85,6 +87,8 @@ class Frags(BaseModel):
         list of fragment definitions of type `Fragment`
     """
 
+    model_config = ConfigDict(defer_build=True)
+
     frags: list[Fragment] = Field(default_factory=list, min_length=1)
 
     def __str__(self) -> str:
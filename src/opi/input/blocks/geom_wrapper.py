@@ -1,7 +1,7 @@
 import re
 from typing import Annotated, Literal
 
-from pydantic import BaseModel, Field, model_validator
+from pydantic import BaseModel, ConfigDict, Field, model_validator
 
 __all__ = ("Internal", "Internals")
 
@@ -11,6 +11,8 @@ class GeomWrapper(BaseModel):
     Base class for all custom classes used for `BlockGeom`
     """
 
+    model_config = ConfigDict(defer_build=True)
+
     mode: str
     atom1: Annotated[int, Field(ge=0)] | Literal["*"] | None = None
     atom2: Annotated[int, Field(ge=0)] | Literal["*"] | None = None
@@ -54,6 +56,8 @@ class GeomWrapper(BaseModel):
 class GeomWrapperBox(BaseModel):
     """Class to model a collection of `GeomWrapper` objects"""
 
+    model_config = ConfigDict(defer_build=True)
+
     def __str__(self) -> str:
         return f"{{ {' '.join(str(val) for key, val in self.__dict__.items() if val is not None)} }} end"
 
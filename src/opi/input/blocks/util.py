@@ -16,7 +16,7 @@ class InputFilePath(BaseModel):
         Path to the file of type `Path`.
     """
 
-    model_config = ConfigDict(arbitrary_types_allowed=True)
+    model_config = ConfigDict(arbitrary_types_allowed=True, defer_build=True)
     file: Path
 
     def __str__(self) -> str:
@@ -42,6 +42,8 @@ class InputString(BaseModel):
         String to be stored.
     """
 
+    model_config = ConfigDict(defer_build=True)
+
     string: str
 
     def __str__(self) -> str:
@@ -58,6 +60,8 @@ class NumList(BaseModel):
         Stores list of integers or floats
     """
 
+    model_config = ConfigDict(defer_build=True)
+
     numlist: conlist(int) | conlist(float)  # type: ignore
 
     def __init__(self, numlist: list[int] | list[float]) -> None:
@@ -120,6 +124,8 @@ class IntGroup(BaseModel):
         Stores list of integers or pairs of integers
     """
 
+    model_config = ConfigDict(defer_build=True)
+
     values: list[int | tuple[int, int]]
 
     def __str__(self) -> str:
@@ -4,6 +4,8 @@ Module that holds the main class for input handling.
 
 import os
 from pathlib import Path
+from types import EllipsisType
+from typing import Any, Iterable, Mapping
 
 from opi.input.arbitrary_string import (
     ArbitraryString,
@@ -36,6 +38,8 @@ class Input:
         Memory per CPU core in MiB.
     _moinp | moinp: Path | None
         `%moinp` file to be used.
+    _shared_blocks: set[type[Block]]
+        Blocks that are shared with inputs created by or from `derive()`. They are copied before they are modified.
     """
 
     def __init__(self) -> None:
@@ -46,6 +50,8 @@ class Input:
         self._simple_keywords: list[SimpleKeyword] = []
         # // Block options
         self._blocks: dict[type[Block], Block] = {}
+        # // Blocks shared with derived inputs (copy-on-write)
+        self._shared_blocks: set[type[Block]] = set()
         # // Arbitrary strings
         self._arbitrary_strings: list[ArbitraryString] = []
 
@@ -167,6 +173,88 @@ class Input:
     # > METHODS
     # %%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%
 
+    # ----------------------------------------------------------------------
+    # > DERIVED INPUTS
+    # ----------------------------------------------------------------------
+    def derive(
+        self,
+        *,
+        add_simple_keywords: Iterable[str | SimpleKeyword] = (),
+        remove_simple_keywords: Iterable[str | SimpleKeyword] = (),
+        add_blocks: Iterable[Block] = (),
+        update_blocks: Mapping[type[Block], Mapping[str, Any]] | None = None,
+        remove_blocks: Iterable[type[Block]] = (),
+        add_arbitrary_strings: Iterable[str] = (),
+        ncores: int | None | EllipsisType = ...,
+        memory: int | None | EllipsisType = ...,
+        moinp: Path | str | os.PathLike[str] | None | EllipsisType = ...,
+    ) -> "Input":
+        """
+        Create a new input from this one with a few changes, e.g., for parameter sweeps.
+
+        Unlike `copy.deepcopy()`, unchanged blocks are shared between both inputs and only copied once either of
+        the inputs modifies them through `get_blocks()` (copy-on-write). Simple keywords and arbitrary strings
+        are shared as well, only the lists holding them are copied.
+        Blocks taken directly from the `blocks` attribute must therefore not be modified.
+
+        Parameters
+        ----------
+        add_simple_keywords : Iterable[str | SimpleKeyword], default: ()
+            Simple keywords to add.
+        remove_simple_keywords : Iterable[str | SimpleKeyword], default: ()
+            Simple keywords to remove. Missing keywords are ignored.
+        add_blocks : Iterable[Block], default: ()
+            Blocks to add. Existing blocks of the same type are replaced.
+        update_blocks : Mapping[type[Block], Mapping[str, Any]] | None, default: None
+            New values of block options per block type. The block is created if it is missing.
+        remove_blocks : Iterable[type[Block]], default: ()
+            Types of the blocks to remove. Missing blocks are ignored.
+        add_arbitrary_strings : Iterable[str], default: ()
+            Arbitrary strings to add at the default position.
+        ncores : int | None, optional
+            New number of cores. Unchanged if not given.
+        memory : int | None, optional
+            New memory per core in MiB. Unchanged if not given.
+        moinp : Path | str | os.PathLike[str] | None, optional
+            New `%moinp` file. Unchanged if not given.
+
+        Returns
+        -------
+        Input
+            The new input. This input is not modified.
+        """
+        derived = Input()
+        derived._simple_keywords = self._simple_keywords.copy()
+        derived._blocks = self._blocks.copy()
+        derived._arbitrary_strings = self._arbitrary_strings.copy()
+        derived._ncores = self._ncores
+        derived._memory = self._memory
+        derived._moinp = self._moinp
+        # > From now on, both inputs have to copy a block before modifying it
+        self._shared_blocks.update(self._blocks)
+        derived._shared_blocks = set(self._blocks)
+
+        derived.add_simple_keywords(*add_simple_keywords)
+        derived.remove_simple_keywords(*remove_simple_keywords)
+        derived.add_blocks(*add_blocks, overwrite=True)
+        for block_type, options in (update_blocks or {}).items():
+            block = derived._blocks.get(block_type)
+            values = dict(block) if block is not None else {}
+            values.update(options)
+            derived.add_blocks(block_type(**values), overwrite=True)
+        for block_type in remove_blocks:
+            derived._blocks.pop(block_type, None)
+            derived._shared_blocks.discard(block_type)
+        for string in add_arbitrary_strings:
+            derived.add_arbitrary_string(string)
+        if not isinstance(ncores, EllipsisType):
+            derived.ncores = ncores
+        if not isinstance(memory, EllipsisType):
+            derived.memory = memory
+        if not isinstance(moinp, EllipsisType):
+            derived.moinp = moinp
+        return derived
+
     # ----------------------------------------------------------------------
     # > SIMPLE KEYWORDS
     # ----------------------------------------------------------------------
@@ -431,6 +519,7 @@ class Input:
                 self._blocks[type(block)] = block
             elif overwrite:
                 self._blocks[type(block)] = block
+                self._shared_blocks.discard(type(block))
             elif strict:
                 raise ValueError(f"Strict: Block for {block.name} has already been added")
 
@@ -461,6 +550,7 @@ class Input:
             t_block = type(block)
             if t_block in self._blocks:
                 self._blocks.pop(t_block)
+                self._shared_blocks.discard(t_block)
             elif strict:
                 raise ValueError(
                     f"Strict: Block '{block.name}' does not exist so it cannot be removed."
@@ -529,6 +619,10 @@ class Input:
         """
         if self._blocks:
             if block in self._blocks:
+                if block in self._shared_blocks:
+                    # > Copy-on-write: the block might be modified by the caller
+                    self._blocks[block] = self._blocks[block].model_copy(deep=True)
+                    self._shared_blocks.discard(block)
                 return self._blocks[block]
             elif create_missing:
                 created_block = block()
@@ -592,6 +686,7 @@ class Input:
                 return
 
         self._blocks.clear()
+        self._shared_blocks.clear()
 
     # ----------------------------------------------------------------------
     # > ARBITRARY STRINGS
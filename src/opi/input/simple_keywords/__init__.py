@@ -1,41 +1,47 @@
 """
 Modules that hold Python objects representing the most common simple keywords.
+The modules are only imported when one of their objects is accessed for the first time.
 """
 
-from opi.input.simple_keywords.approximation import Approximation
-from opi.input.simple_keywords.atomic_charge import AtomicCharge
-from opi.input.simple_keywords.aux_basis_set import AuxBasisSet
-from opi.input.simple_keywords.avas import Avas
-from opi.input.simple_keywords.base import SimpleKeyword, SimpleKeywordBox
-from opi.input.simple_keywords.basis_set import BasisSet
-from opi.input.simple_keywords.basisoption import BasisOption
-from opi.input.simple_keywords.dft import Dft
-from opi.input.simple_keywords.dispersion_correction import DispersionCorrection
-from opi.input.simple_keywords.dlpno import Dlpno
-from opi.input.simple_keywords.docker import Docker
-from opi.input.simple_keywords.ecp import Ecp
-from opi.input.simple_keywords.esd import Esd
-from opi.input.simple_keywords.external_tools import ExternalTools
-from opi.input.simple_keywords.force_field import ForceField
-from opi.input.simple_keywords.gcp import Gcp
-from opi.input.simple_keywords.goat import Goat
-from opi.input.simple_keywords.grid import Grid
-from opi.input.simple_keywords.method import Method
-from opi.input.simple_keywords.miscellaneous import Miscellaneous
-from opi.input.simple_keywords.neb import Neb
-from opi.input.simple_keywords.opt import Opt
-from opi.input.simple_keywords.output_control import OutputControl
-from opi.input.simple_keywords.property import Property
-from opi.input.simple_keywords.qmmm import Qmmm
-from opi.input.simple_keywords.relativistic_correction import RelativisticCorrection
-from opi.input.simple_keywords.scf import Scf
-from opi.input.simple_keywords.shell_type import ShellType
-from opi.input.simple_keywords.solvation import Solvation
-from opi.input.simple_keywords.solvation_model import SolvationModel
-from opi.input.simple_keywords.solvent import Solvent
-from opi.input.simple_keywords.sqm import Sqm
-from opi.input.simple_keywords.task import Task
-from opi.input.simple_keywords.wft import Wft
+from typing import TYPE_CHECKING
+
+from opi.utils.lazy import lazy_package
+
+if TYPE_CHECKING:
+    from opi.input.simple_keywords.approximation import Approximation
+    from opi.input.simple_keywords.atomic_charge import AtomicCharge
+    from opi.input.simple_keywords.aux_basis_set import AuxBasisSet
+    from opi.input.simple_keywords.avas import Avas
+    from opi.input.simple_keywords.base import SimpleKeyword, SimpleKeywordBox
+    from opi.input.simple_keywords.basis_set import BasisSet
+    from opi.input.simple_keywords.basisoption import BasisOption
+    from opi.input.simple_keywords.dft import Dft
+    from opi.input.simple_keywords.dispersion_correction import DispersionCorrection
+    from opi.input.simple_keywords.dlpno import Dlpno
+    from opi.input.simple_keywords.docker import Docker
+    from opi.input.simple_keywords.ecp import Ecp
+    from opi.input.simple_keywords.esd import Esd
+    from opi.input.simple_keywords.external_tools import ExternalTools
+    from opi.input.simple_keywords.force_field import ForceField
+    from opi.input.simple_keywords.gcp import Gcp
+    from opi.input.simple_keywords.goat import Goat
+    from opi.input.simple_keywords.grid import Grid
+    from opi.input.simple_keywords.method import Method
+    from opi.input.simple_keywords.miscellaneous import Miscellaneous
+    from opi.input.simple_keywords.neb import Neb
+    from opi.input.simple_keywords.opt import Opt
+    from opi.input.simple_keywords.output_control import OutputControl
+    from opi.input.simple_keywords.property import Property
+    from opi.input.simple_keywords.qmmm import Qmmm
+    from opi.input.simple_keywords.relativistic_correction import RelativisticCorrection
+    from opi.input.simple_keywords.scf import Scf
+    from opi.input.simple_keywords.shell_type import ShellType
+    from opi.input.simple_keywords.solvation import Solvation
+    from opi.input.simple_keywords.solvation_model import SolvationModel
+    from opi.input.simple_keywords.solvent import Solvent
+    from opi.input.simple_keywords.sqm import Sqm
+    from opi.input.simple_keywords.task import Task
+    from opi.input.simple_keywords.wft import Wft
 
 __all__ = [
     "Approximation",
@@ -74,3 +80,43 @@ __all__ = [
     "Task",
     "Wft",
 ]
+
+__getattr__, __dir__ = lazy_package(
+    __name__,
+    {
+        ".approximation": ("Approximation",),
+        ".atomic_charge": ("AtomicCharge",),
+        ".aux_basis_set": ("AuxBasisSet",),
+        ".avas": ("Avas",),
+        ".base": ("SimpleKeyword", "SimpleKeywordBox"),
+        ".basis_set": ("BasisSet",),
+        ".basisoption": ("BasisOption",),
+        ".dft": ("Dft",),
+        ".dispersion_correction": ("DispersionCorrection",),
+        ".dlpno": ("Dlpno",),
+        ".docker": ("Docker",),
+        ".ecp": ("Ecp",),
+        ".esd": ("Esd",),
+        ".external_tools": ("ExternalTools",),
+        ".force_field": ("ForceField",),
+        ".gcp": ("Gcp",),
+        ".goat": ("Goat",),
+        ".grid": ("Grid",),
+        ".method": ("Method",),
+        ".miscellaneous": ("Miscellaneous",),
+        ".neb": ("Neb",),
+        ".opt": ("Opt",),
+        ".output_control": ("OutputControl",),
+        ".property": ("Property",),
+        ".qmmm": ("Qmmm",),
+        ".relativistic_correction": ("RelativisticCorrection",),
+        ".scf": ("Scf",),
+        ".shell_type": ("ShellType",),
+        ".solvation": ("Solvation",),
+        ".solvation_model": ("SolvationModel",),
+        ".solvent": ("Solvent",),
+        ".sqm": ("Sqm",),
+        ".task": ("Task",),
+        ".wft": ("Wft",),
+    },
+)
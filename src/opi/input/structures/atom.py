@@ -1,4 +1,4 @@
-from typing import Any
+from typing import Any, Self
 
 import numpy as np
 import numpy.typing as npt
@@ -43,6 +43,33 @@ class _CoordLineBase:
         # // Append string
         self.append_str: str | None = append_str
 
+    @classmethod
+    def _from_trusted(cls, **kwargs: Any) -> Self:
+        """
+        Create a line without validating the values, which must have been taken from a valid line,
+        e.g., when decoding a serialized structure. Takes the same keyword arguments as the constructor,
+        but `coordinates` must be `Coordinates` and `element` must be `Element` for atoms.
+        """
+        line = cls.__new__(cls)
+        line._init_trusted(**kwargs)
+        return line
+
+    def _init_trusted(
+        self,
+        *,
+        coordinates: Coordinates,
+        fragment_id: int | None = None,
+        nuclear_charge: float | None = None,
+        mass: float | None = None,
+        append_str: str | None = None,
+    ) -> None:
+        """Set the same attributes as `__init__()`, see `_from_trusted()`."""
+        self._coordinates = coordinates
+        self._fragment_id = fragment_id
+        self._nuclear_charge = nuclear_charge
+        self._mass = mass
+        self.append_str = append_str
+
     @property
     def coordinates(self) -> Coordinates:
         return self._coordinates
@@ -181,6 +208,10 @@ class _CoordLineWithElementBase(_CoordLineBase):
 
         self._element: Any | None = element
 
+    def _init_trusted(self, *, element: Any | None = None, **kwargs: Any) -> None:
+        super()._init_trusted(**kwargs)
+        self._element = element
+
     def _fmt_element(self) -> str:
         return str(self._element)
 
@@ -203,6 +234,12 @@ class _CoordLineWithSymbolAndChargeBase(_CoordLineWithElementBase):
         self._charge: float
         self.charge = charge
 
+    def _init_trusted(self, *, charge: float | None = None, **kwargs: Any) -> None:
+        super()._init_trusted(**kwargs)
+        if charge is None:
+            raise ValueError(f"{self.__class__.__name__}.charge: cannot be None")
+        self._charge = charge
+
     @property
     def charge(self) -> float:
         return self._charge
@@ -1,4 +1,4 @@
-from typing import cast
+from typing import Self, cast
 
 import numpy as np
 import numpy.typing as npt
@@ -21,8 +21,24 @@ class Coordinates:
         self,
         coordinates: "Coordinates | tuple[int | float, int | float, int | float] | npt.NDArray[np.float64]",
     ) -> None:
-        self._coordinates: npt.NDArray[np.float64] = np.zeros((3,), dtype=np.float64)
-        self.coordinates = cast(npt.NDArray[np.float64], coordinates)
+        self._coordinates: npt.NDArray[np.float64]
+        # > The type is quoted, as subscripting it at runtime is slow
+        self.coordinates = cast("npt.NDArray[np.float64]", coordinates)
+
+    @classmethod
+    def _from_trusted(cls, coordinates: npt.NDArray[np.float64], /) -> Self:
+        """
+        Create coordinates from an array without validating or copying it.
+        Only for values taken from valid coordinates, e.g., when decoding a serialized structure.
+
+        Parameters
+        ----------
+        coordinates : npt.NDArray[np.float64]
+            Array of float64 with shape (3,), which is used as is.
+        """
+        obj = cls.__new__(cls)
+        obj._coordinates = coordinates
+        return obj
 
     @property
     def coordinates(self) -> npt.NDArray[np.float64]:
@@ -9,18 +9,14 @@ from warnings import warn
 import numpy as np
 import numpy.typing as npt
 
-# > RDKIT
-from rdkit.Chem import AddHs, MolFromSmiles, MolFromXYZBlock
-from rdkit.Chem.rdDistGeom import EmbedMolecule
-
 from opi.input.structures.atom import (
     Atom,
     EmbeddingPotential,
     GhostAtom,
     PointCharge,
 )
-from opi.input.structures.coordinates import Coordinates
 from opi.utils.element import Element
+from opi.utils.periodic_table import numbers_to_elements, symbols_to_numbers
 
 __all__ = ("Structure",)
 
@@ -461,7 +457,9 @@ class Structure:
         The `Structure` object extracted from the buffer
         """
         # > Try reading the string
-        atoms = []
+        symbols: list[str] = []
+        rows: list[tuple[float, float, float]] = []
+        fragment_ids: list[int | None] = []
 
         # > Fetch number of atoms
         try:
@@ -489,11 +487,8 @@ class Structure:
             if not match_atom_sym_frag_id:
                 raise ValueError(f"Line {iline}: Could not find atom symbol.")
 
-            atom_sym = match_atom_sym_frag_id.group("elem")
-            try:
-                element = Element(atom_sym)
-            except Exception as err:
-                raise ValueError(f"Line {iline}: Invalid atom symbol: {atom_sym}") from err
+            # >> Converted to elements all at once after the loop
+            symbols.append(match_atom_sym_frag_id.group("elem"))
 
             # > Fragment id
             # >> First, let's assume columns 2 through 4 are the coordinates.
@@ -530,19 +525,29 @@ class Structure:
             except (ValueError, IndexError) as err:
                 raise ValueError(f"Line {iline}: Invalid Z coordinate: {atom_cols[3]}") from err
 
-            # > Adding atom
-            atoms.append(
-                Atom(
-                    element=element,
-                    coordinates=Coordinates(coordinates=(coord_x, coord_y, coord_z)),
-                    fragment_id=frag_id,
-                )
-            )
+            rows.append((coord_x, coord_y, coord_z))
+            fragment_ids.append(frag_id)
         # << END OF LOOP
 
         # > Check number of atoms declared in file agrees with apparent number of atoms.
-        if natoms != len(atoms):
-            raise ValueError(f"{natoms} were expected but {len(atoms)} were found")
+        if natoms != len(rows):
+            raise ValueError(f"{natoms} were expected but {len(rows)} were found")
+
+        try:
+            elements = numbers_to_elements(symbols_to_numbers(symbols))
+        except ValueError as err:
+            # > Find the line of the first invalid symbol
+            for iline, atom_sym in enumerate(symbols, start=3):
+                try:
+                    symbols_to_numbers((atom_sym,))
+                except ValueError:
+                    raise ValueError(f"Line {iline}: Invalid atom symbol: {atom_sym}") from err
+            raise
+
+        atoms = [
+            Atom(element=element, coordinates=row, fragment_id=frag_id)
+            for element, row, frag_id in zip(elements, rows, fragment_ids)
+        ]
 
         return Structure(
             atoms=atoms,
@@ -582,6 +587,10 @@ class Structure:
         RuntimeError
             If EmbedMolecule() is unsuccessful
         """
+        # > RDKit is only imported when needed, as it takes long to import
+        from rdkit.Chem import AddHs, MolFromSmiles
+        from rdkit.Chem.rdDistGeom import EmbedMolecule
+
         mol = MolFromSmiles(smiles)
         if not mol:
             raise ValueError(f"Invalid SMILES string: {smiles}")
@@ -624,6 +633,8 @@ class Structure:
 
         # Compute 3D coordinates if needed
         if not mol.GetConformer().Is3D():
+            from rdkit.Chem.rdDistGeom import EmbedMolecule
+
             res = EmbedMolecule(mol)
             if res < 0:
                 raise RuntimeError("Failed to embed molecule")
@@ -672,6 +683,8 @@ class Structure:
         RdkitMol : RDKit Mol object generated from `Structure` object
         """
 
+        from rdkit.Chem import MolFromXYZBlock
+
         xyz_block = structure.to_xyz_block()
         return MolFromXYZBlock(xyz_block)
 
@@ -721,48 +734,26 @@ class Structure:
         if len(symbols) != positions.shape[0]:
             raise ValueError(f"{len(symbols)} symbols and {positions.shape[0]} positions")
 
-        atoms = []
-        # > Build a list of atoms from element symbols and positions
-        for iatom, ase_atom in enumerate(zip(symbols, positions)):
-            symbol, raw_position = ase_atom
-            # > Indicate the type for static type checking with mypy
-            position = np.asarray(raw_position, dtype=np.float64)
-
-            # > Get Element symbol
-            try:
-                element = Element(symbol)
-            except (ValueError, IndexError):
-                raise ValueError(f"Atom {iatom}: Could not convert {ase_atom[0]} to element symbol")
-
-            coords_cols: list[float] = position.tolist()
+        # > Check that every atom has three coordinates
+        if positions.shape[1] < 3:
+            raise ValueError("Invalid coordinates for atom number: 0")
 
-            if len(coords_cols) < 3:
-                raise ValueError(f"Invalid coordinates for atom number: {iatom}")
+        # > Convert all symbols at once
+        try:
+            elements = numbers_to_elements(symbols_to_numbers(symbols))
+        except ValueError:
+            for iatom, symbol in enumerate(symbols):
+                try:
+                    symbols_to_numbers((symbol,))
+                except ValueError:
+                    raise ValueError(f"Atom {iatom}: Could not convert {symbol} to element symbol")
+            raise
 
-            # > Pass coordinates
-            # // X
-            try:
-                coord_x = float(coords_cols[0])
-            except (ValueError, IndexError) as err:
-                raise ValueError(f"Atom {iatom}: Invalid X coordinate") from err
-            # // Y
-            try:
-                coord_y = float(coords_cols[1])
-            except (ValueError, IndexError) as err:
-                raise ValueError(f"Atom {iatom}: Invalid Y coordinate") from err
-            # // Z
-            try:
-                coord_z = float(coords_cols[2])
-            except (ValueError, IndexError) as err:
-                raise ValueError(f"Atom {iatom}: Invalid Z coordinate") from err
-
-            # > Adding atom
-            atoms.append(
-                Atom(
-                    element=element,
-                    coordinates=Coordinates(coordinates=(coord_x, coord_y, coord_z)),
-                )
-            )
+        # > Build a list of atoms from elements and positions
+        atoms = [
+            Atom(element=element, coordinates=position)
+            for element, position in zip(elements, positions[:, :3])
+        ]
 
         # > Get charge if not supplied
         if charge is None:
@@ -807,19 +798,31 @@ class Structure:
             The Structure object initialized from given lists.
 
         """
-        atoms = []
         if len(symbols) != len(coordinates):
             raise ValueError(f"{len(symbols)} symbols and {len(coordinates)} coordinates")
 
-        for element, coords in zip(symbols, coordinates):
+        # > Convert symbols and atomic numbers separately, each of them all at once
+        numbers = np.empty(len(symbols), dtype=np.int64)
+        str_indices: list[int] = []
+        str_symbols: list[str] = []
+        int_indices: list[int] = []
+        int_symbols: list[int] = []
+        for index, element in enumerate(symbols):
             if isinstance(element, int):
-                element = Element.from_atomic_number(element)
+                int_indices.append(index)
+                int_symbols.append(element)
             elif isinstance(element, str):
-                element = Element(element)
+                str_indices.append(index)
+                str_symbols.append(element)
             else:
                 raise ValueError(f"{element} cannot be converted to an element.")
-            # > assert to make mypy happy
-            assert isinstance(element, Element)
-            atoms.append(Atom(element=element, coordinates=coords))
+        numbers[str_indices] = symbols_to_numbers(str_symbols)
+        numbers[int_indices] = int_symbols
+        elements = numbers_to_elements(numbers)
+
+        atoms = [
+            Atom(element=element, coordinates=coords)
+            for element, coords in zip(elements, coordinates)
+        ]
 
         return cls(atoms=atoms, charge=charge, multiplicity=multiplicity)
@@ -0,0 +1,225 @@
+"""
+Discovery and parallel parsing of many existing ORCA calculations.
+"""
+
+import os
+import re
+from concurrent.futures import Future, ProcessPoolExecutor, as_completed
+from fnmatch import fnmatch
+from pathlib import Path
+from typing import Iterable, Iterator
+
+from opi.output.core import Output
+
+__all__ = ("OutputCollection",)
+
+
+def _series_indices(names: Iterable[str], pattern: re.Pattern[str], /) -> set[int]:
+    """Indices of all names that fully match `pattern`, whose only group is the index."""
+    return {int(match.group(1)) for name in names if (match := pattern.fullmatch(name))}
+
+
+def _contiguous(indices: set[int], start: int, /) -> list[int]:
+    """Leading run of consecutive indices beginning at `start`, as found by `Output.collect_json_files()`."""
+    run = []
+    while start in indices:
+        run.append(start)
+        start += 1
+    return run
+
+
+def _parse_output(
+    output: Output,
+    do_create_property_json: bool | None,
+    do_create_gbw_json: bool | None,
+    read_prop_json: bool,
+    read_gbw_json: bool,
+    /,
+) -> Output:
+    """Parse a single output. Runs in the worker processes."""
+    output.parse(
+        do_create_property_json=do_create_property_json,
+        do_create_gbw_json=do_create_gbw_json,
+        read_prop_json=read_prop_json,
+        read_gbw_json=read_gbw_json,
+    )
+    return output
+
+
+class OutputCollection:
+    """
+    All ORCA jobs below a directory, each as an unparsed `Output`.
+
+    Jobs are found in a single walk over the directory tree. Every file `<basename>.out` or
+    `<basename>.property.json` marks a job and GBW files of scans (`<basename>.001.gbw`, ...) and
+    NEB runs (`<basename>_im0.gbw`, ...) are assigned from the same directory listing,
+    so no file is probed individually.
+
+    Attributes
+    ----------
+    root: Path
+        Directory that was searched.
+    outputs: list[Output]
+        Outputs of all jobs, sorted by directory and basename.
+    """
+
+    # > Suffixes of files that mark a job
+    MARKER_SUFFIXES = (".out", ".property.json")
+
+    def __init__(
+        self,
+        root: Path | str | os.PathLike[str],
+        /,
+        *,
+        recursive: bool = True,
+        version_check: bool = True,
+    ) -> None:
+        """
+        Parameters
+        ----------
+        root : Path | str | os.PathLike[str]
+            Directory to search.
+        recursive : bool, default: True
+            Also search all subdirectories.
+        version_check : bool, default: True
+            Passed on to every `Output`.
+
+        Raises
+        ------
+        FileNotFoundError
+            If `root` is not a directory.
+        FileExistsError
+            If a job has GBW files of both a scan and a NEB run.
+        """
+        self.root = Path(root).expanduser().resolve()
+        if not self.root.is_dir():
+            raise FileNotFoundError(f"Directory does not exist: {self.root}")
+        self.outputs: list[Output] = []
+
+        pending = [self.root]
+        while pending:
+            directory = pending.pop()
+            names = []
+            with os.scandir(directory) as entries:
+                for entry in entries:
+                    if entry.is_dir(follow_symlinks=False):
+                        if recursive:
+                            pending.append(Path(entry.path))
+                    else:
+                        names.append(entry.name)
+            self.outputs.extend(self._group(directory, names, version_check))
+        self.outputs.sort(key=lambda output: (output.working_dir, output.basename))
+
+    @staticmethod
+    def _group(directory: Path, names: list[str], version_check: bool, /) -> Iterator[Output]:
+        """Create the outputs of all jobs in a directory from the names of its files."""
+        basenames = sorted(
+            {
+                name.removesuffix(suffix)
+                for name in names
+                for suffix in OutputCollection.MARKER_SUFFIXES
+                if name.endswith(suffix) and len(name) > len(suffix)
+            }
+        )
+        gbw_names = [name for name in names if name.endswith(".gbw")]
+        for basename in basenames:
+            prefix = re.escape(basename)
+            # > Same search as in `Output.get_gbw_json_files()`
+            scan = _contiguous(
+                _series_indices(gbw_names, re.compile(rf"{prefix}\.(\d{{3}})\.gbw")), 1
+            )
+            neb = _contiguous(_series_indices(gbw_names, re.compile(rf"{prefix}_im(\d+)\.gbw")), 0)
+            if scan and neb:
+                raise FileExistsError(
+                    f"Both Scan and NEB type .gbw files found for {directory / basename}!"
+                    " Only one type should be present."
+                )
+            gbw_json_files = [directory / f"{basename}.json"]
+            gbw_json_files += [directory / f"{basename}.{i:03}.json" for i in scan]
+            gbw_json_files += [directory / f"{basename}_im{i}.json" for i in neb]
+            yield Output(
+                basename,
+                working_dir=directory,
+                version_check=version_check,
+                gbw_json_files=gbw_json_files,
+            )
+
+    def __len__(self) -> int:
+        return len(self.outputs)
+
+    def __iter__(self) -> Iterator[Output]:
+        return iter(self.outputs)
+
+    def select(self, pattern: str, /) -> "OutputCollection":
+        """
+        Jobs whose path relative to `root` matches a shell-style pattern, e.g., `"conformers/*/job"`.
+
+        Parameters
+        ----------
+        pattern : str
+            Pattern that is matched against `<directory>/<basename>`, relative to `root`.
+        """
+        selection = object.__new__(type(self))
+        selection.root = self.root
+        selection.outputs = [
+            output
+            for output in self.outputs
+            if fnmatch(
+                (output.working_dir / output.basename).relative_to(self.root).as_posix(), pattern
+            )
+        ]
+        return selection
+
+    def parse(
+        self,
+        *,
+        max_workers: int | None = None,
+        do_create_property_json: bool | None = None,
+        do_create_gbw_json: bool | None = None,
+        read_prop_json: bool = True,
+        read_gbw_json: bool = True,
+    ) -> Iterator[tuple[Output, Exception | None]]:
+        """
+        Parse all jobs in parallel processes and yield them as they complete.
+        Parsed outputs replace the unparsed ones in `outputs`.
+        See `Output.parse()` for the parameters that control which JSON files are created and read.
+
+        Parameters
+        ----------
+        max_workers : int | None, default: None
+            Number of worker processes. If None, the number of CPUs is used. With 1, jobs are parsed in this process.
+
+        Yields
+        ------
+        tuple[Output, Exception | None]
+            The parsed output and None, or the unparsed output and the exception raised during parsing.
+        """
+        options = (do_create_property_json, do_create_gbw_json, read_prop_json, read_gbw_json)
+        workers = max_workers or os.cpu_count() or 1
+        if workers == 1 or len(self.outputs) <= 1:
+            for i, output in enumerate(self.outputs):
+                try:
+                    self.outputs[i] = _parse_output(output, *options)
+                except Exception as err:
+                    yield output, err
+                else:
+                    yield self.outputs[i], None
+            return
+
+        executor = ProcessPoolExecutor(workers)
+        try:
+            futures: dict[Future[Output], int] = {
+                executor.submit(_parse_output, output, *options): i
+                for i, output in enumerate(self.outputs)
+            }
+            for future in as_completed(futures):
+                i = futures[future]
+                try:
+                    self.outputs[i] = future.result()
+                except Exception as err:
+                    yield self.outputs[i], err
+                else:
+                    yield self.outputs[i], None
+        finally:
+            # > Do not wait for the remaining jobs if the caller stops early
+            executor.shutdown(cancel_futures=True)
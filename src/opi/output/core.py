@@ -5,7 +5,7 @@ It's mostly based on the ORCA's two JSONs files.
 
 import json
 from pathlib import Path
-from typing import Any, Callable, cast
+from typing import Any, Callable, Iterable, cast
 from warnings import warn
 
 import numpy as np
@@ -13,11 +13,13 @@ import numpy.typing as npt
 from pydantic import StrictInt, StrictStr
 
 from opi.execution.core import Runner
+from opi.execution.watchdog import AbortReason
 from opi.input.structures import Atom, Coordinates, Structure
 from opi.output.cube import CubeOutput
 from opi.output.gbw_suffix import GbwSuffix
 from opi.output.grepper.recipes import (
     get_float_from_line,
+    get_scf_cycles,
     has_geometry_optimization_converged,
     has_scf_converged,
     has_terminated_normally,
@@ -32,6 +34,7 @@ from opi.output.models.base.strict_types import (
 )
 from opi.output.models.json.gbw.gbw_results import GbwResults
 from opi.output.models.json.gbw.properties.mo import MO
+from opi.output.models.json.property.properties.calc_time import CalculationTiming
 from opi.output.models.json.property.properties.dipole_moment import DipoleMoment
 from opi.output.models.json.property.properties.energy import Energy
 from opi.output.models.json.property.properties.energy_list import EnergyList
@@ -54,8 +57,10 @@ from opi.output.models.json.property.properties.quadrupole_moment import Quadrup
 from opi.output.models.json.property.property_results import (
     PropertyResults,
 )
+from opi.output.plot_request import PlotRequest
 from opi.utils.misc import check_minimal_version, lowercase
 from opi.utils.orca_version import OrcaVersion
+from opi.utils.tracing import span
 from opi.utils.units import AU_TO_ANGST, AU_TO_EV
 
 
@@ -90,6 +95,7 @@ class Output:
         working_dir: Path | None = None,
         version_check: bool = True,
         parse: bool = False,
+        gbw_json_files: Iterable[Path] | None = None,
     ):
         """
         ORCA output parser that is mainly based on the JSON-property and JSON-GBW file.
@@ -110,6 +116,9 @@ class Output:
             True: Create (if turned on by `create_gbw_json/create_property_json`) and parse JSONs files at the end of the initialization.
             False: Only return an Output object. In order to use the object to access the JSON data,
                    `Output.parse()` has to be called first.
+        gbw_json_files: Iterable[Path] | None, default: None
+            Paths to the GBW JSON files, if they are already known, e.g., from `OutputCollection`.
+            If None, they are searched in the working directory with `get_gbw_json_files()`.
 
         Raises
         ----------
@@ -124,7 +133,9 @@ class Output:
             raise FileNotFoundError(f"Working dir does not exist: {working_dir}")
 
         # // JSON PATHS
-        self.gbw_json_files = self.get_gbw_json_files()
+        self.gbw_json_files = (
+            self.get_gbw_json_files() if gbw_json_files is None else list(gbw_json_files)
+        )
         self.property_json_file = self.get_file(".property.json")
 
         # > // REDUMP JSON AFTER PARSING
@@ -174,39 +185,43 @@ class Output:
         FileNotFoundError
             If any JSON file should be read that is not present.
         """
-        # // Create JSONs files
-        # // GBW JSON files
-        if do_create_gbw_json is None:
-            self.create_missing_gbw_json()
-        elif do_create_gbw_json:
-            self.create_gbw_json(force=True)
-
-        # // Property JSON file
-        if do_create_property_json is None:
-            self.create_missing_property_json()
-        elif do_create_property_json:
-            self.create_property_json(force=True)
-
-        # // PARSE JSONS
-        # // Property JSON
-        if read_prop_json:
-            self.property_json_data = self._process_json_file(self.property_json_file)
-            # > Check in property json whether version fits:
-            if self.do_version_check:
-                self.check_version()
-            self.results_properties = PropertyResults(**self.property_json_data)
-        else:
-            if self.do_version_check:
-                warn("No version check possible.")
+        with span("output.parse", basename=self.basename):
+            # // Create JSONs files
+            with span("output.create_jsons"):
+                # // GBW JSON files
+                if do_create_gbw_json is None:
+                    self.create_missing_gbw_json()
+                elif do_create_gbw_json:
+                    self.create_gbw_json(force=True)
+
+                # // Property JSON file
+                if do_create_property_json is None:
+                    self.create_missing_property_json()
+                elif do_create_property_json:
+                    self.create_property_json(force=True)
+
+            # // PARSE JSONS
+            # // Property JSON
+            if read_prop_json:
+                self.property_json_data = self._process_json_file(self.property_json_file)
+                # > Check in property json whether version fits:
+                if self.do_version_check:
+                    self.check_version()
+                with span("output.validate", model="PropertyResults"):
+                    self.results_properties = PropertyResults(**self.property_json_data)
+            else:
+                if self.do_version_check:
+                    warn("No version check possible.")
 
-        # // GBW JSON file
-        if read_gbw_json:
-            self.gbw_json_data = [self._process_json_file(file) for file in self.gbw_json_files]
-            self.results_gbw = [GbwResults(**data) for data in self.gbw_json_data]
+            # // GBW JSON file
+            if read_gbw_json:
+                self.gbw_json_data = [self._process_json_file(file) for file in self.gbw_json_files]
+                with span("output.validate", model="GbwResults", count=len(self.gbw_json_data)):
+                    self.results_gbw = [GbwResults(**data) for data in self.gbw_json_data]
 
-        # > Redump JSON files
-        if self.do_redump_jsons:
-            self._redump_jsons()
+            # > Redump JSON files
+            if self.do_redump_jsons:
+                self._redump_jsons()
 
     @property
     def num_gbw_json_files(self) -> int:
@@ -243,8 +258,12 @@ class Output:
         if not json_file.is_file():
             raise FileNotFoundError(f"JSON file does not exist: {json_file}")
 
-        with json_file.open() as f_json:
+        with (
+            span("output.read_json", file=json_file.name) as trace,
+            json_file.open() as f_json,
+        ):
             json_data: dict[str, Any] = json.load(f_json)
+            trace.set("size", f_json.tell())
             return json_data
 
     def _process_json_file(self, json_file: Path, /) -> dict[str, Any]:
@@ -259,7 +278,8 @@ class Output:
 
         json_data: dict[str, Any] = self._read_json(json_file)
         # > Convert all keys to lowercase.
-        lowercase(json_data)
+        with span("output.lowercase", file=json_file.name):
+            lowercase(json_data)
         return json_data
 
     def _redump_jsons(self) -> None:
@@ -546,6 +566,20 @@ class Output:
         except FileNotFoundError:
             return False
 
+    def get_abort_reason(self) -> AbortReason | None:
+        """
+        Reason why the job was aborted by a `Watchdog`, read from the ".abort.json" file.
+
+        Returns
+        -------
+        AbortReason | None
+            The abort record or None, if the job was not aborted.
+        """
+        try:
+            return AbortReason.read(self.get_file(".abort.json"))
+        except FileNotFoundError:
+            return None
+
     def scf_converged(self) -> bool:
         """
         Determine if ORCA SCF converged, by looking for "SUCCESS" in the ".out" file.
@@ -563,6 +597,22 @@ class Output:
         except FileNotFoundError:
             return False
 
+    def get_scf_cycles(self) -> list[int]:
+        """
+        Number of cycles of all converged SCF runs, e.g., one per step of a geometry optimization.
+        If the ".out" file does not exist, an empty list is returned.
+
+        Returns
+        -------
+        list[int]
+            Number of SCF cycles in the order of the ".out" file.
+        """
+        outfile = self.get_outfile()
+        try:
+            return get_scf_cycles(outfile)
+        except FileNotFoundError:
+            return []
+
     def geometry_optimization_converged(self) -> bool:
         """
         Determine if ORCA geometry optimization converged, by looking for "HURRAY" in the ".out" file.
@@ -681,44 +731,15 @@ class Output:
             Returns the cube output object or returns None if the cube file cannot be retrieved.
         """
 
-        operator_list = ["a", "b"]
-
-        # > Define input string for orca_plot.
-        # > If anything goes wrong orca_plot should exit.
-        stdin_list = [
-            "1",  # Select type of plot
-            "1",  # Enter MO plot
-            "2",  # Select index of orbital
-            str(index),  # Enter index
-            "3",  # Select alpha/beta operator
-            str(operator),  # Enter alpha/beta (0/1)
-            "4",  # Select the resolution (grid size) settings
-            str(resolution),  # Enter resolution
-            "5",  # Select the output format
-            "7",  # Request cube file format
-            "11",  # Perform the plotting
-            "12",  # Exit the program
-        ]
-
-        if isinstance(gbw_type, str):
-            gbw_type = GbwSuffix(gbw_type)
-
-        # > determine which gbw file to plot
-        suffix = gbw_type.value
-        gbw_file = self.gbw_json_files[gbw_index].with_suffix(suffix)
-
-        self.run_orca_plot(stdin_list, timeout=timeout, gbw_file=gbw_file)
-
-        # > get the resulting cube file as string
-        cube_file = self.get_file(
-            f".mo{index}{operator_list[operator]}.cube",
-            basename=self.gbw_json_files[gbw_index].stem,
+        request = PlotRequest.mo(index, operator=operator)
+        cubes = self.plot_batch(
+            [request],
+            resolution=resolution,
+            timeout=timeout,
+            gbw_type=gbw_type,
+            gbw_index=gbw_index,
         )
-
-        if not cube_file.is_file():
-            return None
-
-        return CubeOutput(cube_file)
+        return cubes[request]
 
     def plot_density(
         self,
@@ -752,31 +773,11 @@ class Output:
         CubeOutput | None
             Returns the cube output object or returns None if the cube file cannot be retrieved.
         """
-        gbw_file = self.gbw_json_files[gbw_index].with_suffix(".gbw")
-
-        # > Define input string for orca_plot.
-        # > If anything goes wrong orca_plot should exit.
-        stdin_list = [
-            "1",  # Select type of plot
-            "2",  # Enter density plot
-            "n",  # Do not use the default density
-            f"{self.basename}{suffix}",  # Select density name
-            "4",  # Select the resolution (grid size) settings
-            str(resolution),  # Enter resolution
-            "5",  # Select the output format
-            "7",  # Request cube file format
-            "11",  # Perform the plotting
-            "12",  # Exit the program
-        ]
-        self.run_orca_plot(stdin_list, timeout=timeout, gbw_file=gbw_file)
-
-        # > get the resulting cube file as string
-        cube_file = self.get_file(".eldens.cube", basename=gbw_file.stem)
-
-        if not cube_file.is_file():
-            return None
-
-        return CubeOutput(cube_file)
+        request = PlotRequest.density(suffix=suffix)
+        cubes = self.plot_batch(
+            [request], resolution=resolution, timeout=timeout, gbw_index=gbw_index
+        )
+        return cubes[request]
 
     def plot_spin_density(
         self,
@@ -811,30 +812,90 @@ class Output:
         CubeOutput | None
             Returns the cube output object or returns None if the cube file cannot be retrieved.
         """
-        gbw_file = self.gbw_json_files[gbw_index].with_suffix(".gbw")
-        # > Define input string for orca_plot.
-        # > If anything goes wrong orca_plot should exit.
+        request = PlotRequest.spin_density(suffix=suffix)
+        cubes = self.plot_batch(
+            [request], resolution=resolution, timeout=timeout, gbw_index=gbw_index
+        )
+        return cubes[request]
+
+    def plot_batch(
+        self,
+        requests: Iterable[PlotRequest],
+        /,
+        *,
+        resolution: StrictNonNegativeInt = 40,
+        timeout: int = 600,
+        gbw_type: str | GbwSuffix = GbwSuffix.GBW,
+        gbw_index: int = 0,
+    ) -> dict[PlotRequest, CubeOutput | None]:
+        """
+        Generates the cube files for many MOs and densities in a single interactive orca_plot session.
+        Thereby, orca_plot is started and the gbw file is loaded only once for all requests.
+        **Attention:** will terminate orca_plot after 600 seconds by default. If you plot many or large cubes you will
+        have to adapt this threshold or set it to -1 for waiting indefinitely!
+
+        Parameters
+        ----------
+        requests: Iterable[PlotRequest]
+            Items to plot. Duplicates are plotted only once.
+        resolution: StrictNonNegativeInt, default = 40
+            Resolution of all generated cube files.
+        timeout: int, default = 600
+            Time after which the whole orca_plot session will be stopped. Set to -1 for waiting indefinitely long.
+        gbw_type: str | GbwSuffix, default = GbwSuffix.GBW
+            Type of the gbw file that is used for plotting.
+        gbw_index: int, default = 0
+            Non-negative index of gbw file in `self.gbw_json_files` that is used for plotting. Default 0 refers to the main gbw file.
+
+        Returns
+        -------
+        dict[PlotRequest, CubeOutput | None]
+            Cube output object for each request or None if the cube file was not (re-)written by orca_plot.
+
+        Raises
+        ----------
+        ValueError
+            If no request is given or if several requests would write to the same cube file.
+        FileNotFoundError
+            If the gbw file is not found.
+        """
+        # > Remove duplicates but keep order
+        unique_requests = list(dict.fromkeys(requests))
+        if not unique_requests:
+            raise ValueError("No plot requests supplied to plot_batch!")
+
+        if isinstance(gbw_type, str):
+            gbw_type = GbwSuffix(gbw_type)
+        gbw_file = self.gbw_json_files[gbw_index].with_suffix(gbw_type.value)
+
+        # > Cube files that are expected. orca_plot always uses the same name for a plot type.
+        cube_files = {request: request.cube_file(gbw_file) for request in unique_requests}
+        if len(set(cube_files.values())) != len(cube_files):
+            raise ValueError(
+                "Several plot requests would write to the same cube file. Use separate batches."
+            )
+
+        # > Remember modification times to detect cubes that were not rewritten
+        mtimes = {
+            request: cube_file.stat().st_mtime_ns if cube_file.is_file() else None
+            for request, cube_file in cube_files.items()
+        }
+
         stdin_list = [
-            "1",  # Select type of plot
-            "3",  # Enter spin density plot
-            "n",  # Do not use the default density
-            f"{self.basename}{suffix}",  # Select density name
-            "4",  # Select the resolution (grid size) settings
-            str(resolution),  # Enter resolution
-            "5",  # Select the output format
-            "7",  # Request cube file format
-            "11",  # Perform the plotting
-            "12",  # Exit the program
+            line
+            for request in unique_requests
+            for line in request.stdin_list(self.basename, resolution=resolution)
         ]
+        stdin_list.append("12")  # Exit the program
         self.run_orca_plot(stdin_list, timeout=timeout, gbw_file=gbw_file)
 
-        # > get the resulting cube file as string
-        cube_file = self.get_file(".spindens.cube", basename=gbw_file.stem)
-
-        if not cube_file.is_file():
-            return None
-
-        return CubeOutput(cube_file)
+        cubes: dict[PlotRequest, CubeOutput | None] = {}
+        for request, cube_file in cube_files.items():
+            if cube_file.is_file() and cube_file.stat().st_mtime_ns != mtimes[request]:
+                cubes[request] = CubeOutput(cube_file)
+            else:
+                cubes[request] = None
+        return cubes
 
     def _safe_get(self, *attrs: str | int) -> Any | None:
         """
@@ -865,18 +926,19 @@ class Output:
             but returns None if any part of the chain is missing or None, in a mypy-friendly way.
         """
         current = self
-        for attr in attrs:
-            if current is None:
-                return None
-            try:
-                if isinstance(attr, int) and isinstance(current, list):
-                    current = current[attr]
-                elif isinstance(attr, str):
-                    current = getattr(current, attr)
-                else:
-                    raise TypeError
-            except (AttributeError, IndexError, TypeError):
-                return None
+        with span("output.get", path=attrs):
+            for attr in attrs:
+                if current is None:
+                    return None
+                try:
+                    if isinstance(attr, int) and isinstance(current, list):
+                        current = current[attr]
+                    elif isinstance(attr, str):
+                        current = getattr(current, attr)
+                    else:
+                        raise TypeError
+                except (AttributeError, IndexError, TypeError):
+                    return None
         return current
 
     def get_hftype(self, index: int = 0) -> Hftyp | None:
@@ -996,6 +1058,22 @@ class Output:
 
         return nbf
 
+    def get_calculation_timings(self) -> CalculationTiming | None:
+        """
+        Get the wall times of the ORCA modules from the json properties file.
+
+        Returns
+        -------
+        timings : CalculationTiming | None
+            Wall times in seconds, or None if the job has no timings.
+        """
+        timings = self._safe_get("results_properties", "calculation_timings")
+
+        if timings is not None:
+            timings = cast(CalculationTiming, timings)
+
+        return timings
+
     def get_final_energy(self, *, index: int = -1) -> StrictFiniteFloat | None:
         """
         Easy access to the final single point energy.
@@ -1,11 +1,232 @@
+from itertools import islice
 from pathlib import Path
-from typing import Iterator
+from typing import Any, Iterator, TextIO
+
+import numpy as np
+import numpy.typing as npt
+
+# > Suffix of the binary cache file for volumetric data.
+CUBE_CACHE_SUFFIX = ".npy"
+
+
+class CubeHeader:
+    """
+    Header of a Gaussian cube file.
+
+    Attributes
+    ----------
+    comments: tuple[str, str]
+        The two comment lines at the top of the file.
+    origin: npt.NDArray[np.float64]
+        Origin of the volumetric grid, shape (3,).
+    shape: tuple[int, int, int]
+        Number of voxels along each of the three axes.
+    axes: npt.NDArray[np.float64]
+        Voxel step vectors as rows, shape (3, 3).
+    atomic_numbers: npt.NDArray[np.int64]
+        Atomic numbers of all atoms, shape (natoms,).
+    nuclear_charges: npt.NDArray[np.float64]
+        Nuclear charges of all atoms, shape (natoms,).
+    atom_coordinates: npt.NDArray[np.float64]
+        Cartesian coordinates of all atoms, shape (natoms, 3).
+    mo_indices: tuple[int, ...] | None
+        Indices of the orbitals stored in the file. Only present if the number of atoms is given as negative number.
+    nval: int
+        Number of values stored per voxel.
+    angstrom: bool
+        If True, the grid is given in Angstrom, otherwise in Bohr.
+        Indicated by negative voxel numbers in the file.
+    nlines: int
+        Number of header lines, i.e., the line index at which the volumetric data starts.
+    """
+
+    def __init__(
+        self,
+        *,
+        comments: tuple[str, str],
+        origin: npt.NDArray[np.float64],
+        shape: tuple[int, int, int],
+        axes: npt.NDArray[np.float64],
+        atomic_numbers: npt.NDArray[np.int64],
+        nuclear_charges: npt.NDArray[np.float64],
+        atom_coordinates: npt.NDArray[np.float64],
+        mo_indices: tuple[int, ...] | None = None,
+        nval: int = 1,
+        angstrom: bool = False,
+        nlines: int = 0,
+    ) -> None:
+        self.comments = comments
+        self.origin = origin
+        self.shape = shape
+        self.axes = axes
+        self.atomic_numbers = atomic_numbers
+        self.nuclear_charges = nuclear_charges
+        self.atom_coordinates = atom_coordinates
+        self.mo_indices = mo_indices
+        self.nval = nval
+        self.angstrom = angstrom
+        self.nlines = nlines
+
+    @property
+    def natoms(self) -> int:
+        return len(self.atomic_numbers)
+
+    @property
+    def npoints(self) -> int:
+        """Total number of grid points."""
+        return int(np.prod(self.shape))
+
+    @property
+    def data_shape(self) -> tuple[int, ...]:
+        """Shape of the volumetric data. A fourth axis is added if more than one value is stored per voxel."""
+        if self.nval > 1:
+            return (*self.shape, self.nval)
+        return self.shape
+
+    @property
+    def voxel_volume(self) -> float:
+        """Volume of a single voxel, i.e., the determinant of `axes`."""
+        return float(abs(np.linalg.det(self.axes)))
+
+    @property
+    def plane_size(self) -> int:
+        """Number of values per plane of constant x index."""
+        return self.shape[1] * self.shape[2] * self.nval
+
+    def copy(self, **changes: Any) -> "CubeHeader":
+        """
+        Return a copy of the header with some attributes replaced.
+
+        Parameters
+        ----------
+        **changes : Any
+            Attributes to replace, e.g., `shape` or `origin`.
+        """
+        attributes: dict[str, Any] = {
+            "comments": self.comments,
+            "origin": self.origin.copy(),
+            "shape": self.shape,
+            "axes": self.axes.copy(),
+            "atomic_numbers": self.atomic_numbers.copy(),
+            "nuclear_charges": self.nuclear_charges.copy(),
+            "atom_coordinates": self.atom_coordinates.copy(),
+            "mo_indices": self.mo_indices,
+            "nval": self.nval,
+            "angstrom": self.angstrom,
+        }
+        attributes.update(changes)
+        return CubeHeader(**attributes)
+
+    def format_orca(self) -> str:
+        """Format the header lines of a cube file."""
+        sign = -1 if self.angstrom else 1
+        natoms = -self.natoms if self.mo_indices is not None else self.natoms
+        origin = "".join(f"{x:12.6f}" for x in self.origin)
+        nval = f"{self.nval:5d}" if self.nval > 1 and self.mo_indices is None else ""
+        lines = [*self.comments, f"{natoms:5d}{origin}{nval}"]
+        for count, axis in zip(self.shape, self.axes):
+            lines.append(f"{sign * count:5d}" + "".join(f"{x:12.6f}" for x in axis))
+        for number, charge, coords in zip(
+            self.atomic_numbers, self.nuclear_charges, self.atom_coordinates
+        ):
+            lines.append(f"{number:5d}{charge:12.6f}" + "".join(f"{x:12.6f}" for x in coords))
+        if self.mo_indices is not None:
+            lines.append(f"{len(self.mo_indices):5d}" + "".join(f"{i:5d}" for i in self.mo_indices))
+        return "\n".join(lines) + "\n"
+
+    def to_dict(self) -> dict[str, Any]:
+        """Convert the header to plain JSON-serializable data."""
+        return {
+            "comments": list(self.comments),
+            "origin": self.origin.tolist(),
+            "shape": list(self.shape),
+            "axes": self.axes.tolist(),
+            "atomic_numbers": self.atomic_numbers.tolist(),
+            "nuclear_charges": self.nuclear_charges.tolist(),
+            "atom_coordinates": self.atom_coordinates.tolist(),
+            "mo_indices": list(self.mo_indices) if self.mo_indices is not None else None,
+            "nval": self.nval,
+            "angstrom": self.angstrom,
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any], /) -> "CubeHeader":
+        """Create a header from data created by `to_dict()`."""
+        mo_indices = data.get("mo_indices")
+        return cls(
+            comments=(data["comments"][0], data["comments"][1]),
+            origin=np.array(data["origin"], dtype=np.float64),
+            shape=(data["shape"][0], data["shape"][1], data["shape"][2]),
+            axes=np.array(data["axes"], dtype=np.float64).reshape(3, 3),
+            atomic_numbers=np.array(data["atomic_numbers"], dtype=np.int64),
+            nuclear_charges=np.array(data["nuclear_charges"], dtype=np.float64),
+            atom_coordinates=np.array(data["atom_coordinates"], dtype=np.float64).reshape(-1, 3),
+            mo_indices=tuple(mo_indices) if mo_indices is not None else None,
+            nval=data.get("nval", 1),
+            angstrom=data.get("angstrom", False),
+        )
+
+    @classmethod
+    def from_lines(cls, lines: Iterator[str], /) -> "CubeHeader":
+        """
+        Parse the header from the lines of a cube file. Consumes exactly the header lines from `lines`.
+
+        Parameters
+        ----------
+        lines : Iterator[str]
+            Lines of a cube file starting at the first line.
+
+        Raises
+        ------
+        ValueError
+            If the header is incomplete or malformed.
+        """
+        try:
+            comments = (next(lines).rstrip("\n"), next(lines).rstrip("\n"))
+            fields = next(lines).split()
+            natoms = int(fields[0])
+            origin = np.array(fields[1:4], dtype=np.float64)
+            nval = int(fields[4]) if len(fields) > 4 else 1
+
+            voxels = [next(lines).split() for _ in range(3)]
+            counts = [int(v[0]) for v in voxels]
+            axes = np.array([v[1:4] for v in voxels], dtype=np.float64)
+
+            atoms = np.array(
+                [next(lines).split()[:5] for _ in range(abs(natoms))], dtype=np.float64
+            ).reshape(abs(natoms), 5)
+            nlines = 6 + abs(natoms)
+
+            # > Negative number of atoms: Orbital indices follow the atoms.
+            mo_indices = None
+            if natoms < 0:
+                mo_fields = [int(f) for f in next(lines).split()]
+                mo_indices = tuple(mo_fields[1 : 1 + mo_fields[0]])
+                nval = max(len(mo_indices), 1)
+                nlines += 1
+        except (StopIteration, IndexError, ValueError) as err:
+            raise ValueError(f"Invalid cube file header: {err}") from err
+
+        return cls(
+            comments=comments,
+            origin=origin,
+            shape=(abs(counts[0]), abs(counts[1]), abs(counts[2])),
+            axes=axes,
+            atomic_numbers=atoms[:, 0].astype(np.int64),
+            nuclear_charges=atoms[:, 1],
+            atom_coordinates=atoms[:, 2:5],
+            mo_indices=mo_indices,
+            nval=nval,
+            angstrom=counts[0] < 0,
+            nlines=nlines,
+        )
 
 
 class CubeOutput:
     """
     Class that stores the path to a cube file and provides easy access to the cube
     data via the cube property. Reads the cube file upon access to cube property.
+    Structured access is given through `header` and `read_data()`.
     """
 
     def __init__(self, path: Path):
@@ -13,12 +234,18 @@ class CubeOutput:
             self._path = path
         else:
             raise FileNotFoundError(f"{path} is not a valid file.")
+        self._header: CubeHeader | None = None
 
     @property
     def path(self) -> Path:
         """Read only access to the path."""
         return self._path
 
+    @property
+    def cache_path(self) -> Path:
+        """Path to the binary cache of the volumetric data next to the cube file."""
+        return self._path.with_suffix(CUBE_CACHE_SUFFIX)
+
     @property
     def cube(self) -> str:
         """
@@ -36,6 +263,132 @@ class CubeOutput:
         """
         return self._path.read_text()
 
+    @property
+    def header(self) -> CubeHeader:
+        """
+        Header of the cube file. Only the header lines are read and the result is kept.
+
+        Raises
+        ----------
+        FileNotFoundError
+            If the cube file does not exist.
+        ValueError
+            If the header is malformed.
+        """
+        if self._header is None:
+            with self._path.open() as f:
+                self._header = CubeHeader.from_lines(f)
+        return self._header
+
+    def _open_data(self) -> TextIO:
+        """Open the cube file and skip all header lines."""
+        f = self._path.open()
+        for _ in islice(f, self.header.nlines):
+            pass
+        return f
+
+    def read_data(self, *, use_cache: bool = False) -> npt.NDArray[np.float64]:
+        """
+        Read the volumetric data into an array of shape `header.data_shape`,
+        i.e., (nx, ny, nz) or (nx, ny, nz, nval).
+
+        Parameters
+        ----------
+        use_cache : bool, default: False
+            True: Convert the text data once into a binary `.npy` file next to the cube file (see `write_cache()`)
+            and return a read-only memory-map of it. The cache is recreated if it is older than the cube file.
+            False: Parse the text data and return an in-memory array.
+
+        Raises
+        ----------
+        FileNotFoundError
+            If the cube file does not exist.
+        ValueError
+            If the number of values does not match the header.
+        """
+        if use_cache:
+            if not self.has_valid_cache():
+                self.write_cache()
+            data: npt.NDArray[np.float64] = np.load(self.cache_path, mmap_mode="r")
+            return data
+
+        header = self.header
+        with self._open_data() as f:
+            # > Bulk conversion of all remaining text at once.
+            values = np.fromstring(f.read(), dtype=np.float64, sep=" ")
+
+        expected = header.npoints * header.nval
+        if values.size != expected:
+            raise ValueError(
+                f"Cube file {self._path} contains {values.size} values, but {expected} were expected."
+            )
+        return values.reshape(header.data_shape)
+
+    def iter_chunks(self, planes: int = 16, /) -> Iterator[npt.NDArray[np.float64]]:
+        """
+        Lazily read the volumetric data in chunks of `planes` planes along the first axis.
+        Each chunk has the shape (n, ny, nz) or (n, ny, nz, nval) with n <= `planes`.
+        Only a single chunk is kept in memory at a time, so cubes larger than the main memory can be processed.
+
+        Parameters
+        ----------
+        planes : int, default: 16
+            Number of planes per chunk.
+
+        Raises
+        ------
+        FileNotFoundError
+            If the cube file does not exist.
+        ValueError
+            If the number of values does not match the header.
+        """
+        if planes < 1:
+            raise ValueError("Number of planes per chunk must be positive.")
+        header = self.header
+        nx = header.shape[0]
+        buffer = np.empty(0, dtype=np.float64)
+        with self._open_data() as f:
+            for x0 in range(0, nx, planes):
+                n = min(planes, nx - x0)
+                needed = n * header.plane_size
+                parts = [buffer]
+                available = buffer.size
+                while available < needed:
+                    # > Read roughly 4 MiB of text at once and convert in bulk
+                    lines = f.readlines(1 << 22)
+                    if not lines:
+                        raise ValueError(f"Cube file {self._path} contains too few values.")
+                    values = np.fromstring("".join(lines), dtype=np.float64, sep=" ")
+                    parts.append(values)
+                    available += values.size
+                values = np.concatenate(parts) if len(parts) > 1 else parts[0]
+                yield values[:needed].reshape((n, *header.data_shape[1:]))
+                buffer = values[needed:]
+            if buffer.size or f.read().strip():
+                raise ValueError(f"Cube file {self._path} contains too many values.")
+
+    def has_valid_cache(self) -> bool:
+        """Check if the binary cache exists and is not older than the cube file."""
+        cache = self.cache_path
+        return cache.is_file() and cache.stat().st_mtime >= self._path.stat().st_mtime
+
+    def write_cache(self) -> Path:
+        """
+        Parse the volumetric data and store it as binary `.npy` file next to the cube file.
+
+        Returns
+        -------
+        Path
+            Path to the binary cache file.
+        """
+        cache = self.cache_path
+        # > Write to a temporary file first, so that concurrent readers never see a partial cache.
+        tmp_cache = cache.with_suffix(".tmp" + CUBE_CACHE_SUFFIX)
+        with tmp_cache.open("wb") as f:
+            np.save(f, self.read_data(use_cache=False))
+        tmp_cache.replace(cache)
+        return cache
+
     def __iter__(self) -> Iterator[str]:
         """
         Lazily yields lines from the cube file (memory efficient).
@@ -0,0 +1,465 @@
+"""
+Vectorized arithmetic and compact storage for cube files.
+
+All operations process the volumetric data in chunks of planes along the first grid axis,
+so cube files larger than the main memory can be handled.
+The results are written to a new file. If the target path ends with `COMPRESSED_CUBE_SUFFIX`
+a compressed binary cube is written, otherwise a text cube.
+
+The compressed binary format is a zip archive (readable with `numpy.load`) that contains
+the header as `header.json` and the volumetric data as `data.npy`.
+By default the data is stored as float32, which reproduces the text of cube files with up to 7 significant
+digits (ORCA writes 6) exactly upon conversion back to text. Use float64 for a bit-exact round-trip of the parsed values.
+"""
+
+import json
+import math
+import zipfile
+from pathlib import Path
+from types import TracebackType
+from typing import IO, Any, Callable, Iterable, Iterator, Protocol, Sequence
+
+import numpy as np
+import numpy.typing as npt
+
+from opi.output.cube import CubeHeader, CubeOutput
+
+__all__ = (
+    "COMPRESSED_CUBE_SUFFIX",
+    "CompressedCube",
+    "add",
+    "compress",
+    "crop",
+    "decompress",
+    "downsample",
+    "integrate",
+    "scale",
+    "subtract",
+    "write_cube",
+)
+
+# > File suffix of compressed binary cubes
+COMPRESSED_CUBE_SUFFIX = ".npz"
+# > Default number of planes processed at once
+CHUNK_PLANES = 16
+
+
+class CubeSource(Protocol):
+    """Anything that provides a cube header and chunks of volumetric data."""
+
+    @property
+    def header(self) -> CubeHeader: ...
+
+    def iter_chunks(self, planes: int = CHUNK_PLANES, /) -> Iterator[npt.NDArray[np.float64]]: ...
+
+
+class CompressedCube:
+    """
+    Cube stored in the compressed binary format.
+    Offers the same `header`, `read_data()` and `iter_chunks()` interface as `CubeOutput`.
+    """
+
+    HEADER_NAME = "header.json"
+    DATA_NAME = "data.npy"
+
+    def __init__(self, path: Path) -> None:
+        if not path.is_file():
+            raise FileNotFoundError(f"{path} is not a valid file.")
+        self._path = path
+        self._header: CubeHeader | None = None
+
+    @property
+    def path(self) -> Path:
+        """Read only access to the path."""
+        return self._path
+
+    @property
+    def header(self) -> CubeHeader:
+        if self._header is None:
+            with zipfile.ZipFile(self._path) as archive:
+                self._header = CubeHeader.from_dict(json.loads(archive.read(self.HEADER_NAME)))
+        return self._header
+
+    def iter_chunks(self, planes: int = CHUNK_PLANES, /) -> Iterator[npt.NDArray[np.float64]]:
+        """
+        Lazily read the volumetric data in chunks of `planes` planes along the first axis.
+
+        Parameters
+        ----------
+        planes : int, default: 16
+            Number of planes per chunk.
+        """
+        header = self.header
+        nx = header.shape[0]
+        with zipfile.ZipFile(self._path) as archive, archive.open(self.DATA_NAME) as f:
+            version = np.lib.format.read_magic(f)
+            if version == (1, 0):
+                shape, _, dtype = np.lib.format.read_array_header_1_0(f)
+            else:
+                shape, _, dtype = np.lib.format.read_array_header_2_0(f)
+            if tuple(shape) != header.data_shape:
+                raise ValueError(f"Compressed cube {self._path} has inconsistent data shape.")
+            for x0 in range(0, nx, planes):
+                n = min(planes, nx - x0)
+                nbytes = n * header.plane_size * dtype.itemsize
+                values = np.frombuffer(f.read(nbytes), dtype=dtype)
+                yield values.astype(np.float64).reshape((n, *header.data_shape[1:]))
+
+    def read_data(self) -> npt.NDArray[np.float64]:
+        """Read the complete volumetric data."""
+        return np.concatenate(list(self.iter_chunks(max(self.header.shape[0], 1))))
+
+    def __str__(self) -> str:
+        """Returns the name of the class and the path the object holds"""
+        return f"{self.__class__.__name__}({self.path})"
+
+
+class _CubeWriter:
+    """Writes a cube file plane by plane, either as text or as compressed binary cube."""
+
+    # > Number of values per line in text cube files
+    VALUES_PER_LINE = 6
+
+    def __init__(self, path: Path, header: CubeHeader, /, *, dtype: npt.DTypeLike) -> None:
+        self.path = path
+        self.header = header
+        self.dtype = np.dtype(dtype)
+        self.binary = path.suffix == COMPRESSED_CUBE_SUFFIX
+        self._archive: zipfile.ZipFile | None = None
+        self._file: IO[Any] | None = None
+        # > Format of all lines that belong to one row of constant x and y index.
+        row = header.shape[2] * header.nval
+        full, rest = divmod(row, self.VALUES_PER_LINE)
+        self._row_format = ("%13.5E" * self.VALUES_PER_LINE + "\n") * full
+        if rest:
+            self._row_format += "%13.5E" * rest + "\n"
+
+    def __enter__(self) -> "_CubeWriter":
+        if self.binary:
+            self._archive = zipfile.ZipFile(self.path, "w", compression=zipfile.ZIP_DEFLATED)
+            self._archive.writestr(CompressedCube.HEADER_NAME, json.dumps(self.header.to_dict()))
+            self._file = self._archive.open(CompressedCube.DATA_NAME, "w", force_zip64=True)
+            np.lib.format.write_array_header_2_0(
+                self._file,
+                {
+                    "descr": np.lib.format.dtype_to_descr(self.dtype),
+                    "fortran_order": False,
+                    "shape": self.header.data_shape,
+                },
+            )
+        else:
+            self._file = self.path.open("w")
+            self._file.write(self.header.format_orca())
+        return self
+
+    def write(self, chunk: npt.NDArray[np.float64], /) -> None:
+        """Append a chunk of planes."""
+        assert self._file is not None
+        if self.binary:
+            self._file.write(np.ascontiguousarray(chunk, dtype=self.dtype).tobytes())
+        else:
+            rows = chunk.reshape(-1, self.header.shape[2] * self.header.nval)
+            text = (self._row_format * len(rows)) % tuple(rows.ravel().tolist())
+            self._file.write(text)
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc: BaseException | None,
+        traceback: TracebackType | None,
+    ) -> None:
+        if self._file is not None:
+            self._file.close()
+        if self._archive is not None:
+            self._archive.close()
+
+    def result(self) -> CubeOutput | CompressedCube:
+        """Object that gives access to the written file."""
+        return CompressedCube(self.path) if self.binary else CubeOutput(self.path)
+
+
+def write_cube(
+    target: Path,
+    header: CubeHeader,
+    chunks: Iterable[npt.NDArray[np.float64]],
+    /,
+    *,
+    dtype: npt.DTypeLike = np.float32,
+) -> CubeOutput | CompressedCube:
+    """
+    Write a cube file from chunks of planes along the first grid axis.
+
+    Parameters
+    ----------
+    target : Path
+        Path of the cube. Written in compressed binary format if the suffix is `COMPRESSED_CUBE_SUFFIX`.
+    header : CubeHeader
+        Header of the cube.
+    chunks : Iterable[npt.NDArray[np.float64]]
+        Volumetric data in chunks of shape (n, ny, nz) or (n, ny, nz, nval), in order along the first axis.
+    dtype : npt.DTypeLike, default: np.float32
+        Data type used for compressed binary cubes.
+    """
+    with _CubeWriter(target, header, dtype=dtype) as writer:
+        for chunk in chunks:
+            writer.write(chunk)
+    return writer.result()
+
+
+def _check_same_grid(first: CubeHeader, second: CubeHeader, /) -> None:
+    """Raise ValueError if the two cubes are not defined on the same grid."""
+    if (
+        first.data_shape != second.data_shape
+        or first.angstrom != second.angstrom
+        or not np.allclose(first.origin, second.origin)
+        or not np.allclose(first.axes, second.axes)
+    ):
+        raise ValueError("Cubes are not defined on the same grid.")
+
+
+def _combine(
+    first: CubeSource,
+    second: CubeSource,
+    target: Path,
+    operation: Callable[
+        [npt.NDArray[np.float64], npt.NDArray[np.float64]], npt.NDArray[np.float64]
+    ],
+    /,
+    *,
+    planes: int,
+    dtype: npt.DTypeLike,
+) -> CubeOutput | CompressedCube:
+    """Apply an element-wise `operation` to two cubes on the same grid."""
+    _check_same_grid(first.header, second.header)
+    chunks = (
+        operation(a, b) for a, b in zip(first.iter_chunks(planes), second.iter_chunks(planes))
+    )
+    return write_cube(target, first.header, chunks, dtype=dtype)
+
+
+def add(
+    first: CubeSource,
+    second: CubeSource,
+    target: Path,
+    /,
+    *,
+    planes: int = CHUNK_PLANES,
+    dtype: npt.DTypeLike = np.float32,
+) -> CubeOutput | CompressedCube:
+    """
+    Element-wise sum of two cubes on the same grid. The header of `first` is used for the result.
+
+    Parameters
+    ----------
+    first : CubeSource
+    second : CubeSource
+    target : Path
+        Path of the resulting cube. Written in compressed binary format if the suffix is `COMPRESSED_CUBE_SUFFIX`.
+    planes : int, default: 16
+        Number of planes processed at once.
+    dtype : npt.DTypeLike, default: np.float32
+        Data type used for compressed binary cubes.
+
+    Raises
+    ------
+    ValueError
+        If the cubes are not defined on the same grid.
+    """
+    return _combine(first, second, target, np.add, planes=planes, dtype=dtype)
+
+
+def subtract(
+    first: CubeSource,
+    second: CubeSource,
+    target: Path,
+    /,
+    *,
+    planes: int = CHUNK_PLANES,
+    dtype: npt.DTypeLike = np.float32,
+) -> CubeOutput | CompressedCube:
+    """
+    Element-wise difference `first - second` of two cubes on the same grid, e.g., for difference densities.
+    For the parameters refer to `add()`.
+
+    Raises
+    ------
+    ValueError
+        If the cubes are not defined on the same grid.
+    """
+    return _combine(first, second, target, np.subtract, planes=planes, dtype=dtype)
+
+
+def scale(
+    cube: CubeSource,
+    factor: float,
+    target: Path,
+    /,
+    *,
+    planes: int = CHUNK_PLANES,
+    dtype: npt.DTypeLike = np.float32,
+) -> CubeOutput | CompressedCube:
+    """
+    Multiply all values of a cube by `factor`. For the other parameters refer to `add()`.
+    """
+    chunks = (chunk * factor for chunk in cube.iter_chunks(planes))
+    return write_cube(target, cube.header, chunks, dtype=dtype)
+
+
+def integrate(
+    cube: CubeSource, /, *, planes: int = CHUNK_PLANES
+) -> float | npt.NDArray[np.float64]:
+    """
+    Integrate a cube numerically, i.e., the sum of all values times the voxel volume.
+
+    Returns
+    -------
+    float | npt.NDArray[np.float64]
+        The integral, or an array with one integral per value if more than one value is stored per voxel.
+    """
+    header = cube.header
+    total = np.zeros(header.nval, dtype=np.float64)
+    for chunk in cube.iter_chunks(planes):
+        total += chunk.reshape(-1, header.nval).sum(axis=0)
+    total *= header.voxel_volume
+    return float(total[0]) if header.nval == 1 else total
+
+
+def crop(
+    cube: CubeSource,
+    lower: Sequence[float],
+    upper: Sequence[float],
+    target: Path,
+    /,
+    *,
+    planes: int = CHUNK_PLANES,
+    dtype: npt.DTypeLike = np.float32,
+) -> CubeOutput | CompressedCube:
+    """
+    Crop a cube to all grid points inside an axis-aligned bounding box.
+    For the other parameters refer to `add()`.
+
+    Parameters
+    ----------
+    lower : Sequence[float]
+        Lower corner of the bounding box in the units of the cube.
+    upper : Sequence[float]
+        Upper corner of the bounding box in the units of the cube.
+
+    Raises
+    ------
+    ValueError
+        If the grid axes are not aligned with the Cartesian axes or if no grid point is inside the bounding box.
+    """
+    header = cube.header
+    steps = np.diag(header.axes)
+    if not np.allclose(header.axes, np.diag(steps)) or np.any(steps <= 0):
+        raise ValueError("Cropping requires grid axes aligned with the Cartesian axes.")
+
+    start = np.ceil((np.asarray(lower) - header.origin) / steps - 1e-9).astype(int)
+    stop = np.floor((np.asarray(upper) - header.origin) / steps + 1e-9).astype(int) + 1
+    start = np.clip(start, 0, header.shape)
+    stop = np.clip(stop, 0, header.shape)
+    if np.any(stop <= start):
+        raise ValueError("No grid point inside the bounding box.")
+
+    new_header = header.copy(
+        origin=header.origin + start * steps,
+        shape=(int(stop[0] - start[0]), int(stop[1] - start[1]), int(stop[2] - start[2])),
+    )
+
+    def chunks() -> Iterator[npt.NDArray[np.float64]]:
+        x0 = 0
+        for chunk in cube.iter_chunks(planes):
+            lo = max(start[0] - x0, 0)
+            hi = min(stop[0] - x0, len(chunk))
+            if lo < hi:
+                yield chunk[lo:hi, start[1] : stop[1], start[2] : stop[2]]
+            x0 += len(chunk)
+
+    return write_cube(target, new_header, chunks(), dtype=dtype)
+
+
+def downsample(
+    cube: CubeSource,
+    factor: int,
+    target: Path,
+    /,
+    *,
+    planes: int = CHUNK_PLANES,
+    dtype: npt.DTypeLike = np.float32,
+) -> CubeOutput | CompressedCube:
+    """
+    Keep only every `factor`-th grid point along each axis.
+    For the other parameters refer to `add()`.
+
+    Parameters
+    ----------
+    factor : int
+        Positive integer stride.
+    """
+    if factor < 1:
+        raise ValueError("Downsampling factor must be a positive integer.")
+    header = cube.header
+    new_header = header.copy(
+        axes=header.axes * factor,
+        shape=(
+            math.ceil(header.shape[0] / factor),
+            math.ceil(header.shape[1] / factor),
+            math.ceil(header.shape[2] / factor),
+        ),
+    )
+    # > Chunks that contain a multiple of `factor` planes keep the stride aligned
+    planes = max(planes // factor, 1) * factor
+    chunks = (chunk[::factor, ::factor, ::factor] for chunk in cube.iter_chunks(planes))
+    return write_cube(target, new_header, chunks, dtype=dtype)
+
+
+def compress(
+    cube: CubeSource,
+    target: Path | None = None,
+    /,
+    *,
+    planes: int = CHUNK_PLANES,
+    dtype: npt.DTypeLike = np.float32,
+) -> CompressedCube:
+    """
+    Convert a cube into the compressed binary format.
+
+    Parameters
+    ----------
+    cube : CubeSource
+    target : Path | None, default: None
+        Path of the compressed cube. If None, `COMPRESSED_CUBE_SUFFIX` is appended to the path of `cube`.
+    planes : int, default: 16
+        Number of planes processed at once.
+    dtype : npt.DTypeLike, default: np.float32
+        Data type for storing the values.
+    """
+    if target is None:
+        if not isinstance(cube, CubeOutput | CompressedCube):
+            raise ValueError("A target path is required.")
+        target = cube.path.with_name(cube.path.name + COMPRESSED_CUBE_SUFFIX)
+    if target.suffix != COMPRESSED_CUBE_SUFFIX:
+        raise ValueError(f"Compressed cubes must have the suffix {COMPRESSED_CUBE_SUFFIX}")
+    result = write_cube(target, cube.header, cube.iter_chunks(planes), dtype=dtype)
+    assert isinstance(result, CompressedCube)
+    return result
+
+
+def decompress(cube: CubeSource, target: Path, /, *, planes: int = CHUNK_PLANES) -> CubeOutput:
+    """
+    Convert a cube back into the text format, e.g., for visualization tools.
+
+    Parameters
+    ----------
+    cube : CubeSource
+    target : Path
+        Path of the text cube.
+    planes : int, default: 16
+        Number of planes processed at once.
+    """
+    if target.suffix == COMPRESSED_CUBE_SUFFIX:
+        raise ValueError(f"Text cubes must not have the suffix {COMPRESSED_CUBE_SUFFIX}")
+    result = write_cube(target, cube.header, cube.iter_chunks(planes))
+    assert isinstance(result, CubeOutput)
+    return result
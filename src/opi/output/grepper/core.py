@@ -1,17 +1,43 @@
-from collections.abc import Iterator
+from collections.abc import Iterable, Iterator
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 from pathlib import Path
 from re import IGNORECASE, Pattern, RegexFlag, compile, escape, split
-from typing import Any, Callable
+from typing import Any, Callable, TextIO
 
 from opi.output.grepper.pre_condition import (
     ConditionStatus,
     PreCondition,
 )
+from opi.utils.tracing import span
+
+# > Maximum number of compiled patterns kept in the global regex cache.
+REGEX_CACHE_SIZE: int = 1024
+
+
+@lru_cache(maxsize=REGEX_CACHE_SIZE)
+def _compile_escaped(string: str, flags: RegexFlag | None, /) -> Pattern[str]:
+    """
+    Compile an escaped plain string. Results are cached globally, so repeated searches
+    for the same string do not recompile the pattern.
+
+    Parameters
+    ----------
+    string : str
+        Plain string to be compiled.
+    flags : RegexFlag | None
+        Flags from the `re` module to be incorporated into the Pattern object.
+    """
+    if flags:
+        return compile(escape(string), flags)
+    else:
+        return compile(escape(string))
 
 
 def str2regex(string: str | Pattern[str], flags: RegexFlag | None = None, /) -> Pattern[str]:
     """
-    Translates a plain string into a re.Pattern from regex
+    Translates a plain string into a re.Pattern from regex.
+    Compiled patterns are taken from a global LRU cache.
 
     Parameters
     ----------
@@ -27,10 +53,7 @@ def str2regex(string: str | Pattern[str], flags: RegexFlag | None = None, /) ->
     """
     if isinstance(string, Pattern):
         return string
-    if flags:
-        return compile(escape(string), flags)
-    else:
-        return compile(escape(string))
+    return _compile_escaped(string, flags)
 
 
 def index_in_list(list_to_check: list[str], index: int | None) -> bool:
@@ -59,17 +82,20 @@ def index_in_list(list_to_check: list[str], index: int | None) -> bool:
 
 class Grepper:
     """
-    This class can access a file and search for pattern inside it
+    This class can access a file and search for pattern inside it.
+    Every call of `search` compiles a `GrepQuery` and scans the file once with it.
+    If the same search is performed repeatedly or on many files, create a `GrepQuery` once and reuse it.
 
     Attributes
     ----------
     file: Path
         Path to the file that gets searched
+    pattern: Pattern[str] | None
+        Compiled pattern of the most recent search.
     """
 
     def __init__(self, file: Path) -> None:
         self.file = file
-        self._search_completed: bool = False
         self.pattern: Pattern[str] | None = None
 
     def search(
@@ -90,6 +116,7 @@ class Grepper:
     ) -> list[Any] | Any:
         """
         Search function that search for `pattern` in given file.
+        Thin-wrapper around `GrepQuery.scan_lines()`.
 
         Parameters
         ----------
@@ -131,190 +158,36 @@ class Grepper:
 
         If no matching_pattern is found `fallback` is returned.
         """
-        self._search_completed = False
-        if not case_sensitive:
-            flags = IGNORECASE
-        else:
-            flags = None
-
-        if isinstance(pattern, str):
-            # > convert string to regex pattern
-            self.pattern = str2regex(pattern, flags)
-        else:
-            self.pattern = pattern
-
-        if merge_sep:
-            field_sep += "+"
-        # > Searches for the `PreCondition` and collects the matches of the main pattern
-        matches: list[str] = self.search_through_lines(pre_conditions, skip_lines)
-        # > returns the wanted field and match form all matches
-        reduced_matches: list[str] = self.reduce_matches(
-            matches, matching_pattern, field, field_sep, trim_whitespaces, fallback
+        query = GrepQuery(
+            pattern,
+            pre_conditions=pre_conditions,
+            kind=kind,
+            case_sensitive=case_sensitive,
+            field_sep=field_sep,
+            trim_whitespaces=trim_whitespaces,
+            merge_sep=merge_sep,
+            fallback=fallback,
+            skip_lines=skip_lines,
+            field=field,
+            matching_pattern=matching_pattern,
         )
-        if reduced_matches != fallback:
-            # > converts match/matches to the type defined by kind
-            return_value: list[Any] = self.convert_matches(reduced_matches, kind, fallback)
-        else:
-            return_value = fallback
-        return return_value
-
-    def open_file(self) -> Iterator[str]:
+        self.pattern = query.pattern
+        with (
+            span("grepper.search", file=self.file, pattern=query.pattern.pattern),
+            self.open_file() as file,
+        ):
+            return query.scan_lines(file)
+
+    def open_file(self) -> TextIO:
         """
         Opens the file and yields the lines
 
         Returns
         -------
-        Iterator[str]
+        TextIO
         """
         return self.file.open()
 
-    def search_through_lines(
-        self, pre_conditions: list[PreCondition] | None, skip_lines: int | None
-    ) -> list[str]:
-        """
-        Determines whether a `PreCondition` pattern or pattern is searched and calls the correct function until search is completed
-
-        Parameters
-        ----------
-        pre_conditions : list[PreCondition]| None
-            condition that have to be fulfilled before the pattern can be searched
-        skip_lines : int| None
-            Numbers of lines that are skipped, after pattern is found
-
-        Returns
-        -------
-        list[str]
-            List containing all the lines that are a matching_pattern for the main search
-        """
-        pre_condition_search: bool = bool(pre_conditions)
-        first_time: bool = True
-        matches: list[str] = []
-
-        file = self.open_file()
-        while True:
-            while pre_condition_search and not self._search_completed and pre_conditions:
-                # > searches for the pre conditions in the file
-                pre_conditions_in_file = self.search_for_precondition(
-                    file, pre_conditions, first_time
-                )
-                # > checks if pre conditions are found
-                pre_conditions_found = self.condition_found(pre_conditions_in_file)
-                if pre_conditions_found:
-                    first_time = False
-                    pre_condition_search = False
-            # < searches for the pattern in the file
-            line = self.search_for_pattern(file)
-
-            if not self._search_completed:
-                try:
-                    if isinstance(skip_lines, int):
-                        for _ in range(skip_lines):
-                            line = next(file)
-                    if line:
-                        matches.append(line)
-                    pre_condition_search = bool(pre_conditions)
-                except StopIteration:
-                    self._search_completed = True
-            else:
-                return matches
-
-    def search_for_precondition(
-        self,
-        file: Iterator[str],
-        pre_conditions: list[PreCondition],
-        first_time: bool,
-    ) -> list[PreCondition]:
-        """
-        Searches for all the pre conditions that needs to be searched
-
-        Parameters
-        ----------
-        file : Iterator[str]
-            The lines of the file
-        pre_conditions : list[PreConditions]
-            list of all the pre conditions
-        first_time : bool
-            Is that the first time searching for the pre conditions
-
-        Returns
-        -------
-        list[PreConditions]
-        """
-        try:
-            line: str = next(file)
-        except StopIteration:
-            self._search_completed = True
-        else:
-            for condition in pre_conditions:
-                if isinstance(condition.pattern, str):
-                    condition.pattern = str2regex(condition.pattern, None)
-                line_counter = 0
-                # > Checks if condition search is needed
-                if first_time or condition.per_match:
-                    condition.condition_information = ConditionStatus()
-                    while not bool(condition.condition_information):
-                        if not condition.pattern.search(line):
-                            line_counter = +1
-                            try:
-                                line = next(file)
-                            except StopIteration:
-                                self._search_completed = True
-                                return pre_conditions
-                            # > checks if the search is within the search scope
-                        if condition.within:
-                            if not line_counter - condition.within:
-                                return pre_conditions
-                        if condition.pattern.search(line):
-                            condition.condition_information.condition_found = True
-                            condition.condition_information.line = line
-        return pre_conditions
-
-    @staticmethod
-    def condition_found(pre_conditions: list[PreCondition]) -> bool:
-        """
-        Checks if all `PreCondition` where found
-
-        Parameters
-        ----------
-        pre_conditions : list[PreCondition]
-            List of all pre conditions
-        """
-        for condition in pre_conditions:
-            if not bool(condition.condition_information):
-                return False
-
-        return True
-
-    def search_for_pattern(self, file: Iterator[str]) -> str | None:
-        """
-        Searches for the pattern
-
-        Parameters
-        ----------
-        file : Iterator[str]
-            The lines of the file
-
-        Returns
-        -------
-        str | None
-            Last checked line, None if last line has been searched
-        """
-        try:
-            line = next(file)
-        except StopIteration:
-            self._search_completed = True
-        else:
-            while not self._search_completed:
-                assert self.pattern
-                if self.pattern.search(line):
-                    return line
-                else:
-                    try:
-                        line = next(file)
-                    except StopIteration:
-                        self._search_completed = True
-        return None
-
     @staticmethod
     def reduce_matches(
         matches: list[str],
@@ -417,3 +290,258 @@ class Grepper:
             except ValueError:
                 converted_list.append(fallback)
         return converted_list
+
+
+class GrepQuery:
+    """
+    Compiled, immutable search query.
+    All patterns are compiled once upon initialization (using the global regex cache of `str2regex`)
+    and the given `PreCondition` objects are copied, so they are never modified by a scan.
+    All state of a search is kept in a separate object per scan.
+    Thereby, the same query can be used to scan many files concurrently, e.g., from a thread pool.
+
+    For the meaning of the parameters refer to `Grepper.search()`.
+    """
+
+    __slots__ = (
+        "_pattern",
+        "_pre_conditions",
+        "_kind",
+        "_field_sep",
+        "_trim_whitespaces",
+        "_fallback",
+        "_skip_lines",
+        "_field",
+        "_matching_pattern",
+    )
+
+    def __init__(
+        self,
+        pattern: str | Pattern[str],
+        /,
+        *,
+        pre_conditions: Iterable[PreCondition] | None = None,
+        kind: Callable[[str], Any] = str,
+        case_sensitive: bool = False,
+        field_sep: str = " ",
+        trim_whitespaces: bool = True,
+        merge_sep: bool = True,
+        fallback: Any | None = None,
+        skip_lines: int = 0,
+        field: int | None = None,
+        matching_pattern: int | None = None,
+    ) -> None:
+        flags = None if case_sensitive else IGNORECASE
+        self._pattern: Pattern[str] = str2regex(pattern, flags)
+        # > Private copies with compiled patterns. Pre-conditions are always case-sensitive.
+        self._pre_conditions: tuple[PreCondition, ...] = tuple(
+            PreCondition(
+                str2regex(condition.pattern, None),
+                within=condition.within,
+                per_match=condition.per_match,
+            )
+            for condition in pre_conditions or ()
+        )
+        self._kind: Callable[[str], Any] = kind
+        self._field_sep: str = field_sep + "+" if merge_sep else field_sep
+        self._trim_whitespaces: bool = trim_whitespaces
+        self._fallback: Any | None = fallback
+        self._skip_lines: int = skip_lines or 0
+        self._field: int | None = field
+        self._matching_pattern: int | None = matching_pattern
+
+    @property
+    def pattern(self) -> Pattern[str]:
+        return self._pattern
+
+    @property
+    def pre_conditions(self) -> tuple[PreCondition, ...]:
+        return self._pre_conditions
+
+    @property
+    def skip_lines(self) -> int:
+        return self._skip_lines
+
+    def scan_lines(self, lines: Iterable[str], /) -> list[Any] | Any:
+        """
+        Search through the given lines.
+
+        Parameters
+        ----------
+        lines : Iterable[str]
+            Lines to search, e.g., an opened text file.
+
+        Returns
+        -------
+        A list of converted values to the desired data type using `kind`
+
+        If no matching_pattern is found `fallback` is returned.
+        """
+        # > Searches for the `PreCondition` and collects the matches of the main pattern
+        matches = _GrepScan(self, iter(lines)).search_through_lines()
+        # > returns the wanted field and match form all matches
+        reduced_matches: list[str] = Grepper.reduce_matches(
+            matches,
+            self._matching_pattern,
+            self._field,
+            self._field_sep,
+            self._trim_whitespaces,
+            self._fallback,
+        )
+        if reduced_matches != self._fallback:
+            # > converts match/matches to the type defined by kind
+            return Grepper.convert_matches(reduced_matches, self._kind, self._fallback)
+        return self._fallback
+
+    def scan(self, file: Path, /) -> list[Any] | Any:
+        """
+        Search through a single file.
+
+        Parameters
+        ----------
+        file : Path
+            Path to the file that gets searched.
+
+        Raises
+        ------
+        FileNotFoundError
+            If `file` does not exist.
+        """
+        with span("grepper.scan", file=file, pattern=self.pattern.pattern), file.open() as f:
+            return self.scan_lines(f)
+
+    def scan_files(
+        self, files: Iterable[Path], /, *, max_workers: int | None = None
+    ) -> list[list[Any] | Any]:
+        """
+        Search through many files concurrently with a thread pool.
+
+        Parameters
+        ----------
+        files : Iterable[Path]
+            Paths to the files that get searched.
+        max_workers : int | None, default: None
+            Maximum number of threads. If None, the default of `ThreadPoolExecutor` is used.
+
+        Returns
+        -------
+        list[list[Any] | Any]
+            Results of `scan()` in the same order as `files`.
+
+        Raises
+        ------
+        FileNotFoundError
+            If any of the `files` does not exist.
+        """
+        with ThreadPoolExecutor(max_workers=max_workers) as pool:
+            return list(pool.map(self.scan, files))
+
+
+class _GrepScan:
+    """
+    State of a single scan of a `GrepQuery` through the lines of a file.
+    A new object is created for every scan, so that `GrepQuery` itself stays stateless.
+    """
+
+    def __init__(self, query: GrepQuery, lines: Iterator[str], /) -> None:
+        self.query = query
+        self.lines = lines
+        self.search_completed: bool = False
+        # > Status of each pre-condition of `query`, in the same order
+        self.condition_information: list[ConditionStatus] = [
+            ConditionStatus() for _ in query.pre_conditions
+        ]
+
+    def search_through_lines(self) -> list[str]:
+        """
+        Determines whether a `PreCondition` pattern or pattern is searched and calls the correct function until search is completed
+
+        Returns
+        -------
+        list[str]
+            List containing all the lines that are a matching_pattern for the main search
+        """
+        pre_conditions = self.query.pre_conditions
+        pre_condition_search: bool = bool(pre_conditions)
+        first_time: bool = True
+        matches: list[str] = []
+
+        while True:
+            while pre_condition_search and not self.search_completed:
+                # > searches for the pre conditions in the file
+                self.search_for_precondition(first_time)
+                # > checks if pre conditions are found
+                if self.condition_found():
+                    first_time = False
+                    pre_condition_search = False
+            # < searches for the pattern in the file
+            line = self.search_for_pattern()
+
+            if not self.search_completed:
+                try:
+                    for _ in range(self.query.skip_lines):
+                        line = next(self.lines)
+                    if line:
+                        matches.append(line)
+                    pre_condition_search = bool(pre_conditions)
+                except StopIteration:
+                    self.search_completed = True
+            else:
+                return matches
+
+    def search_for_precondition(self, first_time: bool, /) -> None:
+        """
+        Searches for all the pre conditions that needs to be searched
+
+        Parameters
+        ----------
+        first_time : bool
+            Is that the first time searching for the pre conditions
+        """
+        try:
+            line: str = next(self.lines)
+        except StopIteration:
+            self.search_completed = True
+            return
+
+        for index, condition in enumerate(self.query.pre_conditions):
+            assert isinstance(condition.pattern, Pattern)
+            line_counter = 0
+            # > Checks if condition search is needed
+            if first_time or condition.per_match:
+                status = self.condition_information[index] = ConditionStatus()
+                while not bool(status):
+                    if not condition.pattern.search(line):
+                        line_counter = +1
+                        try:
+                            line = next(self.lines)
+                        except StopIteration:
+                            self.search_completed = True
+                            return
+                        # > checks if the search is within the search scope
+                    if condition.within:
+                        if not line_counter - condition.within:
+                            return
+                    if condition.pattern.search(line):
+                        status.condition_found = True
+                        status.line = line
+
+    def condition_found(self) -> bool:
+        """Checks if all `PreCondition` where found"""
+        return all(self.condition_information)
+
+    def search_for_pattern(self) -> str | None:
+        """
+        Searches for the pattern
+
+        Returns
+        -------
+        str | None
+            Last checked line, None if last line has been searched
+        """
+        pattern = self.query.pattern
+        for line in self.lines:
+            if pattern.search(line):
+                return line
+        self.search_completed = True
+        return None
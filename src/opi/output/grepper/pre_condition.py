@@ -38,11 +38,10 @@ class PreCondition:
         self.pattern: str | Pattern[str] = pattern
         self.within: int | None = within
         self.per_match: bool = per_match
-        self.condition_information: ConditionStatus = ConditionStatus()
 
 
 class ConditionStatus:
-    """Keeps track where the condition are found"""
+    """Keeps track where the condition are found. One instance is kept per condition and scan."""
 
     def __init__(self, condition_found: bool = False, line: str | None = None):
         self.condition_found = condition_found
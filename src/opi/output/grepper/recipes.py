@@ -1,6 +1,25 @@
+from functools import lru_cache
 from pathlib import Path
 
-from opi.output.grepper.core import Grepper
+from opi.output.grepper.core import GrepQuery
+
+
+@lru_cache(maxsize=128)
+def _string_query(search_for: str, /) -> GrepQuery:
+    """Compiled query for `has_string_in_file`. Shared between all calls and threads."""
+    return GrepQuery(search_for, fallback=[False], kind=bool, case_sensitive=True)
+
+
+@lru_cache(maxsize=128)
+def _float_query(search_for: str, field: int, /) -> GrepQuery:
+    """Compiled query for `get_float_from_line`. Shared between all calls and threads."""
+    return GrepQuery(search_for, fallback=[None], kind=float, field=field, case_sensitive=True)
+
+
+@lru_cache(maxsize=1)
+def _scf_cycles_query() -> GrepQuery:
+    """Compiled query for `get_scf_cycles`."""
+    return GrepQuery("SCF CONVERGED AFTER", kind=int, field=-3, fallback=[], case_sensitive=True)
 
 
 def has_string_in_file(file_name: Path, search_for: str, /, *, strict: bool = True) -> bool:
@@ -29,13 +48,7 @@ def has_string_in_file(file_name: Path, search_for: str, /, *, strict: bool = Tr
         True if *search_for* was found, else False
     """
     try:
-        grepper = Grepper(file_name)
-        results = grepper.search(
-            search_for,
-            fallback=[False],
-            kind=bool,
-            case_sensitive=True,
-        )
+        results = _string_query(search_for).scan(file_name)
         return bool(results[0])
 
     except FileNotFoundError:
@@ -83,14 +96,7 @@ def get_float_from_line(
         The float value if it could be retrieved, or None if not and `strict` is False.
     """
     try:
-        grepper = Grepper(file_name)
-        results = grepper.search(
-            search_for,
-            fallback=[None],
-            kind=float,
-            field=field,
-            case_sensitive=True,
-        )
+        results = _float_query(search_for, field).scan(file_name)
         return float(results[index])
 
     except (FileNotFoundError, TypeError, ValueError, IndexError):
@@ -199,3 +205,21 @@ def has_scf_converged(file_name: Path, /) -> bool:
         True if expression is found in file else False
     """
     return has_string_in_file(file_name, "SUCCESS")
+
+
+def get_scf_cycles(file_name: Path, /) -> list[int]:
+    """
+    Number of cycles of all converged SCF runs, taken from the lines 'SCF CONVERGED AFTER n CYCLES'.
+
+    Parameter
+    ---------
+    file_name: Path
+        Name of the output file
+
+    Returns
+    -------
+    list[int]
+        Number of cycles of each converged SCF in the order of the output file.
+    """
+    results = _scf_cycles_query().scan(file_name)
+    return [cycles for cycles in results if isinstance(cycles, int)]
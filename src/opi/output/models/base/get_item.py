@@ -2,7 +2,7 @@ import re
 import typing
 from typing import Any, Union, get_args, get_origin
 
-from pydantic import BaseModel
+from pydantic import BaseModel, ConfigDict
 
 
 def get_clean_type_name(t: Any) -> str:
@@ -30,6 +30,9 @@ def get_clean_type_name(t: Any) -> str:
 class GetItem(BaseModel):
     """This class contains the get_item function for nearly all other classes"""
 
+    # > Validators are built on first use, a process usually only touches a few of the models
+    model_config = ConfigDict(defer_build=True)
+
     def __getitem__(self, name: str) -> Any:
         return getattr(self, name.lower())
 
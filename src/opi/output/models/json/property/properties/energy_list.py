@@ -41,7 +41,8 @@ class EnergyList(RootModel[list[EnergyTypes]]):
     """RootModel for identifying different ORCA energy types based on their `method` string"""
 
     model_config: ClassVar[ConfigDict] = {  # type: ignore
-        "discriminator": "method"
+        "discriminator": "method",
+        "defer_build": True,
     }
 
     def __iter__(self) -> Iterator[EnergyTypes]:  # type: ignore
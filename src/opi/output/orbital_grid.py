@@ -0,0 +1,524 @@
+"""
+Evaluation of molecular orbitals and electron densities on arbitrary points or cube grids,
+directly from the basis set and MO coefficients stored in the GBW JSON file.
+This avoids starting an `orca_plot` process for every plot.
+
+Basis functions are real solid harmonics in the order used by ORCA (m = 0, +1, -1, +2, -2, ...),
+including the ORCA sign convention for |m| >= 3.
+All coordinates are in Bohr.
+"""
+
+from concurrent.futures import ThreadPoolExecutor
+from math import gamma, log, pi, sqrt
+from pathlib import Path
+from typing import Callable, Iterator, Sequence
+
+import numpy as np
+import numpy.typing as npt
+
+from opi.output.core import Output
+from opi.output.cube import CubeHeader, CubeOutput
+from opi.output.cube_tools import CompressedCube, write_cube
+from opi.output.hftyp import Hftyp
+from opi.output.models.json.gbw.gbw_results import GbwResults
+from opi.output.plot_request import PlotRequest, PlotType
+from opi.utils.units import ANGST_TO_AU
+
+__all__ = ("OrbitalEvaluator", "solid_harmonics")
+
+# > Angular momentum of the shell labels used in the GBW JSON file
+SHELL_ANGULAR_MOMENTA = {"s": 0, "p": 1, "d": 2, "f": 3, "g": 4, "h": 5, "i": 6}
+
+
+def solid_harmonics(lmax: int, points: npt.NDArray[np.float64], /) -> list[npt.NDArray[np.float64]]:
+    """
+    Real regular solid harmonics r^l Y_lm for all angular momenta up to `lmax`.
+    The angular part is normalized to one on the unit sphere.
+
+    Parameters
+    ----------
+    lmax : int
+        Highest angular momentum.
+    points : npt.NDArray[np.float64]
+        Points relative to the expansion center, shape (npoints, 3).
+
+    Returns
+    -------
+    list[npt.NDArray[np.float64]]
+        One array per angular momentum l with shape (2l+1, npoints) in ORCA order.
+    """
+    x, y, z = points[:, 0], points[:, 1], points[:, 2]
+    r2 = x * x + y * y + z * z
+    zero = np.zeros_like(x)
+    # > Cosine- and sine-like harmonics C_lm and S_lm for m = 0..l, by the standard recurrences.
+    # >> Both are normalized to 4 pi / (2l+1) on the unit sphere.
+    cosine = [[np.ones_like(x)]]
+    sine = [[zero]]
+    for k in range(lmax):
+        new_cosine = []
+        new_sine = []
+        for m in range(k + 1):
+            previous = k - 1 >= m
+            scale = sqrt((k + m + 1) * (k - m + 1))
+            lower = sqrt((k + m) * (k - m)) * r2
+            new_cosine.append(
+                ((2 * k + 1) * z * cosine[k][m] - (lower * cosine[k - 1][m] if previous else 0))
+                / scale
+            )
+            new_sine.append(
+                ((2 * k + 1) * z * sine[k][m] - (lower * sine[k - 1][m] if previous else 0)) / scale
+            )
+        factor = sqrt((2 if k == 0 else 1) * (2 * k + 1) / (2 * k + 2))
+        new_cosine.append(factor * (x * cosine[k][k] - y * sine[k][k]))
+        new_sine.append(factor * (y * cosine[k][k] + x * sine[k][k]))
+        cosine.append(new_cosine)
+        sine.append(new_sine)
+
+    harmonics = []
+    for momentum in range(lmax + 1):
+        norm = sqrt((2 * momentum + 1) / (4 * pi))
+        rows = [cosine[momentum][0]]
+        for m in range(1, momentum + 1):
+            # > ORCA flips the sign of the functions with |m| >= 3
+            sign = -1.0 if m >= 3 else 1.0
+            rows += [sign * cosine[momentum][m], sign * sine[momentum][m]]
+        harmonics.append(norm * np.array(rows))
+    return harmonics
+
+
+class _Shell:
+    """Contracted shell of basis functions on a single atom."""
+
+    __slots__ = ("center", "momentum", "exponents", "coefficients", "offset", "radius2")
+
+    def __init__(
+        self,
+        center: npt.NDArray[np.float64],
+        momentum: int,
+        exponents: Sequence[float],
+        coefficients: Sequence[float],
+        offset: int,
+        /,
+        *,
+        threshold: float,
+    ) -> None:
+        self.center = center
+        self.momentum = momentum
+        self.exponents = np.asarray(exponents, dtype=np.float64)
+        # > The coefficients refer to normalized primitives, so the radial normalization is included here
+        norms = np.sqrt(2 * (2 * self.exponents) ** (momentum + 1.5) / gamma(momentum + 1.5))
+        self.coefficients = np.asarray(coefficients, dtype=np.float64) * norms
+        # > First basis function of the shell
+        self.offset = offset
+        # > Squared distance beyond which all functions of the shell are below `threshold`
+        amplitude = float(np.abs(self.coefficients).sum()) * sqrt((2 * momentum + 1) / (4 * pi))
+        alpha = float(self.exponents.min())
+        radius2 = max(log(amplitude / threshold), 0.0) / alpha
+        for _ in range(2):
+            radius2 = (
+                max(log(amplitude / threshold) + 0.5 * momentum * log(max(radius2, 1.0)), 0.0)
+                / alpha
+            )
+        self.radius2 = radius2
+
+    @property
+    def nfunctions(self) -> int:
+        return 2 * self.momentum + 1
+
+
+class OrbitalEvaluator:
+    """
+    Evaluates molecular orbitals, electron densities and spin densities from `GbwResults`.
+    Points are processed in chunks, shells that are negligible for all points of a chunk are skipped,
+    and chunks can be distributed over a thread pool.
+
+    Attributes
+    ----------
+    chunk_size: int
+        Number of points evaluated at once.
+    max_workers: int
+        Number of threads. With 1, chunks are processed sequentially.
+    """
+
+    def __init__(
+        self,
+        gbw: GbwResults,
+        /,
+        *,
+        chunk_size: int = 4096,
+        threshold: float = 1e-10,
+        max_workers: int = 1,
+    ) -> None:
+        """
+        Parameters
+        ----------
+        gbw : GbwResults
+            Parsed GBW JSON file. Must contain the basis set and the MO coefficients.
+        chunk_size : int, default: 4096
+            Number of points evaluated at once.
+        threshold : float, default: 1e-10
+            Basis functions with absolute values below this threshold are neglected.
+        max_workers : int, default: 1
+            Number of threads.
+
+        Raises
+        ------
+        ValueError
+            If basis set or MO coefficients are not available.
+        """
+        if chunk_size < 1 or max_workers < 1:
+            raise ValueError("`chunk_size` and `max_workers` must be positive integers.")
+        self.chunk_size = chunk_size
+        self.max_workers = max_workers
+
+        molecule = gbw.molecule
+        if molecule is None or not molecule.atoms:
+            raise ValueError("GBW results do not contain any atoms.")
+        orbitals = molecule.molecularorbitals
+        if orbitals is None or not orbitals.mos:
+            raise ValueError("GBW results do not contain molecular orbitals.")
+
+        unit = ANGST_TO_AU if (molecule.coordinateunits or "").lower().startswith("ang") else 1.0
+        self._shells: list[_Shell] = []
+        atom_coordinates = []
+        atomic_numbers = []
+        nuclear_charges = []
+        offset = 0
+        for atom in molecule.atoms:
+            if atom.coords is None or atom.basis is None:
+                raise ValueError("GBW results do not contain the basis set of all atoms.")
+            center = np.asarray(atom.coords, dtype=np.float64) * unit
+            atom_coordinates.append(center)
+            atomic_numbers.append(atom.elementnumber or 0)
+            nuclear_charges.append(atom.nuclearcharge or 0.0)
+            for shell in atom.basis:
+                if shell.shell is None or shell.exponents is None or shell.coefficients is None:
+                    raise ValueError("Incomplete basis set information in GBW results.")
+                try:
+                    momentum = SHELL_ANGULAR_MOMENTA[shell.shell.lower()]
+                except KeyError:
+                    raise ValueError(f"Unsupported shell type: {shell.shell}") from None
+                self._shells.append(
+                    _Shell(
+                        center,
+                        momentum,
+                        shell.exponents,
+                        shell.coefficients,
+                        offset,
+                        threshold=threshold,
+                    )
+                )
+                offset += 2 * momentum + 1
+        self._nbf = offset
+        self._lmax = max(shell.momentum for shell in self._shells)
+        self._atom_coordinates = np.array(atom_coordinates)
+        self._atomic_numbers = np.array(atomic_numbers, dtype=np.int64)
+        self._nuclear_charges = np.array(nuclear_charges, dtype=np.float64)
+
+        coefficients = np.array([mo.mocoefficients for mo in orbitals.mos], dtype=np.float64)
+        if coefficients.ndim != 2 or coefficients.shape[1] != self._nbf:
+            raise ValueError("Number of MO coefficients does not match the basis set.")
+        occupations = np.array([mo.occupancy or 0.0 for mo in orbitals.mos], dtype=np.float64)
+        # > Coefficients and occupations per operator, alpha MOs are indicated by 0 and beta MOs by 1
+        self._unrestricted = molecule.hftyp is not None and Hftyp(molecule.hftyp) is Hftyp.UHF
+        if self._unrestricted:
+            half = len(coefficients) // 2
+            self._coefficients = [coefficients[:half], coefficients[half:]]
+            self._occupations = [occupations[:half], occupations[half:]]
+        else:
+            self._coefficients = [coefficients]
+            self._occupations = [occupations]
+
+    @classmethod
+    def from_output(
+        cls,
+        output: Output,
+        /,
+        *,
+        gbw_index: int = 0,
+        chunk_size: int = 4096,
+        threshold: float = 1e-10,
+        max_workers: int = 1,
+    ) -> "OrbitalEvaluator":
+        """
+        Create an evaluator from a parsed `Output`. For the other parameters refer to `__init__()`.
+
+        Parameters
+        ----------
+        output : Output
+            Parsed output.
+        gbw_index : int, default: 0
+            Index of the GBW file in `output.gbw_json_files`.
+
+        Raises
+        ------
+        ValueError
+            If the GBW JSON files have not been parsed.
+        """
+        if not output.results_gbw:
+            raise ValueError("GBW JSON files have not been parsed. Call `Output.parse()` first.")
+        return cls(
+            output.results_gbw[gbw_index],
+            chunk_size=chunk_size,
+            threshold=threshold,
+            max_workers=max_workers,
+        )
+
+    @property
+    def nbf(self) -> int:
+        """Number of basis functions."""
+        return self._nbf
+
+    @property
+    def unrestricted(self) -> bool:
+        """True, if there are separate alpha and beta orbitals."""
+        return self._unrestricted
+
+    @property
+    def atom_coordinates(self) -> npt.NDArray[np.float64]:
+        """Coordinates of all atoms in Bohr, shape (natoms, 3)."""
+        return self._atom_coordinates
+
+    def basis_values(self, points: npt.NDArray[np.float64], /) -> npt.NDArray[np.float64]:
+        """
+        Values of all basis functions.
+
+        Parameters
+        ----------
+        points : npt.NDArray[np.float64]
+            Points in Bohr, shape (npoints, 3).
+
+        Returns
+        -------
+        npt.NDArray[np.float64]
+            Shape (npoints, nbf).
+        """
+        points = np.asarray(points, dtype=np.float64).reshape(-1, 3)
+        values = np.zeros((len(points), self._nbf), dtype=np.float64)
+        for shell in self._shells:
+            relative = points - shell.center
+            r2 = np.einsum("ij,ij->i", relative, relative)
+            # > Distance screening
+            inside = np.flatnonzero(r2 < shell.radius2)
+            if inside.size == 0:
+                continue
+            if inside.size < len(points):
+                relative = relative[inside]
+                r2 = r2[inside]
+            radial = np.exp(-np.outer(r2, shell.exponents)) @ shell.coefficients
+            angular = solid_harmonics(shell.momentum, relative)[shell.momentum]
+            block = (angular * radial).T
+            if inside.size < len(points):
+                values[inside, shell.offset : shell.offset + shell.nfunctions] = block
+            else:
+                values[:, shell.offset : shell.offset + shell.nfunctions] = block
+        return values
+
+    def _evaluate(
+        self,
+        points: npt.NDArray[np.float64],
+        function: Callable[[npt.NDArray[np.float64]], npt.NDArray[np.float64]],
+        /,
+    ) -> npt.NDArray[np.float64]:
+        """Apply `function` to chunks of `points`, optionally in parallel, and join the results."""
+        points = np.asarray(points, dtype=np.float64).reshape(-1, 3)
+        chunks = [
+            points[start : start + self.chunk_size]
+            for start in range(0, len(points), self.chunk_size)
+        ]
+        if len(chunks) <= 1:
+            return function(points)
+        if self.max_workers == 1:
+            return np.concatenate([function(chunk) for chunk in chunks])
+        with ThreadPoolExecutor(max_workers=self.max_workers) as pool:
+            return np.concatenate(list(pool.map(function, chunks)))
+
+    def mo_values(
+        self,
+        points: npt.NDArray[np.float64],
+        indices: int | Sequence[int],
+        /,
+        *,
+        operator: int = 0,
+    ) -> npt.NDArray[np.float64]:
+        """
+        Values of molecular orbitals.
+
+        Parameters
+        ----------
+        points : npt.NDArray[np.float64]
+            Points in Bohr, shape (npoints, 3).
+        indices : int | Sequence[int]
+            Index or indices of the MOs.
+        operator : int, default: 0
+            Alpha MOs are indicated by 0 and beta MOs by 1. Only relevant for unrestricted orbitals.
+
+        Returns
+        -------
+        npt.NDArray[np.float64]
+            Shape (npoints,) for a single index, otherwise (npoints, len(indices)).
+        """
+        if operator not in (0, 1):
+            raise ValueError(f"Operator must be 0 (alpha) or 1 (beta), not: {operator}")
+        coefficients = self._coefficients[operator if self._unrestricted else 0][
+            np.atleast_1d(indices)
+        ]
+        values = self._evaluate(points, lambda chunk: self.basis_values(chunk) @ coefficients.T)
+        return values[:, 0] if np.ndim(indices) == 0 else values
+
+    def _weighted_density(
+        self, points: npt.NDArray[np.float64], weights: list[npt.NDArray[np.float64]], /
+    ) -> npt.NDArray[np.float64]:
+        """Sum of squared MOs weighted by `weights` for each operator."""
+        selected = [
+            (coefficients[weight != 0.0], weight[weight != 0.0])
+            for coefficients, weight in zip(self._coefficients, weights)
+        ]
+
+        def chunk_density(chunk: npt.NDArray[np.float64]) -> npt.NDArray[np.float64]:
+            basis = self.basis_values(chunk)
+            density = np.zeros(len(chunk), dtype=np.float64)
+            for coefficients, weight in selected:
+                density += (basis @ coefficients.T) ** 2 @ weight
+            return density
+
+        return self._evaluate(points, chunk_density)
+
+    def density(self, points: npt.NDArray[np.float64], /) -> npt.NDArray[np.float64]:
+        """
+        Electron density from the occupied orbitals.
+
+        Parameters
+        ----------
+        points : npt.NDArray[np.float64]
+            Points in Bohr, shape (npoints, 3).
+        """
+        return self._weighted_density(points, self._occupations)
+
+    def spin_density(self, points: npt.NDArray[np.float64], /) -> npt.NDArray[np.float64]:
+        """
+        Spin density from the occupied orbitals.
+        For restricted open-shell orbitals, singly occupied orbitals are treated as alpha orbitals.
+
+        Parameters
+        ----------
+        points : npt.NDArray[np.float64]
+            Points in Bohr, shape (npoints, 3).
+        """
+        if self._unrestricted:
+            weights = [self._occupations[0], -self._occupations[1]]
+        else:
+            occupations = self._occupations[0]
+            weights = [2 * np.minimum(occupations, 1.0) - occupations]
+        return self._weighted_density(points, weights)
+
+    def evaluate(
+        self, request: PlotRequest, points: npt.NDArray[np.float64], /
+    ) -> npt.NDArray[np.float64]:
+        """
+        Evaluate a plot request on `points`.
+        For densities, the SCF density of the orbitals is used and `PlotRequest.suffix` is ignored.
+        """
+        match request.plot_type:
+            case PlotType.MO:
+                assert request.index is not None
+                return self.mo_values(points, request.index, operator=request.operator)
+            case PlotType.DENSITY:
+                return self.density(points)
+            case PlotType.SPIN_DENSITY:
+                return self.spin_density(points)
+
+    def cube_header(
+        self, /, *, resolution: int = 40, margin: float = 7.0, comment: str = ""
+    ) -> CubeHeader:
+        """
+        Header of a cube grid around the molecule with `resolution` points along each axis.
+
+        Parameters
+        ----------
+        resolution : int, default: 40
+            Number of grid points per axis.
+        margin : float, default: 7.0
+            Distance in Bohr between the outermost atoms and the border of the grid.
+        comment : str, default: ""
+            First comment line of the cube file.
+        """
+        if resolution < 2:
+            raise ValueError("Resolution must be at least 2.")
+        lower = self._atom_coordinates.min(axis=0) - margin
+        upper = self._atom_coordinates.max(axis=0) + margin
+        return CubeHeader(
+            comments=(comment, "Generated by OPI from the GBW JSON file"),
+            origin=lower,
+            shape=(resolution, resolution, resolution),
+            axes=np.diag((upper - lower) / (resolution - 1)),
+            atomic_numbers=self._atomic_numbers,
+            nuclear_charges=self._nuclear_charges,
+            atom_coordinates=self._atom_coordinates,
+        )
+
+    @staticmethod
+    def grid_points(header: CubeHeader, /, *, planes: int = 1) -> Iterator[npt.NDArray[np.float64]]:
+        """
+        Points of a cube grid in chunks of `planes` planes along the first axis.
+
+        Returns
+        -------
+        Iterator[npt.NDArray[np.float64]]
+            Arrays of shape (n * ny * nz, 3) in the order of the volumetric data.
+        """
+        nx, ny, nz = header.shape
+        j, k = np.meshgrid(np.arange(ny), np.arange(nz), indexing="ij")
+        plane = (
+            header.origin
+            + np.outer(j.ravel(), header.axes[1])
+            + np.outer(k.ravel(), header.axes[2])
+        )
+        for x0 in range(0, nx, planes):
+            offsets = np.arange(x0, min(x0 + planes, nx))[:, None, None] * header.axes[0]
+            yield (plane[None, :, :] + offsets).reshape(-1, 3)
+
+    def write_cube(
+        self,
+        target: Path,
+        request: PlotRequest,
+        /,
+        *,
+        header: CubeHeader | None = None,
+        resolution: int = 40,
+        margin: float = 7.0,
+    ) -> CubeOutput | CompressedCube:
+        """
+        Evaluate a plot request on a cube grid and write the cube file.
+
+        Parameters
+        ----------
+        target : Path
+            Path of the cube. Written in compressed binary format if the suffix is `.npz`.
+        request : PlotRequest
+            Item to plot.
+        header : CubeHeader | None, default: None
+            Grid to use. If None, a grid around the molecule is created with `cube_header()`.
+        resolution : int, default: 40
+            Number of grid points per axis, if no header is given.
+        margin : float, default: 7.0
+            Distance in Bohr between the outermost atoms and the border of the grid, if no header is given.
+        """
+        if header is None:
+            header = self.cube_header(resolution=resolution, margin=margin, comment=target.name)
+        if header.angstrom:
+            raise ValueError("Cube grids in Angstrom are not supported.")
+        if request.plot_type is PlotType.MO:
+            assert request.index is not None
+            header = header.copy(mo_indices=(request.index,), nval=1)
+        else:
+            header = header.copy(mo_indices=None, nval=1)
+
+        # > Evaluate enough planes at once to fill the thread pool
+        ny, nz = header.shape[1:]
+        planes = max(self.chunk_size * self.max_workers // (ny * nz), 1)
+        chunks = (
+            self.evaluate(request, points).reshape(-1, ny, nz)
+            for points in self.grid_points(header, planes=planes)
+        )
+        return write_cube(target, header, chunks)
@@ -0,0 +1,305 @@
+"""
+Module for generating many cube files in parallel, e.g., for many orbitals across all images of a scan or NEB.
+`PlotExecutor` distributes `orca_plot` sessions over a process pool and `CubeCache` keeps
+already generated cube files, addressed by the content of the underlying GBW file.
+"""
+
+import hashlib
+import os
+import shutil
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Iterable
+
+from opi.output.core import Output
+from opi.output.cube import CubeOutput
+from opi.output.gbw_suffix import GbwSuffix
+from opi.output.plot_request import PlotRequest, PlotType
+from opi.utils.misc import file_digest
+
+__all__ = ("CubeCache", "PlotExecutor")
+
+
+def _atomic_copy(source: Path, target: Path, /) -> None:
+    """
+    Copy `source` to `target`. An existing `target` is replaced atomically.
+    Cubes are deliberately not hard-linked, as `orca_plot` overwrites existing cube files in place.
+
+    Parameters
+    ----------
+    source : Path
+    target : Path
+    """
+    tmp_target = target.with_name(f".{target.name}.{os.getpid()}.tmp")
+    shutil.copyfile(source, tmp_target)
+    tmp_target.replace(target)
+
+
+class CubeCache:
+    """
+    Content-addressed storage of cube files.
+    Each cube is identified by the hash of the GBW file (and the density file for densities),
+    the plot type, the MO index and operator, the density suffix and the resolution.
+
+    Attributes
+    ----------
+    directory: Path
+        Directory in which the cube files are stored.
+    """
+
+    def __init__(self, directory: Path | str | os.PathLike[str]) -> None:
+        self.directory = Path(directory).expanduser().resolve()
+        self.directory.mkdir(parents=True, exist_ok=True)
+
+    def key(
+        self, gbw_file: Path, request: PlotRequest, /, *, resolution: int, densities_file: Path
+    ) -> str:
+        """
+        Key of a cube in the cache.
+
+        Parameters
+        ----------
+        gbw_file : Path
+            GBW file used for plotting.
+        request : PlotRequest
+            Plot request.
+        resolution : int
+            Resolution of the cube.
+        densities_file : Path
+            File that contains the densities. Only considered for density plots.
+        """
+        parts = [
+            file_digest(gbw_file),
+            request.plot_type.value,
+            str(request.index),
+            str(request.operator),
+            str(resolution),
+        ]
+        if request.plot_type is not PlotType.MO:
+            parts.append(request.suffix)
+            if densities_file.is_file():
+                parts.append(file_digest(densities_file))
+        return hashlib.sha256("|".join(parts).encode()).hexdigest()
+
+    def get_path(self, key: str, /) -> Path:
+        """Path of the cube file that belongs to `key`."""
+        return self.directory / f"{key}.cube"
+
+    def get(self, key: str, /) -> Path | None:
+        """Path to cached cube file or None if it is not cached."""
+        path = self.get_path(key)
+        return path if path.is_file() else None
+
+    def put(self, key: str, cube_file: Path, /) -> Path:
+        """
+        Add a cube file to the cache.
+
+        Returns
+        -------
+        Path
+            Path of the cube file in the cache.
+        """
+        path = self.get_path(key)
+        _atomic_copy(cube_file, path)
+        return path
+
+
+def _plot_session(
+    basename: str,
+    working_dir: Path,
+    gbw_index: int,
+    requests: list[PlotRequest],
+    resolution: int,
+    timeout: int,
+    gbw_type: GbwSuffix,
+) -> dict[PlotRequest, Path | None]:
+    """
+    Run a single `orca_plot` session inside a worker process.
+    Must stay a module-level function to be picklable.
+    """
+    output = Output(basename, working_dir=working_dir, version_check=False)
+    cubes = output.plot_batch(
+        requests,
+        resolution=resolution,
+        timeout=timeout,
+        gbw_type=gbw_type,
+        gbw_index=gbw_index,
+    )
+    return {request: cube.path if cube else None for request, cube in cubes.items()}
+
+
+def split_sessions(
+    requests: list[PlotRequest], /, *, max_size: int | None = None
+) -> list[list[PlotRequest]]:
+    """
+    Split requests into chunks that are handled by separate `orca_plot` sessions.
+
+    Parameters
+    ----------
+    requests : list[PlotRequest]
+        Requests for a single GBW file.
+    max_size : int | None, default: None
+        Maximum number of requests per session. If None, all requests are handled by one session.
+    """
+    if not max_size:
+        return [requests]
+    return [requests[i : i + max_size] for i in range(0, len(requests), max_size)]
+
+
+class PlotExecutor:
+    """
+    Generates cube files for many plot requests and GBW files (e.g. all images of a scan or NEB) in parallel.
+    Each worker process runs one `orca_plot` session at a time.
+    If a `CubeCache` is given, cubes that have been generated before are taken from the cache instead.
+
+    Attributes
+    ----------
+    max_workers: int
+        Maximum number of concurrent `orca_plot` processes.
+    cache: CubeCache | None
+        Optional cache for cube files.
+    requests_per_session: int | None
+        Maximum number of requests handled by a single `orca_plot` session.
+        Smaller sessions distribute better over the workers, larger sessions load the GBW file less often.
+    timeout: int
+        Timeout in seconds for a single `orca_plot` session. Set to -1 to wait indefinitely.
+    """
+
+    def __init__(
+        self,
+        *,
+        max_workers: int | None = None,
+        cache: CubeCache | None = None,
+        requests_per_session: int | None = None,
+        timeout: int = 600,
+    ) -> None:
+        """
+        Parameters
+        ----------
+        max_workers : int | None, default: None
+            Maximum number of concurrent `orca_plot` processes. If None, the number of CPU cores available to
+            the current process is used.
+        cache : CubeCache | None, default: None
+            Optional cache for cube files.
+        requests_per_session : int | None, default: None
+            Maximum number of requests per `orca_plot` session. If None, all requests for a GBW file are
+            handled by a single session.
+        timeout : int, default: 600
+            Timeout in seconds for a single `orca_plot` session.
+        """
+        if max_workers is None:
+            max_workers = len(os.sched_getaffinity(0)) if hasattr(os, "sched_getaffinity") else 1
+        if max_workers < 1:
+            raise ValueError(f"{self.__class__.__name__}.max_workers must be a positive integer.")
+        self.max_workers: int = max_workers
+        self.cache: CubeCache | None = cache
+        self.requests_per_session: int | None = requests_per_session
+        self.timeout: int = timeout
+
+    def plot(
+        self,
+        output: Output,
+        requests: Iterable[PlotRequest],
+        /,
+        *,
+        gbw_indices: Iterable[int] | None = None,
+        resolution: int = 40,
+        gbw_type: str | GbwSuffix = GbwSuffix.GBW,
+    ) -> dict[tuple[int, PlotRequest], CubeOutput | None]:
+        """
+        Generate the cube files for all requests and all selected GBW files of `output`.
+
+        Parameters
+        ----------
+        output : Output
+            Output of the job. Does not need to be parsed.
+        requests : Iterable[PlotRequest]
+            Items to plot for each GBW file.
+        gbw_indices : Iterable[int] | None, default: None
+            Indices of the GBW files in `output.gbw_json_files` to plot. If None, all GBW files are used.
+        resolution : int, default: 40
+            Resolution of all cube files.
+        gbw_type : str | GbwSuffix, default: GbwSuffix.GBW
+            Type of the GBW files that are used for plotting.
+
+        Returns
+        -------
+        dict[tuple[int, PlotRequest], CubeOutput | None]
+            Cube output object for each pair of GBW index and request, or None if the cube could not be generated.
+
+        Raises
+        ------
+        ValueError
+            If several requests would write to the same cube file.
+        FileNotFoundError
+            If any of the selected GBW files does not exist.
+        """
+        gbw_type = GbwSuffix(gbw_type)
+        requests = list(dict.fromkeys(requests))
+        # > Sessions for the same GBW file run concurrently, so no two requests may share a cube file.
+        cube_names = {request.cube_file(Path(output.basename)) for request in requests}
+        if len(cube_names) != len(requests):
+            raise ValueError(
+                "Several plot requests would write to the same cube file. Use separate calls."
+            )
+        if gbw_indices is None:
+            gbw_indices = range(output.num_gbw_json_files)
+        densities_file = output.get_file(".densities")
+
+        results: dict[tuple[int, PlotRequest], CubeOutput | None] = {}
+        keys: dict[tuple[int, PlotRequest], str] = {}
+        # > Requests per GBW index that are not cached
+        missing: dict[int, list[PlotRequest]] = {}
+
+        for gbw_index in gbw_indices:
+            gbw_file = output.gbw_json_files[gbw_index].with_suffix(gbw_type.value)
+            if not gbw_file.is_file():
+                raise FileNotFoundError(f"The requested .gbw file is not available: ({gbw_file})")
+            for request in requests:
+                if self.cache is not None:
+                    key = self.cache.key(
+                        gbw_file, request, resolution=resolution, densities_file=densities_file
+                    )
+                    keys[gbw_index, request] = key
+                    if cached := self.cache.get(key):
+                        cube_file = request.cube_file(gbw_file)
+                        _atomic_copy(cached, cube_file)
+                        results[gbw_index, request] = CubeOutput(cube_file)
+                        continue
+                missing.setdefault(gbw_index, []).append(request)
+
+        sessions = [
+            (gbw_index, session)
+            for gbw_index, index_requests in missing.items()
+            for session in split_sessions(index_requests, max_size=self.requests_per_session)
+        ]
+        if not sessions:
+            return results
+
+        with ProcessPoolExecutor(max_workers=min(self.max_workers, len(sessions))) as pool:
+            futures = [
+                (
+                    gbw_index,
+                    pool.submit(
+                        _plot_session,
+                        output.basename,
+                        output.working_dir,
+                        gbw_index,
+                        session,
+                        resolution,
+                        self.timeout,
+                        gbw_type,
+                    ),
+                )
+                for gbw_index, session in sessions
+            ]
+            for gbw_index, future in futures:
+                for request, cube_path in future.result().items():
+                    if cube_path is None:
+                        results[gbw_index, request] = None
+                        continue
+                    if self.cache is not None:
+                        self.cache.put(keys[gbw_index, request], cube_path)
+                    results[gbw_index, request] = CubeOutput(cube_path)
+
+        return results
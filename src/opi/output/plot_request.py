@@ -0,0 +1,166 @@
+from pathlib import Path
+
+from opi.models.string_enum import StringEnum
+
+__all__ = ("PlotRequest", "PlotType")
+
+
+class PlotType(StringEnum):
+    """Enumeration of the plot types supported for `orca_plot`."""
+
+    MO = "mo"
+    """Molecular orbital."""
+    DENSITY = "density"
+    """Electron density."""
+    SPIN_DENSITY = "spin_density"
+    """Spin density."""
+
+
+class PlotRequest:
+    """
+    Single item to be plotted by `orca_plot`.
+    Objects are immutable and hashable, so they can be used as dictionary keys.
+
+    Attributes
+    ----------
+    plot_type: PlotType
+        Type of the plot.
+    index: int | None
+        Index of the MO. Only used for `PlotType.MO`.
+    operator: int
+        Operator of the MO, alpha MOs are indicated by 0 and beta MOs by 1. Only used for `PlotType.MO`.
+    suffix: str
+        Suffix of the density file, e.g., ".scfp". Only used for densities.
+    """
+
+    __slots__ = ("_plot_type", "_index", "_operator", "_suffix")
+
+    # > Character ORCA uses in cube file names for the operator.
+    OPERATOR_NAMES = ("a", "b")
+
+    def __init__(
+        self,
+        plot_type: PlotType | str,
+        /,
+        *,
+        index: int | None = None,
+        operator: int = 0,
+        suffix: str = ".scfp",
+    ) -> None:
+        plot_type = PlotType(plot_type)
+        if plot_type is PlotType.MO:
+            if index is None or index < 0:
+                raise ValueError("A non-negative MO index is required for MO plots.")
+            if operator not in (0, 1):
+                raise ValueError(f"Operator must be 0 (alpha) or 1 (beta), not: {operator}")
+        else:
+            # > Irrelevant for densities
+            index = None
+            operator = 0
+        self._plot_type: PlotType = plot_type
+        self._index: int | None = index
+        self._operator: int = operator
+        self._suffix: str = suffix
+
+    @classmethod
+    def mo(cls, index: int, /, *, operator: int = 0) -> "PlotRequest":
+        """Request for a molecular orbital."""
+        return cls(PlotType.MO, index=index, operator=operator)
+
+    @classmethod
+    def density(cls, *, suffix: str = ".scfp") -> "PlotRequest":
+        """Request for the electron density."""
+        return cls(PlotType.DENSITY, suffix=suffix)
+
+    @classmethod
+    def spin_density(cls, *, suffix: str = ".scfp") -> "PlotRequest":
+        """Request for the spin density."""
+        return cls(PlotType.SPIN_DENSITY, suffix=suffix)
+
+    @property
+    def plot_type(self) -> PlotType:
+        return self._plot_type
+
+    @property
+    def index(self) -> int | None:
+        return self._index
+
+    @property
+    def operator(self) -> int:
+        return self._operator
+
+    @property
+    def suffix(self) -> str:
+        return self._suffix
+
+    def _key(self) -> tuple[PlotType, int | None, int, str]:
+        return self._plot_type, self._index, self._operator, self._suffix
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, PlotRequest):
+            return NotImplemented
+        return self._key() == other._key()
+
+    def __hash__(self) -> int:
+        return hash(self._key())
+
+    def __repr__(self) -> str:
+        if self._plot_type is PlotType.MO:
+            return f"{self.__class__.__name__}.mo({self._index}, operator={self._operator})"
+        return f"{self.__class__.__name__}.{self._plot_type.value}(suffix={self._suffix!r})"
+
+    def stdin_list(self, density_basename: str, /, *, resolution: int = 40) -> list[str]:
+        """
+        Input lines for an interactive `orca_plot` session that perform this plot.
+        The exit command is not included, so several requests can be chained in one session.
+
+        Parameters
+        ----------
+        density_basename : str
+            Basename of the density file. `suffix` is appended.
+        resolution : int, default: 40
+            Resolution of the generated cube file.
+        """
+        match self._plot_type:
+            case PlotType.MO:
+                selection = [
+                    "1",  # Select type of plot
+                    "1",  # Enter MO plot
+                    "2",  # Select index of orbital
+                    str(self._index),  # Enter index
+                    "3",  # Select alpha/beta operator
+                    str(self._operator),  # Enter alpha/beta (0/1)
+                ]
+            case PlotType.DENSITY | PlotType.SPIN_DENSITY:
+                selection = [
+                    "1",  # Select type of plot
+                    # > Enter density or spin density plot
+                    "2" if self._plot_type is PlotType.DENSITY else "3",
+                    "n",  # Do not use the default density
+                    f"{density_basename}{self._suffix}",  # Select density name
+                ]
+        return selection + [
+            "4",  # Select the resolution (grid size) settings
+            str(resolution),  # Enter resolution
+            "5",  # Select the output format
+            "7",  # Request cube file format
+            "11",  # Perform the plotting
+        ]
+
+    def cube_file(self, gbw_file: Path, /) -> Path:
+        """
+        Path to the cube file `orca_plot` writes for this request.
+
+        Parameters
+        ----------
+        gbw_file : Path
+            GBW file used for plotting. The cube file is placed next to it.
+        """
+        match self._plot_type:
+            case PlotType.MO:
+                name = f".mo{self._index}{self.OPERATOR_NAMES[self._operator]}.cube"
+            case PlotType.DENSITY:
+                name = ".eldens.cube"
+            case PlotType.SPIN_DENSITY:
+                name = ".spindens.cube"
+        return gbw_file.with_name(gbw_file.stem + name)
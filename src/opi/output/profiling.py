@@ -0,0 +1,502 @@
+"""
+Per-module wall times of many ORCA jobs, as recorded in the `Calculation_Timings` of the property JSON files.
+The timings are collected into a table of jobs by modules, together with the method, basis set, number of cores,
+and number of basis functions of every job. The table gives percentiles per group of jobs and fits power laws of
+the wall time against the number of basis functions and cores, e.g., to predict the cost of a job before submission.
+"""
+
+import re
+from functools import lru_cache
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Iterable, Sequence
+
+import numpy as np
+import numpy.typing as npt
+
+from opi.output.core import Output
+from opi.output.models.json.property.properties.calc_time import CalculationTiming
+from opi.output.warehouse import Column, ColumnKind, ResultsWarehouse
+
+if TYPE_CHECKING:
+    from pandas import DataFrame
+
+__all__ = (
+    "MODULES",
+    "PROFILE_COLUMNS",
+    "ScalingFit",
+    "TimingProfiles",
+    "read_job_settings",
+    "read_timings",
+)
+
+# > Modules with their own timings in `CalculationTiming`
+_TIMED_MODULES = tuple(name for name in CalculationTiming.model_fields if name != "sum")
+# > All modules, "other" is the remainder of the total wall time
+MODULES: tuple[str, ...] = (*_TIMED_MODULES, "other")
+# > Marks the end of the input echoed at the top of an output file
+_END_OF_INPUT = "****END OF INPUT****"
+_ECHO = re.compile(r"\|\s*\d+>(.*)")
+_NPROCS = re.compile(r"\bnprocs\s+(\d+)")
+_PAL = re.compile(r"pal(\d+)")
+
+
+@lru_cache(maxsize=None)
+def _known_keywords(*boxes: str) -> frozenset[str]:
+    """Keywords of the given simple keyword boxes, e.g., "BasisSet", in lower case."""
+    from opi.input import simple_keywords
+    from opi.input.simple_keywords.base import SimpleKeyword
+
+    return frozenset(
+        keyword.keyword.lower()
+        for box in boxes
+        for keyword in vars(getattr(simple_keywords, box)).values()
+        if isinstance(keyword, SimpleKeyword)
+    )
+
+
+def read_job_settings(outfile: Path, /) -> dict[str, Any]:
+    """
+    Method, basis set, and number of cores of a job, from the input that ORCA echoes at the top of its output.
+    Method and basis set are the first simple keywords that are known methods (of `Method`, `Dft`, `Wft`,
+    or `Sqm`) and basis sets (of `BasisSet`).
+
+    Parameters
+    ----------
+    outfile : Path
+        ORCA output file `.out`.
+
+    Returns
+    -------
+    dict[str, Any]
+        "keywords": all simple keywords in lower case, "method" and "basis": str or None,
+        "ncores": number of MPI processes, 1 without `%pal` or `PAL<n>`.
+
+    Raises
+    ------
+    FileNotFoundError
+        If `outfile` does not exist.
+    """
+    lines = []
+    with outfile.open() as f:
+        for line in f:
+            if line.startswith(_END_OF_INPUT):
+                break
+            if match := _ECHO.match(line):
+                # > Comments are removed
+                lines.append(match.group(1).partition("#")[0].lower())
+
+    keywords = [word for line in lines if line.lstrip().startswith("!") for word in line.split()]
+    keywords = [word.removeprefix("!") for word in keywords if word != "!"]
+    methods = _known_keywords("Method", "Dft", "Wft", "Sqm")
+    basis_sets = _known_keywords("BasisSet")
+
+    ncores = 1
+    if match := _NPROCS.search("\n".join(lines)):
+        ncores = int(match.group(1))
+    else:
+        for keyword in keywords:
+            if match := _PAL.fullmatch(keyword):
+                ncores = int(match.group(1))
+    return {
+        "keywords": keywords,
+        "method": next((word for word in keywords if word in methods), None),
+        "basis": next((word for word in keywords if word in basis_sets), None),
+        "ncores": ncores,
+    }
+
+
+def read_timings(output: Output, /) -> dict[str, float] | None:
+    """
+    Wall time of every module in `MODULES` and the total wall time ("sum") in seconds.
+    Modules that did not run take 0 seconds. The output is parsed if it has not been yet,
+    which creates a missing property JSON file, but neither creates nor reads the GBW JSON files.
+
+    Returns
+    -------
+    dict[str, float] | None
+        None if the job has no timings.
+    """
+    if output.results_properties is None:
+        output.parse(do_create_gbw_json=False, read_gbw_json=False)
+    timings = output.get_calculation_timings()
+    return None if timings is None else _complete_timings(timings.model_dump())
+
+
+def _complete_timings(timings: dict[str, float | None], /) -> dict[str, float] | None:
+    """Timings of all `MODULES` and "sum" from the fields of `CalculationTiming`, see `read_timings()`."""
+    total = timings.get("sum")
+    if total is None:
+        return None
+    times = {module: timings.get(module) or 0.0 for module in _TIMED_MODULES}
+    times["other"] = max(total - sum(times.values()), 0.0)
+    times["sum"] = total
+    return times
+
+
+def _job_settings(output: Output, /) -> dict[str, Any]:
+    """Column getter, see `read_job_settings()`."""
+    return read_job_settings(output.get_outfile())
+
+
+PROFILE_COLUMNS: tuple[Column, ...] = (Column("job_settings", _job_settings, ColumnKind.JSON),)
+"""Columns that a `ResultsWarehouse` needs next to its default columns for `TimingProfiles.from_warehouse()`."""
+
+
+class ScalingFit:
+    """
+    Power law `time = prefactor * nbf**nbf_exponent * ncores**-ncores_exponent`, fitted in log space.
+    An `ncores_exponent` of 1 means perfect parallel scaling, 0 means no speed-up from more cores.
+
+    Attributes
+    ----------
+    prefactor: float
+        Time in seconds of a job with a single basis function on one core.
+    nbf_exponent: float
+        Exponent of the number of basis functions.
+    ncores_exponent: float
+        Speed-up exponent of the number of cores. 0 if all jobs ran on the same number of cores.
+    njobs: int
+        Number of jobs the fit is based on.
+    rms_log_error: float
+        Root mean square error of the natural logarithm of the time, e.g., 0.1 means about 10% error.
+    """
+
+    __slots__ = ("prefactor", "nbf_exponent", "ncores_exponent", "njobs", "rms_log_error")
+
+    def __init__(
+        self,
+        prefactor: float,
+        nbf_exponent: float,
+        ncores_exponent: float,
+        /,
+        *,
+        njobs: int = 0,
+        rms_log_error: float = 0.0,
+    ) -> None:
+        self.prefactor = prefactor
+        self.nbf_exponent = nbf_exponent
+        self.ncores_exponent = ncores_exponent
+        self.njobs = njobs
+        self.rms_log_error = rms_log_error
+
+    def __repr__(self) -> str:
+        return (
+            f"{self.__class__.__name__}({self.prefactor:.4g}, {self.nbf_exponent:.3f},"
+            f" {self.ncores_exponent:.3f}, njobs={self.njobs}, rms_log_error={self.rms_log_error:.3f})"
+        )
+
+    @classmethod
+    def fit(
+        cls,
+        nbf: npt.ArrayLike,
+        ncores: npt.ArrayLike,
+        times: npt.ArrayLike,
+        /,
+    ) -> "ScalingFit":
+        """
+        Least-squares fit of the logarithm of the times.
+        Jobs without number of basis functions (NaN) or with non-positive times are ignored.
+
+        Raises
+        ------
+        ValueError
+            If fewer jobs remain than parameters are fitted.
+        """
+        nbf = np.asarray(nbf, dtype=np.float64)
+        ncores = np.asarray(ncores, dtype=np.float64)
+        times = np.asarray(times, dtype=np.float64)
+        valid = np.isfinite(nbf) & (nbf > 0) & (ncores > 0) & (times > 0)
+        log_nbf, log_ncores, log_times = (
+            np.log(nbf[valid]),
+            np.log(ncores[valid]),
+            np.log(times[valid]),
+        )
+
+        # > Exponents of quantities that do not vary cannot be determined and are fixed to 0
+        design = [np.ones_like(log_times)]
+        varies = [np.ptp(values) > 0 if values.size else False for values in (log_nbf, log_ncores)]
+        if varies[0]:
+            design.append(log_nbf)
+        if varies[1]:
+            design.append(-log_ncores)
+        if log_times.size < len(design):
+            raise ValueError(
+                f"{cls.__name__}.fit: {log_times.size} valid jobs are too few to fit {len(design)} parameters."
+            )
+        matrix = np.stack(design, axis=1)
+        coefficients = np.linalg.lstsq(matrix, log_times, rcond=None)[0]
+        residuals = log_times - matrix @ coefficients
+
+        exponents = iter(coefficients[1:])
+        return cls(
+            float(np.exp(coefficients[0])),
+            float(next(exponents)) if varies[0] else 0.0,
+            float(next(exponents)) if varies[1] else 0.0,
+            njobs=int(log_times.size),
+            rms_log_error=float(np.sqrt(np.mean(residuals**2))),
+        )
+
+    def predict(self, nbf: npt.ArrayLike, ncores: npt.ArrayLike = 1, /) -> Any:
+        """Predicted time in seconds, for scalars or arrays."""
+        return (
+            self.prefactor
+            * np.power(nbf, self.nbf_exponent, dtype=np.float64)
+            * np.power(ncores, -self.ncores_exponent, dtype=np.float64)
+        )
+
+
+class TimingProfiles:
+    """
+    Table of the per-module wall times of many jobs.
+
+    Attributes
+    ----------
+    basename: npt.NDArray[np.object_]
+        Basename of every job.
+    method: npt.NDArray[np.object_]
+        Method of every job or None, see `read_job_settings()`.
+    basis: npt.NDArray[np.object_]
+        Basis set of every job or None.
+    ncores: npt.NDArray[np.int64]
+        Number of cores of every job.
+    nbf: npt.NDArray[np.float64]
+        Number of basis functions of every job, NaN if unknown.
+    times: npt.NDArray[np.float64]
+        Wall times in seconds with shape (jobs, columns), the columns are `MODULES` and "sum".
+    """
+
+    # > Columns of `times`
+    COLUMNS: tuple[str, ...] = (*MODULES, "sum")
+    # > Attributes by which jobs can be grouped
+    GROUP_KEYS = ("method", "basis", "ncores")
+
+    def __init__(self, rows: Iterable[dict[str, Any]] = (), /) -> None:
+        """
+        Parameters
+        ----------
+        rows : Iterable[dict[str, Any]], default: ()
+            One dict per job with the keys "basename", "method", "basis", "ncores", "nbf",
+            and "timings" (see `read_timings()`).
+        """
+        rows = list(rows)
+        self.basename = np.array([row["basename"] for row in rows], dtype=object)
+        self.method = np.array([row["method"] for row in rows], dtype=object)
+        self.basis = np.array([row["basis"] for row in rows], dtype=object)
+        self.ncores = np.array([row["ncores"] for row in rows], dtype=np.int64)
+        self.nbf = np.array(
+            [np.nan if row["nbf"] is None else row["nbf"] for row in rows], dtype=np.float64
+        )
+        self.times = np.array(
+            [[row["timings"][column] for column in self.COLUMNS] for row in rows],
+            dtype=np.float64,
+        ).reshape(len(rows), len(self.COLUMNS))
+
+    @classmethod
+    def from_outputs(cls, outputs: Iterable[Output], /) -> "TimingProfiles":
+        """
+        Collect the timings of outputs. Unparsed outputs are parsed, see `read_timings()`.
+        Jobs without timings are skipped.
+        For many jobs, ingest them into a `ResultsWarehouse` and use `from_warehouse()` instead.
+
+        Raises
+        ------
+        FileNotFoundError
+            If the property JSON or the `.out` file of a job does not exist.
+        """
+        rows = []
+        for output in outputs:
+            if (timings := read_timings(output)) is None:
+                continue
+            settings = read_job_settings(output.get_outfile())
+            rows.append(
+                {
+                    "basename": output.basename,
+                    "method": settings["method"],
+                    "basis": settings["basis"],
+                    "ncores": settings["ncores"],
+                    "nbf": output.get_nbf(),
+                    "timings": timings,
+                }
+            )
+        return cls(rows)
+
+    @classmethod
+    def from_warehouse(
+        cls,
+        warehouse: ResultsWarehouse,
+        /,
+        *,
+        where: str | None = None,
+        parameters: Sequence[Any] = (),
+    ) -> "TimingProfiles":
+        """
+        Collect the timings of all jobs in a warehouse that was created with the default columns and
+        `PROFILE_COLUMNS`. Jobs without timings are skipped.
+
+        Parameters
+        ----------
+        where : str | None, default: None
+            Optional SQL condition on the jobs, see `ResultsWarehouse.query()`.
+        parameters : Sequence[Any], default: ()
+            Parameters for the placeholders in `where`.
+
+        Raises
+        ------
+        ValueError
+            If a required column is missing from the warehouse.
+        """
+        data = warehouse.query(
+            "jobs",
+            ["basename", "nbf", "timings", "job_settings"],
+            where=where,
+            parameters=parameters,
+        )
+        rows = []
+        for basename, nbf, timings, settings in zip(
+            data["basename"], data["nbf"], data["timings"], data["job_settings"]
+        ):
+            if timings is None or settings is None:
+                continue
+            if (times := _complete_timings(timings)) is None:
+                continue
+            rows.append(
+                {
+                    "basename": basename,
+                    "method": settings["method"],
+                    "basis": settings["basis"],
+                    "ncores": settings["ncores"],
+                    "nbf": None if np.isnan(nbf) else nbf,
+                    "timings": times,
+                }
+            )
+        return cls(rows)
+
+    def __len__(self) -> int:
+        return len(self.basename)
+
+    def _subset(self, mask: npt.NDArray[np.bool_], /) -> "TimingProfiles":
+        subset = object.__new__(type(self))
+        for name in ("basename", "method", "basis", "ncores", "nbf", "times"):
+            setattr(subset, name, getattr(self, name)[mask])
+        return subset
+
+    def column(self, name: str, /) -> npt.NDArray[np.float64]:
+        """
+        Wall times of a module or "sum" in seconds for all jobs.
+
+        Raises
+        ------
+        ValueError
+            If `name` is not in `COLUMNS`.
+        """
+        if name not in self.COLUMNS:
+            raise ValueError(f"Unknown timing column: {name}. Must be one of {self.COLUMNS}")
+        times: npt.NDArray[np.float64] = self.times[:, self.COLUMNS.index(name)]
+        return times
+
+    def select(
+        self, *, method: str | None = None, basis: str | None = None, ncores: int | None = None
+    ) -> "TimingProfiles":
+        """Jobs with the given method, basis set, and number of cores. Criteria that are None are ignored."""
+        mask = np.ones(len(self), dtype=np.bool_)
+        if method is not None:
+            mask &= self.method == method.lower()
+        if basis is not None:
+            mask &= self.basis == basis.lower()
+        if ncores is not None:
+            mask &= self.ncores == ncores
+        return self._subset(mask)
+
+    def groups(
+        self, by: Sequence[str] = ("method", "basis"), /
+    ) -> dict[tuple[Any, ...], "TimingProfiles"]:
+        """
+        Split the jobs into groups with equal values of the attributes `by`, which are `GROUP_KEYS`.
+
+        Raises
+        ------
+        ValueError
+            If `by` contains an unknown attribute.
+        """
+        if unknown := set(by) - set(self.GROUP_KEYS):
+            raise ValueError(f"Cannot group by {sorted(unknown)}. Must be any of {self.GROUP_KEYS}")
+        keys = list(zip(*(getattr(self, name).tolist() for name in by)))
+        index: dict[tuple[Any, ...], list[int]] = {}
+        for i, key in enumerate(keys):
+            index.setdefault(key, []).append(i)
+        return {key: self._subset(np.array(rows)) for key, rows in index.items()}
+
+    def percentiles(
+        self,
+        q: Sequence[float] = (50.0, 90.0, 99.0),
+        /,
+        *,
+        by: Sequence[str] = ("method", "basis"),
+    ) -> dict[tuple[Any, ...], dict[str, npt.NDArray[np.float64]]]:
+        """
+        Percentiles of the wall times per group of jobs.
+
+        Parameters
+        ----------
+        q : Sequence[float], default: (50.0, 90.0, 99.0)
+            Percentiles between 0 and 100.
+        by : Sequence[str], default: ("method", "basis")
+            Attributes that define the groups, see `groups()`. Empty for a single group of all jobs.
+
+        Returns
+        -------
+        dict[tuple[Any, ...], dict[str, npt.NDArray[np.float64]]]
+            Group -> column of `COLUMNS` -> one value per percentile in seconds.
+        """
+        result = {}
+        for key, group in self.groups(by).items():
+            values = np.percentile(group.times, q, axis=0)
+            result[key] = {column: values[:, i] for i, column in enumerate(self.COLUMNS)}
+        return result
+
+    def fractions(self) -> dict[str, float]:
+        """Share of every module in the total wall time of all jobs."""
+        totals = self.times.sum(axis=0)
+        total = totals[-1] or 1.0
+        return {module: float(totals[i] / total) for i, module in enumerate(MODULES)}
+
+    def fit_scaling(
+        self, column: str = "sum", /, *, by: Sequence[str] = ("method", "basis")
+    ) -> dict[tuple[Any, ...], ScalingFit]:
+        """
+        Fit a `ScalingFit` of the wall time of a module against the number of basis functions and cores per group.
+        Groups with too few jobs for a fit are left out.
+
+        Parameters
+        ----------
+        column : str, default: "sum"
+            Module or "sum".
+        by : Sequence[str], default: ("method", "basis")
+            Attributes that define the groups, see `groups()`.
+        """
+        # > Validates `column` before the groups are fitted
+        self.column(column)
+        fits = {}
+        for key, group in self.groups(by).items():
+            try:
+                fits[key] = ScalingFit.fit(group.nbf, group.ncores, group.column(column))
+            except ValueError:
+                continue
+        return fits
+
+    def to_dataframe(self) -> "DataFrame":
+        """
+        One row per job with the attributes and one column per module. Requires pandas.
+
+        Raises
+        ------
+        ImportError
+            If pandas is not installed.
+        """
+        import pandas as pd
+
+        data: dict[str, Any] = {
+            name: getattr(self, name) for name in ("basename", "method", "basis", "ncores", "nbf")
+        }
+        data.update(zip(self.COLUMNS, self.times.T))
+        return pd.DataFrame(data)
@@ -0,0 +1,602 @@
+"""
+Local store for results extracted from many ORCA jobs.
+Selected `Output` getters are evaluated once per job in parallel and written to an SQLite database,
+with one row per job and one row per geometry. Later analyses query the database without parsing
+any JSON file again, and repeated ingestion only processes new or changed jobs.
+"""
+
+import hashlib
+import io
+import json
+import os
+import sqlite3
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Callable, Iterable, Iterator, Sequence, cast
+
+import numpy as np
+import numpy.typing as npt
+from pydantic import BaseModel
+
+from opi.models.string_enum import StringEnum
+from opi.output.core import Output
+
+if TYPE_CHECKING:
+    from pandas import DataFrame
+
+__all__ = ("Column", "ColumnKind", "ResultsWarehouse", "DEFAULT_COLUMNS")
+
+
+class ColumnKind(StringEnum):
+    """Type of the values of a column and how they are stored."""
+
+    FLOAT = "float"
+    """Floating point number, missing values become NaN."""
+    INT = "int"
+    """Integer number."""
+    BOOL = "bool"
+    """Boolean value."""
+    STR = "str"
+    """Text."""
+    ARRAY = "array"
+    """Numerical array of any shape, stored in NPY format."""
+    JSON = "json"
+    """Any JSON-serializable value or pydantic model."""
+
+
+class Column:
+    """
+    Value that is extracted from every job.
+
+    Attributes
+    ----------
+    name: str
+        Name of the column. Must be a valid identifier.
+    getter: str | Callable[..., Any]
+        Name of an `Output` method or a function that takes the `Output` as first argument.
+        Functions must be defined at module level, so that they can be sent to worker processes.
+    kind: ColumnKind
+        Type of the values.
+    per_geometry: bool
+        The getter is called for every geometry with the keyword `index`, instead of once per job.
+    gbw: bool
+        The getter requires the GBW JSON files, which are otherwise not read.
+    kwargs: dict[str, Any]
+        Further keyword arguments for the getter.
+    """
+
+    __slots__ = ("name", "getter", "kind", "per_geometry", "gbw", "kwargs")
+
+    def __init__(
+        self,
+        name: str,
+        getter: str | Callable[..., Any],
+        /,
+        kind: ColumnKind | str = ColumnKind.FLOAT,
+        *,
+        per_geometry: bool = False,
+        gbw: bool = False,
+        **kwargs: Any,
+    ) -> None:
+        if not name.isidentifier():
+            raise ValueError(f"{self.__class__.__name__}.name: {name!r} is not a valid identifier!")
+        self.name = name
+        self.getter = getter
+        self.kind = ColumnKind(kind)
+        self.per_geometry = per_geometry
+        self.gbw = gbw
+        self.kwargs = kwargs
+
+    def __repr__(self) -> str:
+        return f"{self.__class__.__name__}({self.name!r}, {self.getter!r}, {str(self.kind)!r})"
+
+    @property
+    def signature(self) -> str:
+        """String that changes whenever the definition of the column changes."""
+        getter = self.getter if isinstance(self.getter, str) else self.getter.__qualname__
+        kwargs = json.dumps(self.kwargs, sort_keys=True, default=str)
+        return f"{self.name}:{getter}:{self.kind}:{self.per_geometry}:{kwargs}"
+
+    def evaluate(self, output: Output, /, index: int | None = None) -> Any:
+        """Evaluate the getter for `output` and, for per-geometry columns, the geometry `index`."""
+        kwargs = dict(self.kwargs)
+        if index is not None:
+            kwargs["index"] = index
+        if isinstance(self.getter, str):
+            return getattr(output, self.getter)(**kwargs)
+        return self.getter(output, **kwargs)
+
+    def encode(self, value: Any, /) -> float | int | str | bytes | None:
+        """Convert a value returned by the getter to a value that can be stored in SQLite."""
+        if value is None:
+            return None
+        match self.kind:
+            case ColumnKind.FLOAT:
+                return float(value)
+            case ColumnKind.INT | ColumnKind.BOOL:
+                return int(value)
+            case ColumnKind.STR:
+                return str(value)
+            case ColumnKind.ARRAY:
+                buffer = io.BytesIO()
+                np.save(buffer, np.asarray(value), allow_pickle=False)
+                return buffer.getvalue()
+            case _:
+                return json.dumps(_to_plain(value))
+
+    def decode(self, values: Sequence[Any], /) -> npt.NDArray[Any]:
+        """Convert the stored values of the column to a NumPy array."""
+        missing = any(value is None for value in values)
+        match self.kind:
+            case ColumnKind.FLOAT:
+                return np.array([np.nan if v is None else v for v in values], dtype=np.float64)
+            case ColumnKind.INT if not missing:
+                return np.array(values, dtype=np.int64)
+            case ColumnKind.INT:
+                # > Missing values can only be represented by NaN
+                return np.array([np.nan if v is None else v for v in values], dtype=np.float64)
+            case ColumnKind.BOOL if not missing:
+                return np.array(values, dtype=np.bool_)
+        array = np.empty(len(values), dtype=object)
+        for i, value in enumerate(values):
+            if value is None:
+                continue
+            match self.kind:
+                case ColumnKind.ARRAY:
+                    array[i] = np.load(io.BytesIO(value), allow_pickle=False)
+                case ColumnKind.JSON:
+                    array[i] = json.loads(value)
+                case ColumnKind.BOOL:
+                    array[i] = bool(value)
+                case _:
+                    array[i] = value
+        return array
+
+
+def _to_plain(value: Any, /) -> Any:
+    """Convert pydantic models and NumPy arrays within `value` into JSON-serializable data."""
+    if isinstance(value, BaseModel):
+        return value.model_dump(mode="json")
+    if isinstance(value, np.ndarray):
+        return value.tolist()
+    if isinstance(value, dict):
+        return {str(key): _to_plain(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_to_plain(item) for item in value]
+    return value
+
+
+def _mulliken_charges(output: Output, /, *, index: int = -1) -> list[float] | None:
+    """Mulliken charges of all atoms."""
+    mulliken = output.get_mulliken(index=index)
+    if not mulliken or mulliken[0].atomiccharges is None:
+        return None
+    return [charge[0] for charge in mulliken[0].atomiccharges]
+
+
+def _coordinates(output: Output, /, *, index: int = -1) -> list[list[float]] | None:
+    """Cartesian coordinates in Angstrom."""
+    structure = output.get_structure(index=index, with_fragments=False)
+    if structure is None:
+        return None
+    return [list(atom.coordinates.coordinates) for atom in structure.atoms]
+
+
+def _timings(output: Output, /) -> dict[str, float | None] | None:
+    """Wall times of the ORCA modules in seconds."""
+    timings = output.get_calculation_timings()
+    if timings is None:
+        return None
+    return cast(dict[str, float | None], timings.model_dump())
+
+
+def _total_time(output: Output, /) -> float | None:
+    """Total wall time in seconds."""
+    timings = _timings(output)
+    return None if timings is None else timings.get("sum")
+
+
+DEFAULT_COLUMNS: tuple[Column, ...] = (
+    Column("charge", "get_charge", ColumnKind.INT),
+    Column("mult", "get_mult", ColumnKind.INT),
+    Column("nbf", "get_nbf", ColumnKind.INT),
+    Column("scf_converged", "scf_converged", ColumnKind.BOOL),
+    Column("total_time", _total_time),
+    Column("timings", _timings, ColumnKind.JSON),
+    Column("final_energy", "get_final_energy", per_geometry=True),
+    Column("coordinates", _coordinates, ColumnKind.ARRAY, per_geometry=True),
+    Column("gradient", "get_gradient", ColumnKind.ARRAY, per_geometry=True),
+    Column("mulliken_charges", _mulliken_charges, ColumnKind.ARRAY, per_geometry=True),
+)
+"""Columns extracted by default."""
+
+
+def _job_files(directory: Path, basename: str, /) -> list[Path]:
+    """Files from which the results of a job are read."""
+    files = [directory / f"{basename}{suffix}" for suffix in (".out", ".property.json", ".json")]
+    # > JSON files of multi-GBW runs, e.g., scans or NEB
+    files += sorted(directory.glob(f"{basename}.[0-9][0-9][0-9].json"))
+    files += sorted(directory.glob(f"{basename}_im*.json"))
+    return files
+
+
+def _fingerprint(directory: Path, basename: str, columns_signature: str, /) -> str:
+    """Hash of the sizes and modification times of all result files of a job and of the column definitions."""
+    digest = hashlib.sha256(columns_signature.encode())
+    for file in _job_files(directory, basename):
+        try:
+            stat = file.stat()
+        except FileNotFoundError:
+            continue
+        digest.update(f"\0{file.name}:{stat.st_size}:{stat.st_mtime_ns}".encode())
+    return digest.hexdigest()
+
+
+def _extract(
+    directory: Path, basename: str, columns: tuple[Column, ...], /
+) -> tuple[dict[str, Any], list[dict[str, Any]]]:
+    """
+    Extract all columns of one job. Runs in the worker processes.
+
+    Returns
+    -------
+    tuple[dict[str, Any], list[dict[str, Any]]]
+        Encoded values of the job row and of the geometry rows.
+    """
+    output = Output(basename, working_dir=directory, version_check=False)
+    job: dict[str, Any] = {
+        "terminated_normally": int(output.terminated_normally()),
+        "ngeometries": 0,
+        "error": None,
+    }
+    try:
+        output.parse(
+            do_create_property_json=False,
+            do_create_gbw_json=False,
+            read_gbw_json=any(column.gbw for column in columns),
+        )
+    except Exception as err:
+        job["error"] = f"{type(err).__name__}: {err}"
+        return job, []
+
+    assert output.results_properties is not None
+    ngeometries = len(output.results_properties.geometries or ())
+    job["ngeometries"] = ngeometries
+    geometries: list[dict[str, Any]] = [{"geometry": i} for i in range(ngeometries)]
+    for column in columns:
+        try:
+            if column.per_geometry:
+                for i, row in enumerate(geometries):
+                    row[column.name] = column.encode(column.evaluate(output, i))
+            else:
+                job[column.name] = column.encode(column.evaluate(output))
+        except Exception as err:
+            # > Keep the other columns, but record the first failing getter
+            if job["error"] is None:
+                job["error"] = f"{column.name}: {type(err).__name__}: {err}"
+    return job, geometries
+
+
+class ResultsWarehouse:
+    """
+    SQLite database with results extracted from many ORCA jobs.
+
+    The table `jobs` has one row per job with the columns `job_id`, `directory`, `basename`,
+    `terminated_normally`, `ngeometries`, `error`, and all job columns.
+    The table `geometries` has one row per geometry of each job with the columns `job_id`, `geometry`
+    (the index of the geometry), and all per-geometry columns.
+
+    Attributes
+    ----------
+    path: Path
+        Path of the database file.
+    columns: tuple[Column, ...]
+        Columns that are extracted from each job.
+    """
+
+    # > Columns of the job table that are always present
+    JOB_COLUMNS = ("job_id", "directory", "basename", "terminated_normally", "ngeometries", "error")
+    # > Columns of the geometry table that are always present
+    GEOMETRY_COLUMNS = ("job_id", "geometry")
+    # > Number of jobs after which the database is committed during ingestion
+    COMMIT_INTERVAL = 500
+
+    def __init__(
+        self,
+        path: Path | str | os.PathLike[str],
+        /,
+        columns: Iterable[Column] = DEFAULT_COLUMNS,
+    ) -> None:
+        """
+        Parameters
+        ----------
+        path : Path | str | os.PathLike[str]
+            Database file. Created if it does not exist.
+        columns : Iterable[Column], default: DEFAULT_COLUMNS
+            Columns to extract. Columns that are not present in an existing database are added.
+
+        Raises
+        ------
+        ValueError
+            If column names are duplicated or clash with the fixed columns.
+        """
+        self.path = Path(path).expanduser().resolve()
+        self.columns = tuple(columns)
+        names = [column.name for column in self.columns]
+        if len(set(names)) != len(names) or set(names) & {
+            *self.JOB_COLUMNS,
+            *self.GEOMETRY_COLUMNS,
+        }:
+            raise ValueError(f"{self.__class__.__name__}.columns: invalid column names {names}")
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._connection = sqlite3.connect(self.path)
+        self._create_tables()
+
+    def close(self) -> None:
+        """Close the database connection."""
+        self._connection.close()
+
+    def __enter__(self) -> "ResultsWarehouse":
+        return self
+
+    def __exit__(self, *_: Any) -> None:
+        self.close()
+
+    @property
+    def columns_signature(self) -> str:
+        """String that identifies the column definitions. Jobs are extracted again if it changes."""
+        return "\n".join(column.signature for column in self.columns)
+
+    def _table_columns(self, table: str, /) -> list[str]:
+        return [row[1] for row in self._connection.execute(f"PRAGMA table_info({table})")]
+
+    def _create_tables(self) -> None:
+        """Create the tables and add missing columns."""
+        with self._connection:
+            self._connection.execute(
+                "CREATE TABLE IF NOT EXISTS jobs ("
+                "job_id INTEGER PRIMARY KEY, directory TEXT NOT NULL, basename TEXT NOT NULL, "
+                "fingerprint TEXT NOT NULL, terminated_normally INTEGER, ngeometries INTEGER, error TEXT, "
+                "UNIQUE (directory, basename))"
+            )
+            self._connection.execute(
+                "CREATE TABLE IF NOT EXISTS geometries ("
+                "job_id INTEGER NOT NULL REFERENCES jobs (job_id) ON DELETE CASCADE, "
+                "geometry INTEGER NOT NULL, PRIMARY KEY (job_id, geometry))"
+            )
+            for table, per_geometry in (("jobs", False), ("geometries", True)):
+                existing = set(self._table_columns(table))
+                for column in self.columns:
+                    if column.per_geometry == per_geometry and column.name not in existing:
+                        self._connection.execute(f'ALTER TABLE {table} ADD COLUMN "{column.name}"')
+
+    @staticmethod
+    def discover(paths: Iterable[Path | str | os.PathLike[str]], /) -> Iterator[tuple[Path, str]]:
+        """
+        Find the jobs in the given directories, i.e., all files `<basename>.out`.
+        Paths to `.out` files are used directly.
+
+        Yields
+        ------
+        tuple[Path, str]
+            Resolved directory and basename of each job.
+        """
+        for path in paths:
+            path = Path(path).expanduser().resolve()
+            if path.is_file():
+                yield path.parent, path.name.removesuffix(".out")
+                continue
+            with os.scandir(path) as entries:
+                for entry in sorted(entries, key=lambda e: e.name):
+                    if entry.name.endswith(".out") and entry.is_file():
+                        yield path, entry.name.removesuffix(".out")
+
+    def ingest(
+        self,
+        paths: Iterable[Path | str | os.PathLike[str]],
+        /,
+        *,
+        max_workers: int | None = None,
+    ) -> int:
+        """
+        Extract the columns from all new or changed jobs in `paths` and store them.
+        A job is changed if any of its `.out` or JSON files or the column definitions changed.
+        Jobs are parsed in parallel processes.
+
+        Parameters
+        ----------
+        paths : Iterable[Path | str | os.PathLike[str]]
+            Job directories or `.out` files, see `discover()`.
+        max_workers : int | None, default: None
+            Number of worker processes. If None, the number of CPUs is used. With 1, jobs are parsed in this process.
+
+        Returns
+        -------
+        int
+            Number of jobs that were extracted.
+        """
+        signature = self.columns_signature
+        known = {
+            (Path(directory), basename): fingerprint
+            for directory, basename, fingerprint in self._connection.execute(
+                "SELECT directory, basename, fingerprint FROM jobs"
+            )
+        }
+        todo = []
+        for directory, basename in self.discover(paths):
+            fingerprint = _fingerprint(directory, basename, signature)
+            if known.get((directory, basename)) != fingerprint:
+                todo.append((directory, basename, fingerprint))
+
+        workers = max_workers or os.cpu_count() or 1
+        if workers == 1 or len(todo) <= 1:
+            results: Iterable[tuple[dict[str, Any], list[dict[str, Any]]]] = (
+                _extract(directory, basename, self.columns) for directory, basename, _ in todo
+            )
+            self._store(todo, results)
+        else:
+            with ProcessPoolExecutor(workers) as executor:
+                results = executor.map(
+                    _extract,
+                    [directory for directory, _, _ in todo],
+                    [basename for _, basename, _ in todo],
+                    [self.columns] * len(todo),
+                    chunksize=max(1, min(64, len(todo) // (4 * workers))),
+                )
+                self._store(todo, results)
+        return len(todo)
+
+    def _store(
+        self,
+        todo: list[tuple[Path, str, str]],
+        results: Iterable[tuple[dict[str, Any], list[dict[str, Any]]]],
+        /,
+    ) -> None:
+        """Write the extracted rows, replacing previous rows of the same jobs."""
+        connection = self._connection
+        try:
+            for count, ((directory, basename, fingerprint), (job, geometries)) in enumerate(
+                zip(todo, results), start=1
+            ):
+                job.update(directory=str(directory), basename=basename, fingerprint=fingerprint)
+                row = connection.execute(
+                    "SELECT job_id FROM jobs WHERE directory = ? AND basename = ?",
+                    (job["directory"], basename),
+                ).fetchone()
+                if row is not None:
+                    job["job_id"] = row[0]
+                    connection.execute("DELETE FROM geometries WHERE job_id = ?", row)
+                names = ", ".join(f'"{name}"' for name in job)
+                cursor = connection.execute(
+                    f"INSERT OR REPLACE INTO jobs ({names}) VALUES ({', '.join('?' * len(job))})",
+                    tuple(job.values()),
+                )
+                for geometry in geometries:
+                    geometry["job_id"] = cursor.lastrowid
+                    names = ", ".join(f'"{name}"' for name in geometry)
+                    connection.execute(
+                        f"INSERT INTO geometries ({names}) VALUES ({', '.join('?' * len(geometry))})",
+                        tuple(geometry.values()),
+                    )
+                if count % self.COMMIT_INTERVAL == 0:
+                    connection.commit()
+        finally:
+            connection.commit()
+
+    def remove_missing(self) -> int:
+        """
+        Remove all jobs whose `.out` file does not exist anymore.
+
+        Returns
+        -------
+        int
+            Number of removed jobs.
+        """
+        removed = [
+            (job_id,)
+            for job_id, directory, basename in self._connection.execute(
+                "SELECT job_id, directory, basename FROM jobs"
+            )
+            if not (Path(directory) / f"{basename}.out").is_file()
+        ]
+        with self._connection:
+            self._connection.executemany("DELETE FROM geometries WHERE job_id = ?", removed)
+            self._connection.executemany("DELETE FROM jobs WHERE job_id = ?", removed)
+        return len(removed)
+
+    def __len__(self) -> int:
+        return int(self._connection.execute("SELECT COUNT(*) FROM jobs").fetchone()[0])
+
+    def query(
+        self,
+        table: str = "jobs",
+        /,
+        columns: Iterable[str] | None = None,
+        *,
+        where: str | None = None,
+        parameters: Sequence[Any] = (),
+    ) -> dict[str, npt.NDArray[Any]]:
+        """
+        Read columns of a table as NumPy arrays.
+
+        Parameters
+        ----------
+        table : str, default: "jobs"
+            Either "jobs" or "geometries".
+        columns : Iterable[str] | None, default: None
+            Names of the columns. If None, all columns of the table.
+            For "geometries", columns of the job table can be requested as well.
+        where : str | None, default: None
+            Optional SQL condition, e.g., `"final_energy < ?"`.
+        parameters : Sequence[Any], default: ()
+            Parameters for the placeholders in `where`.
+
+        Returns
+        -------
+        dict[str, npt.NDArray[Any]]
+            One array per column in the order of `job_id` (and `geometry`).
+
+        Raises
+        ------
+        ValueError
+            If the table or a column does not exist.
+        """
+        if table not in ("jobs", "geometries"):
+            raise ValueError(f"Unknown table: {table}")
+        available = self._table_columns(table)
+        if table == "geometries":
+            available += [name for name in self._table_columns("jobs") if name not in available]
+        names = (
+            [name for name in available if name != "fingerprint"]
+            if columns is None
+            else list(columns)
+        )
+        if unknown := set(names) - set(available):
+            raise ValueError(f"Unknown columns for table {table}: {sorted(unknown)}")
+
+        if table == "jobs":
+            source = "jobs"
+            order = "jobs.job_id"
+        else:
+            source = "geometries JOIN jobs USING (job_id)"
+            order = "geometries.job_id, geometries.geometry"
+        selection = ", ".join(f'"{name}"' for name in names)
+        sql = f"SELECT {selection} FROM {source}"
+        if where:
+            sql += f" WHERE {where}"
+        rows = self._connection.execute(f"{sql} ORDER BY {order}", tuple(parameters)).fetchall()
+
+        by_name = {column.name: column for column in self.columns}
+        fixed_kinds = {
+            "directory": ColumnKind.STR,
+            "basename": ColumnKind.STR,
+            "error": ColumnKind.STR,
+            "terminated_normally": ColumnKind.BOOL,
+        }
+        result = {}
+        for i, name in enumerate(names):
+            column = by_name.get(name) or Column(name, name, fixed_kinds.get(name, ColumnKind.INT))
+            result[name] = column.decode([row[i] for row in rows])
+        return result
+
+    def to_dataframe(
+        self,
+        table: str = "jobs",
+        /,
+        columns: Iterable[str] | None = None,
+        *,
+        where: str | None = None,
+        parameters: Sequence[Any] = (),
+    ) -> "DataFrame":
+        """
+        Same as `query()`, but returns a pandas DataFrame. Requires pandas.
+
+        Raises
+        ------
+        ImportError
+            If pandas is not installed.
+        """
+        import pandas as pd
+
+        data = self.query(table, columns, where=where, parameters=parameters)
+        return pd.DataFrame(data)
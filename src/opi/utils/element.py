@@ -381,247 +381,9 @@ class Element(StringEnum):
         ------
         ValueError: Is raised if atomic number is out of range.
         """
-        match atomic_number:
-            case 0:
-                return cls.X
-            case 1:
-                return cls.HYDROGEN
-            case 2:
-                return cls.HELIUM
-            case 3:
-                return cls.LITHIUM
-            case 4:
-                return cls.BERYLLIUM
-            case 5:
-                return cls.BORON
-            case 6:
-                return cls.CARBON
-            case 7:
-                return cls.NITROGEN
-            case 8:
-                return cls.OXYGEN
-            case 9:
-                return cls.FLUORINE
-            case 10:
-                return cls.NEON
-            case 11:
-                return cls.SODIUM
-            case 12:
-                return cls.MAGNESIUM
-            case 13:
-                return cls.ALUMINUM
-            case 14:
-                return cls.SILICON
-            case 15:
-                return cls.PHOSPHORUS
-            case 16:
-                return cls.SULFUR
-            case 17:
-                return cls.CHLORINE
-            case 18:
-                return cls.ARGON
-            case 19:
-                return cls.POTASSIUM
-            case 20:
-                return cls.CALCIUM
-            case 21:
-                return cls.SCANDIUM
-            case 22:
-                return cls.TITANIUM
-            case 23:
-                return cls.VANADIUM
-            case 24:
-                return cls.CHROMIUM
-            case 25:
-                return cls.MANGANESE
-            case 26:
-                return cls.IRON
-            case 27:
-                return cls.COBALT
-            case 28:
-                return cls.NICKEL
-            case 29:
-                return cls.COPPER
-            case 30:
-                return cls.ZINC
-            case 31:
-                return cls.GALLIUM
-            case 32:
-                return cls.GERMANIUM
-            case 33:
-                return cls.ARSENIC
-            case 34:
-                return cls.SELENIUM
-            case 35:
-                return cls.BROMINE
-            case 36:
-                return cls.KRYPTON
-            case 37:
-                return cls.RUBIDIUM
-            case 38:
-                return cls.STRONTIUM
-            case 39:
-                return cls.YTTRIUM
-            case 40:
-                return cls.ZIRCONIUM
-            case 41:
-                return cls.NIOBIUM
-            case 42:
-                return cls.MOLYBDENUM
-            case 43:
-                return cls.TECHNETIUM
-            case 44:
-                return cls.RUTHENIUM
-            case 45:
-                return cls.RHODIUM
-            case 46:
-                return cls.PALLADIUM
-            case 47:
-                return cls.SILVER
-            case 48:
-                return cls.CADMIUM
-            case 49:
-                return cls.INDIUM
-            case 50:
-                return cls.TIN
-            case 51:
-                return cls.ANTIMONY
-            case 52:
-                return cls.TELLURIUM
-            case 53:
-                return cls.IODINE
-            case 54:
-                return cls.XENON
-            case 55:
-                return cls.CESIUM
-            case 56:
-                return cls.BARIUM
-            case 57:
-                return cls.LANTHANUM
-            case 58:
-                return cls.CERIUM
-            case 59:
-                return cls.PRASEODYMIUM
-            case 60:
-                return cls.NEODYMIUM
-            case 61:
-                return cls.PROMETHIUM
-            case 62:
-                return cls.SAMARIUM
-            case 63:
-                return cls.EUROPIUM
-            case 64:
-                return cls.GADOLINIUM
-            case 65:
-                return cls.TERBIUM
-            case 66:
-                return cls.DYSPROSIUM
-            case 67:
-                return cls.HOLMIUM
-            case 68:
-                return cls.ERBIUM
-            case 69:
-                return cls.THULIUM
-            case 70:
-                return cls.YTTERBIUM
-            case 71:
-                return cls.LUTETIUM
-            case 72:
-                return cls.HAFNIUM
-            case 73:
-                return cls.TANTALUM
-            case 74:
-                return cls.WOLFRAM
-            case 75:
-                return cls.RHENIUM
-            case 76:
-                return cls.OSMIUM
-            case 77:
-                return cls.IRIDIUM
-            case 78:
-                return cls.PLATINUM
-            case 79:
-                return cls.GOLD
-            case 80:
-                return cls.MERCURY
-            case 81:
-                return cls.THALLIUM
-            case 82:
-                return cls.LEAD
-            case 83:
-                return cls.BISMUTH
-            case 84:
-                return cls.POLONIUM
-            case 85:
-                return cls.ASTATINE
-            case 86:
-                return cls.RADON
-            case 87:
-                return cls.FRANCIUM
-            case 88:
-                return cls.RADIUM
-            case 89:
-                return cls.ACTINIUM
-            case 90:
-                return cls.THORIUM
-            case 91:
-                return cls.PROTACTINIUM
-            case 92:
-                return cls.URANIUM
-            case 93:
-                return cls.NEPTUNIUM
-            case 94:
-                return cls.PLUTONIUM
-            case 95:
-                return cls.AMERICIUM
-            case 96:
-                return cls.CURIUM
-            case 97:
-                return cls.BERKELIUM
-            case 98:
-                return cls.CALIFORNIUM
-            case 99:
-                return cls.EINSTEINIUM
-            case 100:
-                return cls.FERMIUM
-            case 101:
-                return cls.MENDELEVIUM
-            case 102:
-                return cls.NOBELIUM
-            case 103:
-                return cls.LAWRENCIUM
-            case 104:
-                return cls.RUTHERFORDIUM
-            case 105:
-                return cls.DUBNIUM
-            case 106:
-                return cls.SEABORGIUM
-            case 107:
-                return cls.BOHRIUM
-            case 108:
-                return cls.HASSIUM
-            case 109:
-                return cls.MEITNERIUM
-            case 110:
-                return cls.DARMSTADTIUM
-            case 111:
-                return cls.ROENTGENIUM
-            case 112:
-                return cls.COPERNICIUM
-            case 113:
-                return cls.NIHONIUM
-            case 114:
-                return cls.FLEROVIUM
-            case 115:
-                return cls.MOSCOVIUM
-            case 116:
-                return cls.LIVERMORIUM
-            case 117:
-                return cls.TENNESSINE
-            case 118:
-                return cls.OGANESSON
-            case _:
-                raise ValueError(f"Atomic number {atomic_number} out of range: 1 <= x <= 118")
+        if atomic_number not in range(len(ELEMENTS_BY_NUMBER)):
+            raise ValueError(f"Atomic number {atomic_number} out of range: 1 <= x <= 118")
+        return ELEMENTS_BY_NUMBER[int(atomic_number)]
 
     @property
     def atomic_number(self) -> int:
@@ -900,3 +662,8 @@ ATOMIC_NUMBERS_FROM_ELEMENT: dict[Element, int] = {
     Element.OG: 118,
     Element.OGANESSON: 118,
 }
+
+# > Elements indexed by their atomic number, starting with the dummy atom
+ELEMENTS_BY_NUMBER: tuple[Element, ...] = tuple(
+    sorted(set(ATOMIC_NUMBERS_FROM_ELEMENT), key=ATOMIC_NUMBERS_FROM_ELEMENT.__getitem__)
+)
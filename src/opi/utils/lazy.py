@@ -0,0 +1,69 @@
+"""
+Lazy loading of the public names of a package (PEP 562).
+The submodules of a package are only imported when one of their names is accessed for the first time.
+"""
+
+import importlib
+import importlib.util
+import sys
+from types import ModuleType
+from typing import Any, Callable, Iterable, Mapping
+
+__all__ = ("lazy_package",)
+
+
+def lazy_package(
+    package: str,
+    /,
+    attributes: Mapping[str, Iterable[str]],
+    *,
+    submodules: Iterable[str] = (),
+) -> tuple[Callable[[str], Any], Callable[[], list[str]]]:
+    """
+    Create the module-level `__getattr__()` and `__dir__()` of a package.
+
+    Example
+    -------
+    ::
+
+     >>__getattr__, __dir__ = lazy_package(__name__, {".base": ("Block",)})
+
+    Parameters
+    ----------
+    package : str
+        Name of the package, i.e., `__name__`.
+    attributes : Mapping[str, Iterable[str]]
+        Names of the attributes defined by every submodule. Submodules are given relative to `package`.
+    submodules : Iterable[str], default: ()
+        Submodules that are accessible as attributes of the package.
+
+    Returns
+    -------
+    Callable[[str], Any]
+        `__getattr__()`, imports the submodule of an attribute on first access.
+    Callable[[], list[str]]
+        `__dir__()`, lists the lazy attributes next to those that are already loaded.
+    """
+    # > Attribute name -> absolute name of the module to import
+    origins = {
+        name: importlib.util.resolve_name(module, package)
+        for module, names in attributes.items()
+        for name in names
+    }
+    origins.update({name: f"{package}.{name}" for name in submodules})
+
+    def __getattr__(name: str) -> Any:
+        try:
+            origin = origins[name]
+        except KeyError:
+            raise AttributeError(f"module {package!r} has no attribute {name!r}") from None
+        module: ModuleType = importlib.import_module(origin)
+        value = module if origin == f"{package}.{name}" else getattr(module, name)
+        # > Later accesses do not go through `__getattr__()` anymore
+        setattr(sys.modules[package], name, value)
+        return value
+
+    def __dir__() -> list[str]:
+        return sorted(set(vars(sys.modules[package])) | set(origins))
+
+    return __getattr__, __dir__
@@ -1,6 +1,8 @@
+import hashlib
 import os
 import platform
 import sys
+from functools import lru_cache
 from pathlib import Path
 from typing import Any, Mapping, Sequence, cast
 
@@ -200,3 +202,31 @@ def resolve_binary_name(name: str | OrcaBinary, /) -> str:
         return name + ".exe"
     else:
         return name
+
+
+@lru_cache(maxsize=256)
+def _file_digest(path: Path, size: int, mtime_ns: int, /) -> str:
+    """
+    SHA-256 of a file. `size` and `mtime_ns` are only part of the cache key,
+    so a file is only hashed again if it was modified.
+    """
+    with path.open("rb") as f:
+        return hashlib.file_digest(f, "sha256").hexdigest()
+
+
+def file_digest(path: Path, /) -> str:
+    """
+    Content hash of a file. Hashes are kept in memory as long as the file is not modified.
+
+    Parameters
+    ----------
+    path : Path
+        File to be hashed.
+
+    Raises
+    ------
+    FileNotFoundError
+        If `path` does not exist.
+    """
+    stat = path.resolve().stat()
+    return _file_digest(path.resolve(), stat.st_size, stat.st_mtime_ns)
@@ -0,0 +1,220 @@
+"""
+Element properties as NumPy arrays indexed by the atomic number and vectorized conversion between element symbols
+and atomic numbers. Index 0 belongs to the dummy atom `Element.X`, whose properties are all zero.
+The arrays are read-only and shared by all users.
+"""
+
+from typing import Iterable, TypeVar
+
+import numpy as np
+import numpy.typing as npt
+
+from opi.utils.element import ALIASES, ELEMENTS_BY_NUMBER, Element
+
+__all__ = (
+    "ATOMIC_MASSES",
+    "COVALENT_RADII",
+    "SYMBOLS",
+    "VALENCE_ELECTRONS",
+    "numbers_to_elements",
+    "numbers_to_symbols",
+    "symbols_to_numbers",
+)
+
+T = TypeVar("T", bound=np.generic)
+
+
+def _table(values: str, dtype: type[T], /) -> npt.NDArray[T]:
+    """Read-only array of whitespace-separated values from Z = 1 on, with a zero for the dummy atom in front."""
+    array = np.array(["0", *values.split()]).astype(dtype)
+    assert array.shape == (len(ELEMENTS_BY_NUMBER),)
+    array.flags.writeable = False
+    return array
+
+
+SYMBOLS: npt.NDArray[np.str_] = np.array([element.value for element in ELEMENTS_BY_NUMBER])
+SYMBOLS.flags.writeable = False
+"""Element symbols, e.g., `SYMBOLS[6] == "C"`."""
+
+ATOMIC_MASSES: npt.NDArray[np.float64] = _table(
+    """
+    1.008 4.0026 6.94 9.0122 10.81 12.011 14.007 15.999 18.998 20.180
+    22.990 24.305 26.982 28.085 30.974 32.06 35.45 39.95 39.098 40.078
+    44.956 47.867 50.942 51.996 54.938 55.845 58.933 58.693 63.546 65.38
+    69.723 72.630 74.922 78.971 79.904 83.798 85.468 87.62 88.906 91.224
+    92.906 95.95 98.0 101.07 102.91 106.42 107.87 112.41 114.82 118.71
+    121.76 127.60 126.90 131.29 132.91 137.33 138.91 140.12 140.91 144.24
+    145.0 150.36 151.96 157.25 158.93 162.50 164.93 167.26 168.93 173.05
+    174.97 178.49 180.95 183.84 186.21 190.23 192.22 195.08 196.97 200.59
+    204.38 207.2 208.98 209.0 210.0 222.0 223.0 226.0 227.0 232.04
+    231.04 238.03 237.0 244.0 243.0 247.0 247.0 251.0 252.0 257.0
+    258.0 259.0 266.0 267.0 268.0 269.0 270.0 269.0 278.0 281.0
+    282.0 285.0 286.0 289.0 290.0 293.0 294.0 294.0
+    """,
+    np.float64,
+)
+"""
+Standard atomic weights in Dalton (IUPAC, abridged to five significant digits).
+Elements without stable isotopes have the mass number of their longest-lived isotope.
+"""
+
+COVALENT_RADII: npt.NDArray[np.float64] = _table(
+    """
+    0.32 0.46 1.33 1.02 0.85 0.75 0.71 0.63 0.64 0.67
+    1.55 1.39 1.26 1.16 1.11 1.03 0.99 0.96 1.96 1.71
+    1.48 1.36 1.34 1.22 1.19 1.16 1.11 1.10 1.12 1.18
+    1.24 1.21 1.21 1.16 1.14 1.17 2.10 1.85 1.63 1.54
+    1.47 1.38 1.28 1.25 1.25 1.20 1.28 1.36 1.42 1.40
+    1.40 1.36 1.33 1.31 2.32 1.96 1.80 1.63 1.76 1.74
+    1.73 1.72 1.68 1.69 1.68 1.67 1.66 1.65 1.64 1.70
+    1.62 1.52 1.46 1.37 1.31 1.29 1.22 1.23 1.24 1.33
+    1.44 1.44 1.51 1.45 1.47 1.42 2.23 2.01 1.86 1.75
+    1.69 1.70 1.71 1.72 1.66 1.66 1.68 1.68 1.65 1.67
+    1.73 1.76 1.61 1.57 1.49 1.43 1.41 1.34 1.29 1.28
+    1.21 1.22 1.36 1.43 1.62 1.75 1.65 1.57
+    """,
+    np.float64,
+)
+"""Single-bond covalent radii in Angstrom (P. Pyykkö, M. Atsumi, Chem. Eur. J. 2009, 15, 186)."""
+
+VALENCE_ELECTRONS: npt.NDArray[np.int64] = _table(
+    """
+    1 2 1 2 3 4 5 6 7 8
+    1 2 3 4 5 6 7 8 1 2
+    3 4 5 6 7 8 9 10 11 12
+    3 4 5 6 7 8 1 2 3 4
+    5 6 7 8 9 10 11 12 3 4
+    5 6 7 8 1 2 3 4 5 6
+    7 8 9 10 11 12 13 14 15 2
+    3 4 5 6 7 8 9 10 11 12
+    3 4 5 6 7 8 1 2 3 4
+    5 6 7 8 9 10 11 12 13 14
+    15 2 3 4 5 6 7 8 9 10
+    11 12 3 4 5 6 7 8
+    """,
+    np.int64,
+)
+"""Number of electrons outside of the noble gas core and of completely filled d and f shells."""
+
+# > Symbol in any case or alias -> atomic number
+_NUMBERS_FROM_SYMBOL: dict[str, int] = {}
+for _number, _symbol in enumerate(SYMBOLS.tolist()):
+    _NUMBERS_FROM_SYMBOL.update(dict.fromkeys((_symbol, _symbol.upper(), _symbol.lower()), _number))
+for _alias, _element in ALIASES.items():
+    _NUMBERS_FROM_SYMBOL.update(
+        dict.fromkeys((_alias, _alias.lower(), _alias.title()), _element.atomic_number)
+    )
+# >> Mixed case that `str.upper()`, `str.lower()` and `str.title()` do not cover, e.g., "cL"
+for _symbol, _number in list(_NUMBERS_FROM_SYMBOL.items()):
+    if len(_symbol) == 2:
+        _NUMBERS_FROM_SYMBOL[_symbol[0].lower() + _symbol[1].upper()] = _number
+
+# > The same mapping for arrays: the code points of a symbol with at most two characters -> atomic number, else -1
+# >> Characters beyond ASCII are clipped to 127, which is part of no symbol
+_NUMBERS_FROM_CODES: npt.NDArray[np.int64] = np.full(128 * 128, -1, dtype=np.int64)
+for _symbol, _number in _NUMBERS_FROM_SYMBOL.items():
+    _codes = [ord(_char) for _char in _symbol] + [0]
+    _NUMBERS_FROM_CODES[_codes[0] << 7 | _codes[1]] = _number
+_NUMBERS_FROM_CODES.flags.writeable = False
+
+
+def _unknown_symbol(symbol: object, /) -> ValueError:
+    return ValueError(f"Unknown element symbol: {symbol}")
+
+
+def symbols_to_numbers(symbols: Iterable[str] | npt.NDArray[np.str_], /) -> npt.NDArray[np.int64]:
+    """
+    Convert element symbols to atomic numbers. Symbols are case-insensitive, as for `Element`.
+    NumPy string arrays are converted without a Python loop.
+
+    Parameters
+    ----------
+    symbols : Iterable[str] | npt.NDArray[np.str_]
+        Element symbols or `Element` members.
+
+    Returns
+    -------
+    npt.NDArray[np.int64]
+        Atomic numbers with the shape of `symbols`.
+
+    Raises
+    ------
+    ValueError
+        If a symbol is unknown.
+    """
+    if isinstance(symbols, np.ndarray) and symbols.dtype.kind == "U":
+        flat = symbols.ravel()
+        if flat.dtype.itemsize > 8:
+            too_long = np.strings.str_len(flat) > 2
+            if too_long.any():
+                raise _unknown_symbol(flat[too_long.argmax()])
+        codes = np.minimum(np.ascontiguousarray(flat, dtype="<U2").view("<u4"), 127).reshape(-1, 2)
+        numbers: npt.NDArray[np.int64] = _NUMBERS_FROM_CODES[codes[:, 0] << 7 | codes[:, 1]]
+        if numbers.size and numbers.min() < 0:
+            raise _unknown_symbol(flat[numbers.argmin()])
+        return numbers.reshape(symbols.shape)
+
+    values = symbols if isinstance(symbols, (list, tuple)) else list(symbols)
+    try:
+        return np.fromiter(
+            (_NUMBERS_FROM_SYMBOL[symbol] for symbol in values), dtype=np.int64, count=len(values)
+        )
+    except (KeyError, TypeError) as err:
+        raise _unknown_symbol(err.args[0] if isinstance(err, KeyError) else err) from None
+
+
+def _check_numbers(numbers: npt.ArrayLike, /) -> npt.NDArray[np.integer]:
+    """
+    Raises
+    ------
+    ValueError
+        If an atomic number is out of range or not an integer.
+    """
+    array = np.asarray(numbers)
+    if array.size == 0:
+        return array.astype(np.int64)
+    if array.dtype.kind not in "iu":
+        raise ValueError(f"Atomic numbers must be integers, got {array.dtype}")
+    if array.min() < 0 or array.max() >= len(ELEMENTS_BY_NUMBER):
+        raise ValueError(f"Atomic numbers out of range: 0 <= x <= {len(ELEMENTS_BY_NUMBER) - 1}")
+    return array
+
+
+def numbers_to_symbols(numbers: npt.ArrayLike, /) -> npt.NDArray[np.str_]:
+    """
+    Convert atomic numbers to element symbols.
+
+    Parameters
+    ----------
+    numbers : npt.ArrayLike
+        Atomic numbers, 0 is the dummy atom.
+
+    Returns
+    -------
+    npt.NDArray[np.str_]
+        Element symbols with the shape of `numbers`.
+
+    Raises
+    ------
+    ValueError
+        If an atomic number is out of range.
+    """
+    symbols: npt.NDArray[np.str_] = SYMBOLS[_check_numbers(numbers)]
+    return symbols
+
+
+def numbers_to_elements(numbers: npt.ArrayLike, /) -> list[Element]:
+    """
+    Convert atomic numbers to `Element` members.
+
+    Parameters
+    ----------
+    numbers : npt.ArrayLike
+        Atomic numbers, 0 is the dummy atom.
+
+    Raises
+    ------
+    ValueError
+        If an atomic number is out of range.
+    """
+    return [ELEMENTS_BY_NUMBER[number] for number in _check_numbers(numbers).ravel().tolist()]
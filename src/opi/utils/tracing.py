@@ -0,0 +1,385 @@
+"""
+Opt-in tracing of the stages of a job: writing the input, running ORCA and `orca_2json`, reading, lowercasing and
+validating the JSON files, getters and Grepper searches.
+
+Tracing is disabled by default, then `span()` returns a shared no-op span and costs little more than a function call.
+It is enabled by installing a sink, which receives every finished span::
+
+     >>with tracing(MemorySink()) as sink:
+     >>    calc.write_input()
+     >>    calc.run()
+     >>    calc.get_output().parse()
+     >>sink.totals()
+
+Spans opened while another span is active become its children. The active span is tracked per thread and
+asyncio task, so spans of threads started within a span have no parent.
+"""
+
+import itertools
+import json
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from functools import wraps
+from pathlib import Path
+from types import TracebackType
+from typing import Any, Callable, Iterator, Protocol, TypeVar
+
+__all__ = (
+    "Span",
+    "SpanSink",
+    "MemorySink",
+    "JsonLinesSink",
+    "OpenTelemetrySink",
+    "span",
+    "traced",
+    "current_span",
+    "set_sink",
+    "get_sink",
+    "tracing",
+)
+
+R = TypeVar("R")
+Sink = TypeVar("Sink", bound="SpanSink")
+
+
+class SpanSink(Protocol):
+    """Receiver of spans. Must be thread-safe if jobs are traced from several threads."""
+
+    def on_start(self, span: "Span", /) -> None: ...
+
+    def on_end(self, span: "Span", /) -> None: ...
+
+
+# > Installed sink, None disables tracing
+_SINK: SpanSink | None = None
+# > Innermost open span of the current thread or task
+_CURRENT: ContextVar["Span | None"] = ContextVar("opi_current_span", default=None)
+_IDS = itertools.count(1)
+
+
+class Span:
+    """
+    Timed stage of a job.
+
+    Attributes
+    ----------
+    name: str
+        Name of the stage, e.g., "runner.run".
+    attributes: dict[str, Any]
+        Details of the stage, e.g., basename, file sizes or exit codes.
+    span_id: int
+        Unique ID within the process.
+    parent_id: int | None
+        ID of the span that was active when this span was opened.
+    start_ns: int
+        Start as nanoseconds since the epoch.
+    duration_ns: int | None
+        Wall-clock duration in nanoseconds, None while the span is open.
+    error: str | None
+        Type and message of the exception that ended the span.
+    """
+
+    __slots__ = (
+        "name",
+        "attributes",
+        "span_id",
+        "parent_id",
+        "start_ns",
+        "duration_ns",
+        "error",
+        "_sink",
+        "_start",
+        "_token",
+    )
+
+    def __init__(self, name: str, attributes: dict[str, Any], sink: SpanSink, /) -> None:
+        self.name = name
+        self.attributes = attributes
+        self.span_id = next(_IDS)
+        self.parent_id: int | None = None
+        self.start_ns = 0
+        self.duration_ns: int | None = None
+        self.error: str | None = None
+        self._sink = sink
+
+    def __enter__(self) -> "Span":
+        parent = _CURRENT.get()
+        self.parent_id = parent.span_id if parent is not None else None
+        self._token = _CURRENT.set(self)
+        self.start_ns = time.time_ns()
+        self._sink.on_start(self)
+        self._start = time.perf_counter_ns()
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc: BaseException | None,
+        traceback: TracebackType | None,
+    ) -> None:
+        self.duration_ns = time.perf_counter_ns() - self._start
+        _CURRENT.reset(self._token)
+        if exc is not None:
+            self.error = f"{type(exc).__name__}: {exc}"
+        self._sink.on_end(self)
+
+    @property
+    def duration(self) -> float | None:
+        """Duration in seconds."""
+        return None if self.duration_ns is None else self.duration_ns / 1e9
+
+    def set(self, key: str, value: Any, /) -> None:
+        """Set an attribute."""
+        self.attributes[key] = value
+
+    def set_attributes(self, **attributes: Any) -> None:
+        self.attributes.update(attributes)
+
+    def to_dict(self) -> dict[str, Any]:
+        """JSON-serializable representation. Attributes that are not JSON types are converted to strings."""
+        return {
+            "name": self.name,
+            "span_id": self.span_id,
+            "parent_id": self.parent_id,
+            "start_ns": self.start_ns,
+            "duration_ns": self.duration_ns,
+            "error": self.error,
+            "attributes": {key: _plain(value) for key, value in self.attributes.items()},
+        }
+
+
+class _NoSpan:
+    """Span returned while tracing is disabled."""
+
+    __slots__ = ()
+
+    def __enter__(self) -> "_NoSpan":
+        return self
+
+    def __exit__(self, *args: Any) -> None:
+        return None
+
+    def set(self, key: str, value: Any, /) -> None:
+        return None
+
+    def set_attributes(self, **attributes: Any) -> None:
+        return None
+
+
+_NO_SPAN = _NoSpan()
+
+
+def _plain(value: Any, /) -> Any:
+    """Value as JSON type."""
+    if value is None or isinstance(value, (bool, int, float, str)):
+        return value
+    if isinstance(value, (list, tuple)):
+        return [_plain(item) for item in value]
+    return str(value)
+
+
+def span(name: str, /, **attributes: Any) -> Span | _NoSpan:
+    """
+    Open a span as context manager, e.g., `with span("output.parse", basename=basename) as s: ...`.
+
+    Parameters
+    ----------
+    name : str
+        Name of the stage.
+    **attributes : Any
+        Initial attributes. More can be added with `set()` and `set_attributes()` of the span.
+    """
+    sink = _SINK
+    if sink is None:
+        return _NO_SPAN
+    return Span(name, attributes, sink)
+
+
+def current_span() -> Span | _NoSpan:
+    """Innermost open span, to add attributes from within a traced function."""
+    if _SINK is None:
+        return _NO_SPAN
+    return _CURRENT.get() or _NO_SPAN
+
+
+def traced(name: str, /) -> Callable[[Callable[..., R]], Callable[..., R]]:
+    """
+    Decorator that runs every call of a function in a span.
+
+    Parameters
+    ----------
+    name : str
+        Name of the span.
+    """
+
+    def decorator(func: Callable[..., R]) -> Callable[..., R]:
+        @wraps(func)
+        def wrapper(*args: Any, **kwargs: Any) -> R:
+            if _SINK is None:
+                return func(*args, **kwargs)
+            with span(name):
+                return func(*args, **kwargs)
+
+        return wrapper
+
+    return decorator
+
+
+def get_sink() -> SpanSink | None:
+    """Installed sink, None if tracing is disabled."""
+    return _SINK
+
+
+def set_sink(sink: SpanSink | None, /) -> SpanSink | None:
+    """
+    Install a sink for all threads, or disable tracing with None.
+
+    Returns
+    -------
+    SpanSink | None
+        Previously installed sink.
+    """
+    global _SINK
+    previous, _SINK = _SINK, sink
+    return previous
+
+
+@contextmanager
+def tracing(sink: Sink, /) -> Iterator[Sink]:
+    """Install `sink` within the context, the previous sink is restored afterward."""
+    previous = set_sink(sink)
+    try:
+        yield sink
+    finally:
+        set_sink(previous)
+
+
+# %%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%
+#                                                       SINKS
+# %%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%
+class MemorySink:
+    """
+    Collects finished spans in memory.
+
+    Attributes
+    ----------
+    spans: list[Span]
+        Finished spans in the order they ended, i.e., children before their parents.
+    """
+
+    def __init__(self) -> None:
+        self.spans: list[Span] = []
+        self._lock = threading.Lock()
+
+    def on_start(self, span: Span, /) -> None:
+        return None
+
+    def on_end(self, span: Span, /) -> None:
+        with self._lock:
+            self.spans.append(span)
+
+    def clear(self) -> None:
+        with self._lock:
+            self.spans.clear()
+
+    def find(self, name: str, /) -> list[Span]:
+        """Finished spans with the given name."""
+        with self._lock:
+            return [span for span in self.spans if span.name == name]
+
+    def totals(self) -> dict[str, tuple[int, float]]:
+        """
+        Number of spans and their total duration in seconds per name, sorted by the total duration.
+        Nested spans are also contained in the duration of their parents.
+        """
+        totals: dict[str, tuple[int, float]] = {}
+        with self._lock:
+            for span in self.spans:
+                count, total = totals.get(span.name, (0, 0.0))
+                totals[span.name] = (count + 1, total + (span.duration or 0.0))
+        return dict(sorted(totals.items(), key=lambda item: -item[1][1]))
+
+
+class JsonLinesSink:
+    """
+    Appends every finished span as a line of JSON (see `Span.to_dict()`) to a file.
+
+    Attributes
+    ----------
+    path: Path
+        The file.
+    """
+
+    def __init__(self, path: Path | str, /) -> None:
+        self.path = Path(path)
+        self._file = self.path.open("a")
+        self._lock = threading.Lock()
+
+    def __enter__(self) -> "JsonLinesSink":
+        return self
+
+    def __exit__(self, *args: Any) -> None:
+        self.close()
+
+    def on_start(self, span: Span, /) -> None:
+        return None
+
+    def on_end(self, span: Span, /) -> None:
+        line = json.dumps(span.to_dict()) + "\n"
+        with self._lock:
+            self._file.write(line)
+            self._file.flush()
+
+    def close(self) -> None:
+        with self._lock:
+            self._file.close()
+
+
+class OpenTelemetrySink:
+    """
+    Exports spans through OpenTelemetry, with the parent-child relations of OPI's spans.
+    Requires the `opentelemetry-api` package and a configured tracer provider to send spans anywhere.
+    """
+
+    def __init__(self, tracer: Any = None, /) -> None:
+        """
+        Parameters
+        ----------
+        tracer : Any, default: None
+            OpenTelemetry tracer, by default the tracer "opi" of the global tracer provider.
+
+        Raises
+        ------
+        ImportError
+            If OpenTelemetry is not installed.
+        """
+        from opentelemetry import trace
+
+        self._trace = trace
+        self.tracer = tracer if tracer is not None else trace.get_tracer("opi")
+        # > Span ID -> open OpenTelemetry span
+        self._open: dict[int, Any] = {}
+        self._lock = threading.Lock()
+
+    def on_start(self, span: Span, /) -> None:
+        with self._lock:
+            parent = self._open.get(span.parent_id) if span.parent_id is not None else None
+        context = self._trace.set_span_in_context(parent) if parent is not None else None
+        otel_span = self.tracer.start_span(span.name, context=context, start_time=span.start_ns)
+        with self._lock:
+            self._open[span.span_id] = otel_span
+
+    def on_end(self, span: Span, /) -> None:
+        with self._lock:
+            otel_span = self._open.pop(span.span_id, None)
+        if otel_span is None:
+            return
+        for key, value in span.attributes.items():
+            value = _plain(value)
+            if value is not None:
+                otel_span.set_attribute(key, value)
+        if span.error is not None:
+            otel_span.set_status(self._trace.Status(self._trace.StatusCode.ERROR, span.error))
+        otel_span.end(end_time=span.start_ns + (span.duration_ns or 0))
@@ -0,0 +1,22 @@
+import pytest
+
+from opi.execution.fake_orca import FakeOrca
+
+
+@pytest.fixture
+def fake_orca(
+    tmp_path_factory: pytest.TempPathFactory, monkeypatch: pytest.MonkeyPatch
+) -> FakeOrca:
+    """
+    Stand-in ORCA installation found through `OPI_ORCA`.
+    Change the behavior of the binaries with `fake_orca.configure()`.
+
+    Returns
+    -------
+    FakeOrca
+        Settings of the installed binaries.
+    """
+    fake = FakeOrca()
+    fake.install(tmp_path_factory.mktemp("fake_orca"))
+    monkeypatch.setenv("OPI_ORCA", str(fake.orca))
+    return fake
@@ -0,0 +1,47 @@
+from pathlib import Path
+from typing import Callable, Sequence
+
+import pytest
+
+from opi.core import Calculator
+from opi.input.simple_keywords import BasisSet, Method, SimpleKeyword
+from opi.input.structures.structure import Structure
+
+WATER = """3
+
+O 0.0000000 0.0000000 0.1173000
+H 0.0000000 0.7572000 -0.4692000
+H 0.0000000 -0.7572000 -0.4692000
+"""
+
+
+@pytest.fixture
+def water_calculator(tmp_path: Path) -> Callable[..., Calculator]:
+    """
+    Factory of calculators for a water molecule in `tmp_path`.
+
+    Returns
+    -------
+    Callable[..., Calculator]
+        Called with the basename and optionally
+        `shift`: displacement of the oxygen atom along z in Angstrom,
+        `keywords`: simple keywords, by default HF/def2-SVP, and
+        `ncores`: number of cores.
+    """
+
+    def make_calculator(
+        basename: str,
+        /,
+        *,
+        shift: float = 0.0,
+        keywords: Sequence[SimpleKeyword] = (Method.HF, BasisSet.DEF2_SVP),
+        ncores: int | None = None,
+    ) -> Calculator:
+        calc = Calculator(basename, working_dir=tmp_path, version_check=False)
+        calc.structure = Structure.from_xyz_block(WATER)
+        calc.structure.atoms[0].coordinates.z += shift
+        calc.input.add_simple_keywords(*keywords)
+        calc.input.ncores = ncores
+        return calc
+
+    return make_calculator
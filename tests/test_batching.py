@@ -0,0 +1,105 @@
+import os
+import socket
+import threading
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+import opi
+from opi.external_methods.batching import MicroBatcher
+from opi.external_methods.pool import ServerPool
+from opi.external_methods.server import ServerStatus
+
+# > Worker with a NumPy toy model: every atom is bound harmonically to the origin
+WORKER_SCRIPT = """
+import os
+import sys
+sys.path.insert(0, {src!r})
+import numpy as np
+from opi.external_methods.batching import MicroBatcher
+from opi.external_methods.session import serve
+
+def model(messages):
+    positions = np.array([message["positions"] for message in messages])
+    energies = 0.5 * np.sum(positions**2, axis=(1, 2))
+    return [
+        {{"energy": float(energy), "gradient": gradient.tolist(), "batch": len(messages), "pid": os.getpid()}}
+        for energy, gradient in zip(energies, positions)
+    ]
+
+host, port = sys.argv[2].split(":")
+serve((host, int(port)), MicroBatcher(model, window=0.01), thread_safe=True)
+"""
+
+
+def harmonic_batch(batch):
+    positions = np.array(batch)
+    return list(0.5 * np.sum(positions**2, axis=(1, 2)))
+
+
+def test_micro_batcher():
+    """Concurrent requests are evaluated in batches and the results are scattered back"""
+    rng = np.random.default_rng(1)
+    structures = rng.normal(size=(64, 5, 3))
+    results = [None] * len(structures)
+    barrier = threading.Barrier(len(structures))
+
+    with MicroBatcher(harmonic_batch, max_batch=16, window=0.05) as batcher:
+
+        def call(i):
+            barrier.wait()
+            results[i] = batcher(structures[i])
+
+        threads = [threading.Thread(target=call, args=(i,)) for i in range(len(structures))]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+    assert np.allclose(results, 0.5 * np.sum(structures**2, axis=(1, 2)))
+    assert batcher.nrequests == 64
+    assert batcher.nbatches < 64
+
+
+def test_micro_batcher_error():
+    """Errors of the batch function are raised for all requests of the batch"""
+    with MicroBatcher(lambda batch: [], window=0.0) as batcher:
+        with pytest.raises(ValueError, match="0 results for 1 requests"):
+            batcher(1)
+
+
+def free_port_range(n):
+    """First of `n` consecutive free ports"""
+    for _ in range(100):
+        with socket.socket() as sock:
+            sock.bind(("127.0.0.1", 0))
+            port = sock.getsockname()[1]
+        try:
+            sockets = [socket.create_server(("127.0.0.1", port + i)) for i in range(n)]
+        except OSError:
+            continue
+        for sock in sockets:
+            sock.close()
+        return port
+    pytest.skip("No free port range")
+
+
+def test_server_pool(tmp_path):
+    """Requests are spread across the workers and batched within each worker"""
+    script = tmp_path / "worker.py"
+    script.write_text(WORKER_SCRIPT.format(src=str(Path(opi.__file__).parents[1])))
+    rng = np.random.default_rng(2)
+    structures = rng.normal(size=(300, 4, 3))
+
+    with ServerPool(str(script), 2, port=free_port_range(2), window=32) as pool:
+        assert pool.start() == ServerStatus.RUNNING
+        results = pool.map({"type": "engrad", "positions": s.tolist()} for s in structures)
+        assert pool.loads == [0, 0]
+
+    energies = [result["energy"] for result in results]
+    assert np.allclose(energies, 0.5 * np.sum(structures**2, axis=(1, 2)))
+    assert np.allclose(results[7]["gradient"], structures[7])
+    assert len({result["pid"] for result in results}) == 2
+    assert os.getpid() not in {result["pid"] for result in results}
+    assert max(result["batch"] for result in results) > 1
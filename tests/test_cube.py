@@ -0,0 +1,40 @@
+import numpy as np
+import pytest
+
+from opi.output.cube import CubeOutput
+
+
+@pytest.mark.parametrize("get_file", ["water.mo4a.cube"], indirect=True)
+def test_cube_header(get_file):
+    """Reads the header of an orbital cube file"""
+    header = CubeOutput(get_file).header
+    assert header.comments[0] == "water.mo4a.cube"
+    assert header.shape == (3, 4, 5)
+    assert header.natoms == 3
+    assert header.mo_indices == (4,)
+    assert header.nlines == 10
+    assert list(header.atomic_numbers) == [8, 1, 1]
+    assert np.allclose(header.origin, [-2.0, -2.5, -3.0])
+    assert np.allclose(header.atom_coordinates[1], [0.0, 1.43, 0.88])
+    assert header.voxel_volume == pytest.approx(1.0)
+
+
+@pytest.mark.parametrize("get_file", ["water.mo4a.cube"], indirect=True)
+def test_cube_data(get_file):
+    """Volumetric data is stored with the z index running fastest"""
+    data = CubeOutput(get_file).read_data()
+    assert data.shape == (3, 4, 5)
+    assert data[2, 3, 4] == pytest.approx(0.234 - 0.1)
+    assert data[1, 0, 2] == pytest.approx(0.102 - 0.1)
+
+
+@pytest.mark.parametrize("get_file", ["water.mo4a.cube"], indirect=True)
+def test_cube_data_cache(get_file, tmp_path):
+    """The binary cache is created once and returned as memory-map"""
+    cube_file = tmp_path / get_file.name
+    cube_file.write_text(get_file.read_text())
+    cube = CubeOutput(cube_file)
+    data = cube.read_data(use_cache=True)
+    assert cube.cache_path.is_file()
+    assert isinstance(data, np.memmap)
+    assert np.array_equal(data, cube.read_data())
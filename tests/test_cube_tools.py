@@ -0,0 +1,68 @@
+import numpy as np
+import pytest
+
+from opi.output import cube_tools
+from opi.output.cube import CubeOutput
+
+
+@pytest.fixture
+def cube(get_file, tmp_path):
+    cube_file = tmp_path / get_file.name
+    cube_file.write_text(get_file.read_text())
+    return CubeOutput(cube_file)
+
+
+@pytest.mark.parametrize("get_file", ["water.mo4a.cube"], indirect=True)
+def test_iter_chunks(cube):
+    """Chunks of planes concatenate to the full data"""
+    chunks = list(cube.iter_chunks(2))
+    assert [len(chunk) for chunk in chunks] == [2, 1]
+    assert np.array_equal(np.concatenate(chunks), cube.read_data())
+
+
+@pytest.mark.parametrize("get_file", ["water.mo4a.cube"], indirect=True)
+def test_compressed_round_trip(cube, tmp_path):
+    """Compressing and decompressing reproduces the original cube file"""
+    compressed = cube_tools.compress(cube)
+    assert compressed.path.name == "water.mo4a.cube.npz"
+    assert np.load(compressed.path)["data"].dtype == np.float32
+    assert np.allclose(compressed.read_data(), cube.read_data())
+
+    restored = cube_tools.decompress(compressed, tmp_path / "restored.cube")
+    assert restored.cube == cube.cube
+
+
+@pytest.mark.parametrize("get_file", ["water.mo4a.cube"], indirect=True)
+def test_arithmetic(cube, tmp_path):
+    """Element-wise operations and integration"""
+    data = cube.read_data()
+    doubled = cube_tools.add(cube, cube, tmp_path / "sum.cube", planes=1)
+    assert np.allclose(doubled.read_data(), 2 * data)
+    zero = cube_tools.subtract(doubled, cube, tmp_path / "diff.npz")
+    assert np.allclose(zero.read_data(), data)
+    scaled = cube_tools.scale(cube, -0.5, tmp_path / "scaled.cube")
+    assert np.allclose(scaled.read_data(), -0.5 * data)
+    assert cube_tools.integrate(cube) == pytest.approx(data.sum())
+
+
+@pytest.mark.parametrize("get_file", ["water.mo4a.cube"], indirect=True)
+def test_crop_downsample(cube, tmp_path):
+    """Cropping shifts the origin and downsampling scales the axes"""
+    data = cube.read_data()
+    cropped = cube_tools.crop(cube, [-1.5, -2.5, -1.0], [0.0, 0.0, 5.0], tmp_path / "crop.cube")
+    assert cropped.header.shape == (2, 3, 3)
+    assert np.allclose(cropped.header.origin, [-1.0, -2.5, -1.0])
+    assert np.allclose(cropped.read_data(), data[1:3, 0:3, 2:5])
+
+    coarse = cube_tools.downsample(cube, 2, tmp_path / "coarse.cube", planes=1)
+    assert coarse.header.shape == (2, 2, 3)
+    assert np.allclose(coarse.header.axes, 2 * np.eye(3))
+    assert np.allclose(coarse.read_data(), data[::2, ::2, ::2])
+
+
+@pytest.mark.parametrize("get_file", ["water.mo4a.cube"], indirect=True)
+def test_grid_mismatch(cube, tmp_path):
+    """Cubes on different grids cannot be combined"""
+    coarse = cube_tools.downsample(cube, 2, tmp_path / "coarse.cube")
+    with pytest.raises(ValueError):
+        cube_tools.add(cube, coarse, tmp_path / "sum.cube")
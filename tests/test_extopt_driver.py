@@ -0,0 +1,78 @@
+import subprocess
+
+import numpy as np
+import pytest
+
+from opi.external_methods.driver import ExtOptDriver, engrad_file
+from opi.input.blocks.block_method import BlockMethod
+from opi.input.core import Input
+from opi.input.simple_keywords import ExternalTools
+from opi.input.structures.structure import Structure
+from opi.utils.units import AU_TO_ANGST
+
+# > Force constant of the toy potential in Eh/Bohr^2
+K = 0.5
+
+
+def harmonic(structure: Structure):
+    """Toy potential: every atom is bound harmonically to the origin"""
+    positions = np.array([atom.coordinates.coordinates for atom in structure.atoms]) / AU_TO_ANGST
+    return 0.5 * K * float(np.sum(positions**2)), K * positions
+
+
+def write_step(directory, coordinates, *, gradient=True):
+    """Write the files that ORCA writes for an ExtOpt step"""
+    lines = [f"H {x:.10f} {y:.10f} {z:.10f}" for x, y, z in coordinates]
+    (directory / "job_EXT.xyz").write_text(f"{len(lines)}\n\n" + "\n".join(lines) + "\n")
+    (directory / "job_EXT.extinp.tmp").write_text(f"job_EXT.xyz\n0\n1\n1\n{int(gradient)}\n")
+
+
+def read_engrad(file):
+    values = [line for line in file.read_text().splitlines() if not line.startswith("#")]
+    return float(values[1]), np.array(values[2:], dtype=float).reshape(-1, 3)
+
+
+def test_driver_steepest_descent(tmp_path):
+    """ORCA's calls of the shim are served by the callable in this process"""
+    coordinates = np.array([[1.0, 0.0, 0.0], [0.0, -0.5, 0.5]])
+    with ExtOptDriver(harmonic) as driver:
+        shim = driver.shim_path
+        for _ in range(5):
+            write_step(tmp_path, coordinates)
+            proc = subprocess.run(
+                [str(shim), "job_EXT.extinp.tmp"], cwd=tmp_path, capture_output=True, text=True
+            )
+            assert proc.returncode == 0, proc.stderr
+            energy, gradient = read_engrad(tmp_path / "job_EXT.engrad")
+            reference, _ = harmonic(Structure.from_xyz(tmp_path / "job_EXT.xyz"))
+            assert energy == pytest.approx(reference)
+            coordinates = coordinates - 1.5 * gradient * AU_TO_ANGST
+        assert driver.ncalls == 5
+    assert not shim.exists()
+    # > Steepest descent converges towards the origin
+    assert np.abs(coordinates).max() < 1e-3
+
+
+def test_driver_errors(tmp_path):
+    """Errors of the callable are reported by the shim to ORCA"""
+    write_step(tmp_path, [[0.0, 0.0, 0.0]])
+    with ExtOptDriver(lambda structure: (0.0, [1.0])) as driver:
+        proc = subprocess.run(
+            [str(driver.shim_path), "job_EXT.extinp.tmp"],
+            cwd=tmp_path,
+            capture_output=True,
+            text=True,
+        )
+    assert proc.returncode == 1
+    assert "expected 3" in proc.stderr
+    assert not engrad_file(tmp_path / "job_EXT.extinp.tmp").exists()
+
+
+def test_configure(tmp_path):
+    """The input requests ExtOpt with the shim"""
+    inp = Input()
+    with ExtOptDriver(harmonic, directory=tmp_path) as driver:
+        driver.configure(inp)
+        assert inp.has_simple_keywords(ExternalTools.EXTOPT) == (True,)
+        block = inp.get_blocks(BlockMethod)[BlockMethod]
+        assert f'ProgExt "{tmp_path / "extopt_shim"}"' in block.format_orca()
@@ -0,0 +1,108 @@
+import json
+import subprocess
+
+import pytest
+
+from opi.core import Calculator
+from opi.execution.core import Runner
+from opi.execution.fake_orca import FakeFailure, FakeOrca
+from opi.execution.watchdog import JobProgress, ScfStagnation, Watchdog
+from opi.input.simple_keywords import BasisSet, Dft, Task
+from opi.input.structures.structure import Structure
+from opi.lib.orca_binary import OrcaBinary
+from opi.output.grepper.recipes import get_scf_cycles, has_geometry_optimization_converged
+
+
+def make_calculator(working_dir, basename="job", *keywords):
+    calc = Calculator(basename, working_dir=working_dir)
+    calc.structure = Structure.from_lists(
+        ["O", "H", "H"], [(0.0, 0.0, 0.0), (0.96, 0.0, 0.0), (-0.24, 0.93, 0.0)]
+    )
+    calc.input.add_simple_keywords(Dft.B3LYP, BasisSet.DEF2_SVP, *keywords)
+    calc.write_input()
+    return calc
+
+
+def test_optimization(fake_orca, tmp_path):
+    """A job runs, its JSON files are created and parsed like those of ORCA"""
+    fake_orca.configure(opt_cycles=4, scf_cycles=6)
+    assert str(Runner().get_version()) == fake_orca.version
+
+    calc = make_calculator(tmp_path, "job", Task.OPT)
+    calc.run()
+    output = calc.get_output()
+    assert output.terminated_normally()
+    outfile = tmp_path / "job.out"
+    assert has_geometry_optimization_converged(outfile)
+    assert get_scf_cycles(outfile) == [6] * 4
+    progress = JobProgress()
+    progress.read(outfile)
+    assert len(progress.cycle_times) == 4
+    assert progress.rms_gradients == sorted(progress.rms_gradients, reverse=True)
+
+    output.parse()
+    assert len(output.results_properties.geometries) == 4
+    assert output.get_final_energy() == pytest.approx(-74.5, abs=1.0)
+    assert len(output.results_gbw[0].molecule.molecularorbitals.mos) == 30
+    assert output.plot_mo(2).read_data().size == 40**3
+
+
+@pytest.mark.parametrize(
+    "failure", [FakeFailure.INPUT_ERROR, FakeFailure.SCF_NOT_CONVERGED, FakeFailure.CRASH]
+)
+def test_failures(fake_orca, tmp_path, failure):
+    """Failed jobs leave an output that does not terminate normally and no results"""
+    fake_orca.configure(failure=failure)
+    calc = make_calculator(tmp_path)
+    calc.run()
+    output = calc.get_output()
+    assert not output.terminated_normally()
+    with pytest.raises(FileNotFoundError):
+        output.parse()
+
+
+def test_hang(fake_orca, tmp_path):
+    """Hanging jobs are stopped by timeouts and watchdogs"""
+    fake_orca.configure(failure="hang")
+    calc = make_calculator(tmp_path)
+    with pytest.raises(subprocess.TimeoutExpired):
+        calc.run(timeout=1)
+
+    calc.run(watchdog=Watchdog([ScfStagnation(5)], interval=0.05, grace_period=1.0))
+    assert calc.get_output().get_abort_reason().policy == "ScfStagnation"
+
+
+def test_failure_rate(fake_orca, tmp_path):
+    """Failing jobs are picked by their basename"""
+    fake_orca.configure(failure=FakeFailure.INPUT_ERROR, failure_rate=0.5)
+    failed = set()
+    for i in range(12):
+        calc = make_calculator(tmp_path, f"job{i}")
+        calc.run()
+        if not calc.get_output().terminated_normally():
+            failed.add(i)
+    assert 0 < len(failed) < 12
+    calc = make_calculator(tmp_path, f"job{min(failed)}")
+    calc.run()
+    assert not calc.get_output().terminated_normally()
+
+
+def test_truncated_json(fake_orca, tmp_path):
+    fake_orca.configure(truncate_json=True)
+    calc = make_calculator(tmp_path)
+    calc.run()
+    with pytest.raises(json.JSONDecodeError):
+        calc.get_output().parse()
+
+
+def test_config_file(fake_orca, tmp_path, monkeypatch):
+    """The binaries are found through the config file"""
+    monkeypatch.delenv("OPI_ORCA")
+    monkeypatch.setenv("XDG_CONFIG_HOME", str(tmp_path))
+    fake_orca.write_config_file(tmp_path)
+    assert Runner().get_orca_binary(OrcaBinary.ORCA_2JSON) == fake_orca.orca.with_name("orca_2json")
+
+    with pytest.raises(TypeError):
+        fake_orca.configure(nonexistent=1)
+    with pytest.raises(ValueError):
+        FakeOrca(failure_rate=2.0)
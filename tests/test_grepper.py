@@ -1,6 +1,8 @@
+from re import IGNORECASE
+
 import pytest
 
-from opi.output.grepper.core import Grepper
+from opi.output.grepper.core import Grepper, GrepQuery, str2regex
 from opi.output.grepper.pre_condition import PreCondition
 
 
@@ -159,3 +161,38 @@ def test_wrong_kind(get_file):
         kind=int,
     )
     assert results == [-75.95933498564268]
+
+
+@pytest.mark.parametrize("get_file", ["scf.out"], indirect=True)
+def test_query_does_not_modify_pre_conditions(get_file):
+    """Compiling a query must not alter the `PreCondition` objects of the caller"""
+    test_pre_condition = PreCondition("SCF ENERGY")
+    query = GrepQuery(
+        "energy",
+        pre_conditions=[test_pre_condition],
+        matching_pattern=0,
+        field=-4,
+        kind=float,
+    )
+    assert query.scan(get_file) == [-75.95933498564268]
+    assert test_pre_condition.pattern == "SCF ENERGY"
+
+
+@pytest.mark.parametrize("get_file", ["scf.out"], indirect=True)
+def test_query_scan_files_concurrently(get_file):
+    """Scans the same file many times from a thread pool with a single query"""
+    query = GrepQuery(
+        "O",
+        pre_conditions=[PreCondition("INPUT FILE", within=300, per_match=True)],
+        case_sensitive=True,
+        matching_pattern=-1,
+        merge_sep=False,
+    )
+    results = query.scan_files([get_file] * 32, max_workers=8)
+    assert results == [["| 14> O         -3.56626        1.77639        0.00000"]] * 32
+
+
+def test_str2regex_cache():
+    """Plain strings are compiled only once"""
+    assert str2regex("SCF ENERGY") is str2regex("SCF ENERGY")
+    assert str2regex("SCF ENERGY", IGNORECASE) is not str2regex("SCF ENERGY")
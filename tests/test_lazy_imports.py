@@ -0,0 +1,85 @@
+import importlib
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+import opi
+
+LAZY_PACKAGES = (
+    "opi.input",
+    "opi.input.blocks",
+    "opi.input.simple_keywords",
+    "opi.external_methods",
+)
+
+
+@pytest.mark.parametrize("package", LAZY_PACKAGES)
+def test_public_names(package):
+    """All public names are importable and listed by `dir()`"""
+    module = importlib.import_module(package)
+    for name in module.__all__:
+        assert getattr(module, name) is not None
+        assert name in dir(module)
+    with pytest.raises(AttributeError, match="no attribute 'Missing'"):
+        module.Missing
+
+
+def test_import_is_lazy():
+    """Importing the input class does not import all blocks and keyword boxes"""
+    code = (
+        "import sys\n"
+        "from opi.input import Input\n"
+        "from opi.input.blocks import BlockScf\n"
+        "print(' '.join(sorted(sys.modules)))\n"
+    )
+    proc = subprocess.run(
+        [sys.executable, "-W", "ignore", "-c", code],
+        env={"PYTHONPATH": str(Path(opi.__file__).parents[1])},
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    modules = proc.stdout.split()
+    assert "opi.input.blocks.block_scf" in modules
+    assert "opi.input.blocks.block_geom" not in modules
+    assert "opi.input.simple_keywords.basis_set" not in modules
+    assert "rdkit" not in modules
+
+
+def test_extopt_client_import():
+    """The module imported by ExtOpt client scripts does not load the calculator, input or output stack"""
+    code = (
+        "import sys\nimport opi.external_methods.interface\nprint(' '.join(sorted(sys.modules)))\n"
+    )
+    proc = subprocess.run(
+        [sys.executable, "-W", "ignore", "-c", code],
+        env={"PYTHONPATH": str(Path(opi.__file__).parents[1])},
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    modules = proc.stdout.split()
+    for name in ("opi.core", "opi.output.core", "opi.input.core", "opi.external_methods.driver"):
+        assert name not in modules
+
+
+def test_deferred_validators():
+    """Validators of output models and blocks are only built on first use"""
+    code = (
+        "from opi.input.blocks import BlockScf\n"
+        "from opi.output.models.json.property.property_results import PropertyResults\n"
+        "print(BlockScf.__pydantic_complete__, PropertyResults.__pydantic_complete__)\n"
+        "BlockScf(maxiter=10)\n"
+        "PropertyResults()\n"
+        "print(BlockScf.__pydantic_complete__, PropertyResults.__pydantic_complete__)\n"
+    )
+    proc = subprocess.run(
+        [sys.executable, "-W", "ignore", "-c", code],
+        env={"PYTHONPATH": str(Path(opi.__file__).parents[1])},
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    assert proc.stdout.split() == ["False", "False", "True", "True"]
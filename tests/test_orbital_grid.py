@@ -0,0 +1,92 @@
+import json
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+from opi.output.cube import CubeOutput
+from opi.output.models.json.gbw.gbw_results import GbwResults
+from opi.output.orbital_grid import OrbitalEvaluator, solid_harmonics
+from opi.output.plot_request import PlotRequest
+from opi.utils.misc import lowercase
+
+JSON_FILES = Path(__file__).resolve().parent / "fixtures" / "json_files"
+
+
+def single_atom_gbw(shells: list[str], exponent: float = 0.5) -> GbwResults:
+    """One atom at the origin with one primitive per shell and one MO per basis function"""
+    nbf = sum(2 * "spdf".index(shell) + 1 for shell in shells)
+    data = {
+        "orca header": None,
+        "molecule": {
+            "atoms": [
+                {
+                    "basis": [
+                        {"coefficients": [1.0], "exponents": [exponent], "shell": shell}
+                        for shell in shells
+                    ],
+                    "coords": [0.0, 0.0, 0.0],
+                    "elementnumber": 1,
+                    "nuclearcharge": 1.0,
+                }
+            ],
+            "coordinateunits": "Bohrs",
+            "hftyp": "RHF",
+            "origin": [0.0, 0.0, 0.0],
+            "molecularorbitals": {
+                "mos": [{"mocoefficients": list(row), "occupancy": 0.0} for row in np.eye(nbf)]
+            },
+        },
+    }
+    return GbwResults(**data)
+
+
+@pytest.fixture
+def water() -> GbwResults:
+    with (JSON_FILES / "scf.json").open() as f:
+        data = json.load(f)
+    lowercase(data)
+    return GbwResults(**data)
+
+
+def test_solid_harmonics_order():
+    """Functions follow the ORCA order m = 0, +1, -1, ..."""
+    p = solid_harmonics(1, np.eye(3))[1]
+    # > pz, px, py evaluated at unit vectors along x, y and z
+    assert np.allclose(p, np.sqrt(3 / (4 * np.pi)) * np.eye(3)[[2, 0, 1]])
+
+
+def test_basis_normalization():
+    """Basis functions up to f are orthonormal"""
+    evaluator = OrbitalEvaluator(single_atom_gbw(["s", "p", "d", "f"]), max_workers=2)
+    step = 0.25
+    axis = np.arange(-7.0, 7.0 + step / 2, step)
+    points = np.stack(np.meshgrid(axis, axis, axis, indexing="ij"), axis=-1).reshape(-1, 3)
+    values = evaluator.mo_values(points, range(evaluator.nbf))
+    overlap = values.T @ values * step**3
+    assert np.allclose(overlap, np.eye(evaluator.nbf), atol=1e-6)
+
+
+def test_water_density(water):
+    """Density of a closed-shell molecule"""
+    evaluator = OrbitalEvaluator(water, chunk_size=7)
+    assert evaluator.nbf == 24
+    points = evaluator.atom_coordinates + 0.3
+    occupied = evaluator.mo_values(points, range(5))
+    density = evaluator.density(points)
+    assert np.allclose(density, 2 * (occupied**2).sum(axis=1))
+    assert np.all(density > 0.0)
+    assert np.allclose(evaluator.spin_density(points), 0.0)
+
+
+def test_write_cube(water, tmp_path):
+    """Write an orbital cube without orca_plot"""
+    evaluator = OrbitalEvaluator(water, chunk_size=50)
+    cube = evaluator.write_cube(tmp_path / "water.mo4a.cube", PlotRequest.mo(4), resolution=6)
+    assert isinstance(cube, CubeOutput)
+    assert cube.header.mo_indices == (4,)
+    header = cube.header
+    data = cube.read_data()
+    assert data.shape == (6, 6, 6)
+    point = header.origin + 2 * header.axes[0] + 3 * header.axes[1] + 4 * header.axes[2]
+    assert data[2, 3, 4] == pytest.approx(evaluator.mo_values(point[None], 4)[0], rel=1e-5)
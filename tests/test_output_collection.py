@@ -0,0 +1,61 @@
+import shutil
+from pathlib import Path
+
+import pytest
+
+from opi.output.collection import OutputCollection
+from opi.output.core import Output
+
+JSON_FILES = Path(__file__).parent / "fixtures" / "json_files"
+
+
+def touch(directory: Path, *names: str) -> None:
+    directory.mkdir(parents=True, exist_ok=True)
+    for name in names:
+        (directory / name).write_text("")
+
+
+def test_discover(tmp_path):
+    """Jobs and multi-GBW series are found as with `Output.get_gbw_json_files()`"""
+    touch(tmp_path / "scan", "job.out", "job.gbw", "job.001.gbw", "job.002.gbw", "job.004.gbw")
+    touch(tmp_path / "neb" / "deep", "neb.property.json", "neb_im0.gbw", "neb_im1.gbw", "neb.inp")
+    touch(tmp_path, "single.out", "single_trj.xyz", "notes.txt")
+
+    collection = OutputCollection(tmp_path, version_check=False)
+    assert [output.basename for output in collection] == ["single", "neb", "job"]
+    for output in collection:
+        reference = Output(output.basename, working_dir=output.working_dir, version_check=False)
+        assert output.gbw_json_files == reference.gbw_json_files
+    assert collection.outputs[2].num_gbw_json_files == 3
+
+    assert [output.basename for output in collection.select("neb/*/*")] == ["neb"]
+    assert len(OutputCollection(tmp_path, recursive=False)) == 1
+
+    touch(tmp_path / "scan", "job_im0.gbw")
+    with pytest.raises(FileExistsError):
+        OutputCollection(tmp_path)
+
+
+@pytest.mark.parametrize("max_workers", [1, 2])
+def test_parse(tmp_path, max_workers):
+    """Jobs are parsed and errors are reported per job"""
+    for name in ("opt", "scf"):
+        shutil.copyfile(JSON_FILES / f"{name}.property.json", tmp_path / f"{name}.property.json")
+    touch(tmp_path, "broken.out")
+
+    collection = OutputCollection(tmp_path, version_check=False)
+    results = {
+        output.basename: (output, error)
+        for output, error in collection.parse(
+            max_workers=max_workers,
+            do_create_property_json=False,
+            do_create_gbw_json=False,
+            read_gbw_json=False,
+        )
+    }
+    assert isinstance(results["broken"][1], FileNotFoundError)
+    assert results["opt"][1] is None
+    assert results["opt"][0].get_final_energy() == pytest.approx(
+        collection.outputs[1].get_final_energy()
+    )
+    assert all(output.results_properties for output in collection.outputs[1:])
@@ -0,0 +1,76 @@
+import numpy as np
+import pytest
+
+from opi.input.structures.structure import Structure
+from opi.utils.element import ELEMENTS_BY_NUMBER, Element
+from opi.utils.periodic_table import (
+    ATOMIC_MASSES,
+    COVALENT_RADII,
+    SYMBOLS,
+    VALENCE_ELECTRONS,
+    numbers_to_elements,
+    numbers_to_symbols,
+    symbols_to_numbers,
+)
+
+
+def test_tables():
+    """Tables are indexed by the atomic number and cannot be modified"""
+    for table in (SYMBOLS, ATOMIC_MASSES, COVALENT_RADII, VALENCE_ELECTRONS):
+        assert table.shape == (119,)
+        assert not table.flags.writeable
+    assert SYMBOLS[[0, 1, 6, 118]].tolist() == ["X", "H", "C", "Og"]
+    assert ATOMIC_MASSES[[1, 6, 8]].tolist() == [1.008, 12.011, 15.999]
+    assert COVALENT_RADII[6] == 0.75
+    # > Fe, Ga, Yb, Lu, Pb
+    assert VALENCE_ELECTRONS[[26, 31, 70, 71, 82]].tolist() == [8, 3, 2, 3, 4]
+
+
+def test_conversion_matches_element():
+    """Symbols are converted like `Element` does, for lists and arrays"""
+    symbols = []
+    for element in ELEMENTS_BY_NUMBER:
+        symbol = element.value
+        symbols += [symbol, symbol.upper(), symbol.lower(), symbol[0].lower() + symbol[1:].upper()]
+    symbols += ["Da", "xx", Element.IRON]
+    expected = [Element(symbol).atomic_number for symbol in symbols]
+    assert symbols_to_numbers(symbols).tolist() == expected
+    assert symbols_to_numbers(np.array(symbols).reshape(-1, 1)).ravel().tolist() == expected
+    assert symbols_to_numbers(iter(symbols)).tolist() == expected
+
+    numbers = np.arange(119)
+    assert numbers_to_symbols(numbers).tolist() == [e.value for e in ELEMENTS_BY_NUMBER]
+    assert numbers_to_elements(numbers) == [Element.from_atomic_number(z) for z in numbers]
+
+
+@pytest.mark.parametrize("symbols", (["C", "Qq"], np.array(["C", "Qq"]), np.array(["C", "Hex"])))
+def test_invalid_symbols(symbols):
+    with pytest.raises(ValueError, match="Unknown element symbol: (Qq|Hex)"):
+        symbols_to_numbers(symbols)
+
+
+@pytest.mark.parametrize("numbers", ([1, 119], [-1], [1.0]))
+def test_invalid_numbers(numbers):
+    with pytest.raises(ValueError):
+        numbers_to_symbols(numbers)
+
+
+def test_structure_constructors():
+    """Constructors convert all symbols at once"""
+    structure = Structure.from_lists(["C", 1, "cl", 8], [(0.0, 0.0, float(i)) for i in range(4)])
+    assert [atom.element for atom in structure.atoms] == [
+        Element.C,
+        Element.H,
+        Element.CL,
+        Element.O,
+    ]
+    assert structure.nelectrons == 6 + 1 + 17 + 8
+
+    xyz = "2\n\nC 0 0 0\nQq 0 0 1\n"
+    with pytest.raises(ValueError, match="Line 4: Invalid atom symbol: Qq"):
+        Structure.from_xyz_buffer(iter(xyz.splitlines()))
+
+    ase = pytest.importorskip("ase")
+    structure = Structure.from_ase(ase.Atoms("H2O", positions=[(0, 0, 0), (0, 0, 1), (0, 1, 0)]))
+    assert [atom.element for atom in structure.atoms] == [Element.H, Element.H, Element.O]
+    assert structure.atoms[2].coordinates.coordinates.tolist() == [0.0, 1.0, 0.0]
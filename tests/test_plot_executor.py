@@ -0,0 +1,55 @@
+import pytest
+
+from opi.output.core import Output
+from opi.output.plot_executor import CubeCache, PlotExecutor, split_sessions
+from opi.output.plot_request import PlotRequest
+
+
+def test_cube_cache_key(tmp_path):
+    """Keys depend on the content of the GBW file and on the request"""
+    cache = CubeCache(tmp_path / "cache")
+    gbw_file = tmp_path / "job.gbw"
+    gbw_file.write_bytes(b"wavefunction")
+    densities = tmp_path / "job.densities"
+    key = cache.key(gbw_file, PlotRequest.mo(1), resolution=40, densities_file=densities)
+    assert key == cache.key(gbw_file, PlotRequest.mo(1), resolution=40, densities_file=densities)
+    assert key != cache.key(gbw_file, PlotRequest.mo(1), resolution=80, densities_file=densities)
+    assert key != cache.key(gbw_file, PlotRequest.mo(2), resolution=40, densities_file=densities)
+    gbw_file.write_bytes(b"other wavefunction")
+    assert key != cache.key(gbw_file, PlotRequest.mo(1), resolution=40, densities_file=densities)
+
+
+def test_split_sessions():
+    """Requests are chunked into sessions of limited size"""
+    requests = [PlotRequest.mo(i) for i in range(5)]
+    assert split_sessions(requests) == [requests]
+    assert [len(s) for s in split_sessions(requests, max_size=2)] == [2, 2, 1]
+
+
+def test_plot_from_cache(tmp_path):
+    """Cached cubes are copied next to the GBW files without running orca_plot"""
+    for name in ("job.gbw", "job.001.gbw", "job.002.gbw"):
+        (tmp_path / name).write_text(name)
+    output = Output("job", working_dir=tmp_path, version_check=False)
+    cache = CubeCache(tmp_path / "cache")
+    request = PlotRequest.mo(3)
+    for gbw_file in output.gbw_json_files:
+        gbw_file = gbw_file.with_suffix(".gbw")
+        key = cache.key(gbw_file, request, resolution=40, densities_file=tmp_path / "x")
+        source = tmp_path / "source.cube"
+        source.write_text(f"cube of {gbw_file.name}")
+        cache.put(key, source)
+
+    cubes = PlotExecutor(max_workers=2, cache=cache).plot(output, [request])
+    assert len(cubes) == 3
+    assert cubes[1, request].path.name == "job.001.mo3a.cube"
+    assert cubes[2, request].cube == "cube of job.002.gbw"
+
+
+def test_plot_conflicting_requests(tmp_path):
+    """Two densities cannot be plotted concurrently for the same GBW file"""
+    (tmp_path / "job.gbw").touch()
+    output = Output("job", working_dir=tmp_path, version_check=False)
+    requests = [PlotRequest.density(), PlotRequest.density(suffix=".scfp_fod")]
+    with pytest.raises(ValueError):
+        PlotExecutor(max_workers=1).plot(output, requests)
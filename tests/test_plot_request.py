@@ -0,0 +1,55 @@
+import pytest
+
+from opi.output.core import Output
+from opi.output.plot_request import PlotRequest
+
+
+def test_mo_stdin_list():
+    """Input for a single MO plot without the exit command"""
+    request = PlotRequest.mo(5, operator=1)
+    stdin_list = ["1", "1", "2", "5", "3", "1", "4", "60", "5", "7", "11"]
+    assert request.stdin_list("job", resolution=60) == stdin_list
+
+
+def test_density_stdin_list():
+    """Input for a spin density plot of the FOD density"""
+    request = PlotRequest.spin_density(suffix=".scfp_fod")
+    assert request.stdin_list("job")[:4] == ["1", "3", "n", "job.scfp_fod"]
+
+
+def test_request_hashable():
+    """Equal requests can be used interchangeably as keys"""
+    assert PlotRequest.mo(3) == PlotRequest("mo", index=3)
+    assert len({PlotRequest.mo(3), PlotRequest.mo(3, operator=1), PlotRequest.mo(3)}) == 2
+
+
+def test_plot_batch(tmp_path, monkeypatch):
+    """All requests are plotted in a single orca_plot session"""
+    (tmp_path / "job.gbw").touch()
+    output = Output("job", working_dir=tmp_path, version_check=False)
+    sessions = []
+
+    def fake_run_orca_plot(self, stdin_list, *, gbw_file=None, timeout=-1):
+        sessions.append(stdin_list)
+        # > Fake orca_plot writes all but the last cube
+        for name in ("job.mo0a.cube", "job.mo1a.cube"):
+            (gbw_file.parent / name).write_text("cube")
+
+    monkeypatch.setattr(Output, "run_orca_plot", fake_run_orca_plot)
+    requests = [PlotRequest.mo(0), PlotRequest.mo(1), PlotRequest.density()]
+    cubes = output.plot_batch(requests + [PlotRequest.mo(0)])
+
+    assert len(sessions) == 1
+    assert sessions[0].count("11") == 3
+    assert sessions[0][-1] == "12"
+    assert cubes[requests[0]].path.name == "job.mo0a.cube"
+    assert cubes[requests[1]] is not None
+    assert cubes[requests[2]] is None
+
+
+def test_plot_batch_conflicting_cubes(tmp_path):
+    """Two densities would be written to the same cube file"""
+    (tmp_path / "job.gbw").touch()
+    output = Output("job", working_dir=tmp_path, version_check=False)
+    with pytest.raises(ValueError):
+        output.plot_batch([PlotRequest.density(), PlotRequest.density(suffix=".scfp_fod")])
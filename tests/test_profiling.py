@@ -0,0 +1,94 @@
+import numpy as np
+import pytest
+
+from opi.core import Calculator
+from opi.input.simple_keywords import BasisSet, Dft, Task
+from opi.input.structures.structure import Structure
+from opi.output.profiling import (
+    MODULES,
+    PROFILE_COLUMNS,
+    ScalingFit,
+    TimingProfiles,
+    read_job_settings,
+)
+from opi.output.warehouse import DEFAULT_COLUMNS, ResultsWarehouse
+
+
+@pytest.mark.parametrize(
+    "lines, ncores",
+    [
+        (["! B3LYP def2-SVP Opt  # comment", "%pal", "  nprocs 4", "end"], 4),
+        (["!Opt", "! PAL8 def2-SVP B3LYP"], 8),
+        (["! B3LYP def2-SVP"], 1),
+    ],
+)
+def test_read_job_settings(tmp_path, lines, ncores):
+    """Method, basis set and cores are read from the input echoed in the output"""
+    echo = "".join(f"|{i:3d}> {line}\n" for i, line in enumerate(lines, start=1))
+    outfile = tmp_path / "job.out"
+    outfile.write_text(f"INPUT FILE\n{echo}\n****END OF INPUT****\n|  1> ! HF\n")
+    settings = read_job_settings(outfile)
+    assert settings["method"] == "b3lyp"
+    assert settings["basis"] == "def2-svp"
+    assert settings["ncores"] == ncores
+
+
+def test_scaling_fit():
+    """Exponents of a power law are recovered, those of constant quantities are 0"""
+    rng = np.random.default_rng(1)
+    nbf = rng.integers(50, 2000, 200)
+    ncores = rng.choice([1, 2, 4, 8, 16], 200)
+    times = 2e-7 * nbf**2.7 * ncores**-0.8 * np.exp(rng.normal(0.0, 0.05, 200))
+    fit = ScalingFit.fit(nbf, ncores, times)
+    assert fit.nbf_exponent == pytest.approx(2.7, abs=0.05)
+    assert fit.ncores_exponent == pytest.approx(0.8, abs=0.05)
+    assert fit.rms_log_error == pytest.approx(0.05, abs=0.02)
+    assert fit.predict(1000, 4) == pytest.approx(2e-7 * 1000**2.7 * 4**-0.8, rel=0.2)
+
+    fit = ScalingFit.fit([100.0, 200.0, np.nan], [4, 4, 4], [1.0, 8.0, 5.0])
+    assert (fit.nbf_exponent, fit.ncores_exponent, fit.njobs) == (pytest.approx(3.0), 0.0, 2)
+    with pytest.raises(ValueError):
+        ScalingFit.fit([np.nan, 100.0], [1, 1], [1.0, 0.0])
+
+
+def test_profiles(fake_orca, tmp_path):
+    """Timings of jobs are collected from outputs and from a warehouse"""
+    for i, ncores in enumerate((1, 2, 2)):
+        calc = Calculator(f"job{i}", working_dir=tmp_path)
+        calc.structure = Structure.from_lists(
+            ["O", "H", "H"] * (i + 1), [(0.0, 0.0, 1.5 * n) for n in range(3 * (i + 1))]
+        )
+        calc.input.add_simple_keywords(Dft.B3LYP, BasisSet.DEF2_SVP, Task.OPT)
+        calc.input.ncores = ncores
+        calc.write_input()
+        calc.run()
+
+    outputs = [Calculator(f"job{i}", working_dir=tmp_path).get_output() for i in range(2)]
+    profiles = TimingProfiles.from_outputs(outputs)
+    assert len(profiles) == 2
+    assert profiles.method.tolist() == ["b3lyp", "b3lyp"]
+    assert profiles.basis.tolist() == ["def2-svp", "def2-svp"]
+    assert profiles.ncores.tolist() == [1, 2]
+    assert profiles.nbf.tolist() == [output.get_nbf() for output in outputs]
+    assert profiles.times.shape == (2, len(MODULES) + 1)
+    assert profiles.times[:, :-1].sum(axis=1) == pytest.approx(profiles.column("sum"))
+    assert sum(profiles.fractions().values()) == pytest.approx(1.0)
+    assert profiles.fractions()["scf"] > 0.5
+
+    with ResultsWarehouse(tmp_path / "results.db", (*DEFAULT_COLUMNS, *PROFILE_COLUMNS)) as db:
+        db.ingest([tmp_path], max_workers=1)
+        stored = TimingProfiles.from_warehouse(db)
+    assert stored.basename.tolist() == ["job0", "job1"]
+    assert stored.times == pytest.approx(profiles.times)
+
+    ((key, percentiles),) = profiles.percentiles((0, 100)).items()
+    assert key == ("b3lyp", "def2-svp")
+    assert percentiles["sum"].tolist() == sorted(profiles.column("sum"))
+    assert set(profiles.groups(("ncores",))) == {(1,), (2,)}
+    assert len(profiles.select(basis="DEF2-SVP", ncores=2)) == 1
+    # > Two jobs are too few to fit both exponents
+    assert profiles.fit_scaling("scf", by=()) == {}
+    with pytest.raises(ValueError):
+        profiles.fit_scaling("nonexistent")
+    with pytest.raises(ValueError):
+        profiles.groups(("basename",))
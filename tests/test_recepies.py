@@ -1,6 +1,7 @@
 import pytest
 
 from opi.output.grepper.recipes import (
+    get_scf_cycles,
     has_aborted_run,
     has_geometry_optimization_converged,
     has_scf_converged,
@@ -46,6 +47,11 @@ def test_scf_converged(get_file):
     assert has_scf_converged(get_file)
 
 
+@pytest.mark.parametrize("get_file", ["geometry.out"], indirect=True)
+def test_scf_cycles(get_file):
+    assert get_scf_cycles(get_file) == [11, 7, 6, 6, 3]
+
+
 @pytest.mark.parametrize("get_file", ["failed_scf.out"], indirect=True)
 @pytest.mark.xfail
 def test_failed_scf_converged(get_file):
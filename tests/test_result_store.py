@@ -0,0 +1,75 @@
+import pytest
+
+from opi.core import Calculator
+from opi.execution.result_store import ResultStore
+
+
+def test_input_hash(water_calculator):
+    """Hash ignores the basename and numerical noise, but not the input"""
+    reference = water_calculator("a", ncores=2).input_hash(orca_version="6.1.0")
+    assert water_calculator("b", shift=1e-9, ncores=2).input_hash(orca_version="6.1.0") == reference
+    assert water_calculator("a", shift=1e-3, ncores=2).input_hash(orca_version="6.1.0") != reference
+    assert water_calculator("a", ncores=2).input_hash(orca_version="6.1.1") != reference
+    calc = water_calculator("a", ncores=2)
+    calc.input.memory = 1000
+    assert calc.input_hash(orca_version="6.1.0") != reference
+
+
+class FakeRunner:
+    """Writes a successful output file instead of running ORCA"""
+
+    def __init__(self, calls: list[str]) -> None:
+        self.calls = calls
+
+    def run_orca(self, inpfile, timeout=-1, stage_files=(), watchdog=None):
+        self.calls.append(inpfile.stem)
+        inpfile.with_suffix(".out").write_text("****ORCA TERMINATED NORMALLY****\n")
+        inpfile.with_suffix(".gbw").write_bytes(b"gbw")
+
+
+def test_run_with_result_store(tmp_path, monkeypatch, water_calculator):
+    """Second identical job is materialized from the store"""
+    calls = []
+    monkeypatch.setattr(Calculator, "_create_runner", lambda self: FakeRunner(calls))
+    monkeypatch.setattr("opi.core.orca_version_tag", lambda runner: "6.1.0")
+    store = ResultStore(tmp_path / "store")
+
+    for basename in ("first", "second"):
+        calc = water_calculator(basename, ncores=2)
+        calc.result_store = store
+        calc.write_input()
+        calc.run()
+
+    assert calls == ["first"]
+    assert (tmp_path / "second.gbw").read_bytes() == b"gbw"
+    assert calc.get_output().terminated_normally()
+
+
+@pytest.mark.parametrize("hardlink", [False, True])
+def test_materialize(tmp_path, hardlink):
+    """Files are stored under a neutral basename and renamed on materialization"""
+    source = tmp_path / "source"
+    source.mkdir()
+    (source / "job.out").write_text("out")
+    (source / "job.property.json").write_text("{}")
+    (source / "job.inp").write_text("inp")
+    store = ResultStore(tmp_path / "store", hardlink=hardlink)
+    store.put("abcdef", source, "job")
+    assert "abcdef" in store
+
+    target = tmp_path / "target"
+    target.mkdir()
+    assert not store.materialize("123456", target, "new")
+    assert store.materialize("abcdef", target, "new")
+    assert sorted(path.name for path in target.iterdir()) == ["new.out", "new.property.json"]
+    assert (target / "new.out").stat().st_nlink == (2 if hardlink else 1)
+
+
+def test_job_files(tmp_path):
+    """Glob characters in the basename are matched literally"""
+    for name in ("job[1].out", "job[1].gbw", "job[1].inp", "job1.out", "job[1]_extra.out"):
+        (tmp_path / name).write_text("")
+    assert [path.name for path in ResultStore.job_files(tmp_path, "job[1]")] == [
+        "job[1].gbw",
+        "job[1].out",
+    ]
@@ -0,0 +1,78 @@
+import os
+import stat
+from pathlib import Path
+
+import pytest
+
+from opi.execution.core import Runner
+from opi.execution.scratch import Scratch
+
+# > Stand-in for ORCA that records its working directory and writes result and temporary files
+FAKE_ORCA = """#!/bin/sh
+base="${1%.inp}"
+pwd > "$base.cwd"
+cat guess/job.moinp.gbw > "$base.gbw"
+echo tmp > "$base.tmp"
+echo '{}' > "$base.property.json"
+echo "****ORCA TERMINATED NORMALLY****"
+"""
+
+
+@pytest.fixture
+def job(tmp_path):
+    working_dir = tmp_path / "work"
+    (working_dir / "guess").mkdir(parents=True)
+    (working_dir / "job.inp").write_text("! HF\n")
+    (working_dir / "guess" / "job.moinp.gbw").write_text("guess")
+    return working_dir
+
+
+def test_stage(job, tmp_path):
+    """Inputs are staged with their relative paths and only results are copied back"""
+    scratch = Scratch(tmp_path)
+    with pytest.raises(RuntimeError):
+        with scratch.stage(job / "job.inp", [job / "guess" / "job.moinp.gbw"]) as inpfile:
+            scratch_dir = inpfile.parent
+            assert scratch_dir != job
+            assert (scratch_dir / "guess" / "job.moinp.gbw").read_text() == "guess"
+            (scratch_dir / "job.gbw").write_text("result")
+            (scratch_dir / "job.tmp").write_text("tmp")
+            # > Results of scan steps and NEB images
+            for name in ("job.001.gbw", "job.001.json", "job_im1.gbw", "job.property.txt"):
+                (scratch_dir / name).write_text(name)
+            raise RuntimeError("ORCA failed")
+
+    # > Cleanup and copy back also happen on failure
+    assert not scratch_dir.exists()
+    assert (job / "job.gbw").read_text() == "result"
+    for name in ("job.001.gbw", "job.001.json", "job_im1.gbw", "job.property.txt"):
+        assert (job / name).read_text() == name
+    assert not (job / "job.tmp").exists()
+
+
+def test_run_orca_in_scratch(job, tmp_path, monkeypatch):
+    """ORCA runs in the scratch directory, output is written to the working directory"""
+    orca = tmp_path / "orca"
+    orca.write_text(FAKE_ORCA)
+    orca.chmod(orca.stat().st_mode | stat.S_IEXEC)
+    monkeypatch.setenv("OPI_ORCA", str(orca))
+    scratch_root = tmp_path / "scratch"
+    scratch_root.mkdir()
+
+    runner = Runner(job, scratch=Scratch(scratch_root, copy_back=(".gbw", ".property.json")))
+    runner.run_orca(job / "job.inp", stage_files=[job / "guess" / "job.moinp.gbw"])
+
+    assert "ORCA TERMINATED NORMALLY" in (job / "job.out").read_text()
+    assert (job / "job.gbw").read_text() == "guess"
+    assert (job / "job.property.json").is_file()
+    assert not (job / "job.tmp").exists()
+    assert not (job / "job.cwd").exists()
+    assert os.listdir(scratch_root) == []
+
+
+def test_default_root(monkeypatch, tmp_path):
+    """Scratch root defaults to $TMPDIR"""
+    monkeypatch.setenv("TMPDIR", str(tmp_path))
+    assert Scratch().root == Path(tmp_path).resolve()
+    assert Scratch().is_result("job_trj.xyz", "job")
+    assert not Scratch().is_result("job.tmp", "job")
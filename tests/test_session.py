@@ -0,0 +1,137 @@
+import socket
+import time
+from pathlib import Path
+
+import pytest
+
+import opi
+from opi.external_methods.server import CalcServer, OpiServer, ServerStatus
+from opi.external_methods.session import ClientSession, ServerError
+
+# > Server that adds numbers and records the calculator
+SERVER_SCRIPT = """
+import sys
+sys.path.insert(0, {src!r})
+from opi.external_methods.session import serve
+
+host, port = sys.argv[2].split(":")
+state = {{}}
+
+def handler(message):
+    if message["type"] == "setup_calculator":
+        if message.get("format") == "opi-wire":
+            from opi.execution.wire import decode_message
+
+            message = decode_message(message)
+        state["calculator"] = message["calculator"]
+        return "loaded"
+    if message["type"] == "format_input":
+        return state["calculator"].format_input()
+    if message["type"] == "add":
+        return message["a"] + message["b"]
+    raise ValueError("unknown message")
+
+serve((host, int(port)), handler)
+"""
+
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+@pytest.fixture
+def server_script(tmp_path):
+    script = tmp_path / "server.py"
+    script.write_text(SERVER_SCRIPT.format(src=str(Path(opi.__file__).parents[1])))
+    return script
+
+
+def test_session(server_script):
+    """Messages are pipelined over one connection and matched by their request ID"""
+    calc_server = CalcServer(str(server_script), calculator={"method": "toy"}, port=free_port())
+    assert calc_server.start_server() == ServerStatus.RUNNING
+    try:
+        session = calc_server.open_session(window=8)
+        assert calc_server.load_calculator() == "loaded"
+
+        messages = [{"type": "add", "a": i, "b": 1} for i in range(200)]
+        assert session.map(messages) == list(range(1, 201))
+
+        # > Responses can be collected in any order
+        first = session.submit({"type": "add", "a": 1, "b": 1})
+        second = session.submit({"type": "add", "a": 2, "b": 2})
+        assert session.result(second) == 4
+        assert session.result(first) == 2
+
+        with pytest.raises(ServerError, match="unknown message"):
+            session.request({"type": "unknown"})
+        assert session.ping()
+        assert session.connected
+    finally:
+        calc_server.kill_server()
+    assert calc_server.session is None
+
+
+def test_reconnect(server_script):
+    """An idle connection is checked and re-established after a server restart"""
+    server = OpiServer(str(server_script), port=free_port())
+    assert server.start_server() == ServerStatus.RUNNING
+    session = ClientSession(("127.0.0.1", server._port), keepalive=0.0)
+    try:
+        assert session.request({"type": "add", "a": 1, "b": 2}) == 3
+        server.kill_server()
+        assert server.start_server() == ServerStatus.RUNNING
+        assert session.request({"type": "add", "a": 2, "b": 2}) == 4
+    finally:
+        session.close()
+        server.kill_server()
+    assert not session.ping(timeout=1.0)
+
+
+def test_boot_failure(tmp_path):
+    """A server that exits during boot is detected without waiting for the boot timeout"""
+    script = tmp_path / "broken.py"
+    script.write_text("raise SystemExit(1)\n")
+    server = OpiServer(str(script), port=free_port())
+    start = time.monotonic()
+    assert server.start_server(max_boot_time=20.0) == ServerStatus.BOOT_FAILED
+    assert time.monotonic() - start < 10.0
+
+
+def test_legacy_server(tmp_path):
+    """A server that never signals readiness is running as soon as its port is reachable"""
+    script = tmp_path / "legacy.py"
+    script.write_text(
+        "import sys\n"
+        "from multiprocessing.connection import Listener\n"
+        "host, port = sys.argv[2].split(':')\n"
+        "with Listener((host, int(port))) as listener:\n"
+        "    while True:\n"
+        "        try:\n"
+        "            listener.accept().close()\n"
+        "        except Exception:\n"
+        "            pass\n"
+    )
+    calc_server = CalcServer(str(script), port=free_port())
+    start = time.monotonic()
+    try:
+        assert calc_server.start_server() == ServerStatus.RUNNING
+        assert time.monotonic() - start < 10.0
+        assert calc_server.server.process.process_is_running()
+    finally:
+        calc_server.kill_server()
+
+
+def test_compact_calculator(server_script, water_calculator):
+    """A calculator sent in the compact wire format is decoded by the server"""
+    calc = water_calculator("job")
+    calc_server = CalcServer(str(server_script), calculator=calc, port=free_port())
+    assert calc_server.start_server() == ServerStatus.RUNNING
+    try:
+        session = calc_server.open_session()
+        assert calc_server.load_calculator(compact=True) == "loaded"
+        assert session.request({"type": "format_input"}) == calc.format_input()
+    finally:
+        calc_server.kill_server()
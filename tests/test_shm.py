@@ -0,0 +1,123 @@
+import socket
+import sys
+from multiprocessing.shared_memory import SharedMemory
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+import opi
+from opi.external_methods.interface import ExtoptInterface, format_engrad, read_engrad
+from opi.external_methods.server import OpiServer, ServerStatus
+from opi.external_methods.session import ClientSession
+from opi.external_methods.shm import SharedArrays, ShmEngradClient
+
+# > Server with a toy potential: atoms bound harmonically to the origin, scaled by the atomic number,
+# >> plus the Coulomb interaction of every point charge with a unit charge at the origin
+SERVER_SCRIPT = """
+import sys
+sys.path.insert(0, {src!r})
+import numpy as np
+import pytest
+from opi.external_methods.session import serve
+from opi.external_methods.shm import ShmEngradHandler
+
+def toy(numbers, coordinates, point_charges, do_gradient):
+    energy = 0.5 * np.sum(numbers[:, None] * coordinates**2)
+    if point_charges is not None:
+        energy += np.sum(point_charges[:, 0] / np.linalg.norm(point_charges[:, 1:], axis=1))
+    return energy, numbers[:, None] * coordinates if do_gradient else None
+
+host, port = sys.argv[2].split(":")
+serve((host, int(port)), ShmEngradHandler(toy))
+"""
+
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def test_shared_arrays():
+    """Views of the owner and an attached block share the memory"""
+    with SharedArrays.create({"a": ((5, 3), np.float64), "b": ((2,), np.int32)}) as owner:
+        attached = SharedArrays.attach(owner.descriptor)
+        owner["a"][:] = 1.5
+        attached["b"][:] = [7, 8]
+        assert np.all(attached["a"] == 1.5)
+        assert owner["b"].tolist() == [7, 8]
+        attached.close()
+        assert "a" not in attached
+
+
+def test_shared_arrays_views():
+    """Closing with views still referenced keeps the memory mapped, instead of leaving the views dangling"""
+    owner = SharedArrays.create({"a": ((4,), np.float64)})
+    view = owner["a"]
+    view[:] = 2.0
+    owner.close()
+    assert np.all(view == 2.0)
+
+
+@pytest.mark.skipif(sys.version_info >= (3, 13), reason="attached blocks are not tracked")
+def test_tracked_name():
+    """Before Python 3.13, blocks are tracked under their name with a leading slash, see `shm._attach()`"""
+    with SharedArrays.create({"a": ((1,), np.float64)}) as owner:
+        shm = SharedMemory(owner.name)
+        assert shm._name == f"/{owner.name}"
+        shm.close()
+
+
+def test_shm_engrad(tmp_path):
+    """Coordinates, point charges and gradients are exchanged through shared memory"""
+    script = tmp_path / "server.py"
+    script.write_text(SERVER_SCRIPT.format(src=str(Path(opi.__file__).parents[1])))
+    server = OpiServer(str(script), port=free_port())
+    assert server.start_server() == ServerStatus.RUNNING
+    rng = np.random.default_rng(3)
+    numbers = rng.integers(1, 10, size=20000)
+    coordinates = rng.normal(size=(20000, 3))
+    point_charges = np.column_stack([rng.normal(size=50), rng.normal(size=(50, 3)) + 5.0])
+    try:
+        with (
+            ClientSession(("127.0.0.1", server._port)) as session,
+            ShmEngradClient(session) as client,
+        ):
+            for step in range(3):
+                energy, gradient = client.compute(numbers, coordinates + step, point_charges)
+                assert np.allclose(gradient, numbers[:, None] * (coordinates + step))
+            reference = 0.5 * np.sum(numbers[:, None] * (coordinates + 2) ** 2)
+            reference += np.sum(point_charges[:, 0] / np.linalg.norm(point_charges[:, 1:], axis=1))
+            assert np.isclose(energy, reference)
+
+            energy, gradient = client.compute(numbers[:10], coordinates[:10], do_gradient=False)
+            assert gradient is None
+            assert np.isclose(energy, 0.5 * np.sum(numbers[:10, None] * coordinates[:10] ** 2))
+    finally:
+        server.kill_server()
+
+
+def test_engrad_round_trip(tmp_path):
+    """The bulk writer matches the previous format and reading it back is exact"""
+    rng = np.random.default_rng(4)
+    gradient = rng.normal(size=(1000, 3)) * 10.0 ** rng.integers(-30, 30, size=(1000, 3))
+    gradient[0] = [0.0, -0.0, 1.0]
+
+    expected = "#\n# Number of atoms\n#\n1000\n#\n# Total energy [Eh]\n#\n-7.612345678912e+01\n"
+    expected += "#\n# Gradient [Eh/Bohr] A1X, A1Y, A1Z, A2X, ...\n#\n"
+    expected += "\n".join(f"{g: .12e}" for g in gradient.ravel()) + "\n"
+    assert format_engrad(1000, -76.12345678912, gradient) == expected
+
+    engrad = tmp_path / "job_EXT.engrad"
+    ExtoptInterface().write_orca_input(engrad, 1000, -76.12345678912, gradient.ravel().tolist())
+    assert engrad.read_text() == expected
+    natoms, energy, read = read_engrad(engrad)
+    assert natoms == 1000
+    assert energy == -76.12345678912
+    assert np.array_equal(read.ravel(), [float(f"{g: .12e}") for g in gradient.ravel()])
+    assert format_engrad(natoms, energy, read) == expected
+
+    # > Without gradient
+    ExtoptInterface().write_orca_input(engrad, 2, 1.0)
+    assert read_engrad(engrad) == (2, 1.0, None)
@@ -0,0 +1,55 @@
+from opi.execution.sweep import write_jobs
+from opi.input.blocks import BlockMethod, BlockScf
+from opi.input.core import Input
+from opi.input.simple_keywords import BasisSet, Dft, Method
+
+
+def test_derive_copy_on_write():
+    """Derived inputs share unchanged blocks until either side modifies them"""
+    template = Input()
+    template.add_simple_keywords(Method.HF, BasisSet.DEF2_SVP)
+    template.add_blocks(BlockScf(maxiter=100), BlockMethod(d3s6=0.64))
+
+    derived = template.derive(
+        add_simple_keywords=[BasisSet.DEF2_TZVP],
+        remove_simple_keywords=[BasisSet.DEF2_SVP],
+        update_blocks={BlockScf: {"maxiter": 200}},
+        ncores=4,
+    )
+    assert template.simple_keywords == [Method.HF, BasisSet.DEF2_SVP]
+    assert derived.simple_keywords == [Method.HF, BasisSet.DEF2_TZVP]
+    assert template.blocks[BlockScf].maxiter == 100
+    assert derived.blocks[BlockScf].maxiter == 200
+    assert derived.blocks[BlockMethod] is template.blocks[BlockMethod]
+    assert (template.ncores, derived.ncores) == (None, 4)
+
+    # > Modification through get_blocks copies the shared block first
+    method = derived.get_blocks(BlockMethod)[BlockMethod]
+    method.d3s6 = 0.5
+    assert template.blocks[BlockMethod].d3s6 == 0.64
+    assert template.get_blocks(BlockMethod)[BlockMethod] is not method
+
+    # > Unchanged option is kept
+    assert derived.derive(ncores=None).ncores is None
+    assert derived.derive().ncores == 4
+
+
+def test_write_jobs(tmp_path, water_calculator):
+    """One input file per row, with changes applied on top of the template"""
+    template = water_calculator("template", keywords=(BasisSet.DEF2_SVP,))
+    template.input.add_blocks(BlockScf(maxiter=150))
+
+    rows = [
+        {"basename": f"{functional}", "add_simple_keywords": [functional]}
+        for functional in (Dft.PBE, Dft.B3LYP, Dft.TPSS)
+    ]
+    rows.append({"basename": "hf", "working_dir": tmp_path / "hf", "add_simple_keywords": ["HF"]})
+    calculators = write_jobs(template, rows, max_workers=2)
+
+    assert [calc.basename for calc in calculators] == ["pbe", "b3lyp", "tpss", "hf"]
+    pbe = (tmp_path / "pbe.inp").read_text()
+    assert "!pbe" in pbe and "maxiter 150" in pbe and "jsonpropfile true" in pbe
+    assert "!hf" in (tmp_path / "hf" / "hf.inp").read_text()
+    assert "!pbe" not in template.format_input()
+    # > Blocks are shared with the template
+    assert calculators[0].input.blocks[BlockScf] is template.input.blocks[BlockScf]
@@ -0,0 +1,126 @@
+import json
+import threading
+
+import pytest
+
+from opi.core import Calculator
+from opi.input.simple_keywords import BasisSet, Dft
+from opi.input.structures.structure import Structure
+from opi.output.grepper.core import Grepper
+from opi.output.grepper.recipes import get_scf_cycles
+from opi.utils.tracing import (
+    JsonLinesSink,
+    MemorySink,
+    OpenTelemetrySink,
+    current_span,
+    get_sink,
+    span,
+    traced,
+    tracing,
+)
+
+
+def test_disabled_by_default():
+    """Without a sink, spans are no-ops and nothing is recorded"""
+    assert get_sink() is None
+    with span("stage", size=1) as trace:
+        trace.set("returncode", 0)
+    assert span("other") is trace
+    assert current_span() is trace
+
+
+def test_nesting():
+    @traced("thread")
+    def in_thread():
+        pass
+
+    @traced("outer")
+    def outer():
+        current_span().set("key", "value")
+        with span("inner", path=("geometries", -1)):
+            pass
+        thread = threading.Thread(target=in_thread)
+        thread.start()
+        thread.join()
+
+    with tracing(MemorySink()) as sink:
+        outer()
+        with pytest.raises(ValueError), span("failed"):
+            raise ValueError("message")
+    assert get_sink() is None
+
+    inner, thread, outer_span, failed = sink.spans
+    assert inner.parent_id == outer_span.span_id
+    assert outer_span.parent_id is None and thread.parent_id is None
+    assert outer_span.attributes == {"key": "value"}
+    assert outer_span.duration >= inner.duration > 0
+    assert failed.error == "ValueError: message"
+    assert inner.to_dict()["attributes"] == {"path": ["geometries", -1]}
+    assert {name: count for name, (count, _) in sink.totals().items()} == dict.fromkeys(
+        ("inner", "thread", "outer", "failed"), 1
+    )
+
+
+def test_job(fake_orca, tmp_path):
+    """A job creates spans for all stages, from writing the input to the getters"""
+    calc = Calculator("job", working_dir=tmp_path)
+    calc.structure = Structure.from_lists(
+        ["O", "H", "H"], [(0.0, 0.0, 0.0), (0.96, 0.0, 0.0), (-0.24, 0.93, 0.0)]
+    )
+    calc.input.add_simple_keywords(Dft.B3LYP, BasisSet.DEF2_SVP)
+    jsonl = tmp_path / "trace.jsonl"
+    with tracing(MemorySink()) as sink, JsonLinesSink(jsonl) as jsonl_sink:
+        with tracing(jsonl_sink):
+            calc.write_input()
+        calc.run()
+        output = calc.get_output()
+        output.parse()
+        output.get_final_energy()
+        assert get_scf_cycles(tmp_path / "job.out")
+        assert Grepper(tmp_path / "job.out").search("TOTAL RUN TIME")
+
+    assert not sink.find("calculator.write_input")
+    records = [json.loads(line) for line in jsonl.read_text().splitlines()]
+    assert [record["name"] for record in records] == [
+        "calculator.format_input",
+        "calculator.write_input",
+    ]
+    assert records[0]["parent_id"] == records[1]["span_id"]
+    assert records[1]["attributes"] == {
+        "basename": "job",
+        "ncores": calc.input.ncores,
+        "size": (tmp_path / "job.inp").stat().st_size,
+    }
+
+    (run_orca,) = sink.find("runner.run_orca")
+    assert run_orca.attributes["output_size"] == (tmp_path / "job.out").stat().st_size
+    runs = sink.find("runner.run")
+    assert [str(run.attributes["binary"]) for run in runs] == ["orca", "orca_2json", "orca_2json"]
+    assert all(run.attributes["returncode"] == 0 for run in runs)
+
+    (parse,) = sink.find("output.parse")
+    children = {s.name for s in sink.spans if s.parent_id == parse.span_id}
+    assert children == {
+        "output.create_jsons",
+        "output.read_json",
+        "output.lowercase",
+        "output.validate",
+    }
+    read_sizes = {s.attributes["file"]: s.attributes["size"] for s in sink.find("output.read_json")}
+    assert read_sizes == {
+        name: (tmp_path / name).stat().st_size for name in ("job.property.json", "job.json")
+    }
+    assert sink.find("output.get")[0].attributes["path"][0] == "results_properties"
+    assert [s.name for s in sink.spans[-2:]] == ["grepper.scan", "grepper.search"]
+
+
+def test_opentelemetry():
+    """The OpenTelemetry sink is optional"""
+    try:
+        import opentelemetry  # noqa: F401
+    except ImportError:
+        with pytest.raises(ImportError):
+            OpenTelemetrySink()
+        return
+    with tracing(OpenTelemetrySink()), span("outer"), span("inner", size=1):
+        pass
@@ -0,0 +1,84 @@
+import os
+import shutil
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+from opi.output.warehouse import Column, ColumnKind, ResultsWarehouse
+
+JSON_FILES = Path(__file__).parent / "fixtures" / "json_files"
+
+
+def make_job(directory: Path, basename: str, source: str) -> None:
+    """Place the JSON files of a fixture in `directory` as a finished job"""
+    directory.mkdir(parents=True, exist_ok=True)
+    shutil.copyfile(JSON_FILES / f"{source}.property.json", directory / f"{basename}.property.json")
+    (directory / f"{basename}.out").write_text("****ORCA TERMINATED NORMALLY****\n")
+
+
+def test_ingest_and_query(tmp_path):
+    """Jobs and geometries are extracted and can be queried as NumPy arrays"""
+    make_job(tmp_path / "a", "opt", "opt")
+    make_job(tmp_path / "b", "scf", "scf")
+    (tmp_path / "b" / "broken.out").write_text("")
+
+    with ResultsWarehouse(tmp_path / "results.db") as warehouse:
+        assert warehouse.ingest([tmp_path / "a", tmp_path / "b"], max_workers=2) == 3
+        jobs = warehouse.query("jobs")
+        assert list(jobs["basename"]) == ["opt", "broken", "scf"]
+        assert list(jobs["ngeometries"]) == [5, 0, 1]
+        assert list(jobs["terminated_normally"]) == [True, False, True]
+        assert jobs["error"][1].startswith("FileNotFoundError")
+        assert np.isnan(jobs["total_time"][1])
+        assert jobs["total_time"][0] == pytest.approx(5.909946)
+        assert jobs["timings"][0]["scf"] == pytest.approx(3.1931)
+
+        geometries = warehouse.query(
+            "geometries", ["basename", "geometry", "final_energy", "coordinates"]
+        )
+        assert list(geometries["basename"]) == ["opt"] * 5 + ["scf"]
+        assert list(geometries["geometry"]) == [0, 1, 2, 3, 4, 0]
+        assert geometries["final_energy"].dtype == np.float64
+        assert geometries["coordinates"][0].shape == (3, 3)
+
+        energies = warehouse.query(
+            "geometries",
+            ["final_energy"],
+            where="basename = ? AND geometry = ?",
+            parameters=("opt", 4),
+        )
+        assert energies["final_energy"] == pytest.approx(geometries["final_energy"][4])
+
+        with pytest.raises(ValueError):
+            warehouse.query("jobs", ["final_energy"])
+
+
+def test_incremental_ingest(tmp_path):
+    """Only new or changed jobs are extracted again"""
+    make_job(tmp_path, "first", "scf")
+    path = tmp_path / "results.db"
+    with ResultsWarehouse(path) as warehouse:
+        assert warehouse.ingest([tmp_path], max_workers=1) == 1
+
+    make_job(tmp_path, "second", "scf")
+    with ResultsWarehouse(path) as warehouse:
+        assert warehouse.ingest([tmp_path], max_workers=1) == 1
+        assert warehouse.ingest([tmp_path], max_workers=1) == 0
+
+        # > Changed file
+        out = tmp_path / "first.out"
+        os.utime(out, ns=(out.stat().st_atime_ns, out.stat().st_mtime_ns + 1000))
+        assert warehouse.ingest([tmp_path], max_workers=1) == 1
+        assert len(warehouse) == 2
+        assert len(warehouse.query("geometries")["job_id"]) == 2
+
+        (tmp_path / "second.out").unlink()
+        assert warehouse.remove_missing() == 1
+        assert len(warehouse) == 1
+
+    # > New columns require extraction of all jobs
+    columns = (Column("nelectrons", "get_nelectrons", ColumnKind.JSON),)
+    with ResultsWarehouse(path, columns) as warehouse:
+        assert warehouse.ingest([tmp_path], max_workers=1) == 1
+        assert warehouse.query("jobs", ["nelectrons"])["nelectrons"][0] == [10, None]
@@ -0,0 +1,57 @@
+import json
+
+from opi.core import Calculator
+from opi.execution.warm_start import WarmStartManager
+from opi.input.simple_keywords import BasisSet, Method, Scf
+
+
+def fake_run(calc: Calculator, cycles: int) -> None:
+    """Write the files of a successful job"""
+    (calc.working_dir / f"{calc.basename}.gbw").write_bytes(calc.basename.encode())
+    (calc.working_dir / f"{calc.basename}.out").write_text(
+        f"    *           SCF CONVERGED AFTER  {cycles:2d} CYCLES          *\n"
+        "                             ****ORCA TERMINATED NORMALLY****\n"
+    )
+
+
+def test_warm_start(tmp_path, water_calculator):
+    """Closest compatible job is used as initial guess and savings are recorded"""
+    manager = WarmStartManager(tmp_path / "guesses", max_rmsd=0.2)
+    for basename, shift in (("far", 0.1), ("near", 0.02)):
+        calc = water_calculator(basename, shift=shift)
+        manager.apply(calc)
+        fake_run(calc, 12)
+        assert manager.register(calc) is not None
+
+    calc = water_calculator("new")
+    entry = manager.apply(calc)
+    assert entry is not None
+    assert entry.gbw_file.read_bytes() == b"near"
+    assert calc.input.moinp == tmp_path / "new.guess.gbw"
+    assert calc.input.has_simple_keywords(Scf.MOREAD) == (True,)
+    assert "new.guess.gbw" in calc.format_input()
+
+    fake_run(calc, 5)
+    manager.register(calc)
+    metadata = json.loads((tmp_path / "new.warmstart.json").read_text())
+    assert metadata["saved_scf_cycles"] == 7
+
+    # > Index is persisted
+    assert len(WarmStartManager(tmp_path / "guesses").entries) == 3
+
+
+def test_no_compatible_job(water_calculator):
+    """Jobs with another basis or multiplicity or too different structures are not used"""
+    manager = WarmStartManager()
+    calc = water_calculator("ref")
+    fake_run(calc, 10)
+    manager.register(calc)
+
+    assert (
+        manager.apply(water_calculator("basis", keywords=(Method.HF, BasisSet.DEF2_TZVP))) is None
+    )
+    assert manager.apply(water_calculator("far", shift=2.0)) is None
+    calc = water_calculator("triplet")
+    calc.structure.multiplicity = 3
+    assert manager.apply(calc) is None
+    assert calc.input.moinp is None
@@ -0,0 +1,102 @@
+import stat
+import time
+from pathlib import Path
+
+import pytest
+
+from opi.execution.core import Runner
+from opi.execution.watchdog import (
+    GradientPlateau,
+    JobProgress,
+    ScfStagnation,
+    TimeBudget,
+    Watchdog,
+    WatchdogPolicy,
+)
+from opi.output.core import Output
+
+OUTPUT_FILES = Path(__file__).parent / "fixtures" / "output_files"
+
+# > Stand-in for ORCA whose SCF oscillates forever
+OSCILLATING_ORCA = """#!/bin/sh
+echo "Iteration    Energy (Eh)           Delta-E    RMSDP     MaxDP     DIISErr   Damp  Time(sec)"
+echo "    1    -75.0000000000000000     0.00e+00  8.93e-03  6.45e-02  3.12e-01  0.700   0.0"
+i=2
+while true; do
+    echo "    $i    -75.0100000000000000    -1.00e-02  6.02e-03  4.46e-02  1.88e-01  0.700   0.0"
+    i=$((i+1))
+    sleep 0.01
+done
+"""
+
+
+def test_progress_geometry_optimization(tmp_path):
+    """The growing `.out` file of an optimization is parsed incrementally, also when lines are split"""
+    data = (OUTPUT_FILES / "geometry.out").read_bytes()
+    outfile = tmp_path / "job.out"
+    progress = JobProgress()
+    progress.read(outfile)
+
+    for i in range(0, len(data), 997):
+        with outfile.open("ab") as f:
+            f.write(data[i : i + 997])
+        progress.read(outfile)
+
+    assert len(progress.cycle_times) == 4
+    assert progress.rms_gradients == [0.0113950966, 0.0033519269, 0.0016716995, 0.0001260527]
+    # > Final single point converged after 3 cycles
+    assert len(progress.scf_delta_e) == 3
+
+
+def test_policies():
+    """Policies only abort jobs that do not improve anymore"""
+    progress = JobProgress()
+    progress.scf_delta_e = [0.0, -1e-2, -1e-3, 2e-3, -5e-3, 1e-2]
+    assert ScfStagnation(3).check(progress) is not None
+    assert ScfStagnation(4).check(progress) is None
+
+    progress.rms_gradients = [1e-2, 5e-3, 4.9e-3, 4.8e-3]
+    assert GradientPlateau(2, min_decrease=0.1).check(progress) is not None
+    assert GradientPlateau(3, min_decrease=0.1).check(progress) is None
+
+    # > Each cycle takes 40 s, so the next one would end at 120 s
+    progress.elapsed = 85.0
+    progress.cycle_times = [0.0, 40.0, 80.0]
+    assert TimeBudget(150).check(progress) is None
+    assert TimeBudget(100).check(progress) is not None
+
+    with pytest.raises(ValueError):
+        ScfStagnation(0)
+
+    # > Policies without `check()` fail on creation, not while ORCA runs
+    class Incomplete(WatchdogPolicy):
+        pass
+
+    with pytest.raises(TypeError):
+        Incomplete()
+
+
+def test_abort_oscillating_scf(tmp_path, monkeypatch):
+    """A hopeless job is terminated early and the reason is available from `Output`"""
+    orca = tmp_path / "orca"
+    orca.write_text(OSCILLATING_ORCA)
+    orca.chmod(orca.stat().st_mode | stat.S_IEXEC)
+    monkeypatch.setenv("OPI_ORCA", str(orca))
+    inpfile = tmp_path / "job.inp"
+    inpfile.write_text("! HF\n")
+
+    watchdog = Watchdog([ScfStagnation(20)], interval=0.05, grace_period=1.0)
+    start = time.monotonic()
+    Runner(tmp_path).run_orca(inpfile, watchdog=watchdog, timeout=30)
+    assert time.monotonic() - start < 20
+
+    reason = Output("job", working_dir=tmp_path).get_abort_reason()
+    assert reason is not None
+    assert reason.policy == "ScfStagnation"
+    assert reason.progress["scf_iterations"] > 20
+    assert reason.progress["last_delta_e"] == -1e-2
+
+    # > The record of a previous run is removed
+    orca.write_text("#!/bin/sh\necho '****ORCA TERMINATED NORMALLY****'\n")
+    Runner(tmp_path).run_orca(inpfile, watchdog=watchdog)
+    assert Output("job", working_dir=tmp_path).get_abort_reason() is None
@@ -0,0 +1,137 @@
+import pickle
+
+import numpy as np
+import pytest
+
+from opi.core import Calculator
+from opi.execution.wire import decode_message, dumps, loads
+from opi.input.blocks import BlockBasis, BlockScf
+from opi.input.blocks.block_basis import FragBasis
+from opi.input.blocks.block_scf import DIIS
+from opi.input.core import Input
+from opi.input.simple_keywords import BasisSet, Method, SimpleKeyword
+from opi.input.structures.atom import Atom, EmbeddingPotential, GhostAtom, PointCharge
+from opi.input.structures.coordinates import Coordinates
+from opi.input.structures.structure import Structure
+
+
+def make_structure(natoms: int) -> Structure:
+    rng = np.random.default_rng(1)
+    symbols = ["C", "H", "O", "N"]
+    structure = Structure(
+        [Atom(element=symbols[i % 4], coordinates=tuple(rng.normal(size=3))) for i in range(natoms)]
+    )
+    structure.set_ls_multiplicity()
+    return structure
+
+
+def test_round_trip_calculator(tmp_path):
+    """Decoded calculator writes the identical input and keeps keyword identity"""
+    moinp = tmp_path / "guess.gbw"
+    moinp.write_bytes(b"")
+    calc = Calculator("job", working_dir=tmp_path, version_check=False)
+    calc.structure = Structure(
+        [
+            Atom(element="O", coordinates=(0.0, 0.0, 0.1173), fragment_id=1, mass=17.999),
+            GhostAtom(element="H", coordinates=(0.0, 0.7572, -0.4692), nuclear_charge=0.0),
+            Atom(
+                element="H",
+                coordinates=(0.0, -0.7572, -0.4692),
+                append_str="newgto S 1 1 1.0 1.0 end end",
+            ),
+            PointCharge(charge=-0.834, coordinates=(1.0, 2.0, 3.0)),
+            EmbeddingPotential(
+                charge=0.5, element="Na", coordinates=(3.0, 2.0, 1.0), fragment_id=2
+            ),
+        ],
+        origin=tmp_path / "water.xyz",
+    )
+    calc.input.add_simple_keywords(Method.HF, BasisSet.DEF2_SVP, SimpleKeyword("customkw"))
+    calc.input.add_blocks(
+        BlockScf(maxiter=150, diis=DIIS(maxeq=7)),
+        BlockBasis(fragbasis=FragBasis(frag={1: BasisSet.DEF2_TZVP, 2: BasisSet.DEF2_SVP})),
+    )
+    calc.input.add_arbitrary_string("%tddft nroots 5 end", pos="bottom")
+    calc.input.ncores = 4
+    calc.input.moinp = moinp
+
+    decoded = loads(dumps(calc))
+    assert isinstance(decoded, Calculator)
+    assert decoded.format_input() == calc.format_input()
+    assert decoded.input.has_simple_keywords(Method.HF, BasisSet.DEF2_SVP) == (True, True)
+    assert (
+        decoded.input.blocks[BlockScf].model_fields_set
+        == calc.input.blocks[BlockScf].model_fields_set
+    )
+    assert decoded.structure.origin == str(tmp_path / "water.xyz")
+    assert decoded.structure.atoms[1].coordinates.y == 0.7572
+
+
+@pytest.mark.parametrize("natoms", [0, 1, 1000])
+def test_round_trip_structure(natoms):
+    """Coordinates are stored exactly and the payload is smaller than pickle"""
+    structure = make_structure(natoms)
+    payload = dumps(structure)
+    decoded = loads(payload)
+    assert isinstance(decoded, Structure)
+    assert decoded.format_orca() == structure.format_orca()
+    if natoms:
+        np.testing.assert_array_equal(
+            [atom.coordinates.coordinates for atom in decoded.atoms],
+            [atom.coordinates.coordinates for atom in structure.atoms],
+        )
+        # > Atoms do not share their coordinates
+        decoded.atoms[0].coordinates.x = 100.0
+        assert decoded.atoms[-1].coordinates.x != 100.0 or natoms == 1
+    if natoms == 1000:
+        assert len(payload) < len(pickle.dumps(structure)) / 3
+
+
+def test_invalid_payload():
+    with pytest.raises(ValueError):
+        loads(b"not a payload")
+    inp = Input()
+    inp.add_simple_keywords(Method.HF)
+    assert isinstance(loads(dumps(inp)), Input)
+    with pytest.raises(TypeError):
+        dumps(object())
+
+
+def test_decode_message():
+    """Only messages in the wire format are decoded"""
+    message = {"type": "setup_calculator", "calculator": {"method": "toy"}}
+    assert decode_message(message) == message
+    inp = Input()
+    inp.add_simple_keywords(Method.HF)
+    decoded = decode_message(
+        {"type": "setup_calculator", "format": "opi-wire", "calculator": dumps(inp)}
+    )
+    assert decoded.keys() == {"type", "calculator"}
+    assert decoded["calculator"].has_simple_keywords(Method.HF) == (True,)
+
+
+@pytest.mark.parametrize(
+    "atom",
+    [
+        Atom(element="O", coordinates=(0.0, 0.0, 1.0), fragment_id=1, mass=17.999),
+        GhostAtom(element="H", coordinates=(0.0, 1.0, 0.0), nuclear_charge=0.0),
+        PointCharge(charge=-0.834, coordinates=(1.0, 2.0, 3.0)),
+        EmbeddingPotential(charge=0.5, element="Na", coordinates=(3.0, 2.0, 1.0), append_str="x"),
+    ],
+)
+def test_trusted_atoms(atom):
+    """Unvalidated constructors set the same attributes as the constructors"""
+    attributes = {
+        "element": atom._element,
+        "coordinates": Coordinates._from_trusted(atom.coordinates.coordinates.copy()),
+        "fragment_id": atom.fragment_id,
+        "nuclear_charge": atom.nuclear_charge,
+        "mass": atom.mass,
+        "append_str": atom.append_str,
+    }
+    if hasattr(atom, "charge"):
+        attributes["charge"] = atom.charge
+    trusted = type(atom)._from_trusted(**attributes)
+    assert vars(trusted).keys() == vars(atom).keys()
+    assert vars(trusted.coordinates).keys() == vars(atom.coordinates).keys()
+    assert trusted.format_orca() == atom.format_orca()